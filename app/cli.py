@@ -0,0 +1,320 @@
+"""
+Headless RimSort: scan installed mods, sort the active mods of a ModsConfig.xml
+and save the sorted list, without loading the Qt widgets.
+
+Usage:
+    python -m app.cli scan --game PATH [--local PATH] [--workshop PATH]
+    python -m app.cli sort --game PATH --mods-config PATH [--method topological]
+    python -m app.cli save --game PATH --mods-config PATH [--output PATH]
+
+The sorted package ids are printed to stdout, and the time taken by each phase
+to stderr.
+"""
+
+import argparse
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from loguru import logger
+
+from app.models.metadata.metadata_factory import read_mods_config, write_mods_config
+from app.models.metadata.metadata_mediator import MetadataMediator
+from app.models.metadata.metadata_structure import (
+    AboutXmlMod,
+    ListedMod,
+    ModsConfig,
+    ModType,
+)
+from app.sort.alphabetical_sort import alphabetical_sort
+from app.sort.dependencies import gen_tier_deps_graphs
+from app.sort.topo_sort import (
+    CircularDependencyError,
+    describe_circular_dependencies,
+    topo_sort,
+)
+from app.utils.constants import SortMethod
+from app.utils.mod_list_matching import get_mods_from_package_ids
+
+# The data source the app gives mods of each type. SteamCMD mods are local mods
+# to the app.
+APP_DATA_SOURCES = {
+    ModType.LUDEON: "expansion",
+    ModType.STEAM_WORKSHOP: "workshop",
+}
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Print the time taken by the wrapped block to stderr.
+    """
+    start = time.perf_counter()
+    yield
+    print(f"{phase}: {time.perf_counter() - start:.3f} s", file=sys.stderr)
+
+
+def build_sort_metadata(mods_metadata: dict[str, ListedMod]) -> dict[str, Any]:
+    """
+    Convert the mods parsed by MetadataMediator to the metadata used by the
+    sort functions, keyed by uuid.
+
+    Like MetadataManager.compile_metadata(), a load after rule also adds the
+    reverse load before rule to the mods it refers to (and the other way
+    around), and rules are only kept for installed mods. Dependencies are not
+    load order rules.
+
+    :param mods_metadata: uuid -> parsed mod
+    :return: uuid -> mod metadata with packageid, name, loadTheseBefore,
+        loadTheseAfter, loadBottom, data_source and path
+    """
+    mods = {
+        uuid: mod
+        for uuid, mod in mods_metadata.items()
+        if isinstance(mod, AboutXmlMod) and mod.valid
+    }
+    sort_metadata: dict[str, Any] = {}
+    packageid_to_uuids: dict[str, list[str]] = {}
+    for uuid, mod in mods.items():
+        package_id = str(mod.package_id)
+        sort_metadata[uuid] = {
+            "packageid": package_id,
+            "name": mod.name,
+            "loadTheseBefore": set(),
+            "loadTheseAfter": set(),
+            "loadBottom": mod.overall_rules.load_last,
+            "data_source": mod.mod_type,
+            "path": str(mod.mod_path),
+        }
+        packageid_to_uuids.setdefault(package_id, []).append(uuid)
+
+    for uuid, mod in mods.items():
+        metadata = sort_metadata[uuid]
+        rules = mod.overall_rules
+        for explicit_key, indirect_key, package_ids in (
+            ("loadTheseBefore", "loadTheseAfter", rules.load_after),
+            ("loadTheseAfter", "loadTheseBefore", rules.load_before),
+        ):
+            for package_id in package_ids:
+                if package_id not in packageid_to_uuids:
+                    continue
+                metadata[explicit_key].add((str(package_id), True))
+                for other_uuid in packageid_to_uuids[package_id]:
+                    sort_metadata[other_uuid][indirect_key].add(
+                        (metadata["packageid"], False)
+                    )
+    return sort_metadata
+
+
+def active_uuids_from_mods_config(
+    mods_config: ModsConfig, sort_metadata: dict[str, Any]
+) -> tuple[list[str], list[str]]:
+    """
+    Find the installed mods of the active mods list of a ModsConfig.xml.
+
+    A package id installed more than once is resolved as the app does, see
+    get_mods_from_package_ids().
+
+    :param mods_config: The parsed ModsConfig.xml
+    :param sort_metadata: uuid -> mod metadata, see build_sort_metadata()
+    :return: The uuids of the active mods in ModsConfig.xml order, and the
+        active package ids that are not installed, as listed in ModsConfig.xml
+    """
+    all_mods = {
+        uuid: {
+            "packageid": metadata["packageid"],
+            "data_source": APP_DATA_SOURCES.get(metadata["data_source"], "local"),
+            "path": metadata["path"],
+        }
+        for uuid, metadata in sort_metadata.items()
+    }
+    package_ids = [str(active_mod) for active_mod in mods_config.activeMods]
+    active_uuids, _, _, missing = get_mods_from_package_ids(all_mods, package_ids)
+    missing_set = set(missing)
+    return list(dict.fromkeys(active_uuids)), [
+        package_id
+        for package_id in package_ids
+        if package_id.lower().replace("_steam", "") in missing_set
+    ]
+
+
+def sort_mods(
+    sort_method: SortMethod, active_uuids: list[str], sort_metadata: dict[str, Any]
+) -> list[str]:
+    """
+    Sort the active mods tier by tier, the same way Sorter.sort() does.
+
+    :param sort_method: The sort method to use
+    :param active_uuids: uuids of the active mods
+    :param sort_metadata: uuid -> mod metadata, see build_sort_metadata()
+    :raises CircularDependencyError: If some mods depend on each other
+    :return: The sorted uuids
+    """
+    uuids = set(active_uuids)
+    package_ids = {sort_metadata[uuid]["packageid"] for uuid in uuids}
+    sort_function = (
+        alphabetical_sort if sort_method == SortMethod.ALPHABETICAL else topo_sort
+    )
+    sorted_uuids = []
+    for graph in gen_tier_deps_graphs(uuids, package_ids, sort_metadata):
+        sorted_uuids += sort_function(graph, uuids, sort_metadata)
+    return list(dict.fromkeys(sorted_uuids))
+
+
+def _scan(args: argparse.Namespace) -> dict[str, Any]:
+    game_path = Path(args.game)
+    user_rules_path = args.user_rules
+    if user_rules_path is None:
+        from app.utils.app_info import AppInfo
+
+        user_rules_path = AppInfo().user_rules_file
+    mediator = MetadataMediator(
+        user_rules_path=Path(user_rules_path),
+        community_rules_path=Path(args.community_rules)
+        if args.community_rules
+        else None,
+        steam_db_path=Path(args.steam_db) if args.steam_db else None,
+        workshop_mods_path=Path(args.workshop) if args.workshop else None,
+        local_mods_path=Path(args.local) if args.local else game_path / "Mods",
+        game_path=game_path,
+    )
+    with timed("scan"):
+        mediator.refresh_metadata()
+    with timed("compile rules"):
+        sort_metadata = build_sort_metadata(mediator.mods_metadata)
+    print(
+        f"Found {len(sort_metadata)} mods for RimWorld {mediator.game_version}",
+        file=sys.stderr,
+    )
+    return sort_metadata
+
+
+def _sort(args: argparse.Namespace) -> tuple[ModsConfig, list[str]] | None:
+    sort_metadata = _scan(args)
+    with timed("read mods config"):
+        mods_config = read_mods_config(Path(args.mods_config))
+    if mods_config is None:
+        print(f"Unable to read mods config: {args.mods_config}", file=sys.stderr)
+        return None
+    active_uuids, missing = active_uuids_from_mods_config(mods_config, sort_metadata)
+    if missing:
+        action = (
+            "Warning: dropping from the saved list"
+            if args.command == "save"
+            else "Skipping"
+        )
+        print(
+            f"{action} {len(missing)} active mods that are not installed: "
+            + ", ".join(missing),
+            file=sys.stderr,
+        )
+
+    sort_method = SortMethod(args.method.capitalize())
+    try:
+        with timed(f"sort ({sort_method.value.lower()})"):
+            sorted_uuids = sort_mods(sort_method, active_uuids, sort_metadata)
+    except CircularDependencyError:
+        print("Unable to sort, found circular dependencies:", file=sys.stderr)
+        for graph in gen_tier_deps_graphs(
+            set(active_uuids),
+            {sort_metadata[uuid]["packageid"] for uuid in active_uuids},
+            sort_metadata,
+        ):
+            for loop in describe_circular_dependencies(graph):
+                print(f"  {loop}", file=sys.stderr)
+        return None
+
+    # Keep the "_steam" suffix of mods installed more than once
+    package_ids = [str(mod) for mod in mods_config.activeMods]
+    duplicates = {
+        package_id.removesuffix("_steam")
+        for package_id in package_ids
+        if package_id.endswith("_steam")
+    }
+    sorted_package_ids = []
+    for uuid in sorted_uuids:
+        metadata = sort_metadata[uuid]
+        package_id = metadata["packageid"]
+        if (
+            package_id in duplicates
+            and metadata["data_source"] == ModType.STEAM_WORKSHOP
+        ):
+            package_id += "_steam"
+        sorted_package_ids.append(package_id)
+    return mods_config, sorted_package_ids
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Log to stderr while running"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser("scan", help="Parse the installed mods")
+    sort_parser = subparsers.add_parser(
+        "sort", help="Print the sorted active mods of a ModsConfig.xml"
+    )
+    save_parser = subparsers.add_parser(
+        "save", help="Sort the active mods of a ModsConfig.xml and save them"
+    )
+    for subparser in (scan_parser, sort_parser, save_parser):
+        subparser.add_argument("--game", required=True, help="RimWorld game folder")
+        subparser.add_argument(
+            "--local", help="Local mods folder, defaults to the game's Mods folder"
+        )
+        subparser.add_argument("--workshop", help="Steam Workshop mods folder")
+        subparser.add_argument(
+            "--user-rules", help="userRules.json, defaults to RimSort's own"
+        )
+        subparser.add_argument("--community-rules", help="Community rules database")
+        subparser.add_argument("--steam-db", help="Steam Workshop database")
+    for subparser in (sort_parser, save_parser):
+        subparser.add_argument(
+            "--mods-config", required=True, help="ModsConfig.xml to sort"
+        )
+        subparser.add_argument(
+            "--method",
+            choices=[method.value.lower() for method in SortMethod],
+            default=SortMethod.TOPOLOGICAL.value.lower(),
+        )
+    save_parser.add_argument(
+        "--output", help="Where to save ModsConfig.xml, defaults to --mods-config"
+    )
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    if args.verbose:
+        logger.add(sys.stderr, level="INFO")
+
+    with timed("total"):
+        if args.command == "scan":
+            _scan(args)
+            return 0
+
+        result = _sort(args)
+        if result is None:
+            return 1
+        mods_config, sorted_package_ids = result
+        if args.command == "sort":
+            print("\n".join(sorted_package_ids))
+            return 0
+
+        output = Path(args.output or args.mods_config)
+        mods_config.activeMods = sorted_package_ids
+        with timed("save"):
+            if not write_mods_config(output, mods_config):
+                print(f"Unable to save mods config: {output}", file=sys.stderr)
+                return 1
+        print(f"Saved {len(sorted_package_ids)} mods to {output}", file=sys.stderr)
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ from loguru import logger
 from PySide6.QtCore import QObject, Slot
 from PySide6.QtWidgets import QPushButton
 
+from app.utils.compiled_steam_db import CompiledSteamDb
 from app.utils.event_bus import EventBus
 from app.utils.metadata import MetadataManager
 from app.views.main_window import MainWindow
@@ -129,11 +130,15 @@ class MainWindowController(QObject):
                         # If not found locally, we need to find its Workshop ID
                         # First check if we have it in our Steam metadata
                         workshop_id = None
-                        if self.metadata_manager.external_steam_metadata:
-                            for (
-                                pfid,
-                                metadata,
-                            ) in self.metadata_manager.external_steam_metadata.items():
+                        steam_metadata = self.metadata_manager.external_steam_metadata
+                        if isinstance(steam_metadata, CompiledSteamDb):
+                            # Use the packageId index instead of decoding every entry
+                            workshop_ids = steam_metadata.publishedfileids_by_packageid(
+                                dep_id
+                            )
+                            workshop_id = workshop_ids[0] if workshop_ids else None
+                        elif steam_metadata:
+                            for pfid, metadata in steam_metadata.items():
                                 if (
                                     metadata.get("packageId", "").lower()
                                     == dep_id.lower()
@@ -70,6 +70,7 @@ class ModsPanelController(QObject):
                 widget = mod.listWidget()
                 # Widget should always be of type ModListWidget
                 if isinstance(widget, ModListWidget):
+                    widget.rule_index.invalidate([mod_data["uuid"]])
                     package_id = widget.metadata_manager.internal_local_metadata[
                         mod_data["uuid"]
                     ]["packageid"]
@@ -9,7 +9,7 @@ from PySide6.QtWidgets import QApplication, QLineEdit, QMessageBox
 
 from app.controllers.theme_controller import ThemeController
 from app.models.settings import Instance, Settings
-from app.utils.constants import SortMethod
+from app.utils.constants import MetadataParserBackend, SortMethod
 from app.utils.event_bus import EventBus
 from app.utils.generic import platform_specific_open
 from app.utils.system_info import SystemInfo
@@ -253,6 +253,11 @@ class SettingsController(QObject):
             self._on_theme_location_open_button_clicked
         )
 
+        # Advanced tab
+        self.settings_dialog.clear_metadata_cache_button.clicked.connect(
+            self._on_clear_metadata_cache_button_clicked
+        )
+
         # Connect signals from dialogs
         EventBus().reset_settings_file.connect(self._do_reset_settings_file)
 
@@ -598,6 +603,9 @@ class SettingsController(QObject):
             self.settings_dialog.sorting_alphabetical_radio.setChecked(True)
         elif self.settings.sorting_algorithm == SortMethod.TOPOLOGICAL:
             self.settings_dialog.sorting_topological_radio.setChecked(True)
+        self.settings_dialog.incremental_sort_checkbox.setChecked(
+            self.settings.incremental_sort
+        )
 
         # Set dependencies checkbox
         self.settings_dialog.check_deps_checkbox.setChecked(
@@ -691,6 +699,16 @@ class SettingsController(QObject):
         self.settings_dialog.render_unity_rich_text_checkbox.setChecked(
             self.settings.render_unity_rich_text
         )
+        self.settings_dialog.use_compiled_steam_db_checkbox.setChecked(
+            self.settings.use_compiled_steam_db
+        )
+        self.settings_dialog.progressive_refresh_checkbox.setChecked(
+            self.settings.progressive_refresh
+        )
+        if self.settings.metadata_parser_backend == MetadataParserBackend.PROCESSES:
+            self.settings_dialog.metadata_parser_processes_radio.setChecked(True)
+        else:
+            self.settings_dialog.metadata_parser_threads_radio.setChecked(True)
         self.settings_dialog.rentry_auth_code.setText(self.settings.rentry_auth_code)
         self.settings_dialog.rentry_auth_code.setCursorPosition(0)
         self.settings_dialog.github_username.setText(self.settings.github_username)
@@ -800,6 +818,9 @@ class SettingsController(QObject):
             self.settings.sorting_algorithm = SortMethod.ALPHABETICAL
         elif self.settings_dialog.sorting_topological_radio.isChecked():
             self.settings.sorting_algorithm = SortMethod.TOPOLOGICAL
+        self.settings.incremental_sort = (
+            self.settings_dialog.incremental_sort_checkbox.isChecked()
+        )
 
         # Set dependencies checkbox
         self.settings.check_dependencies_on_sort = (
@@ -884,6 +905,16 @@ class SettingsController(QObject):
         self.settings.render_unity_rich_text = (
             self.settings_dialog.render_unity_rich_text_checkbox.isChecked()
         )
+        self.settings.use_compiled_steam_db = (
+            self.settings_dialog.use_compiled_steam_db_checkbox.isChecked()
+        )
+        self.settings.progressive_refresh = (
+            self.settings_dialog.progressive_refresh_checkbox.isChecked()
+        )
+        if self.settings_dialog.metadata_parser_processes_radio.isChecked():
+            self.settings.metadata_parser_backend = MetadataParserBackend.PROCESSES
+        else:
+            self.settings.metadata_parser_backend = MetadataParserBackend.THREADS
         self.settings.rentry_auth_code = self.settings_dialog.rentry_auth_code.text()
         self.settings.github_username = self.settings_dialog.github_username.text()
         self.settings.github_token = self.settings_dialog.github_token.text()
@@ -1641,6 +1672,15 @@ class SettingsController(QObject):
         self.settings.instances[self.settings.current_instance].run_args = run_args_list
         self.settings.save()
 
+    @Slot()
+    def _on_clear_metadata_cache_button_clicked(self) -> None:
+        """
+        Handle the clear metadata cache button click.
+
+        Every mod is parsed from disk again on the next refresh.
+        """
+        EventBus().do_clear_metadata_cache.emit()
+
     @Slot()
     def _do_reset_settings_file(self) -> None:
         logger.info("Resetting settings file and retrying load")
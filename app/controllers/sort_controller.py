@@ -1,11 +1,20 @@
-from typing import Callable
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Iterable
 
+import msgspec
 from loguru import logger
 
 import app.sort.dependencies as sort_deps
 from app.sort.alphabetical_sort import do_alphabetical_sort
 from app.sort.topo_sort import CircularDependencyError, do_topo_sort
 from app.utils.constants import SortMethod
+from app.utils.metadata import MetadataManager
+
+# Bump whenever the sort methods change their output so cached orders are discarded
+SORT_CACHE_VERSION = 1
 
 
 class Sorter:
@@ -40,28 +49,12 @@ class Sorter:
         self,
     ) -> list[dict[str, set[str]]]:
         logger.info("Generating dependency graphs")
-        dependencies_graph = sort_deps.gen_deps_graph(
-            self.active_uuids, list(self.active_package_ids)
-        )
-        reverse_dependencies_graph = sort_deps.gen_rev_deps_graph(
-            self.active_uuids, list(self.active_package_ids)
-        )
-
-        tier_one_graph, tier_one_mods = sort_deps.gen_tier_one_deps_graph(
-            dependencies_graph
-        )
-
-        tier_three_graph, tier_three_mods = sort_deps.gen_tier_three_deps_graph(
-            dependencies_graph,
-            reverse_dependencies_graph,
-            self.active_uuids,
-        )
-
-        tier_two_graph = sort_deps.gen_tier_two_deps_graph(
-            self.active_uuids,
-            list(self.active_package_ids),
-            tier_one_mods,
-            tier_three_mods,
+        tier_one_graph, tier_two_graph, tier_three_graph = (
+            sort_deps.gen_tier_deps_graphs(
+                self.active_uuids,
+                self.active_package_ids,
+                MetadataManager.instance().internal_local_metadata,
+            )
         )
 
         return [tier_one_graph, tier_two_graph, tier_three_graph]
@@ -91,3 +84,357 @@ class Sorter:
             return False, []
 
         return True, list(dict.fromkeys(sorted_uuids))
+
+    def sort_incremental(
+        self,
+        previous_order: list[str],
+        previous_dependency_graphs: list[dict[str, set[str]]],
+        dependency_graphs: list[dict[str, set[str]]] | None = None,
+    ) -> tuple[bool, list[str]]:
+        """Re-sorts only the mods affected by changes since a previous sort.
+
+        The changes are worked out from the previous sort: mods that were added
+        or removed, and mods whose load order rules changed. The tier two mods
+        that are connected to a change are sorted again with the controller's
+        sort method, and spliced back into the previous order. Every other mod
+        keeps its place. Changes to tier one or tier three mods, or to which
+        tier a mod is in, fall back to a full sort.
+
+        :param previous_order: The sorted list of UUIDs returned by the previous sort
+        :type previous_order: list[str]
+        :param previous_dependency_graphs: The dependency graphs the previous sort used
+        :type previous_dependency_graphs: list[dict[str, set[str]]]
+        :param dependency_graphs: The dependency graphs of the active mods, defaults to None
+        :type dependency_graphs: list[dict[str, set[str]]] | None, optional
+        :return: True and the sorted list of UUIDs if the sort was successful, False and an empty list otherwise
+        :rtype: tuple[bool, list[str]]
+        """
+        if dependency_graphs is None:
+            dependency_graphs = self.generate_dependency_graphs()
+
+        try:
+            sorted_uuids = self._sort_affected_components(
+                previous_order, previous_dependency_graphs, dependency_graphs
+            )
+        except CircularDependencyError:
+            logger.info("Circular dependency detected, abandoning sort")
+            return False, []
+
+        if sorted_uuids is None:
+            return self.sort(dependency_graphs)
+        return True, sorted_uuids
+
+    def _sort_affected_components(
+        self,
+        previous_order: list[str],
+        previous_dependency_graphs: list[dict[str, set[str]]],
+        dependency_graphs: list[dict[str, set[str]]],
+    ) -> list[str] | None:
+        """
+        Incremental part of sort_incremental(). Returns None when a full sort is needed.
+        """
+        metadata = MetadataManager.instance().internal_local_metadata
+        uuid_to_package_id = {
+            uuid: metadata[uuid]["packageid"] for uuid in self.active_uuids
+        }
+        if len(set(uuid_to_package_id.values())) != len(uuid_to_package_id):
+            logger.info("Duplicate package ids are active, falling back to full sort")
+            return None
+        previous_tiers = _tier_of_package_ids(previous_dependency_graphs)
+        tiers = _tier_of_package_ids(dependency_graphs)
+        previous_uuids = set(previous_order)
+        changed = set()
+        for uuid in self.active_uuids.symmetric_difference(previous_uuids):
+            if uuid not in metadata:
+                logger.info("Removed mods are unknown, falling back to full sort")
+                return None
+            changed.add(metadata[uuid]["packageid"])
+        for package_id in tiers.keys() & previous_tiers.keys():
+            tier = tiers[package_id]
+            if tier != previous_tiers[package_id]:
+                logger.info(f"{package_id} changed tier, falling back to full sort")
+                return None
+            if (
+                dependency_graphs[tier][package_id]
+                != previous_dependency_graphs[tier][package_id]
+            ):
+                changed.add(package_id)
+        for package_id in changed:
+            if tiers.get(package_id, 1) != 1 or previous_tiers.get(package_id, 1) != 1:
+                logger.info(
+                    f"{package_id} is not a tier two mod, falling back to full sort"
+                )
+                return None
+        if any(
+            metadata[uuid]["packageid"] not in previous_tiers for uuid in previous_order
+        ):
+            logger.info(
+                "Previous order does not match its graphs, falling back to full sort"
+            )
+            return None
+
+        # Mods that were connected to a changed mod before may not be anymore
+        previous_graph = previous_dependency_graphs[1]
+        seeds = set(changed)
+        for package_id, dependencies in previous_graph.items():
+            if package_id in changed:
+                seeds.update(dependencies)
+            elif not changed.isdisjoint(dependencies):
+                seeds.add(package_id)
+        graph = dependency_graphs[1]
+        components = _weakly_connected_components(graph, seeds.intersection(graph))
+        logger.info(
+            f"Re-sorting {sum(map(len, components))} mods in {len(components)} "
+            f"affected components of {len(graph)} tier two mods"
+        )
+
+        package_id_to_uuid = {
+            package_id: uuid for uuid, package_id in uuid_to_package_id.items()
+        }
+        blocks: list[list[str]] = []
+        block_of_uuid: dict[str, int] = {}
+        for component in components:
+            sorted_mods = self.sort_method(
+                {package_id: graph[package_id] for package_id in component},
+                {package_id_to_uuid[package_id] for package_id in component},
+            )
+            block_of_uuid.update((uuid, len(blocks)) for uuid in sorted_mods)
+            blocks.append(sorted_mods)
+
+        # Blocks take the place of the first of their mods in the previous
+        # order. Blocks of only new mods go before the first tier two mod that
+        # comes after them alphabetically.
+        base_order = [uuid for uuid in previous_order if uuid in self.active_uuids]
+        placed = {block_of_uuid[uuid] for uuid in base_order if uuid in block_of_uuid}
+        new_blocks = sorted(
+            (index for index in range(len(blocks)) if index not in placed),
+            key=lambda index: metadata[blocks[index][0]]["name"],
+        )
+        sorted_uuids: list[str] = []
+        emitted = set()
+        for uuid in base_order:
+            tier = tiers[uuid_to_package_id[uuid]]
+            while new_blocks and (
+                tier == 2
+                or (
+                    tier == 1
+                    and metadata[uuid]["name"]
+                    > metadata[blocks[new_blocks[0]][0]]["name"]
+                )
+            ):
+                sorted_uuids += blocks[new_blocks.pop(0)]
+            if uuid not in block_of_uuid:
+                sorted_uuids.append(uuid)
+            elif block_of_uuid[uuid] not in emitted:
+                emitted.add(block_of_uuid[uuid])
+                sorted_uuids += blocks[block_of_uuid[uuid]]
+        for index in new_blocks:
+            sorted_uuids += blocks[index]
+
+        if len(sorted_uuids) != len(
+            self.active_uuids
+        ) or not self.active_uuids.issuperset(sorted_uuids):
+            logger.warning(
+                "Incremental sort lost track of mods, falling back to full sort"
+            )
+            return None
+        return sorted_uuids
+
+
+def _tier_of_package_ids(
+    dependency_graphs: list[dict[str, set[str]]],
+) -> dict[str, int]:
+    return {
+        package_id: tier
+        for tier, graph in enumerate(dependency_graphs)
+        for package_id in graph
+    }
+
+
+def _weakly_connected_components(
+    graph: dict[str, set[str]], seeds: set[str]
+) -> list[set[str]]:
+    """
+    The weakly connected components of graph that contain any of seeds.
+    """
+    neighbours: dict[str, set[str]] = {package_id: set() for package_id in graph}
+    for package_id, dependencies in graph.items():
+        for dependency_id in dependencies:
+            if dependency_id in neighbours:
+                neighbours[package_id].add(dependency_id)
+                neighbours[dependency_id].add(package_id)
+    components = []
+    seen: set[str] = set()
+    for seed in sorted(seeds):
+        if seed in seen:
+            continue
+        component = {seed}
+        stack = [seed]
+        while stack:
+            for neighbour in neighbours[stack.pop()]:
+                if neighbour not in component:
+                    component.add(neighbour)
+                    stack.append(neighbour)
+        seen |= component
+        components.append(component)
+    return components
+
+
+class SortCacheSchema(msgspec.Struct):
+    version: int
+    # Cache key -> sorted package ids, least recently used first
+    entries: dict[str, list[str]] = msgspec.field(default_factory=dict)
+
+
+def sort_cache_key(
+    sort_method: SortMethod,
+    active_uuids: set[str],
+    internal_local_metadata: dict[str, Any],
+    rules_paths: Iterable[str | None],
+) -> str | None:
+    """
+    Hash everything a sort of the active mods depends on: the sort method,
+    the package id, name and load order rules of every active mod, and the
+    versions (stat) of the rules files the rules were compiled from.
+
+    :param sort_method: The sort method
+    :param active_uuids: uuids of the mods to sort
+    :param internal_local_metadata: uuid -> mod metadata
+    :param rules_paths: Paths of the community rules and user rules files
+    :return: The cache key, or None if the sort can not be cached
+    """
+    mods = []
+    for uuid in active_uuids:
+        metadata = internal_local_metadata[uuid]
+        mods.append(
+            (
+                metadata["packageid"],
+                str(metadata.get("name")),
+                sorted(rule[0] for rule in metadata.get("loadTheseBefore") or ()),
+                sorted(rule[0] for rule in metadata.get("loadTheseAfter") or ()),
+                bool(metadata.get("loadBottom")),
+            )
+        )
+    mods.sort()
+    if len({mod[0] for mod in mods}) != len(mods):
+        # Sorted package ids could not be mapped back to uuids
+        return None
+    rules_versions = []
+    for path in rules_paths:
+        if path is None:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        rules_versions.append((path, stat.st_mtime_ns, stat.st_size))
+    return hashlib.sha256(
+        msgspec.json.encode([str(sort_method), rules_versions, mods])
+    ).hexdigest()
+
+
+class SortResultCache:
+    """
+    Persistent cache of sort results, keyed by sort_cache_key(). Holds the
+    most recently used max_entries results.
+
+    New results are saved right away. Reads only update the recently used
+    order, which is saved with the next result or by flush().
+    """
+
+    def __init__(self, path: Path, max_entries: int = 16) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, list[str]] = OrderedDict()
+        self._loaded = False
+        # Whether the recently used order changed since the last save
+        self._dirty = False
+
+    def load(self) -> None:
+        """
+        Load the cache from disk. Missing, corrupt or outdated caches are discarded.
+        """
+        self._loaded = True
+        self.entries = OrderedDict()
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "rb") as f:
+                cache = msgspec.json.decode(f.read(), type=SortCacheSchema)
+        except (OSError, msgspec.DecodeError) as e:
+            logger.warning(f"Discarding unreadable sort cache {self.path}: {e}")
+            return
+        if cache.version == SORT_CACHE_VERSION:
+            self.entries = OrderedDict(cache.entries)
+
+    def save(self) -> None:
+        data = msgspec.json.encode(
+            SortCacheSchema(version=SORT_CACHE_VERSION, entries=dict(self.entries))
+        )
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Unable to write sort cache to {self.path}: {e}")
+        self._dirty = False
+
+    def flush(self) -> None:
+        """
+        Save the cache if the recently used order changed since the last save.
+        """
+        if self._dirty:
+            self.save()
+
+    def get(
+        self,
+        key: str,
+        active_uuids: set[str],
+        internal_local_metadata: dict[str, Any],
+    ) -> list[str] | None:
+        """
+        Return the cached sort result for a key as uuids, or None if there is none.
+
+        :param key: Key from sort_cache_key()
+        :param active_uuids: uuids of the mods to sort
+        :param internal_local_metadata: uuid -> mod metadata
+        """
+        if not self._loaded:
+            self.load()
+        package_ids = self.entries.get(key)
+        if package_ids is None:
+            return None
+        package_id_to_uuid = {
+            internal_local_metadata[uuid]["packageid"]: uuid for uuid in active_uuids
+        }
+        if package_id_to_uuid.keys() != set(package_ids):
+            return None
+        if next(reversed(self.entries)) != key:
+            self.entries.move_to_end(key)
+            self._dirty = True
+        return [package_id_to_uuid[package_id] for package_id in package_ids]
+
+    def put(
+        self,
+        key: str,
+        sorted_uuids: list[str],
+        internal_local_metadata: dict[str, Any],
+    ) -> None:
+        """
+        Store a sort result, evicting the least recently used results if full.
+
+        :param key: Key from sort_cache_key()
+        :param sorted_uuids: The sorted uuids
+        :param internal_local_metadata: uuid -> mod metadata
+        """
+        if not self._loaded:
+            self.load()
+        self.entries[key] = [
+            internal_local_metadata[uuid]["packageid"] for uuid in sorted_uuids
+        ]
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.save()
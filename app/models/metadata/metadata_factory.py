@@ -26,7 +26,7 @@ from app.models.metadata.metadata_structure import (
     SteamDbSchema,
 )
 from app.utils.constants import RIMWORLD_DLC_METADATA
-from app.utils.xml import json_to_xml_write, xml_path_to_json
+from app.utils.xml import about_xml_to_json, json_to_xml_write, xml_path_to_json
 
 
 class MalformedDataException(Exception):
@@ -91,6 +91,11 @@ def read_mods_config(path: Path) -> ModsConfig | None:
         version = mods_config.get("version", None)
         activeMods = value_extractor(mods_config.get("activeMods", None))
         knownExpansions = value_extractor(mods_config.get("knownExpansions", None))
+        # A list with a single <li> is read as a plain string
+        if isinstance(activeMods, str):
+            activeMods = [activeMods]
+        if isinstance(knownExpansions, str):
+            knownExpansions = [knownExpansions]
 
         if version is None or activeMods is None or knownExpansions is None:
             logger.error("Error reading mods config: Required fields not found.")
@@ -122,8 +127,12 @@ def write_mods_config(path: Path, mods_config: ModsConfig) -> bool:
     :param mods_config: The ModsConfig object.
     """
     try:
+        mods_config_data = mods_config.to_dict()
+        # RimWorld expects each list entry in its own <li> element
+        for key in ("activeMods", "knownExpansions"):
+            mods_config_data[key] = {"li": mods_config_data[key]}
         json_to_xml_write(
-            {"ModsConfigData": mods_config.to_dict()}, str(path), raise_errs=True
+            {"ModsConfigData": mods_config_data}, str(path), raise_errs=True
         )
         return True
     except Exception as e:
@@ -513,7 +522,7 @@ def _create_about_mod_from_xml(
     base_path: Path, mod_xml_path: Path, target_version: str
 ) -> tuple[bool, AboutXmlMod]:
     try:
-        mod_data = xml_path_to_json(str(mod_xml_path))
+        mod_data = about_xml_to_json(str(mod_xml_path))
     except Exception:
         logger.error(
             f"Unable to parse {mod_xml_path} with the exception: {traceback.format_exc()}"
@@ -12,7 +12,7 @@ from PySide6.QtCore import QObject
 
 from app.models.instance import Instance
 from app.utils.app_info import AppInfo
-from app.utils.constants import SortMethod
+from app.utils.constants import MetadataParserBackend, SortMethod
 from app.utils.event_bus import EventBus
 from app.utils.generic import handle_remove_read_only
 
@@ -67,6 +67,7 @@ class Settings(QObject):
         self.check_dependencies_on_sort: bool = (
             True  # Whether to check for missing dependencies when sorting
         )
+        self.incremental_sort: bool = False  # Whether to only re-sort mods affected by changes since the last sort
 
         # DB Builder
         self.db_builder_include: str = "all_mods"
@@ -96,6 +97,13 @@ class Settings(QObject):
         self.steam_mods_update_check: bool = False
         self.try_download_missing_mods: bool = False
         self.render_unity_rich_text: bool = True
+        self.metadata_parser_backend: MetadataParserBackend = (
+            MetadataParserBackend.THREADS
+        )
+        self.use_compiled_steam_db: bool = False
+        self.progressive_refresh: bool = (
+            False  # Whether to fill the mod lists while mods are being parsed
+        )
 
         self.rentry_auth_code: str = ""
 
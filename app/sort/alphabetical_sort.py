@@ -1,25 +1,159 @@
+import random
+from typing import Any, Iterator
+
 from loguru import logger
 
-from app.utils.metadata import MetadataManager
+
+class _LoadOrder:
+    """
+    Load order that supports inserting after any package id and looking up the
+    position of a package id in O(log n) expected time.
+
+    Package ids are kept in a treap ordered by position, with parent links so a
+    position can be computed by walking up from a node.
+    """
+
+    def __init__(self) -> None:
+        self.root: str | None = None
+        self.left: dict[str, str | None] = {}
+        self.right: dict[str, str | None] = {}
+        self.parent: dict[str, str | None] = {}
+        self.size: dict[str | None, int] = {None: 0}
+        self.priority: dict[str, float] = {}
+        # Insertion counter of each package id
+        self.inserted: dict[str, int] = {}
+        # Fixed seed so the tree shape (and so the running time) is reproducible
+        self._random = random.Random(0)
+
+    def __contains__(self, package_id: object) -> bool:
+        return package_id in self.inserted
+
+    def __iter__(self) -> Iterator[str]:
+        stack: list[str] = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = self.left[node]
+            node = stack.pop()
+            yield node
+            node = self.right[node]
+
+    def position(self, package_id: str) -> int:
+        position = self.size[self.left[package_id]]
+        node = package_id
+        parent = self.parent[node]
+        while parent is not None:
+            if self.right[parent] == node:
+                position += self.size[self.left[parent]] + 1
+            node, parent = parent, self.parent[parent]
+        return position
+
+    def insert_after(self, previous: str | None, package_id: str) -> None:
+        """
+        Insert package_id right after previous, or first if previous is None.
+        """
+        self.inserted[package_id] = len(self.inserted)
+        self.left[package_id] = self.right[package_id] = None
+        self.size[package_id] = 1
+        self.priority[package_id] = self._random.random()
+        if self.root is None:
+            self.parent[package_id] = None
+            self.root = package_id
+            return
+
+        # Attach as a leaf: the right child of previous, or the leftmost
+        # node of its right subtree (the whole tree if previous is None)
+        if previous is not None and self.right[previous] is None:
+            self.right[previous] = package_id
+            self.parent[package_id] = previous
+        else:
+            leaf = self.root if previous is None else self.right[previous]
+            assert leaf is not None
+            while (left := self.left[leaf]) is not None:
+                leaf = left
+            self.left[leaf] = package_id
+            self.parent[package_id] = leaf
+        node = self.parent[package_id]
+        while node is not None:
+            self.size[node] += 1
+            node = self.parent[node]
+
+        # Restore the heap order on priorities
+        node = self.parent[package_id]
+        while node is not None and self.priority[package_id] > self.priority[node]:
+            self._rotate_up(package_id, node)
+            node = self.parent[package_id]
+
+    def _rotate_up(self, node: str, parent: str) -> None:
+        grandparent = self.parent[parent]
+        if self.left[parent] == node:
+            child = self.right[node]
+            self.left[parent] = child
+            self.right[node] = parent
+        else:
+            child = self.left[node]
+            self.right[parent] = child
+            self.left[node] = parent
+        if child is not None:
+            self.parent[child] = parent
+        self.parent[parent] = node
+        self.parent[node] = grandparent
+        if grandparent is None:
+            self.root = node
+        elif self.left[grandparent] == parent:
+            self.left[grandparent] = node
+        else:
+            self.right[grandparent] = node
+        self.size[parent] = (
+            self.size[self.left[parent]] + self.size[self.right[parent]] + 1
+        )
+        self.size[node] = self.size[self.left[node]] + self.size[self.right[node]] + 1
 
 
 def do_alphabetical_sort(
     dependency_graph: dict[str, set[str]], active_mods_uuids: set[str]
 ) -> list[str]:
+    # Imported here so the sort itself can be used without the Qt widgets
+    from app.utils.metadata import MetadataManager
+
     logger.info(f"Starting Alphabetical sort for {len(dependency_graph)} mods")
-    # Cache MetadataManager instance
-    metadata_manager = MetadataManager.instance()
+    reordered = alphabetical_sort(
+        dependency_graph,
+        active_mods_uuids,
+        MetadataManager.instance().internal_local_metadata,
+    )
+    logger.info(f"Finished Alphabetical sort with {len(reordered)} mods")
+    return reordered
+
+
+def alphabetical_sort(
+    dependency_graph: dict[str, set[str]],
+    active_mods_uuids: set[str],
+    internal_local_metadata: dict[str, Any],
+) -> list[str]:
+    """
+    Sort mods by name, moving the dependencies of each mod in front of it.
+
+    Each mod is added in alphabetical order, and its dependencies that are not
+    in the load order yet are inserted right before it, recursively.
+
+    :param dependency_graph: Package id -> package ids it depends on
+    :param active_mods_uuids: uuids of the mods to sort
+    :param internal_local_metadata: uuid -> mod metadata
+    :return: The sorted uuids
+    """
     # Get an alphabetized list of dependencies
     active_mods_id_to_name = dict(
         (
-            metadata_manager.internal_local_metadata[uuid]["packageid"],
-            metadata_manager.internal_local_metadata[uuid]["name"],
+            internal_local_metadata[uuid]["packageid"],
+            internal_local_metadata[uuid]["name"],
         )
         for uuid in active_mods_uuids
     )
     active_mods_packageid_to_uuid = dict(
         (
-            metadata_manager.internal_local_metadata[uuid]["packageid"],
+            internal_local_metadata[uuid]["packageid"],
             uuid,
         )
         for uuid in active_mods_uuids
@@ -27,92 +161,107 @@ def do_alphabetical_sort(
     active_mods_alphabetized = sorted(
         active_mods_id_to_name.items(), key=lambda x: x[1], reverse=False
     )
-    dependencies_alphabetized = {}
-    for tuple_id_name in active_mods_alphabetized:
-        if tuple_id_name[0] in dependency_graph:
-            dependencies_alphabetized[tuple_id_name[0]] = dependency_graph[
-                tuple_id_name[0]
-            ]
-    mods_load_order = []
-    for package_id in dependencies_alphabetized:
+    mods_load_order = _LoadOrder()
+    last_appended = None
+    for package_id, _ in active_mods_alphabetized:
         # Avoid repeating adding packages that have already been added
-        if package_id not in mods_load_order:
+        if package_id in dependency_graph and package_id not in mods_load_order:
             # Add the current mod in alphabetical order
-            mods_load_order.append(package_id)
-
-            # ?
-            index_just_appended = mods_load_order.index(package_id)
-            recursively_force_insert(
+            mods_load_order.insert_after(last_appended, package_id)
+            force_insert_dependencies(
                 mods_load_order,
                 dependency_graph,
                 package_id,
-                active_mods_uuids,
-                index_just_appended,
+                active_mods_id_to_name,
+                last_appended,
             )
+            last_appended = package_id
 
-    reordered = list()
-    for package_id in mods_load_order:
-        if package_id in active_mods_packageid_to_uuid:
-            mod_uuid = active_mods_packageid_to_uuid[package_id]
-            reordered.append(mod_uuid)
-    logger.info(f"Finished Alphabetical sort with {len(reordered)} mods")
-    return reordered
+    return [
+        active_mods_packageid_to_uuid[package_id]
+        for package_id in mods_load_order
+        if package_id in active_mods_packageid_to_uuid
+    ]
 
 
-def recursively_force_insert(
-    mods_load_order: list[str],
+def _reverse_alphabetized_dependencies(
     dependency_graph: dict[str, set[str]],
     package_id: str,
-    active_mods_uuids: set[str],
-    index_just_appended: int,
+    active_mods_id_to_name: dict[str, Any],
+) -> list[str]:
+    deps_id_to_name = {
+        dependency_id: active_mods_id_to_name[dependency_id]
+        for dependency_id in dependency_graph[package_id]
+        if dependency_id in active_mods_id_to_name
+    }
+    return [
+        dependency_id
+        for dependency_id, _ in sorted(
+            deps_id_to_name.items(), key=lambda x: x[1], reverse=True
+        )
+    ]
+
+
+def force_insert_dependencies(
+    mods_load_order: _LoadOrder,
+    dependency_graph: dict[str, set[str]],
+    package_id: str,
+    active_mods_id_to_name: dict[str, Any],
+    previous: str | None,
 ) -> None:
-    # Cache MetadataManager instance
-    metadata_manager = MetadataManager.instance()
-    # Get the reverse alphabetized list (by name) of the current mod's dependencies
-    deps_of_package = dependency_graph[package_id]
-    deps_id_to_name = {}
-    for dependency_id in deps_of_package:
-        for uuid in active_mods_uuids:
-            mod_package_id = metadata_manager.internal_local_metadata[uuid]["packageid"]
-            if dependency_id == mod_package_id:
-                deps_id_to_name[dependency_id] = (
-                    metadata_manager.internal_local_metadata[uuid]["name"]
-                )
-    deps_of_package_alphabetized = sorted(
-        deps_id_to_name.items(), key=lambda x: x[1], reverse=True
-    )
+    """
+    Insert the dependencies of package_id that are not in the load order yet
+    right before it, in reverse alphabetical order, and recurse into them.
 
-    # Iterate through the list of reverse alphabetized dependencies
-    # The idea is to insert at the list index so that e.g.
-    # mod A has dependencies B and C (in that rev alphabetical order),
-    # then the return list will have [C, B, A].
-    for tuple_dep_id_dep_name in deps_of_package_alphabetized:
-        dep_id = tuple_dep_id_dep_name[0]
-        if dep_id not in mods_load_order:
-            # We can't just insert it here. This is because deps in deps_of_package_alphabetized
-            # may contain deps that depend on each other. Therefore, before we insert a dep,
-            # we need to iterate through the sublist starting at the original package_id index
-            # and ending at the live index of the package_id (this gives the sublist of deps)
-            # that have been inserted for this package_id, this also works for recursively
-            # inserted deps of deps). We iterate through this list backwards, as we want to check
-            # for the first dep that the current dep depends on (if it exists). It if exists,
-            # the index to insert the current dep will be the index of that dep + 1, as we do not
-            # want to shift that dep back. Otherwise, if no dep of dep is found, then we insert
-            # at the original index normally.
-            index_to_insert_at = index_just_appended
-            for e in reversed(
-                mods_load_order[index_just_appended : mods_load_order.index(package_id)]
-            ):
-                if e in dependency_graph[dep_id]:
-                    index_to_insert_at = mods_load_order.index(e) + 1
-                    break
-
-            mods_load_order.insert(index_to_insert_at, dep_id)
-            new_idx = mods_load_order.index(dep_id)
-            recursively_force_insert(
-                mods_load_order,
-                dependency_graph,
-                dep_id,
-                active_mods_uuids,
-                new_idx,
+    A dependency that depends on one of the mods already inserted for
+    package_id goes after the last of those, so that e.g. mod A with
+    dependencies B and C (in that reverse alphabetical order) gives [C, B, A].
+    Everything inserted while package_id is being handled ends up between
+    previous and package_id, so those are the mods inserted after package_id.
+
+    :param mods_load_order: Load order to insert into
+    :param dependency_graph: Package id -> package ids it depends on
+    :param package_id: Package id that was just added to the load order
+    :param active_mods_id_to_name: Package id -> name of the active mods
+    :param previous: Package id right before package_id in the load order
+    """
+    # Explicit stack instead of recursion, dependency chains can be long
+    stack = [
+        (
+            package_id,
+            previous,
+            iter(
+                _reverse_alphabetized_dependencies(
+                    dependency_graph, package_id, active_mods_id_to_name
+                )
+            ),
+        )
+    ]
+    while stack:
+        package_id, previous, dependencies = stack[-1]
+        for dep_id in dependencies:
+            if dep_id in mods_load_order:
+                continue
+            inserted = mods_load_order.inserted[package_id]
+            insert_after = previous
+            insert_after_position = -1
+            for e in dependency_graph[dep_id]:
+                if mods_load_order.inserted.get(e, -1) > inserted:
+                    position = mods_load_order.position(e)
+                    if position > insert_after_position:
+                        insert_after, insert_after_position = e, position
+            mods_load_order.insert_after(insert_after, dep_id)
+            stack.append(
+                (
+                    dep_id,
+                    insert_after,
+                    iter(
+                        _reverse_alphabetized_dependencies(
+                            dependency_graph, dep_id, active_mods_id_to_name
+                        )
+                    ),
+                )
             )
+            break
+        else:
+            stack.pop()
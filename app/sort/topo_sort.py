@@ -1,9 +1,11 @@
-import networkx as nx
+from collections import deque
+from typing import Any
+
 from loguru import logger
 from toposort import CircularDependencyError, toposort
 
-from app.utils.metadata import MetadataManager
-from app.views.dialogue import show_warning
+# Most dependency loops listed in the warning shown when sorting fails
+MAX_REPORTED_CYCLES = 50
 
 
 def do_topo_sort(
@@ -13,20 +15,41 @@ def do_topo_sort(
     Sort mods using the topological sort algorithm. For each
     topological level, sort the mods alphabetically.
     """
-    logger.info(f"Initializing toposort for {len(dependency_graph)} mods")
-    # Cache MetadataManager instance
-    metadata_manager = MetadataManager.instance()
+    # Imported here so the sort itself can be used without the Qt widgets
+    from app.utils.metadata import MetadataManager
+
     try:
-        sorted_dependencies = list(toposort(dependency_graph))
+        return topo_sort(
+            dependency_graph,
+            active_mods_uuids,
+            MetadataManager.instance().internal_local_metadata,
+        )
     except CircularDependencyError as e:
         find_circular_dependencies(dependency_graph)
         # Propagate the exception after handling
         raise e
 
+
+def topo_sort(
+    dependency_graph: dict[str, set[str]],
+    active_mods_uuids: set[str],
+    internal_local_metadata: dict[str, Any],
+) -> list[str]:
+    """
+    Topological sort of do_topo_sort() with the metadata passed in.
+
+    :param dependency_graph: Package id -> package ids it depends on
+    :param active_mods_uuids: uuids of the active mods
+    :param internal_local_metadata: uuid -> mod metadata
+    :raises CircularDependencyError: If some mods depend on each other
+    :return: The sorted uuids
+    """
+    logger.info(f"Initializing toposort for {len(dependency_graph)} mods")
+    sorted_dependencies = list(toposort(dependency_graph))
+
     reordered = list()
     active_mods_packageid_to_uuid = dict(
-        (metadata_manager.internal_local_metadata[uuid]["packageid"], uuid)
-        for uuid in active_mods_uuids
+        (internal_local_metadata[uuid]["packageid"], uuid) for uuid in active_mods_uuids
     )
     for level in sorted_dependencies:
         temp_mod_set = set()
@@ -37,7 +60,7 @@ def do_topo_sort(
         # Sort packages in this topological level by name
         sorted_temp_mod_set = sorted(
             temp_mod_set,
-            key=lambda uuid: metadata_manager.internal_local_metadata[uuid]["name"],
+            key=lambda uuid: internal_local_metadata[uuid]["name"],
             reverse=False,
         )
         # Add into reordered set
@@ -47,23 +70,137 @@ def do_topo_sort(
     return reordered
 
 
-def find_circular_dependencies(dependency_graph: dict[str, set[str]]) -> None:
-    graph = nx.DiGraph(dependency_graph)  # type: ignore # Stubs seem to be broken for args
-    cycles = list(nx.simple_cycles(graph))
+def find_strongly_connected_components(
+    dependency_graph: dict[str, set[str]],
+) -> list[list[str]]:
+    """
+    Find the strongly connected components of a dependency graph with Tarjan's
+    algorithm. Dependencies that are not keys of the graph are treated as mods
+    without dependencies.
+
+    :param dependency_graph: Package id -> package ids it depends on
+    :return: The components, each a list of package ids
+    """
+    index: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    components = []
+    for root in dependency_graph:
+        if root in index:
+            continue
+        # Explicit call stack of (package id, iterator over its dependencies)
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        call_stack = [(root, iter(dependency_graph[root]))]
+        while call_stack:
+            package_id, dependencies = call_stack[-1]
+            for dependency_id in dependencies:
+                if dependency_id not in index:
+                    index[dependency_id] = lowlink[dependency_id] = len(index)
+                    stack.append(dependency_id)
+                    on_stack.add(dependency_id)
+                    call_stack.append(
+                        (dependency_id, iter(dependency_graph.get(dependency_id, ())))
+                    )
+                    break
+                if dependency_id in on_stack:
+                    lowlink[package_id] = min(lowlink[package_id], index[dependency_id])
+            else:
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[package_id])
+                if lowlink[package_id] == index[package_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == package_id:
+                            break
+                    components.append(component)
+    return components
+
+
+def find_shortest_cycle(
+    dependency_graph: dict[str, set[str]], component: list[str]
+) -> list[str]:
+    """
+    Find a shortest cycle through the first mod (by package id) of a strongly
+    connected component, using a breadth first search inside the component.
+
+    :param dependency_graph: Package id -> package ids it depends on
+    :param component: Strongly connected component with at least two mods
+    :return: The package ids of the cycle, starting at the first mod
+    """
+    members = set(component)
+    start = min(component)
+    parents: dict[str, str] = {}
+    queue = deque([start])
+    while queue:
+        package_id = queue.popleft()
+        for dependency_id in sorted(dependency_graph.get(package_id, ())):
+            if dependency_id == start:
+                cycle = [package_id]
+                while cycle[-1] != start:
+                    cycle.append(parents[cycle[-1]])
+                return cycle[::-1]
+            if dependency_id in members and dependency_id not in parents:
+                parents[dependency_id] = package_id
+                queue.append(dependency_id)
+    # Not reachable for a strongly connected component
+    return [start]
+
+
+def describe_circular_dependencies(dependency_graph: dict[str, set[str]]) -> list[str]:
+    """
+    Describe one cycle for each group of mods that depend on each other, up to
+    MAX_REPORTED_CYCLES of them. Enumerating every cycle instead can take
+    exponential time on large lists with many rules.
+
+    :param dependency_graph: Package id -> package ids it depends on
+    :return: A "a -> b -> c" line per dependency loop
+    """
+    # Mods that depend on themselves are ignored by toposort, so only
+    # components of two or more mods are circular dependencies
+    components = sorted(
+        (
+            component
+            for component in find_strongly_connected_components(dependency_graph)
+            if len(component) > 1
+        ),
+        key=min,
+    )
 
     cycle_strings = []
-    if cycles:
-        logger.info("Circular dependencies detected:")
-        for cycle in cycles:
-            loop = " -> ".join(cycle)
+    if components:
+        logger.info(
+            f"Circular dependencies detected in {len(components)} group(s) of mods:"
+        )
+        for component in components[:MAX_REPORTED_CYCLES]:
+            loop = " -> ".join(find_shortest_cycle(dependency_graph, component))
             logger.info(loop)
             cycle_strings.append(loop)
+        if len(components) > MAX_REPORTED_CYCLES:
+            cycle_strings.append(
+                f"... and {len(components) - MAX_REPORTED_CYCLES} more dependency loops"
+            )
     else:
         logger.info("No circular dependencies found.")
+    return cycle_strings
+
+
+def find_circular_dependencies(dependency_graph: dict[str, set[str]]) -> None:
+    """
+    Show a warning with the dependency loops of describe_circular_dependencies().
+    """
+    from app.views.dialogue import show_warning
 
     show_warning(
         title="Unable to Sort",
         text="Unable to Sort",
         information="RimSort found circular dependencies in your mods list. Please see the details for dependency loops.",
-        details="\n\n".join(cycle_strings),
+        details="\n\n".join(describe_circular_dependencies(dependency_graph)),
     )
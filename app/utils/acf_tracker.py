@@ -0,0 +1,95 @@
+import hashlib
+import os
+from typing import Any
+
+import msgspec
+from loguru import logger
+
+from app.utils.steam.steamfiles.wrapper import acf_to_dict
+
+# The sections of appworkshop_294100.acf with per mod entries, keyed by publishedfileid
+ACF_ITEM_SECTIONS = ("WorkshopItemDetails", "WorkshopItemsInstalled")
+
+
+def acf_item_hashes(acf_data: dict[str, Any]) -> dict[str, bytes]:
+    """
+    Hash the entries of every mod in parsed appworkshop .acf data.
+
+    :param acf_data: The parsed .acf file, see acf_to_dict()
+    :return: publishedfileid -> hash of the mod's entries in ACF_ITEM_SECTIONS
+    """
+    app_workshop = acf_data.get("AppWorkshop", {})
+    sections = [app_workshop.get(section) or {} for section in ACF_ITEM_SECTIONS]
+    hashes = {}
+    for publishedfileid in set().union(*sections):
+        entries = [section.get(publishedfileid) for section in sections]
+        hashes[publishedfileid] = hashlib.blake2b(
+            msgspec.json.encode(entries, order="sorted"), digest_size=16
+        ).digest()
+    return hashes
+
+
+class AcfTracker:
+    """
+    Tracks a Steam client / SteamCMD appworkshop .acf file, so that it can be
+    checked for changes cheaply and often, e.g. whenever the watchdog sees it
+    change.
+
+    The file is only parsed again if its mtime or size changed, and each
+    parse reports which mods' entries changed, so that only their metadata has
+    to be updated.
+    """
+
+    def __init__(self) -> None:
+        self.path: str | None = None
+        # The parsed file, empty if it does not exist or could not be parsed
+        self.data: dict[str, Any] = {}
+        # (st_mtime_ns, st_size) of the file when it was last parsed
+        self.signature: tuple[int, int] | None = None
+        self.item_hashes: dict[str, bytes] = {}
+        # Counters, to check how often the short-circuit avoids a parse
+        self.parses = 0
+        self.skips = 0
+
+    def refresh(self, path: str) -> set[str] | None:
+        """
+        Parse the .acf file again if it changed since the last refresh.
+
+        :param path: Path to the .acf file. The tracker starts over if it differs
+            from the previous path.
+        :return: The publishedfileids whose entries were added, changed or
+            removed, or None if the file was not parsed again
+        """
+        if path != self.path:
+            self.path = path
+            self.data = {}
+            self.signature = None
+            self.item_hashes = {}
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        signature = (stat.st_mtime_ns, stat.st_size) if stat is not None else None
+        if signature == self.signature:
+            self.skips += 1
+            return None
+
+        if stat is None:
+            data: dict[str, Any] = {}
+        else:
+            try:
+                data = acf_to_dict(path)
+            except Exception as e:
+                logger.error(f"Failed to parse .acf metadata from: {path}. Error: {e}")
+                return None
+            self.parses += 1
+        item_hashes = acf_item_hashes(data)
+        changed = {
+            publishedfileid
+            for publishedfileid in item_hashes.keys() | self.item_hashes.keys()
+            if item_hashes.get(publishedfileid) != self.item_hashes.get(publishedfileid)
+        }
+        self.data = data
+        self.signature = signature
+        self.item_hashes = item_hashes
+        return changed
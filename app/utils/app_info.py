@@ -81,6 +81,7 @@ class AppInfo:
 
         self._databases_folder: Path = self._app_storage_folder / "dbs"
         self._aux_metadata_db: Path = self._databases_folder / "aux_metadata.db"
+        self._cache_folder: Path = self._app_storage_folder / "cache"
         self._saved_modlists_folder: Path = self._app_storage_folder / "modlists"
         self._theme_storage_folder: Path = self._app_storage_folder / "themes"
         self._theme_data_folder: Path = self._application_folder / "themes"
@@ -94,6 +95,7 @@ class AppInfo:
         self._saved_modlists_folder.mkdir(parents=True, exist_ok=True)
 
         self._databases_folder.mkdir(parents=True, exist_ok=True)
+        self._cache_folder.mkdir(parents=True, exist_ok=True)
         self._theme_storage_folder.mkdir(parents=True, exist_ok=True)
 
         self._is_initialized: bool = True
@@ -222,3 +224,12 @@ class AppInfo:
         Get the path to the auxiliary metadata database.
         """
         return self._aux_metadata_db
+
+    @property
+    def cache_folder(self) -> Path:
+        """
+        Get the path to the folder where disposable caches are stored.
+
+        Everything in this folder can be safely deleted; it is rebuilt on demand.
+        """
+        return self._cache_folder
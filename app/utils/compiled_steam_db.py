@@ -0,0 +1,280 @@
+import hashlib
+import os
+import struct
+from pathlib import Path
+from typing import Any, ItemsView, Iterator, MutableMapping, ValuesView
+
+import msgspec
+from loguru import logger
+
+# Bump whenever the compiled layout changes so old files are rebuilt
+COMPILED_STEAM_DB_VERSION = 1
+
+# File layout: MAGIC, little-endian u64 index length, msgpack index, entry data.
+# Entries are msgpack encoded back to back in index order, so a single entry
+# can be decoded from (a mmap of) the file without touching the others.
+MAGIC = b"RSSTMDB\x00"
+HEADER = struct.Struct("<8sQ")
+
+
+class CompiledSteamDbIndex(msgspec.Struct):
+    format_version: int
+    # Stat of the steamDB.json the file was compiled from
+    source_mtime_ns: int
+    source_size: int
+    # The "version" (expiry timestamp) of the Steam DB
+    version: int
+    publishedfileids: list[str]
+    # End offset of each entry in the data section, in publishedfileids order
+    offsets: list[int]
+    # Lowercase packageId -> publishedfileids
+    packageid_to_publishedfileids: dict[str, list[str]]
+    # packageid -> name, see MetadataManager.steamdb_packageid_to_name
+    packageid_to_name: dict[str, str]
+
+
+class CompiledSteamDb(MutableMapping[str, Any]):
+    """
+    Read-mostly view of a compiled Steam DB that behaves like the "database" dict
+    of steamDB.json.
+
+    Entries are decoded when they are first looked up and kept afterwards, so
+    changes made to a returned entry stick. Iterating over values() or items()
+    decodes entries that were not looked up yet without keeping them.
+    """
+
+    def __init__(
+        self, index: CompiledSteamDbIndex, data: memoryview, path: Path | None = None
+    ) -> None:
+        # The compiled file, which other processes can load instead of the entries
+        self.path = path
+        self.version = index.version
+        self.packageid_to_name = index.packageid_to_name
+        self._index = index
+        self._data = data
+        self._positions = {
+            publishedfileid: position
+            for position, publishedfileid in enumerate(index.publishedfileids)
+        }
+        self._decoded: dict[str, Any] = {}
+        # Entries added or removed after loading
+        self._added: dict[str, None] = {}
+        self._removed: set[str] = set()
+
+    def _decode(self, publishedfileid: str) -> Any:
+        position = self._positions[publishedfileid]
+        start = self._index.offsets[position - 1] if position else 0
+        return msgspec.msgpack.decode(self._data[start : self._index.offsets[position]])
+
+    def __getitem__(self, publishedfileid: str) -> Any:
+        if publishedfileid in self._decoded:
+            return self._decoded[publishedfileid]
+        if publishedfileid not in self._positions or publishedfileid in self._removed:
+            raise KeyError(publishedfileid)
+        return self._decoded.setdefault(publishedfileid, self._decode(publishedfileid))
+
+    def __setitem__(self, publishedfileid: str, entry: Any) -> None:
+        if publishedfileid not in self._positions:
+            self._added[publishedfileid] = None
+        self._removed.discard(publishedfileid)
+        self._decoded[publishedfileid] = entry
+
+    def __delitem__(self, publishedfileid: str) -> None:
+        if publishedfileid not in self:
+            raise KeyError(publishedfileid)
+        self._decoded.pop(publishedfileid, None)
+        if publishedfileid in self._added:
+            del self._added[publishedfileid]
+        else:
+            self._removed.add(publishedfileid)
+
+    def __contains__(self, publishedfileid: object) -> bool:
+        if publishedfileid in self._added:
+            return True
+        return (
+            publishedfileid in self._positions and publishedfileid not in self._removed
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        for publishedfileid in self._index.publishedfileids:
+            if publishedfileid not in self._removed:
+                yield publishedfileid
+        yield from list(self._added)
+
+    def __len__(self) -> int:
+        return len(self._positions) - len(self._removed) + len(self._added)
+
+    def iter_entries(self) -> Iterator[tuple[str, Any]]:
+        for publishedfileid in self:
+            if publishedfileid in self._decoded:
+                yield publishedfileid, self._decoded[publishedfileid]
+            else:
+                yield publishedfileid, self._decode(publishedfileid)
+
+    def items(self) -> ItemsView[str, Any]:
+        return _CompiledSteamDbItemsView(self)
+
+    def values(self) -> ValuesView[Any]:
+        return _CompiledSteamDbValuesView(self)
+
+    def changes(self) -> tuple[dict[str, Any], set[str]]:
+        """
+        :return: The entries looked up or set since loading, which may have been
+            changed, and the publishedfileids removed since loading
+        """
+        return dict(self._decoded), set(self._removed)
+
+    def publishedfileids_by_packageid(self, packageid: str) -> list[str]:
+        """
+        Case-insensitive lookup of the publishedfileids that have a packageId.
+        """
+        return [
+            publishedfileid
+            for publishedfileid in self._index.packageid_to_publishedfileids.get(
+                packageid.lower(), ()
+            )
+            if publishedfileid in self
+        ]
+
+
+class _CompiledSteamDbItemsView(ItemsView[str, Any]):
+    _mapping: CompiledSteamDb
+
+    def __iter__(self) -> Iterator[tuple[str, Any]]:
+        return self._mapping.iter_entries()
+
+
+class _CompiledSteamDbValuesView(ValuesView[Any]):
+    _mapping: CompiledSteamDb
+
+    def __iter__(self) -> Iterator[Any]:
+        return (entry for _, entry in self._mapping.iter_entries())
+
+
+def compiled_steam_db_path(json_path: Path, cache_folder: Path) -> Path:
+    digest = hashlib.sha1(str(json_path.resolve()).encode("utf-8")).hexdigest()
+    return cache_folder / f"steamDB-{digest[:16]}.msgpack"
+
+
+def compile_steam_db(json_path: Path, compiled_path: Path) -> None:
+    """
+    Convert steamDB.json into the compiled format.
+
+    :param json_path: Path to steamDB.json
+    :param compiled_path: Path to write the compiled file to
+    """
+    stat = os.stat(json_path)
+    with open(json_path, "rb") as f:
+        db_data = msgspec.json.decode(f.read())
+    database = db_data["database"]
+
+    encoder = msgspec.msgpack.Encoder()
+    data = bytearray()
+    offsets = []
+    packageid_to_publishedfileids: dict[str, list[str]] = {}
+    packageid_to_name = {}
+    for publishedfileid, metadata in database.items():
+        encoder.encode_into(metadata, data, len(data))
+        offsets.append(len(data))
+        if not isinstance(metadata, dict):
+            continue
+        package_id = metadata.get("packageId")
+        if isinstance(package_id, str) and package_id:
+            packageid_to_publishedfileids.setdefault(package_id.lower(), []).append(
+                publishedfileid
+            )
+        packageid, name = metadata.get("packageid"), metadata.get("name")
+        if packageid and name and isinstance(packageid, str) and isinstance(name, str):
+            packageid_to_name[packageid] = name
+
+    index = encoder.encode(
+        CompiledSteamDbIndex(
+            format_version=COMPILED_STEAM_DB_VERSION,
+            source_mtime_ns=stat.st_mtime_ns,
+            source_size=stat.st_size,
+            version=int(db_data["version"]),
+            publishedfileids=list(database),
+            offsets=offsets,
+            packageid_to_publishedfileids=packageid_to_publishedfileids,
+            packageid_to_name=packageid_to_name,
+        )
+    )
+    temp_path = compiled_path.with_suffix(".tmp")
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(index)))
+        f.write(index)
+        f.write(data)
+    os.replace(temp_path, compiled_path)
+
+
+def open_compiled_steam_db(compiled_path: Path) -> CompiledSteamDb | None:
+    """
+    Load a compiled Steam DB file, without checking it against its steamDB.json.
+
+    :param compiled_path: Path to the compiled file
+    :return: The compiled Steam DB, or None if the file is missing or outdated
+    :raises msgspec.MsgspecError: If the file is corrupt
+    """
+    if not compiled_path.exists():
+        return None
+    with open(compiled_path, "rb") as f:
+        contents = f.read()
+    if len(contents) < HEADER.size:
+        return None
+    magic, index_length = HEADER.unpack_from(contents)
+    if magic != MAGIC:
+        return None
+    index = msgspec.msgpack.decode(
+        memoryview(contents)[HEADER.size : HEADER.size + index_length],
+        type=CompiledSteamDbIndex,
+    )
+    if index.format_version != COMPILED_STEAM_DB_VERSION:
+        return None
+    return CompiledSteamDb(
+        index, memoryview(contents)[HEADER.size + index_length :], compiled_path
+    )
+
+
+def _read_compiled_steam_db(
+    compiled_path: Path, json_stat: os.stat_result
+) -> CompiledSteamDb | None:
+    steam_db = open_compiled_steam_db(compiled_path)
+    if (
+        steam_db is None
+        or steam_db._index.source_mtime_ns != json_stat.st_mtime_ns
+        or steam_db._index.source_size != json_stat.st_size
+    ):
+        return None
+    return steam_db
+
+
+def load_compiled_steam_db(
+    json_path: Path, cache_folder: Path
+) -> CompiledSteamDb | None:
+    """
+    Load the compiled copy of a steamDB.json, compiling it first if it is missing
+    or older than the JSON file.
+
+    :param json_path: Path to steamDB.json
+    :param cache_folder: Folder to keep compiled files in
+    :return: The compiled Steam DB, or None if it could not be loaded
+    """
+    compiled_path = compiled_steam_db_path(json_path, cache_folder)
+    try:
+        json_stat = os.stat(json_path)
+        steam_db = _read_compiled_steam_db(compiled_path, json_stat)
+        if steam_db is None:
+            logger.info(f"Compiling Steam DB {json_path} to {compiled_path}")
+            compile_steam_db(json_path, compiled_path)
+            steam_db = _read_compiled_steam_db(compiled_path, json_stat)
+    except (
+        OSError,
+        KeyError,
+        TypeError,
+        ValueError,
+        OverflowError,
+        msgspec.MsgspecError,
+    ) as e:
+        logger.warning(f"Unable to use compiled Steam DB for {json_path}: {e}")
+        return None
+    return steam_db
@@ -34,7 +34,7 @@ class CustomListWidgetItem(QListWidgetItem):
 
         list_widget = self.listWidget()
         if list_widget:
-            # This signal triggers handle_item_data_changed, which repolishes the widget if it has been lazy loaded
+            # This signal triggers handle_item_data_changed, which repaints the item's row
             list_widget.itemChanged.emit(self)
         else:
             # If the CustomListWidgetItem is not added to a QListWidget the signal will not be emitted
@@ -86,6 +86,7 @@ class EventBus(QObject):
     do_import_acf = Signal()
     do_delete_acf = Signal()
     do_install_steamcmd = Signal()
+    do_clear_metadata_cache = Signal()
 
     # MainWindow signals
     do_button_animation = Signal(QPushButton)
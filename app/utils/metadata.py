@@ -1,33 +1,51 @@
 import json
 import os
+import re
 import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
 from functools import lru_cache
+from math import ceil
+from multiprocessing import cpu_count
 from pathlib import Path
-from re import match
 from time import localtime, strftime, time
-from typing import Any, Iterable, Union
+from typing import Any, Collection, Iterable, Mapping, MutableMapping, Union
 from uuid import uuid4
 
 from loguru import logger
-from natsort import natsorted
 from PySide6.QtCore import QObject, QRunnable, QThread, QThreadPool, Signal
 
 from app.controllers.settings_controller import SettingsController
+from app.utils.acf_tracker import AcfTracker
 from app.utils.app_info import AppInfo
+from app.utils.compiled_steam_db import CompiledSteamDb, load_compiled_steam_db
 from app.utils.constants import (
     DB_BUILDER_PRUNE_EXCEPTIONS,
     DB_BUILDER_RECURSE_EXCEPTIONS,
     DEFAULT_USER_RULES,
     RIMWORLD_DLC_METADATA,
+    MetadataParserBackend,
 )
-from app.utils.generic import directories
+from app.utils.event_bus import EventBus
+from app.utils.generic import chunks, directories
+from app.utils.metadata_cache import MetadataCache
+from app.utils.metadata_index import ModMetadataIndex
+from app.utils.metadata_parser import (
+    ParsedMod,
+    init_parser_process,
+    parse_mod_batch,
+    parse_mod_metadata,
+    steam_metadata_for_parser,
+)
+from app.utils.mod_directory_probe import probe_mod_directory
+from app.utils.mod_list_matching import get_mods_from_package_ids
 from app.utils.schema import generate_rimworld_mods_list, validate_rimworld_mods_list
 from app.utils.steam.steamcmd.wrapper import SteamcmdInterface
-from app.utils.steam.steamfiles.wrapper import acf_to_dict, dict_to_acf
+from app.utils.steam.steamfiles.wrapper import acf_to_dict, update_acf_entries
 from app.utils.steam.webapi.wrapper import (
     DynamicQuery,
     ISteamRemoteStorage_GetPublishedFileDetails,
 )
+from app.utils.watchdog_scheduler import WatchdogBatch
 from app.utils.xml import json_to_xml_write, xml_path_to_json
 from app.views.dialogue import (
     show_dialogue_conditional,
@@ -50,11 +68,143 @@ class ModReplacement:
 ModMetadata = dict[str, Any]
 
 
+# Below this many mods, starting parser processes costs more than it saves
+PROCESS_PARSER_MIN_BATCH = 64
+
+
+# About.xml tags that MetadataManager.compile_metadata() reads rules from
+ABOUT_XML_RULE_TAGS = (
+    "moddependencies",
+    "moddependenciesbyversion",
+    "incompatiblewith",
+    "incompatiblewithbyversion",
+    "loadafter",
+    "forceloadafter",
+    "loadafterbyversion",
+    "loadbefore",
+    "forceloadbefore",
+    "loadbeforebyversion",
+)
+
+
+@lru_cache(maxsize=8)
+def _version_tag_pattern(game_version: str) -> re.Pattern[str] | None:
+    """
+    Regex matching the version tags (e.g. <v1.5>) that apply to a game version,
+    or None if the game version is unknown.
+    """
+    parts = game_version.split(".")
+    if len(parts) < 2:
+        return None
+    major, minor = parts[:2]
+    return re.compile(rf"v{major}\.{minor}")
+
+
+def compile_mod_rules(
+    mod_data: ModMetadata, game_version: str
+) -> list[tuple[str, Any]]:
+    """
+    Resolve the dependencies, incompatibilities and load order rules in the
+    About.xml of a mod into a flat table, keeping only the version specific
+    rules that apply to the game version.
+
+    The table does not depend on other mods, so it can be reused until the game
+    version or the mod's About.xml changes.
+
+    :param mod_data: The parsed metadata of the mod
+    :param game_version: The game version, e.g. "1.5.4104 rev435"
+    :return: List of (rule type, <li> value) in the order compile_metadata() applies
+        them, where the rule type is "dependencies", "incompatibilities",
+        "loadTheseBefore" or "loadTheseAfter"
+    """
+    version_pattern = _version_tag_pattern(game_version)
+    metadata_file_path = mod_data.get("metadata_file_path")
+    rule_table: list[tuple[str, Any]] = []
+
+    def add_rules(rule_type: str, tag: str) -> None:
+        value = mod_data.get(tag)
+        if not value:
+            return
+        if not isinstance(value, dict):
+            logger.warning(
+                f"About.xml syntax error. Unable to read <{tag}> tag from XML: {metadata_file_path}"
+            )
+            return
+        if value.get("li"):
+            logger.debug(f"Current mod has <{tag}> rules: {value['li']}")
+            rule_table.append((rule_type, value["li"]))
+
+    def add_rules_by_version(rule_type: str, tag: str) -> None:
+        values = mod_data.get(tag)
+        if not values or version_pattern is None:
+            return
+        if not isinstance(values, dict):
+            logger.warning(
+                f"About.xml syntax error. Unable to read <{tag}> tag from XML: {metadata_file_path}"
+            )
+            return
+        for version, value in values.items():
+            if not version_pattern.match(version):
+                continue
+            if value and isinstance(value, dict) and value.get("li"):
+                logger.debug(
+                    f"Current mod has <{tag}> rules for {version}: {value['li']}"
+                )
+                rule_table.append((rule_type, value["li"]))
+            else:
+                logger.warning(
+                    f"About.xml syntax error. Unable to read <{tag}> tag from XML for version [{version}]: {metadata_file_path}"
+                )
+                logger.debug(value)
+
+    # moddependencies are not equal to mod load order rules
+    mod_dependencies = mod_data.get("moddependencies")
+    dependencies = None
+    if isinstance(mod_dependencies, dict):
+        dependencies = mod_dependencies.get("li")
+    elif isinstance(mod_dependencies, list):
+        # Loop through the list and try to find dictionary. If we find one, use it.
+        for potential_dependencies in mod_dependencies:
+            if (
+                potential_dependencies
+                and isinstance(potential_dependencies, dict)
+                and potential_dependencies.get("li")
+            ):
+                dependencies = potential_dependencies["li"]
+    if dependencies:
+        logger.debug(f"Current mod requires these mods to work: {dependencies}")
+        rule_table.append(("dependencies", dependencies))
+    add_rules_by_version("dependencies", "moddependenciesbyversion")
+
+    if isinstance(mod_data.get("incompatiblewith"), dict):
+        add_rules("incompatibilities", "incompatiblewith")
+    add_rules_by_version("incompatibilities", "incompatiblewithbyversion")
+
+    # Current mod should be loaded AFTER these mods. These mods can be thought
+    # of as "load these before". These are not necessarily dependencies in the sense
+    # that they "depend" on them. But, if they exist in the same mod list, they
+    # should be loaded before.
+    add_rules("loadTheseBefore", "loadafter")
+    add_rules("loadTheseBefore", "forceloadafter")
+    add_rules_by_version("loadTheseBefore", "loadafterbyversion")
+
+    # Current mod should be loaded BEFORE these mods
+    # The current mod is a dependency for all these mods
+    add_rules("loadTheseAfter", "loadbefore")
+    add_rules("loadTheseAfter", "forceloadbefore")
+    add_rules_by_version("loadTheseAfter", "loadbeforebyversion")
+
+    return rule_table
+
+
 class MetadataManager(QObject):
     _instance: "None | MetadataManager" = None
     mod_created_signal = Signal(str)
     mod_deleted_signal = Signal(str)
     mod_metadata_updated_signal = Signal(str)
+    # Emitted for every mod added to internal_local_metadata while refreshing,
+    # parsed or restored from the metadata cache, from the thread that added it
+    mod_parsed_signal = Signal(str)
     show_warning_signal = Signal(str, str, str, str)
 
     def __new__(cls, *args: Any, **kwargs: Any) -> "MetadataManager":
@@ -77,7 +227,8 @@ class MetadataManager(QObject):
             self.show_warning_signal.connect(show_warning)
 
             # Store parsed metadata & paths
-            self.external_steam_metadata: dict[str, Any] | None = None
+            # Either the decoded steamDB.json, or a CompiledSteamDb that decodes lazily
+            self.external_steam_metadata: MutableMapping[str, Any] | None = None
             self.external_steam_metadata_path: str | None = None
             self.external_community_rules: dict[str, Any] | None = None
             self.external_community_rules_path: str | None = None
@@ -93,7 +244,13 @@ class MetadataManager(QObject):
             # Mappers
             self.mod_metadata_file_mapper: dict[str, str] = {}
             self.mod_metadata_dir_mapper: dict[str, str] = {}
-            self.packageid_to_uuids: dict[str, set[str]] = {}
+            # Indexes over internal_local_metadata for lookups by packageid,
+            # publishedfileid, path and name
+            self.mod_index = ModMetadataIndex()
+            self.packageid_to_uuids = self.mod_index.packageid_to_uuids
+            # uuid -> (game version, About.xml rule tags, rule table) of the last
+            # compile, see compile_mod_rules()
+            self.mod_rule_tables: dict[str, tuple[str, tuple[Any, ...], list[Any]]] = {}
             self.steamdb_packageid_to_name: dict[str, str] = {}
             # Empty game version string unless the data is populated
             self.game_version: str = ""
@@ -112,6 +269,19 @@ class MetadataManager(QObject):
                 / "appworkshop_294100.acf",
             )
             self.workshop_acf_data: dict[str, Any] = {}
+            # Re-parse the .acf files only when they change, see refresh_acf_metadata()
+            self.workshop_acf_tracker = AcfTracker()
+            self.steamcmd_acf_tracker = AcfTracker()
+            # Persistent cache of parsed mod metadata, used to skip unchanged mods on refresh
+            self.metadata_cache = MetadataCache(
+                AppInfo().cache_folder / "metadata.json"
+            )
+            EventBus().do_clear_metadata_cache.connect(self.metadata_cache.clear)
+            # Process pool for the "processes" parser backend, alive during a refresh
+            self.parser_process_pool: ProcessPoolExecutor | None = None
+            self.pending_process_parses: list[
+                tuple[str, list[tuple[str, str]], Future[list[ParsedMod]]]
+            ] = []
 
     @classmethod
     def instance(cls, *args: Any, **kwargs: Any) -> "MetadataManager":
@@ -149,7 +319,7 @@ class MetadataManager(QObject):
 
         def get_configured_steam_db(
             life: int, path: str
-        ) -> tuple[dict[str, Any] | None, str | None]:
+        ) -> tuple[MutableMapping[str, Any] | None, str | None]:
             logger.info(f"Checking for Steam DB at: {path}")
             if not validate_db_path(path, "Steam"):
                 return None, None
@@ -158,50 +328,50 @@ class MetadataManager(QObject):
             logger.info(
                 "Steam DB exists!",
             )
-            with open(path, encoding="utf-8") as f:
-                json_string = f.read()
-                logger.info("Checking metadata expiry against database...")
-                db_data = json.loads(json_string)
-                current_time = int(time())
-                db_time = int(db_data["version"])
-                elapsed = current_time - db_time
-                if (
-                    elapsed <= life
-                ):  # If the duration elapsed since db creation is less than expiry than expiry
-                    # The data is valid
-                    db_json_data = db_data[
-                        "database"
-                    ]  # TODO: additional check to verify integrity of this data's schema
-                    logger.info(
-                        "Cached Steam DB is valid! Returning data to RimSort..."
-                    )
-                    total_entries = len(db_json_data)
-                    logger.info(
-                        f"Loaded metadata for {total_entries} Steam Workshop mods from Steam DB"
-                    )
-                else:  # If the cached db data is expired but NOT missing
-                    # Fallback to the expired metadata
-                    if life != 0:  # Disable Notification if value is 0
-                        self.show_warning_signal.emit(
-                            "Steam DB metadata expired",
-                            "Steam DB is expired! Consider updating!\n",
-                            f"Steam DB last updated: {strftime('%Y-%m-%d %H:%M:%S', localtime(db_data['version'] - life))}\n\n"
-                            + "Falling back to cached, but EXPIRED Steam Database...",
-                            "",
-                        )
-                    db_json_data = db_data[
-                        "database"
-                    ]  # TODO: additional check to verify integrity of this data's schema
-                    total_entries = len(db_json_data)
-                    logger.info(
-                        f"Loaded metadata for {total_entries} Steam Workshop mods from Steam DB"
+            db_json_data: MutableMapping[str, Any] | None = None
+            if self.settings_controller.settings.use_compiled_steam_db:
+                # Entries are only decoded when used, see CompiledSteamDb
+                db_json_data = load_compiled_steam_db(
+                    Path(path), AppInfo().cache_folder
+                )
+            if isinstance(db_json_data, CompiledSteamDb):
+                db_time = db_json_data.version
+                self.steamdb_packageid_to_name = dict(db_json_data.packageid_to_name)
+            else:
+                with open(path, encoding="utf-8") as f:
+                    json_string = f.read()
+                    db_data = json.loads(json_string)
+                    db_time = int(db_data["version"])
+                    # TODO: additional check to verify integrity of this data's schema
+                    db_json_data = db_data["database"]
+                    self.steamdb_packageid_to_name = {
+                        metadata["packageid"]: metadata["name"]
+                        for metadata in db_data.get("database", {}).values()
+                        if metadata.get("packageid") and metadata.get("name")
+                    }
+            logger.info("Checking metadata expiry against database...")
+            current_time = int(time())
+            elapsed = current_time - db_time
+            if (
+                elapsed <= life
+            ):  # If the duration elapsed since db creation is less than expiry than expiry
+                # The data is valid
+                logger.info("Cached Steam DB is valid! Returning data to RimSort...")
+            else:  # If the cached db data is expired but NOT missing
+                # Fallback to the expired metadata
+                if life != 0:  # Disable Notification if value is 0
+                    self.show_warning_signal.emit(
+                        "Steam DB metadata expired",
+                        "Steam DB is expired! Consider updating!\n",
+                        f"Steam DB last updated: {strftime('%Y-%m-%d %H:%M:%S', localtime(db_time - life))}\n\n"
+                        + "Falling back to cached, but EXPIRED Steam Database...",
+                        "",
                     )
-                self.steamdb_packageid_to_name = {
-                    metadata["packageid"]: metadata["name"]
-                    for metadata in db_data.get("database", {}).values()
-                    if metadata.get("packageid") and metadata.get("name")
-                }
-                return db_json_data, path
+            total_entries = len(db_json_data)
+            logger.info(
+                f"Loaded metadata for {total_entries} Steam Workshop mods from Steam DB"
+            )
+            return db_json_data, path
 
         def get_configured_community_rules_db(
             path: str,
@@ -440,14 +610,11 @@ class MetadataManager(QObject):
                         )
                         continue
 
-                    deleted_mod_packageid = deleted_mod.get("packageid")
                     self.internal_local_metadata.pop(uuid)
+                    self.mod_index.remove(uuid)
+                    self.mod_rule_tables.pop(uuid, None)
 
-                    if deleted_mod_packageid and self.packageid_to_uuids.get(
-                        deleted_mod_packageid
-                    ):
-                        self.packageid_to_uuids[deleted_mod_packageid].remove(uuid)
-
+        self.metadata_cache.reset_counters()
         # Get & set Rimworld version string
         game_folder = self.settings_controller.settings.instances[
             self.settings_controller.settings.current_instance
@@ -495,8 +662,7 @@ class MetadataManager(QObject):
                 data_source="expansion",
             )
             # Wait for pool to complete
-            self.parser_threadpool.waitForDone()
-            self.parser_threadpool.clear()
+            self.wait_for_parsers()
             logger.info(
                 "Finished querying Official expansions. Supplementing metadata..."
             )
@@ -506,10 +672,9 @@ class MetadataManager(QObject):
             }
             # Base game and expansion About.xml do not contain name, so these
             # must be manually added
-            for metadata in self.internal_local_metadata.values():
-                package_id = metadata["packageid"]
-                appid = package_to_app.get(package_id)
-                if appid:
+            for package_id, appid in package_to_app.items():
+                for uuid in self.mod_index.uuids_by_packageid(package_id):
+                    metadata = self.internal_local_metadata[uuid]
                     dlc_metadata = RIMWORLD_DLC_METADATA[appid]
                     # Default for supported versions if not already present
                     default_versions = {
@@ -527,6 +692,8 @@ class MetadataManager(QObject):
                             ),
                         }
                     )
+                    # The name changed, keep the index in sync
+                    self.mod_index.add(uuid, metadata)
         else:
             logger.error(
                 "Skipping parsing data from empty game data path. Is the game path configured?"
@@ -581,8 +748,8 @@ class MetadataManager(QObject):
             # Check for and purge any found workshop mod metadata from cache
             purge_by_data_source("workshop")
         # Wait for pool to complete
-        self.parser_threadpool.waitForDone()
-        self.parser_threadpool.clear()
+        self.wait_for_parsers()
+        self.shutdown_parser_processes()
         # Generate our file <-> UUID mappers for Watchdog and friends
         # Map mod uuid to metadata file path
         self.mod_metadata_file_mapper = {
@@ -602,6 +769,11 @@ class MetadataManager(QObject):
                 for uuid, metadata in self.internal_local_metadata.items()
             },
         }
+        logger.info(
+            f"Metadata cache: {self.metadata_cache.hits} unchanged mods restored, {self.metadata_cache.misses} parsed"
+        )
+        # Persist the cache, dropping entries for directories that no longer exist
+        self.metadata_cache.save(keep=self.mod_metadata_dir_mapper.keys())
 
     def __update_from_settings(self) -> None:
         self.community_rules_repo = (
@@ -635,298 +807,49 @@ class MetadataManager(QObject):
         # Add dependencies to installed mods based on dependencies listed in About.xml TODO manifest.xml
         logger.info("Started compiling metadata from About.xml")
         for uuid in uuids:
-            logger.debug(
-                f"UUID: {uuid} packageid: "
-                + self.internal_local_metadata[uuid].get("packageid")
-            )
-            # moddependencies are not equal to mod load order rules
-            if self.internal_local_metadata[uuid].get("moddependencies"):
-                if isinstance(
-                    self.internal_local_metadata[uuid]["moddependencies"], dict
-                ):
-                    dependencies = self.internal_local_metadata[uuid][
-                        "moddependencies"
-                    ].get("li")
-                elif isinstance(
-                    self.internal_local_metadata[uuid]["moddependencies"], list
-                ):
-                    # Loop through the list and try to find dictionary. If we find one, use it.
-                    for potential_dependencies in self.internal_local_metadata[uuid][
-                        "moddependencies"
-                    ]:
-                        if (
-                            potential_dependencies
-                            and isinstance(potential_dependencies, dict)
-                            and potential_dependencies.get("li")
-                        ):
-                            dependencies = potential_dependencies["li"]
-                if dependencies:
-                    logger.debug(
-                        f"Current mod requires these mods to work: {dependencies}"
-                    )
-                    add_dependency_to_mod(
-                        self.internal_local_metadata[uuid],
-                        dependencies,
-                        self.internal_local_metadata,
-                    )
-
-            if self.internal_local_metadata[uuid].get("moddependenciesbyversion"):
-                major, minor = self.game_version.split(".")[
-                    :2
-                ]  # Split the version and take the first two parts
-                version_regex = rf"v{major}\.{minor}"  # Construct the regex to match both major and minor versions
-                for version, dependencies_by_ver in self.internal_local_metadata[uuid][
-                    "moddependenciesbyversion"
-                ].items():
-                    if match(version_regex, version):
-                        if (
-                            dependencies_by_ver
-                            and isinstance(dependencies_by_ver, dict)
-                            and dependencies_by_ver.get("li")
-                        ):
-                            logger.debug(
-                                f"Current mod requires these mods by version to work: {dependencies_by_ver['li']}"
-                            )
-                            add_dependency_to_mod(
-                                self.internal_local_metadata[uuid],
-                                dependencies_by_ver["li"],
-                                self.internal_local_metadata,
-                            )
-                        else:
-                            logger.warning(
-                                f"About.xml syntax error. Unable to read <moddependenciesbyversion> tag from XML for version [{version}]: {self.internal_local_metadata[uuid]['metadata_file_path']}"
-                            )
-                            logger.debug(dependencies_by_ver)
-            if self.internal_local_metadata[uuid].get(
-                "incompatiblewith"
-            ) and isinstance(
-                self.internal_local_metadata[uuid].get("incompatiblewith"), dict
+            mod_data = self.internal_local_metadata[uuid]
+            logger.debug(f"UUID: {uuid} packageid: " + mod_data.get("packageid"))
+            # The rule table of a mod only changes with the game version or the
+            # About.xml tags it is compiled from, so it is kept across refreshes
+            rule_tags = tuple(mod_data.get(tag) for tag in ABOUT_XML_RULE_TAGS)
+            cached_rules = self.mod_rule_tables.get(uuid)
+            if (
+                cached_rules is not None
+                and cached_rules[0] == self.game_version
+                and cached_rules[1] == rule_tags
             ):
-                incompatibilities = self.internal_local_metadata[uuid][
-                    "incompatiblewith"
-                ].get("li")
-                if incompatibilities:
-                    logger.debug(
-                        f"Current mod is incompatible with these mods: {incompatibilities}"
-                    )
+                rule_table = cached_rules[2]
+            else:
+                rule_table = compile_mod_rules(mod_data, self.game_version)
+                self.mod_rule_tables[uuid] = (self.game_version, rule_tags, rule_table)
+
+            for rule_type, rule in rule_table:
+                if rule_type == "dependencies":
+                    add_dependency_to_mod(mod_data, rule, self.internal_local_metadata)
+                elif rule_type == "incompatibilities":
                     add_incompatibility_to_mod(
-                        self.internal_local_metadata[uuid],
-                        incompatibilities,
+                        mod_data,
+                        rule,
                         self.internal_local_metadata,
+                        self.packageid_to_uuids,
                     )
-
-            if self.internal_local_metadata[uuid].get("incompatiblewithbyversion"):
-                major, minor = self.game_version.split(".")[
-                    :2
-                ]  # Split the version and take the first two parts
-                version_regex = rf"v{major}\.{minor}"  # Construct the regex to match both major and minor versions
-                for version, incompatibilities_by_ver in self.internal_local_metadata[
-                    uuid
-                ]["incompatiblewithbyversion"].items():
-                    if match(version_regex, version):
-                        if (
-                            incompatibilities_by_ver
-                            and isinstance(incompatibilities_by_ver, dict)
-                            and incompatibilities_by_ver.get("li")
-                        ):
-                            logger.debug(
-                                f"Current mod is incompatible by version with these mods: {incompatibilities_by_ver['li']}"
-                            )
-                            add_incompatibility_to_mod(
-                                self.internal_local_metadata[uuid],
-                                incompatibilities_by_ver["li"],
-                                self.internal_local_metadata,
-                            )
-                        else:
-                            logger.warning(
-                                f"About.xml syntax error. Unable to read <incompatiblewithbyversion> tag from XML for version [{version}]: {self.internal_local_metadata[uuid]['metadata_file_path']}"
-                            )
-                            logger.debug(incompatibilities_by_ver)
-            # Current mod should be loaded AFTER these mods. These mods can be thought
-            # of as "load these before". These are not necessarily dependencies in the sense
-            # that they "depend" on them. But, if they exist in the same mod list, they
-            # should be loaded before.
-            if self.internal_local_metadata[uuid].get("loadafter"):
-                try:
-                    load_these_before = self.internal_local_metadata[uuid][
-                        "loadafter"
-                    ].get("li")
-                    if load_these_before:
-                        logger.debug(
-                            f"Current mod should load after these mods: {load_these_before}"
-                        )
-                        add_load_rule_to_mod(
-                            self.internal_local_metadata[uuid],
-                            load_these_before,
-                            "loadTheseBefore",
-                            "loadTheseAfter",
-                            self.internal_local_metadata,
-                            self.packageid_to_uuids,
-                        )
-                except Exception as e:
-                    mod_metadata_path = self.internal_local_metadata[uuid][
-                        "metadata_file_path"
-                    ]
-                    logger.warning(
-                        f"About.xml syntax error. Unable to read <loadafter> tag from XML: {mod_metadata_path}"
-                    )
-                    logger.debug(e)
-
-            if self.internal_local_metadata[uuid].get("forceloadafter"):
-                try:
-                    force_load_these_before = self.internal_local_metadata[uuid][
-                        "forceloadafter"
-                    ].get("li")
-                    if force_load_these_before:
-                        logger.debug(
-                            f"Current mod should force load after these mods: {force_load_these_before}"
-                        )
-                        add_load_rule_to_mod(
-                            self.internal_local_metadata[uuid],
-                            force_load_these_before,
-                            "loadTheseBefore",
-                            "loadTheseAfter",
-                            self.internal_local_metadata,
-                            self.packageid_to_uuids,
-                        )
-                except Exception as e:
-                    mod_metadata_path = self.internal_local_metadata[uuid][
-                        "mod_metadata_path"
-                    ]
-                    logger.warning(
-                        f"About.xml syntax error. Unable to read <forceloadafter> tag from XML: {mod_metadata_path}"
-                    )
-                    logger.debug(e)
-
-            if self.internal_local_metadata[uuid].get("loadafterbyversion"):
-                major, minor = self.game_version.split(".")[:2]
-                version_regex = rf"v{major}\.{minor}"
-                for version, load_these_before_by_ver in self.internal_local_metadata[
-                    uuid
-                ]["loadafterbyversion"].items():
-                    if match(version_regex, version):
-                        try:
-                            if (
-                                load_these_before_by_ver
-                                and isinstance(load_these_before_by_ver, dict)
-                                and load_these_before_by_ver.get("li")
-                            ):
-                                logger.debug(
-                                    f"Current mod should load before these mods for {version}: {load_these_before_by_ver['li']}"
-                                )
-                                add_load_rule_to_mod(
-                                    self.internal_local_metadata[uuid],
-                                    load_these_before_by_ver["li"],
-                                    "loadTheseBefore",
-                                    "loadTheseAfter",
-                                    self.internal_local_metadata,
-                                    self.packageid_to_uuids,
-                                )
-                            else:
-                                logger.warning(
-                                    f"About.xml syntax error. Unable to read <loadafterbyversion> tag from XML for version [{version}]: {self.internal_local_metadata[uuid]['metadata_file_path']}"
-                                )
-                                logger.debug(load_these_before_by_ver)
-                        except Exception as e:
-                            mod_metadata_path = self.internal_local_metadata[uuid].get(
-                                "metadata_file_path"
-                            )
-                            logger.warning(
-                                f"Error processing <loadafterbyversion> tag for {version} from XML: {mod_metadata_path}"
-                            )
-                            logger.debug(e)
-
-            # Current mod should be loaded BEFORE these mods
-            # The current mod is a dependency for all these mods
-            if self.internal_local_metadata[uuid].get("loadbefore"):
-                try:
-                    load_these_after = self.internal_local_metadata[uuid][
-                        "loadbefore"
-                    ].get("li")
-                    if load_these_after:
-                        logger.debug(
-                            f"Current mod should load before these mods: {load_these_after}"
-                        )
+                else:
+                    try:
                         add_load_rule_to_mod(
-                            self.internal_local_metadata[uuid],
-                            load_these_after,
-                            "loadTheseAfter",
-                            "loadTheseBefore",
+                            mod_data,
+                            rule,
+                            rule_type,
+                            "loadTheseAfter"
+                            if rule_type == "loadTheseBefore"
+                            else "loadTheseBefore",
                             self.internal_local_metadata,
                             self.packageid_to_uuids,
                         )
-                except Exception as e:
-                    mod_metadata_path = self.internal_local_metadata[uuid][
-                        "metadata_file_path"
-                    ]
-                    logger.warning(
-                        f"About.xml syntax error. Unable to read <loadbefore> tag from XML: {mod_metadata_path}"
-                    )
-                    logger.debug(e)
-
-            if self.internal_local_metadata[uuid].get("forceloadbefore"):
-                try:
-                    force_load_these_after = self.internal_local_metadata[uuid][
-                        "forceloadbefore"
-                    ].get("li")
-                    if force_load_these_after:
-                        logger.debug(
-                            f"Current mod should force load before these mods: {force_load_these_after}"
-                        )
-                        add_load_rule_to_mod(
-                            self.internal_local_metadata[uuid],
-                            force_load_these_after,
-                            "loadTheseAfter",
-                            "loadTheseBefore",
-                            self.internal_local_metadata,
-                            self.packageid_to_uuids,
+                    except Exception as e:
+                        logger.warning(
+                            f"About.xml syntax error. Unable to add load order rule {rule} from XML: {mod_data.get('metadata_file_path')}"
                         )
-                except Exception as e:
-                    mod_metadata_path = self.internal_local_metadata[uuid][
-                        "metadata_file_path"
-                    ]
-                    logger.warning(
-                        f"About.xml syntax error. Unable to read <forceloadbefore> tag from XML: {mod_metadata_path}"
-                    )
-                    logger.debug(e)
-
-            if self.internal_local_metadata[uuid].get("loadbeforebyversion"):
-                major, minor = self.game_version.split(".")[:2]
-                version_regex = rf"v{major}\.{minor}"
-                for version, load_these_after_by_ver in self.internal_local_metadata[
-                    uuid
-                ]["loadbeforebyversion"].items():
-                    if match(version_regex, version):
-                        try:
-                            if (
-                                load_these_after_by_ver
-                                and isinstance(load_these_after_by_ver, dict)
-                                and load_these_after_by_ver.get("li")
-                            ):
-                                logger.debug(
-                                    f"Current mod should load after these mods for {version}: {load_these_after_by_ver['li']}"
-                                )
-                                add_load_rule_to_mod(
-                                    self.internal_local_metadata[uuid],
-                                    load_these_after_by_ver["li"],
-                                    "loadTheseAfter",
-                                    "loadTheseBefore",
-                                    self.internal_local_metadata,
-                                    self.packageid_to_uuids,
-                                )
-                            else:
-                                logger.warning(
-                                    f"About.xml syntax error. Unable to read <loadbeforebyversion> tag from XML for version [{version}]: {self.internal_local_metadata[uuid]['metadata_file_path']}"
-                                )
-                                logger.debug(load_these_after_by_ver)
-                        except Exception as e:
-                            mod_metadata_path = self.internal_local_metadata[uuid].get(
-                                "metadata_file_path"
-                            )
-                            logger.warning(
-                                f"Error processing <loadbeforebyversion> tag for {version} from XML: {mod_metadata_path}"
-                            )
-                            logger.debug(e)
+                        logger.debug(e)
 
         logger.info("Finished adding dependencies through About.xml information")
         log_deps_order_info(self.internal_local_metadata)
@@ -1247,12 +1170,166 @@ class MetadataManager(QObject):
             pfid=replacement_data["ReplacementSteamId"],
         )
 
+    def steamdb_signature(self) -> str | None:
+        """
+        Identify the currently loaded Steam DB so that cached metadata which was
+        derived from it can be invalidated when the DB changes.
+        """
+        if not self.external_steam_metadata or not self.external_steam_metadata_path:
+            return None
+        try:
+            stat = os.stat(self.external_steam_metadata_path)
+        except OSError:
+            return None
+        return f"{self.external_steam_metadata_path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def apply_acf_metadata(
+        self, mod_metadata: dict[str, Any], data_source: str
+    ) -> None:
+        """
+        Overlay Steam client / SteamCMD .acf timestamps onto a mod's parsed metadata.
+
+        This is kept separate from parsing so that it is re-applied to metadata
+        restored from the metadata cache, as the .acf data changes independently.
+        """
+        if mod_metadata.get("invalid") or mod_metadata.get("scenario"):
+            return
+        # Grab our mod's publishedfileid
+        publishedfileid = mod_metadata.get("publishedfileid")
+        if not publishedfileid:
+            return
+        # Get our metadata based on data source
+        workshop_acf_data = (
+            self.workshop_acf_data
+            if data_source == "workshop"
+            else self.steamcmd_acf_data
+        )
+        workshop_item_details = workshop_acf_data.get("AppWorkshop", {}).get(
+            "WorkshopItemDetails", {}
+        )
+        workshop_items_installed = workshop_acf_data.get("AppWorkshop", {}).get(
+            "WorkshopItemsInstalled", {}
+        )
+        # Edit our metadata, append values
+        if (
+            workshop_item_details.get(publishedfileid, {}).get("timetouched")
+            and workshop_item_details.get(publishedfileid, {}).get("timetouched") != 0
+        ):
+            # The last time SteamCMD/Steam client touched a mod according to its entry
+            mod_metadata["internal_time_touched"] = int(
+                workshop_item_details[publishedfileid]["timetouched"]
+            )
+        if workshop_item_details.get(publishedfileid, {}).get("timeupdated"):
+            # The last time SteamCMD/Steam client updated a mod according to its entry
+            mod_metadata["internal_time_updated"] = int(
+                workshop_item_details[publishedfileid]["timeupdated"]
+            )
+        if workshop_items_installed.get(publishedfileid, {}).get("timeupdated"):
+            # The last time SteamCMD/Steam client updated a mod according to its entry
+            mod_metadata["internal_time_updated"] = int(
+                workshop_items_installed[publishedfileid]["timeupdated"]
+            )
+
+    def add_parsed_metadata(
+        self,
+        data_source: str,
+        mod_directory: str,
+        uuid: str,
+        mod_metadata: dict[str, Any],
+        steamdb_sensitive: bool,
+        fingerprint: dict[str, tuple[int, int]] | None = None,
+    ) -> None:
+        """
+        Store freshly parsed metadata for a mod, regardless of which parser backend produced it.
+        """
+        # Snapshot the parse result before .acf data or compile_metadata() touch it
+        self.metadata_cache.store(
+            mod_directory,
+            data_source,
+            mod_metadata,
+            steamdb_sensitive=steamdb_sensitive,
+            steamdb_signature=self.steamdb_signature() if steamdb_sensitive else None,
+            fingerprint=fingerprint,
+        )
+        self.__add_mod_metadata(uuid, mod_metadata, data_source)
+
+    def __add_mod_metadata(
+        self, uuid: str, mod_metadata: dict[str, Any], data_source: str
+    ) -> None:
+        self.apply_acf_metadata(mod_metadata, data_source)
+        self.internal_local_metadata[uuid] = mod_metadata
+        self.mod_index.add(uuid, mod_metadata)
+        self.mod_parsed_signal.emit(uuid)
+
     def process_batch(
         self,
         batch: dict[str, str],  # Batch is a mapper of mod directory <-> UUID to parse
         data_source: str,
     ) -> None:
+        steamdb_signature = self.steamdb_signature()
+        to_parse: list[tuple[str, str]] = []
         for directory, uuid in batch.items():
+            # Restore unchanged mods from the metadata cache instead of parsing them
+            cached_metadata = self.metadata_cache.lookup(
+                directory, data_source, steamdb_signature
+            )
+            if cached_metadata is not None:
+                if "uuid" in cached_metadata:
+                    cached_metadata["uuid"] = uuid
+                self.__add_mod_metadata(uuid, cached_metadata, data_source)
+            else:
+                to_parse.append((directory, uuid))
+        if (
+            self.settings_controller.settings.metadata_parser_backend
+            == MetadataParserBackend.PROCESSES
+            and len(to_parse) >= PROCESS_PARSER_MIN_BATCH
+        ):
+            self.__submit_process_parses(data_source, to_parse)
+            return
+        for directory, uuid in to_parse:
+            self.process_update(
+                batch=True,
+                exists=uuid in self.internal_local_metadata.keys(),
+                data_source=data_source,
+                mod_directory=directory,
+                uuid=uuid,
+            )
+
+    def __submit_process_parses(
+        self, data_source: str, to_parse: list[tuple[str, str]]
+    ) -> None:
+        """
+        Parse mod directories on the process pool. Results are merged by wait_for_parsers().
+        """
+        num_processes = cpu_count()
+        if self.parser_process_pool is None:
+            self.parser_process_pool = ProcessPoolExecutor(
+                max_workers=num_processes,
+                initializer=init_parser_process,
+                initargs=steam_metadata_for_parser(self.external_steam_metadata),
+            )
+        logger.info(
+            f"[{data_source}] Parsing {len(to_parse)} mods with {num_processes} parser processes"
+        )
+        # Several chunks per process keeps the pool busy when some mods are slow to parse
+        for chunk in chunks(
+            _list=to_parse, limit=max(1, ceil(len(to_parse) / (num_processes * 4)))
+        ):
+            try:
+                future = self.parser_process_pool.submit(
+                    parse_mod_batch, data_source, chunk
+                )
+            except RuntimeError as e:  # Includes BrokenProcessPool
+                logger.error(f"Unable to submit mods to parser processes: {e}")
+                self.__fallback_to_thread_parses(data_source, chunk)
+                continue
+            self.pending_process_parses.append((data_source, chunk, future))
+
+    def __fallback_to_thread_parses(
+        self, data_source: str, chunk: list[tuple[str, str]]
+    ) -> None:
+        logger.warning(f"[{data_source}] Parsing {len(chunk)} mods on the thread pool")
+        for directory, uuid in chunk:
             self.process_update(
                 batch=True,
                 exists=uuid in self.internal_local_metadata.keys(),
@@ -1261,6 +1338,41 @@ class MetadataManager(QObject):
                 uuid=uuid,
             )
 
+    def wait_for_parsers(self) -> None:
+        """
+        Block until every mod queued by process_batch() has been parsed and merged.
+        """
+        pending_process_parses = self.pending_process_parses
+        self.pending_process_parses = []
+        for data_source, chunk, future in pending_process_parses:
+            try:
+                results = future.result()
+            except Exception as e:
+                logger.error(f"Parser process failed: {type(e).__name__}: {e}")
+                self.__fallback_to_thread_parses(data_source, chunk)
+                continue
+            for result in results:
+                self.add_parsed_metadata(
+                    data_source,
+                    result.mod_directory,
+                    result.uuid,
+                    result.metadata,
+                    result.steamdb_sensitive,
+                    fingerprint=result.fingerprint,
+                )
+        self.parser_threadpool.waitForDone()
+        self.parser_threadpool.clear()
+
+    def shutdown_parser_processes(self) -> None:
+        """
+        Stop the parser processes started by process_batch(), once their mods are
+        merged by wait_for_parsers(). They were started with a snapshot of the
+        Steam metadata, so the next batch starts new ones.
+        """
+        if self.parser_process_pool is not None:
+            self.parser_process_pool.shutdown()
+            self.parser_process_pool = None
+
     def process_creation(self, data_source: str, mod_directory: str, uuid: str) -> None:
         logger.debug(
             f"Processing creation of {data_source + ' mod' if data_source != 'expansion' else data_source} for {mod_directory}"
@@ -1285,12 +1397,50 @@ class MetadataManager(QObject):
             )
             return
 
-        deleted_mod_packageid = deleted_mod.get("packageid")
         self.internal_local_metadata.pop(uuid, None)
-        if deleted_mod_packageid and self.packageid_to_uuids.get(deleted_mod_packageid):
-            self.packageid_to_uuids[deleted_mod_packageid].remove(uuid)
+        self.mod_index.remove(uuid)
+        self.mod_rule_tables.pop(uuid, None)
         self.mod_deleted_signal.emit(uuid)
 
+    def process_changes(self, batch: WatchdogBatch) -> None:
+        """
+        Apply a batch of mod changes seen by the watchdog. Deleted mods are
+        removed, created and updated mods are parsed together, like a refresh,
+        and the metadata of the updated mods is compiled once.
+
+        :param batch: The changes, merged per uuid
+        """
+        created = batch.created
+        # Only mods that already exist are compiled and updated in the lists
+        updated = [
+            uuid for uuid in batch.updated if uuid in self.internal_local_metadata
+        ]
+        logger.info(
+            f"Processing watchdog changes: {len(created)} created, "
+            f"{len(batch.updated)} updated, {len(batch.deleted)} deleted"
+        )
+        for uuid, change in batch.deleted.items():
+            self.process_deletion(change.data_source or "", change.mod_directory, uuid)
+        # data source -> mod directory -> uuid
+        to_parse: dict[str, dict[str, str]] = {}
+        for uuid, change in {**created, **batch.updated}.items():
+            if change.data_source is None:
+                logger.warning(
+                    f"Unable to resolve the data source of {change.mod_directory}, skipping"
+                )
+                continue
+            to_parse.setdefault(change.data_source, {})[change.mod_directory] = uuid
+        for data_source, directory_uuids in to_parse.items():
+            self.process_batch(batch=directory_uuids, data_source=data_source)
+        self.wait_for_parsers()
+        self.shutdown_parser_processes()
+        if updated:
+            self.compile_metadata(uuids=updated)
+        for uuid in updated:
+            self.mod_metadata_updated_signal.emit(uuid)
+        for uuid in created:
+            self.mod_created_signal.emit(uuid)
+
     def process_update(
         self,
         batch: bool,
@@ -1320,33 +1470,65 @@ class MetadataManager(QObject):
     def refresh_acf_metadata(
         self, steamclient: bool = True, steamcmd: bool = True
     ) -> None:
+        """
+        Parse the Steam client and/or SteamCMD appworkshop_294100.acf files again
+        if they changed, and update the .acf timestamps of the mods whose entries
+        changed, see AcfTracker.
+
+        :param steamclient: Whether to check the Steam client .acf file
+        :param steamcmd: Whether to check the SteamCMD .acf file
+        """
         # If we can find the appworkshop_294100.acf files from...
         # ...Steam client
-        if steamclient and os.path.exists(self.workshop_acf_path):
-            try:
-                self.workshop_acf_data = acf_to_dict(self.workshop_acf_path)
+        if steamclient:
+            changed = self.workshop_acf_tracker.refresh(self.workshop_acf_path)
+            if changed is not None:
+                self.workshop_acf_data = self.workshop_acf_tracker.data
                 logger.info(
-                    f"Successfully parsed Steam client appworkshop.acf metadata from: {self.workshop_acf_path}"
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to parse Steam client appworkshop.acf metadata from: {self.workshop_acf_path}. Error: {e}"
+                    f"Successfully parsed Steam client appworkshop.acf metadata from: {self.workshop_acf_path} [{len(changed)} mod entries changed]"
                 )
+                self.__apply_acf_changes(changed, workshop=True)
         # ...SteamCMD
-        if steamcmd and os.path.exists(
-            self.steamcmd_wrapper.steamcmd_appworkshop_acf_path
-        ):
-            try:
-                self.steamcmd_acf_data = acf_to_dict(
-                    self.steamcmd_wrapper.steamcmd_appworkshop_acf_path
-                )
+        if steamcmd:
+            changed = self.steamcmd_acf_tracker.refresh(
+                self.steamcmd_wrapper.steamcmd_appworkshop_acf_path
+            )
+            if changed is not None:
+                self.steamcmd_acf_data = self.steamcmd_acf_tracker.data
                 logger.info(
-                    f"Successfully parsed SteamCMD appworkshop.acf metadata from: {self.steamcmd_wrapper.steamcmd_appworkshop_acf_path}"
-                )
-            except Exception as e:
-                logger.error(
-                    f"Failed to parse SteamCMD appworkshop.acf metadata from: {self.steamcmd_wrapper.steamcmd_appworkshop_acf_path}. Error: {e}"
+                    f"Successfully parsed SteamCMD appworkshop.acf metadata from: {self.steamcmd_wrapper.steamcmd_appworkshop_acf_path} [{len(changed)} mod entries changed]"
                 )
+                self.__apply_acf_changes(changed, workshop=False)
+
+    def __apply_acf_changes(self, publishedfileids: set[str], workshop: bool) -> None:
+        """
+        Apply the .acf data to the parsed mods with the given publishedfileids.
+        Mods without an entry anymore are left with the values they are parsed
+        with.
+
+        :param publishedfileids: The publishedfileids whose .acf entries changed
+        :param workshop: Whether the Steam client .acf file changed, which applies
+            to workshop mods, rather than the SteamCMD one, which applies to the others
+        """
+        for publishedfileid in publishedfileids:
+            for uuid in self.mod_index.uuids_by_publishedfileid(publishedfileid):
+                mod_metadata = self.internal_local_metadata.get(uuid)
+                if mod_metadata is None:
+                    continue
+                data_source = mod_metadata.get("data_source", "")
+                if (data_source == "workshop") != workshop:
+                    continue
+                # Drop the values of the previous entry, which may have been
+                # removed, and start over from the parsed values
+                mod_metadata.pop("internal_time_updated", None)
+                try:
+                    mod_metadata["internal_time_touched"] = int(
+                        os.path.getmtime(mod_metadata["path"])
+                    )
+                except (KeyError, OSError):
+                    mod_metadata.pop("internal_time_touched", None)
+                self.apply_acf_metadata(mod_metadata, data_source)
+                self.mod_metadata_updated_signal.emit(uuid)
 
     def refresh_cache(self, is_initial: bool = False) -> None:
         """
@@ -1423,8 +1605,18 @@ class MetadataManager(QObject):
                 ):
                     mod_manifest_ids.add(mod_manifest_id)
                 workshop_item_details.pop(delete_pfid, None)
-        # Save the updated .acf metadata
-        dict_to_acf(data=acf_metadata, path=acf_path)
+        # Save the updated .acf metadata, only rewriting the removed entries
+        try:
+            update_acf_entries(
+                acf_path,
+                {
+                    ("AppWorkshop", section): dict.fromkeys(publishedfileids)
+                    for section in ("WorkshopItemsInstalled", "WorkshopItemDetails")
+                    if acf_metadata.get("AppWorkshop", {}).get(section) is not None
+                },
+            )
+        except (KeyError, OSError, ValueError) as e:
+            logger.error(f"Failed to update SteamCMD ACF file: {e}")
         # Remove the depotcache files if we have manifest id and file(s) exist
         for mod_manifest_id in mod_manifest_ids:
             manifest_path = Path(depotcache_path) / f"294100_{mod_manifest_id}.manifest"
@@ -1437,8 +1629,9 @@ class MetadataManager(QObject):
 
     def get_mod_name_from_package_id(self, package_id: str) -> str:
         """Get a mod's name from its package ID"""
-        for mod_data in self.internal_local_metadata.values():
-            if mod_data.get("packageid") == package_id:
+        for uuid in self.mod_index.uuids_by_packageid(package_id):
+            mod_data = self.internal_local_metadata.get(uuid)
+            if mod_data is not None:
                 return mod_data.get("name", package_id)
         return package_id
 
@@ -1493,439 +1686,27 @@ class ModParser(QRunnable):
         # Set autoDelete to True
         self.setAutoDelete(True)
 
-    def __parse_mod_metadata(
-        self,
-        data_source: str,
-        mod_directory: str,
-        metadata_manager: MetadataManager,
-        uuid: str,
-    ) -> dict[str, Any]:
-        logger.debug(f"Parsing [{data_source}] directory: {mod_directory}")
-        metadata = {}
-        # Populate a UUID for the directory we are populating - re-use the same UUID
-        # if passed as the "data_source" parameter for single-mod updates
-        uuid = uuid
-        directory_path = Path(mod_directory)
-        directory_name = str(directory_path.name)
-        # Use this to trigger invalid clause intentionally, i.e. when handling exceptions
-        data_malformed = None
-        # Any pfid parsed will be stored here locally
-        pfid = None
-        # Look for a case-insensitive "About" folder
-        invalid_about_folder_path_found = True
-        about_folder_name = "About"
-        for temp_file in os.scandir(mod_directory):
-            if (
-                temp_file.name.lower() == about_folder_name.lower()
-                and temp_file.is_dir()
-            ):
-                about_folder_name = temp_file.name
-                invalid_about_folder_path_found = False
-                break
-        # Look for a case-insensitive "About.xml" file
-        invalid_about_file_path_found = True
-        if not invalid_about_folder_path_found:
-            about_file_name = "About.xml"
-            for temp_file in os.scandir(str((directory_path / about_folder_name))):
-                if (
-                    temp_file.name.lower() == about_file_name.lower()
-                    and temp_file.is_file()
-                ):
-                    about_file_name = temp_file.name
-                    invalid_about_file_path_found = False
-                    break
-        # Look for .rsc scenario files to load metadata from if we didn't find About.xml
-        if invalid_about_file_path_found:
-            scenario_rsc_found = None
-            for temp_file in os.scandir(mod_directory):
-                if temp_file.name.lower().endswith(".rsc") and not temp_file.is_dir():
-                    scenario_rsc_file = temp_file.name
-                    scenario_rsc_found = True
-                    break
-        # If a mod's folder name is a valid PublishedFileId in SteamDB
-        if (
-            self.metadata_manager.external_steam_metadata
-            and directory_name in self.metadata_manager.external_steam_metadata.keys()
-        ):
-            pfid = directory_name
-        # Look for a case-insensitive "PublishedFileId.txt" file if we didn't find a pfid
-        elif not pfid and not invalid_about_folder_path_found:
-            pfid_file_name = "PublishedFileId.txt"
-            for temp_file in os.scandir(str((directory_path / about_folder_name))):
-                if (
-                    temp_file.name.lower() == pfid_file_name.lower()
-                    and temp_file.is_file()
-                ):
-                    pfid_file_name = temp_file.name
-                    pfid_path = str(
-                        (directory_path / about_folder_name / pfid_file_name)
-                    )
-                    try:
-                        with open(pfid_path, encoding="utf-8-sig") as pfid_file:
-                            pfid = pfid_file.read()
-                            pfid = pfid.strip()
-                    except Exception:
-                        logger.error(f"Failed to read pfid from {pfid_path}")
-                    break
-        # If we were able to find an About.xml, populate mod data...
-        if not invalid_about_file_path_found:
-            mod_data_path = str((directory_path / about_folder_name / about_file_name))
-            logger.debug(f"Found mod metadata at: {mod_data_path}")
-            mod_data = {}
-            try:
-                # Try to parse .xml
-                mod_data = xml_path_to_json(mod_data_path)
-            except Exception:
-                # If there was an issue parsing the .xml, track and exit
-                logger.error(
-                    f"Unable to parse {about_file_name} with the exception: {traceback.format_exc()}"
-                )
-                data_malformed = True
-            else:
-                # Case-insensitive `ModMetaData` key.
-                mod_data = {k.lower(): v for k, v in mod_data.items()}
-                if mod_data.get("modmetadata"):
-                    # Initialize our dict from the formatted About.xml metadata
-                    mod_metadata = mod_data["modmetadata"]
-                    # Case-insensitive metadata keys
-                    mod_metadata = {k.lower(): v for k, v in mod_metadata.items()}
-                    if (  # If we don't have a <name>
-                        not mod_metadata.get("name")
-                        and self.metadata_manager.external_steam_metadata  # ... try to find it in Steam DB
-                        and pfid
-                        and self.metadata_manager.external_steam_metadata.get(
-                            pfid, {}
-                        ).get("steamName")
-                    ):
-                        mod_metadata.setdefault(
-                            "name",
-                            self.metadata_manager.external_steam_metadata[pfid][
-                                "steamName"
-                            ],
-                        )
-                        # This is so that DB builder shows we do not have local metadata
-                        mod_metadata.setdefault("DB_BUILDER_NO_NAME", True)
-                    else:
-                        mod_metadata.setdefault("name", "Missing XML: <name>")
-                    # Rename author tag appropriately to normalize it in usage and lookups
-                    mod_metadata = {
-                        ("authors" if key.lower() == "author" else key): value
-                        for key, value in mod_metadata.items()
-                    }
-                    # Make sure <supportedversions> or <targetversion> is correct format
-                    if mod_metadata.get("supportedversions") and not isinstance(
-                        mod_metadata.get("supportedversions"), dict
-                    ):
-                        logger.error(
-                            f"About.xml syntax error. Unable to read <supportedversions> tag from XML: {mod_data_path}"
-                        )
-                        mod_metadata.pop("supportedversions", None)
-                    elif mod_data.get("supportedversions", {}).get("li"):
-                        if isinstance(mod_data["supportedversions"]["li"], str):
-                            mod_data["supportedversions"]["li"] = (
-                                ".".join(
-                                    mod_data["supportedversions"]["li"].split(".")[:2]
-                                )
-                                if mod_data["supportedversions"]["li"].count(".") > 1
-                                else mod_data["supportedversions"]["li"]
-                            )
-                        elif isinstance(mod_data["supportedversions"]["li"], list):
-                            for mod_data["supportedversions"]["li"] in mod_data[
-                                "supportedversions"
-                            ]["li"]:
-                                li = mod_data["supportedversions"]["li"]
-                                if not isinstance(li, str):
-                                    logger.error(f"Failed to parse {li} as a string")
-                                    continue
-                                mod_data["supportedversions"]["li"] = (
-                                    ".".join(li.split(".")[:2])
-                                    if li.count(".") > 1 and isinstance(li, str)
-                                    else li
-                                )
-
-                    if mod_metadata.get("supportedversions", {}).get("li"):
-                        li = mod_metadata["supportedversions"]["li"]
-                        if isinstance(li, str):
-                            mod_metadata["supportedversions"]["li"] = li.strip()
-                        elif isinstance(li, list):
-                            for i, version in enumerate(li):
-                                if not isinstance(version, str):
-                                    logger.error(
-                                        f"Failed to parse {version} as a string"
-                                    )
-                                    continue
-                                li[i] = version.strip()
-
-                    if mod_metadata.get("targetversion"):
-                        mod_metadata["targetversion"] = mod_metadata["targetversion"]
-                        mod_metadata["targetversion"] = (
-                            ".".join(mod_metadata["targetversion"].split(".")[:2])
-                            if mod_metadata["targetversion"].count(".") > 1
-                            and isinstance(mod_metadata["targetversion"], str)
-                            else mod_metadata["targetversion"]
-                        )
-                    # If we parsed a packageid from modmetadata...
-                    if mod_metadata.get("packageid"):
-                        # ...check type of packageid, use first packageid parsed
-                        if isinstance(mod_metadata["packageid"], list):
-                            # Loop through the list and find str. If we find one, use it.
-                            for potential_packageid in mod_metadata["packageid"]:
-                                if potential_packageid and isinstance(
-                                    potential_packageid, str
-                                ):
-                                    mod_metadata["packageid"] = potential_packageid
-                                    break
-                        # Normalize package ID in metadata
-                        mod_metadata["packageid"] = mod_metadata["packageid"].lower()
-                    else:  # ...otherwise, we don't have one from About.xml, and we can check Steam DB...
-                        # ...this can be needed if a mod depends on a RW generated packageid via built-in hashing mechanism.
-                        if (
-                            pfid
-                            and self.metadata_manager.external_steam_metadata
-                            and self.metadata_manager.external_steam_metadata.get(
-                                pfid, {}
-                            ).get("packageId")
-                        ):
-                            mod_metadata["packageid"] = (
-                                self.metadata_manager.external_steam_metadata[pfid][
-                                    "packageId"
-                                ].lower()
-                            )
-                        else:
-                            mod_metadata.setdefault("packageid", "missing.packageid")
-                    # Track pfid if we parsed one earlier
-                    if pfid:  # Make some assumptions if we have a pfid
-                        mod_metadata["publishedfileid"] = pfid
-                        mod_metadata["steam_uri"] = (
-                            f"steam://url/CommunityFilePage/{pfid}"
-                        )
-                        mod_metadata["steam_url"] = (
-                            f"https://steamcommunity.com/sharedfiles/filedetails/?id={pfid}"
-                        )
-                    # If a mod contains C# assemblies, we want to tag the mod
-                    assemblies_path = str(directory_path / "Assemblies")
-                    # Check if the 'Assemblies' directory exists and is a directory
-                    if os.path.exists(assemblies_path) and os.path.isdir(
-                        assemblies_path
-                    ):
-                        try:
-                            # Check if there are any .dll files in the 'Assemblies' directory
-                            if any(
-                                filename.endswith((".dll", ".DLL"))
-                                for filename in os.listdir(assemblies_path)
-                            ):
-                                mod_metadata["csharp"] = (
-                                    True  # Tag the mod as containing C# code
-                                )
-                        except Exception as e:
-                            logger.error(
-                                f"Failed to list directory {assemblies_path}: {e}"
-                            )
-                    else:
-                        # If no 'Assemblies' directory in the main folder, check in subfolders
-                        subfolder_paths = [
-                            str(directory_path / folder)
-                            for folder in os.listdir(mod_directory)
-                            if os.path.isdir(str(directory_path / folder))
-                        ]
-                        for subfolder_path in subfolder_paths:
-                            assemblies_path = str(Path(subfolder_path) / "Assemblies")
-                            # Check if the 'Assemblies' directory exists in the subfolder
-                            if os.path.exists(assemblies_path):
-                                # Check if there are any .dll files in this 'Assemblies' directory
-                                if any(
-                                    filename.endswith((".dll", ".DLL"))
-                                    for filename in os.listdir(assemblies_path)
-                                ):
-                                    mod_metadata["csharp"] = (
-                                        True  # Tag the mod as containing C# code
-                                    )
-                    # data_source will be used with setIcon later
-                    mod_metadata["data_source"] = data_source
-                    mod_metadata["folder"] = directory_name
-                    # This is overwritten if acf data is parsed for Steam/SteamCMD mods
-                    mod_metadata["internal_time_touched"] = int(
-                        os.path.getmtime(mod_directory)
-                    )
-                    mod_metadata["path"] = mod_directory
-                    mod_metadata["metadata_file_mtime"] = int(
-                        os.path.getmtime(mod_data_path)
-                    )
-                    mod_metadata["metadata_file_path"] = mod_data_path
-                    # Grab our mod's publishedfileid
-                    publishedfileid = mod_metadata.get("publishedfileid")
-                    if publishedfileid:
-                        # Get our metadata based on data source
-                        workshop_acf_data = (
-                            self.metadata_manager.workshop_acf_data
-                            if data_source == "workshop"
-                            else self.metadata_manager.steamcmd_acf_data
-                        )
-                        workshop_item_details = workshop_acf_data.get(
-                            "AppWorkshop", {}
-                        ).get("WorkshopItemDetails", {})
-                        workshop_items_installed = workshop_acf_data.get(
-                            "AppWorkshop", {}
-                        ).get("WorkshopItemsInstalled", {})
-                        # Edit our metadata, append values
-                        if (
-                            workshop_item_details.get(publishedfileid, {}).get(
-                                "timetouched"
-                            )
-                            and workshop_item_details.get(publishedfileid, {}).get(
-                                "timetouched"
-                            )
-                            != 0
-                        ):
-                            # The last time SteamCMD/Steam client touched a mod according to its entry
-                            mod_metadata["internal_time_touched"] = int(
-                                workshop_item_details[publishedfileid]["timetouched"]
-                            )
-                        if publishedfileid and workshop_item_details.get(
-                            publishedfileid, {}
-                        ).get("timeupdated"):
-                            # The last time SteamCMD/Steam client updated a mod according to its entry
-                            mod_metadata["internal_time_updated"] = int(
-                                workshop_item_details[publishedfileid]["timeupdated"]
-                            )
-                        if publishedfileid and workshop_items_installed.get(
-                            publishedfileid, {}
-                        ).get("timeupdated"):
-                            # The last time SteamCMD/Steam client updated a mod according to its entry
-                            mod_metadata["internal_time_updated"] = int(
-                                workshop_items_installed[publishedfileid]["timeupdated"]
-                            )
-                    # Assign our metadata to the UUID
-                    metadata[uuid] = mod_metadata
-                else:
-                    logger.error(
-                        f"Key <modmetadata> does not exist in this data: {mod_data}"
-                    )
-                    data_malformed = True
-        # ...or, if we didn't find an About.xml, but we have a RimWorld scenario .rsc to parse...
-        elif invalid_about_file_path_found and scenario_rsc_found:
-            scenario_data_path = str((directory_path / scenario_rsc_file))
-            logger.debug(f"Found scenario metadata at: {scenario_data_path}")
-            scenario_data = {}
-            try:
-                # Try to parse .rsc
-                scenario_data = xml_path_to_json(scenario_data_path)
-            except Exception:
-                # If there was an issue parsing the .rsc, track and exit
-                logger.error(
-                    f"Unable to parse {scenario_rsc_file} with the exception: {traceback.format_exc()}"
-                )
-                data_malformed = True
-            else:
-                # Case-insensitive `savedscenario` key.
-                scenario_data = {k.lower(): v for k, v in scenario_data.items()}
-                if scenario_data.get("savedscenario", {}).get(
-                    "scenario"
-                ):  # If our .rsc metadata has a packageid key
-                    # Initialize our dict from the formatted .rsc metadata
-                    scenario_metadata = scenario_data["savedscenario"]["scenario"]
-                    # Case-insensitive keys.
-                    scenario_metadata = {
-                        k.lower(): v for k, v in scenario_metadata.items()
-                    }
-                    scenario_metadata.setdefault("packageid", "scenario.rsc")
-                    scenario_metadata["scenario"] = True
-                    scenario_metadata.pop("playerfaction", None)
-                    scenario_metadata.pop("parts", None)
-                    if (
-                        scenario_data["savedscenario"]
-                        .get("meta", {})
-                        .get("gameVersion")
-                    ):
-                        scenario_metadata["supportedversions"] = {
-                            "li": scenario_data["savedscenario"]["meta"]["gameVersion"]
-                        }
-                    else:
-                        logger.warning(
-                            f"Unable to parse [gameversion] from this scenario [meta] tag: {scenario_data}"
-                        )
-                    # Track pfid if we parsed one earlier and don't already have one from metadata
-                    if pfid and not scenario_data.get("publishedfileid"):
-                        scenario_data["publishedfileid"] = pfid
-                    if scenario_metadata.get(
-                        "publishedfileid"
-                    ):  # Make some assumptions if we have a pfid
-                        scenario_metadata["steam_uri"] = (
-                            f"steam://url/CommunityFilePage/{pfid}"
-                        )
-                        scenario_metadata["steam_url"] = (
-                            f"https://steamcommunity.com/sharedfiles/filedetails/?id={pfid}"
-                        )
-                    # data_source will be used with setIcon later
-                    scenario_metadata["data_source"] = data_source
-                    scenario_metadata["folder"] = directory_name
-                    scenario_metadata["path"] = mod_directory
-                    # This is overwritten if acf data is parsed for Steam/SteamCMD mods
-                    scenario_metadata["internal_time_touched"] = int(
-                        os.path.getmtime(mod_directory)
-                    )
-                    scenario_metadata["metadata_file_path"] = scenario_data_path
-                    scenario_metadata["metadata_file_mtime"] = int(
-                        os.path.getmtime(scenario_data_path)
-                    )
-                    # Track source & uuid in case metadata becomes detached
-                    scenario_metadata["uuid"] = uuid
-                    # Assign our metadata to the UUID
-                    metadata[uuid] = scenario_metadata
-                else:
-                    logger.error(
-                        f"Key <savedscenario><scenario> does not exist in this data: {scenario_metadata}"
-                    )
-                    data_malformed = True
-        if (
-            (invalid_about_file_path_found and not scenario_rsc_found) or data_malformed
-        ):  # ...finally, if we don't have any metadata parsed, populate invalid mod entry for visibility
-            logger.debug(
-                f"Invalid dir. Populating invalid mod for path: {mod_directory}"
-            )
-            # Assign our metadata to the UUID
-            metadata[uuid] = {
-                "invalid": True,
-                "name": "Invalid item",
-                "packageid": "invalid.item",
-                "authors": "Not found",
-                "description": (
-                    "This mod is considered invalid by RimSort (and the RimWorld game)."
-                    + "\n\nThis mod does NOT contain an ./About/About.xml and is likely leftover from previous usage."
-                    + "\n\nThis can happen sometimes with Steam mods if there are leftover .dds textures or unexpected data."
-                ),
-                "data_source": data_source,
-                "folder": directory_name,
-                "path": mod_directory,
-                # This is overwritten if acf data is parsed for Steam/SteamCMD mods
-                "internal_time_touched": int(os.path.getmtime(mod_directory)),
-                "uuid": uuid,
-            }
-            if pfid:
-                metadata[uuid].update({"publishedfileid": pfid})
-        # Additional checks for local mods
-        if data_source == "local":
-            local_mod_metadata = metadata[uuid]
-            # Check for git repository inside local mods, tag appropriately
-            if os.path.exists(str((directory_path / ".git"))):
-                local_mod_metadata["git_repo"] = True
-            # Check for local mods that are SteamCMD mods, tag appropriately
-            if local_mod_metadata.get("folder") == local_mod_metadata.get(
-                "publishedfileid"
-            ):
-                local_mod_metadata["steamcmd"] = True
-        return metadata
-
     def run(self) -> None:
         try:
-            mod_metadata = self.__parse_mod_metadata(
-                self.data_source, self.mod_directory, self.metadata_manager, self.uuid
+            probe = probe_mod_directory(self.mod_directory)
+            mod_metadata, steamdb_sensitive = parse_mod_metadata(
+                self.data_source,
+                self.mod_directory,
+                self.uuid,
+                self.metadata_manager.external_steam_metadata,
+                probe,
             )
-            packageid = mod_metadata[self.uuid].get("packageid")
-            self.metadata_manager.internal_local_metadata.update(mod_metadata)
-            # Track packageid -> uuid relationships for future uses
-            self.metadata_manager.packageid_to_uuids.setdefault(packageid, set()).add(
-                self.uuid
+            try:
+                fingerprint = probe.fingerprint(mod_metadata.get("metadata_file_path"))
+            except OSError:
+                fingerprint = None
+            self.metadata_manager.add_parsed_metadata(
+                self.data_source,
+                self.mod_directory,
+                self.uuid,
+                mod_metadata,
+                steamdb_sensitive,
+                fingerprint,
             )
         except Exception as e:
             error_message = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
@@ -2018,19 +1799,24 @@ def add_incompatibility_to_mod(
     mod_data: dict[str, Any],
     dependency_or_dependency_ids: Any,
     all_mods: dict[str, Any],
+    all_package_ids: Collection[str] | None = None,
 ) -> None:
     """
     Incompatibility data is collected only if that incompatibility is in `all_mods`.
     There's no need to surface incompatibilities if they aren't even downloaded.
+
+    :param all_package_ids: The package ids of `all_mods`, e.g. MetadataManager.packageid_to_uuids.
+        Collected from `all_mods` if not given, which is slow when called for many mods.
     """
     logger.debug(
-        f"Adding incompatibilities for packages [{dependency_or_dependency_ids}] to mod data: {mod_data} (and reverse direction too)"
+        f"Adding incompatibilities for packages [{dependency_or_dependency_ids}] to mod: {mod_data.get('packageid')}"
     )
     if mod_data:
         # Create a new key with empty set as value by default
         mod_data.setdefault("incompatibilities", set())
 
-        all_package_ids = set(all_mods[uuid]["packageid"] for uuid in all_mods)
+        if all_package_ids is None:
+            all_package_ids = set(all_mods[uuid]["packageid"] for uuid in all_mods)
 
         # If the value is a single string...
         if isinstance(dependency_or_dependency_ids, str):
@@ -2135,20 +1921,7 @@ def get_mods_from_list(
     """
     all_mods = MetadataManager.instance().internal_local_metadata
 
-    active_mods_uuids: list[str] = []
-    inactive_mods_uuids: list[str] = []
-    duplicate_mods: dict[str, Any] = {}
-    duplicates_processed = []
-    missing_mods: list[str] = []
-    populated_mods = []
-    to_populate = []
     logger.debug("Started generating active and inactive mods")
-    # Calculate duplicate mods (SCHEMA: {str packageid: list[str duplicate uuids]})
-    for mod_uuid, mod_data in all_mods.items():
-        # Using setdefault() to initialize the dictionary and then assigning the value
-        duplicate_mods.setdefault(mod_data["packageid"], []).append(mod_uuid)
-    # Filter out non-duplicate mods
-    duplicate_mods = {k: v for k, v in duplicate_mods.items() if len(v) > 1}
     # Calculate mod lists
     if isinstance(mod_list, str):
         # Handle the mod list not existing
@@ -2162,102 +1935,25 @@ def get_mods_from_list(
             )
             logger.debug(f"Saving new mods list to: {mod_list}")
             json_to_xml_write(generated_xml, mod_list)
-        # Parse the ModsConfig.xml activeMods list
-        logger.info(f"Retrieving active mods from RimWorld mod list: {mod_list}")
-        mod_data = xml_path_to_json(mod_list)
-        package_ids_to_import = validate_rimworld_mods_list(mod_data)
+        package_ids_to_import = get_package_ids_from_list(mod_list)
     elif isinstance(mod_list, list):
         logger.info("Retrieving active mods from the provided list of package ids")
         package_ids_to_import = mod_list
-    # Parse the ModsConfig.xml data
-    logger.info("Generating active mod list")
-    for (
-        package_id
-    ) in package_ids_to_import:  # Go through active mods, handle packageids
-        package_id_normalized = package_id.lower()
-        package_id_steam_suffix = "_steam"
-        package_id_normalized_stripped = package_id_normalized.replace(
-            package_id_steam_suffix, ""
-        )
-        # bool to determine whether or not _steam suffix present in ModsConfig entry
-        is_steam = package_id_steam_suffix in package_id_normalized
-        # Determine target_id based on whether suffix exists
-        target_id = (
-            package_id_normalized_stripped
-            if is_steam  # Use suffix if _steam in our ModsConfig entry
-            else package_id_normalized
-        )
-        # Append our packageid to list, used to calculate missing mods later
-        to_populate.append(target_id)
-        sources_order = (
-            # Prioritize workshop duplicate if _steam suffix used...
-            ["workshop", "local"]
-            if is_steam
-            # ... otherwise, we use standard data source priority if suffix not used
-            else ["expansion", "local", "workshop"]
-        )
-        # Loop through all mods
-        for uuid, metadata in all_mods.items():
-            metadata_package_id = metadata["packageid"]
-            if (
-                metadata_package_id
-                in [  # If we have a match with or without _steam present
-                    package_id_normalized,
-                    package_id_normalized_stripped,
-                ]
-            ):
-                # Add non-duplicates to active mods
-                if target_id not in duplicate_mods.keys():
-                    populated_mods.append(target_id)
-                    active_mods_uuids.append(uuid)
-                else:  # Otherwise, duplicate needs calculated
-                    if (
-                        target_id in duplicates_processed
-                    ):  # Skip duplicates that have already been processed
-                        continue
-                    logger.info(
-                        f"Found duplicate mod present in active mods list: {target_id}"
-                    )
-                    # Loop through sorted paths and determine which duplicate to used based on priority
-                    for source in sources_order:
-                        logger.debug(f"Checking for duplicate with source: {source}")
-                        # Sort duplicate mod paths by source priority
-                        paths_to_uuid = {}
-                        for duplicate_uuid in duplicate_mods[target_id]:
-                            if source in all_mods[duplicate_uuid]["data_source"]:
-                                paths_to_uuid[all_mods[duplicate_uuid]["path"]] = (
-                                    duplicate_uuid
-                                )
-                        # Sort duplicate mod paths from current source priority using natsort
-                        source_paths_sorted = natsorted(paths_to_uuid.keys())
-                        if source_paths_sorted:  # If we have paths returned
-                            # If we are here, we've found our calculated duplicate, log and use this mod
-                            calculated_duplicate_uuid = paths_to_uuid[
-                                source_paths_sorted[0]
-                            ]
-                            logger.debug(
-                                f"Using duplicate {source} mod for {target_id}: {all_mods[calculated_duplicate_uuid]['path']}"
-                            )
-                            populated_mods.append(target_id)
-                            duplicates_processed.append(target_id)
-                            active_mods_uuids.append(calculated_duplicate_uuid)
-                            break
-                        else:  # Skip this source priority if no paths
-                            logger.debug(f"No paths returned for {source}")
-                            continue
-    # Calculate missing mods from the difference
-    missing_mods = list(set(to_populate) - set(populated_mods))
-    logger.debug(f"Generated active mods dict with {len(active_mods_uuids)} mods")
-    # Get the inactive mods by subtracting active mods from workshop + expansions
-    logger.info("Generating inactive mod list")
-    inactive_mods_uuids = [
-        uuid for uuid in all_mods.keys() if uuid not in active_mods_uuids
-    ]
-    logger.info(f"# active mods: {len(active_mods_uuids)}")
-    logger.info(f"# inactive mods: {len(inactive_mods_uuids)}")
-    logger.info(f"# duplicate mods: {len(duplicate_mods)}")
-    logger.info(f"# missing mods: {len(missing_mods)}")
-    return active_mods_uuids, inactive_mods_uuids, duplicate_mods, missing_mods
+    return get_mods_from_package_ids(all_mods, package_ids_to_import)
+
+
+def get_package_ids_from_list(mod_list: str) -> list[str]:
+    """
+    Read the active mods of a RimWorld mods list, without matching them against
+    the installed mods.
+
+    :param mod_list: A path to an .rws/.xml style list, e.g. ModsConfig.xml
+    :return: The package ids of the active mods, in load order
+    """
+    # Parse the ModsConfig.xml activeMods list
+    logger.info(f"Retrieving active mods from RimWorld mod list: {mod_list}")
+    mod_data = xml_path_to_json(mod_list)
+    return validate_rimworld_mods_list(mod_data)
 
 
 def log_deps_order_info(all_mods: dict[str, Any]) -> None:
@@ -2572,7 +2268,7 @@ class SteamDatabaseBuilder(QThread):
 
 
 def check_if_pfids_blacklisted(
-    publishedfileids: list[str], steamdb: dict[str, Any]
+    publishedfileids: list[str], steamdb: Mapping[str, Any]
 ) -> list[str]:
     # None-check for steamdb
     if not steamdb:
@@ -2677,7 +2373,19 @@ def import_steamcmd_acf_data(
     logger.debug(f"WorkshopItemDetails after: {item_details_after}")
     logger.info("Successfully imported data!")
     logger.info(f"Writing updated data back to path: {steamcmd_appworkshop_acf_path}")
-    dict_to_acf(data=steamcmd_appworkshop_acf, path=steamcmd_appworkshop_acf_path)
+    # Only rewrite the entries of the imported mods
+    update_acf_entries(
+        steamcmd_appworkshop_acf_path,
+        {
+            ("AppWorkshop", section): {
+                publishedfileid: steamcmd_appworkshop_acf["AppWorkshop"][section][
+                    publishedfileid
+                ]
+                for publishedfileid in acf_to_import["AppWorkshop"][section]
+            }
+            for section in ("WorkshopItemsInstalled", "WorkshopItemDetails")
+        },
+    )
 
 
 def query_workshop_update_data(mods: dict[str, Any]) -> str | None:
@@ -0,0 +1,235 @@
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Iterable
+
+import msgspec
+from loguru import logger
+
+from app.utils.mod_directory_probe import probe_mod_directory
+
+# Bump whenever the shape of ModParser output changes so stale entries are discarded
+METADATA_CACHE_VERSION = 4
+
+
+class MetadataCacheEntry(msgspec.Struct):
+    data_source: str
+    # Path -> (st_mtime_ns, st_size) for every file/folder the parse depended on
+    fingerprint: dict[str, tuple[int, int]]
+    # Whether the parsed result could differ depending on the loaded Steam DB
+    steamdb_sensitive: bool
+    steamdb_signature: str | None
+    # Raw ModParser output, only decoded when the entry is actually used
+    metadata: msgspec.Raw
+
+
+class MetadataCacheSchema(msgspec.Struct):
+    version: int
+    entries: dict[str, MetadataCacheEntry] = msgspec.field(default_factory=dict)
+
+
+def fingerprint_mod_directory(
+    mod_directory: str, metadata_file_path: str | None = None
+) -> dict[str, tuple[int, int]]:
+    """
+    Stat the files and folders that ModParser reads for a mod directory.
+
+    This covers the mod folder itself, its About and Assemblies folders, About.xml,
+    PublishedFileId.txt and the metadata file that was actually parsed (e.g. a
+    scenario .rsc). Creating or removing anything directly inside these folders
+    changes their mtime, so new files are picked up as well.
+
+    Parsers that already probed the directory should use
+    ModDirectoryProbe.fingerprint() instead.
+
+    :param mod_directory: Path to the mod directory
+    :param metadata_file_path: Path to the metadata file that was parsed, if any
+    :return: Mapping of path -> (st_mtime_ns, st_size)
+    """
+    return probe_mod_directory(mod_directory).fingerprint(metadata_file_path)
+
+
+def _fingerprint_matches(fingerprint: dict[str, tuple[int, int]]) -> bool:
+    for path, (mtime_ns, size) in fingerprint.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns != mtime_ns or stat.st_size != size:
+            return False
+    return True
+
+
+class MetadataCache:
+    """
+    Persistent on-disk cache of parsed mod metadata, keyed by mod directory.
+
+    Each entry stores the raw ModParser output together with a stat fingerprint of
+    the files it was parsed from. On refresh, entries whose fingerprint still matches
+    are restored without reading About.xml again; everything else is re-parsed and
+    stored. Entries are only written back to disk when :meth:`save` is called.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, MetadataCacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self._loaded = False
+        self._dirty = False
+        self._lock = Lock()
+
+    def load(self) -> None:
+        """
+        Load the cache from disk, replacing any entries in memory.
+
+        Missing, corrupt or outdated caches are discarded.
+        """
+        with self._lock:
+            self._load()
+
+    def _load(self) -> None:
+        self._loaded = True
+        self.entries = {}
+        if not self.path.exists():
+            logger.debug(f"No metadata cache found at: {self.path}")
+            return
+        try:
+            with open(self.path, "rb") as f:
+                cache = msgspec.json.decode(f.read(), type=MetadataCacheSchema)
+        except (OSError, msgspec.DecodeError) as e:
+            logger.warning(f"Discarding unreadable metadata cache {self.path}: {e}")
+            self._dirty = True
+            return
+        if cache.version != METADATA_CACHE_VERSION:
+            logger.info(
+                f"Discarding metadata cache with version {cache.version}, expected {METADATA_CACHE_VERSION}"
+            )
+            self._dirty = True
+            return
+        self.entries = cache.entries
+        logger.info(f"Loaded {len(self.entries)} entries from metadata cache")
+
+    def save(self, keep: Iterable[str] | None = None) -> None:
+        """
+        Write the cache to disk if anything changed.
+
+        :param keep: If given, entries for mod directories not in this collection are pruned first
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            if keep is not None:
+                keep = set(keep)
+                stale = [path for path in self.entries if path not in keep]
+                for path in stale:
+                    del self.entries[path]
+                if stale:
+                    self._dirty = True
+            if not self._dirty:
+                return
+            data = msgspec.json.encode(
+                MetadataCacheSchema(
+                    version=METADATA_CACHE_VERSION, entries=self.entries
+                )
+            )
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Unable to write metadata cache to {self.path}: {e}")
+
+    def lookup(
+        self, mod_directory: str, data_source: str, steamdb_signature: str | None
+    ) -> dict[str, Any] | None:
+        """
+        Return a freshly decoded copy of the cached metadata for a mod directory, or
+        None if there is no entry or the mod changed since it was cached.
+
+        :param mod_directory: Path to the mod directory
+        :param data_source: Data source the directory is being parsed for
+        :param steamdb_signature: Signature of the currently loaded Steam DB, if any
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
+        entry = self.entries.get(mod_directory)
+        if (
+            entry is None
+            or entry.data_source != data_source
+            or (
+                entry.steamdb_sensitive and entry.steamdb_signature != steamdb_signature
+            )
+            or not _fingerprint_matches(entry.fingerprint)
+        ):
+            self.misses += 1
+            return None
+        try:
+            metadata = msgspec.json.decode(entry.metadata)
+        except msgspec.DecodeError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return metadata
+
+    def store(
+        self,
+        mod_directory: str,
+        data_source: str,
+        metadata: dict[str, Any],
+        steamdb_sensitive: bool,
+        steamdb_signature: str | None,
+        fingerprint: dict[str, tuple[int, int]] | None = None,
+    ) -> None:
+        """
+        Snapshot freshly parsed metadata for a mod directory. Safe to call from parser threads.
+
+        :param mod_directory: Path to the mod directory
+        :param data_source: Data source the directory was parsed for
+        :param metadata: The parsed metadata. It is encoded immediately, so later mutations are not cached
+        :param steamdb_sensitive: Whether the parse consulted (or would have consulted) the Steam DB
+        :param steamdb_signature: Signature of the Steam DB loaded during the parse, if any
+        :param fingerprint: Precomputed fingerprint_mod_directory() result, computed here if not given
+        """
+        try:
+            entry = MetadataCacheEntry(
+                data_source=data_source,
+                fingerprint=fingerprint
+                or fingerprint_mod_directory(
+                    mod_directory, metadata.get("metadata_file_path")
+                ),
+                steamdb_sensitive=steamdb_sensitive,
+                steamdb_signature=steamdb_signature,
+                metadata=msgspec.Raw(msgspec.json.encode(metadata)),
+            )
+        except (OSError, TypeError) as e:
+            logger.debug(f"Not caching metadata for {mod_directory}: {e}")
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self.entries[mod_directory] = entry
+            self._dirty = True
+
+    def clear(self) -> None:
+        """
+        Drop every cached entry and delete the cache file.
+        """
+        logger.info("Clearing metadata cache")
+        with self._lock:
+            self.entries = {}
+            self._loaded = True
+            self._dirty = False
+            try:
+                self.path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.error(f"Unable to delete metadata cache {self.path}: {e}")
+
+    def reset_counters(self) -> None:
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,105 @@
+from threading import Lock
+from typing import Any
+
+
+class ModMetadataIndex:
+    """
+    Lookup indexes over MetadataManager.internal_local_metadata.
+
+    Maps packageid, publishedfileid, mod path and lowercase name to the uuids
+    of the mods that have them, so lookups do not need to scan every mod.
+    Several mods can share a packageid, publishedfileid or name (e.g. a SteamCMD
+    copy of a Workshop mod), so those map to sets of uuids.
+
+    The index is kept in sync by calling :meth:`add` whenever a mod's metadata is
+    stored or its indexed values change, and :meth:`remove` when a mod is dropped.
+    Both are safe to call from parser threads.
+    """
+
+    def __init__(self) -> None:
+        self.packageid_to_uuids: dict[str, set[str]] = {}
+        self.publishedfileid_to_uuids: dict[str, set[str]] = {}
+        self.path_to_uuid: dict[str, str] = {}
+        self.name_to_uuids: dict[str, set[str]] = {}
+        # uuid -> (packageid, publishedfileid, path, name) as last indexed
+        self._indexed: dict[str, tuple[Any, Any, Any, Any]] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _keys(metadata: dict[str, Any]) -> tuple[Any, Any, Any, Any]:
+        name = metadata.get("name")
+        return (
+            metadata.get("packageid"),
+            metadata.get("publishedfileid"),
+            metadata.get("path"),
+            name.lower() if isinstance(name, str) else None,
+        )
+
+    @staticmethod
+    def _discard(index: dict[str, set[str]], key: Any, uuid: str) -> None:
+        uuids = index.get(key)
+        if uuids is not None:
+            uuids.discard(uuid)
+            if not uuids:
+                del index[key]
+
+    def _remove(self, uuid: str) -> None:
+        keys = self._indexed.pop(uuid, None)
+        if keys is None:
+            return
+        packageid, publishedfileid, path, name = keys
+        self._discard(self.packageid_to_uuids, packageid, uuid)
+        self._discard(self.publishedfileid_to_uuids, publishedfileid, uuid)
+        self._discard(self.name_to_uuids, name, uuid)
+        if path is not None and self.path_to_uuid.get(path) == uuid:
+            del self.path_to_uuid[path]
+
+    def add(self, uuid: str, metadata: dict[str, Any]) -> None:
+        """
+        Index a mod, replacing whatever was indexed for its uuid before.
+        """
+        keys = self._keys(metadata)
+        packageid, publishedfileid, path, name = keys
+        with self._lock:
+            self._remove(uuid)
+            self._indexed[uuid] = keys
+            if packageid:
+                self.packageid_to_uuids.setdefault(packageid, set()).add(uuid)
+            if publishedfileid:
+                self.publishedfileid_to_uuids.setdefault(publishedfileid, set()).add(
+                    uuid
+                )
+            if name:
+                self.name_to_uuids.setdefault(name, set()).add(uuid)
+            if path:
+                self.path_to_uuid[path] = uuid
+
+    def remove(self, uuid: str) -> None:
+        """
+        Drop a mod from every index. Unknown uuids are ignored.
+        """
+        with self._lock:
+            self._remove(uuid)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.packageid_to_uuids.clear()
+            self.publishedfileid_to_uuids.clear()
+            self.path_to_uuid.clear()
+            self.name_to_uuids.clear()
+            self._indexed.clear()
+
+    def uuids_by_packageid(self, packageid: str) -> set[str]:
+        return set(self.packageid_to_uuids.get(packageid, ()))
+
+    def uuids_by_publishedfileid(self, publishedfileid: str) -> set[str]:
+        return set(self.publishedfileid_to_uuids.get(publishedfileid, ()))
+
+    def uuid_by_path(self, path: str) -> str | None:
+        return self.path_to_uuid.get(path)
+
+    def uuids_by_name(self, name: str) -> set[str]:
+        """
+        Case-insensitive lookup by mod name.
+        """
+        return set(self.name_to_uuids.get(name.lower(), ()))
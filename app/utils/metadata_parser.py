@@ -0,0 +1,460 @@
+import os
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+import msgspec
+from loguru import logger
+
+from app.utils.compiled_steam_db import CompiledSteamDb, open_compiled_steam_db
+from app.utils.mod_directory_probe import ModDirectoryProbe, probe_mod_directory
+from app.utils.xml import about_xml_to_json, xml_path_to_json
+
+
+def parse_mod_metadata(
+    data_source: str,
+    mod_directory: str,
+    uuid: str,
+    external_steam_metadata: Mapping[str, Any] | None,
+    probe: ModDirectoryProbe | None = None,
+) -> tuple[dict[str, Any], bool]:
+    """
+    Parse the metadata of a single mod directory.
+
+    This only reads from disk and the given Steam DB, so it is safe to run from
+    parser threads as well as parser processes.
+
+    :param data_source: The data source of the mod (expansion, local or workshop)
+    :param mod_directory: Path to the mod directory
+    :param uuid: UUID assigned to the mod directory
+    :param external_steam_metadata: Steam DB metadata used to fill in missing values, if loaded
+    :param probe: Layout of the mod directory, probed here if not given
+    :return: The parsed metadata, and whether it depends on the loaded Steam DB
+    """
+    logger.debug(f"Parsing [{data_source}] directory: {mod_directory}")
+    metadata = {}
+    # Set if the result depends on which Steam DB is loaded, see MetadataCache
+    steamdb_sensitive = False
+    # Populate a UUID for the directory we are populating - re-use the same UUID
+    # if passed as the "data_source" parameter for single-mod updates
+    uuid = uuid
+    directory_path = Path(mod_directory)
+    directory_name = str(directory_path.name)
+    # Use this to trigger invalid clause intentionally, i.e. when handling exceptions
+    data_malformed = None
+    # Any pfid parsed will be stored here locally
+    pfid = None
+    # Collect the layout of the mod directory in a single walk
+    if probe is None:
+        probe = probe_mod_directory(mod_directory)
+    # Look for .rsc scenario files to load metadata from if we didn't find About.xml
+    invalid_about_file_path_found = probe.about_file is None
+    scenario_rsc_found = probe.scenario_file is not None
+    # Read "PublishedFileId.txt" if we found one
+    pfid_from_file = None
+    pfid_path = probe.pfid_file_path
+    if pfid_path:
+        try:
+            with open(pfid_path, encoding="utf-8-sig") as pfid_file:
+                pfid_from_file = pfid_file.read()
+                pfid_from_file = pfid_from_file.strip()
+        except Exception:
+            logger.error(f"Failed to read pfid from {pfid_path}")
+    # A folder named after a pfid only wins over PublishedFileId.txt if Steam DB knows it
+    if directory_name.isdigit() and directory_name != pfid_from_file:
+        steamdb_sensitive = True
+    # If a mod's folder name is a valid PublishedFileId in SteamDB
+    if external_steam_metadata and directory_name in external_steam_metadata.keys():
+        pfid = directory_name
+    # ...otherwise use the pfid from "PublishedFileId.txt" if we found one
+    elif pfid_from_file:
+        pfid = pfid_from_file
+    # If we were able to find an About.xml, populate mod data...
+    if not invalid_about_file_path_found:
+        about_file_name = probe.about_file
+        mod_data_path = str(probe.about_file_path)
+        logger.debug(f"Found mod metadata at: {mod_data_path}")
+        mod_data = {}
+        try:
+            # Try to parse .xml
+            mod_data = about_xml_to_json(mod_data_path)
+        except Exception:
+            # If there was an issue parsing the .xml, track and exit
+            logger.error(
+                f"Unable to parse {about_file_name} with the exception: {traceback.format_exc()}"
+            )
+            data_malformed = True
+        else:
+            # Case-insensitive `ModMetaData` key.
+            mod_data = {k.lower(): v for k, v in mod_data.items()}
+            if mod_data.get("modmetadata"):
+                # Initialize our dict from the formatted About.xml metadata
+                mod_metadata = mod_data["modmetadata"]
+                # Case-insensitive metadata keys
+                mod_metadata = {k.lower(): v for k, v in mod_metadata.items()}
+                if not mod_metadata.get("name") or not mod_metadata.get("packageid"):
+                    # Missing values may be filled in from Steam DB
+                    steamdb_sensitive = True
+                if (  # If we don't have a <name>
+                    not mod_metadata.get("name")
+                    and external_steam_metadata  # ... try to find it in Steam DB
+                    and pfid
+                    and external_steam_metadata.get(pfid, {}).get("steamName")
+                ):
+                    mod_metadata.setdefault(
+                        "name",
+                        external_steam_metadata[pfid]["steamName"],
+                    )
+                    # This is so that DB builder shows we do not have local metadata
+                    mod_metadata.setdefault("DB_BUILDER_NO_NAME", True)
+                else:
+                    mod_metadata.setdefault("name", "Missing XML: <name>")
+                # Rename author tag appropriately to normalize it in usage and lookups
+                mod_metadata = {
+                    ("authors" if key.lower() == "author" else key): value
+                    for key, value in mod_metadata.items()
+                }
+                # Make sure <supportedversions> or <targetversion> is correct format
+                if mod_metadata.get("supportedversions") and not isinstance(
+                    mod_metadata.get("supportedversions"), dict
+                ):
+                    logger.error(
+                        f"About.xml syntax error. Unable to read <supportedversions> tag from XML: {mod_data_path}"
+                    )
+                    mod_metadata.pop("supportedversions", None)
+                elif mod_data.get("supportedversions", {}).get("li"):
+                    if isinstance(mod_data["supportedversions"]["li"], str):
+                        mod_data["supportedversions"]["li"] = (
+                            ".".join(mod_data["supportedversions"]["li"].split(".")[:2])
+                            if mod_data["supportedversions"]["li"].count(".") > 1
+                            else mod_data["supportedversions"]["li"]
+                        )
+                    elif isinstance(mod_data["supportedversions"]["li"], list):
+                        for mod_data["supportedversions"]["li"] in mod_data[
+                            "supportedversions"
+                        ]["li"]:
+                            li = mod_data["supportedversions"]["li"]
+                            if not isinstance(li, str):
+                                logger.error(f"Failed to parse {li} as a string")
+                                continue
+                            mod_data["supportedversions"]["li"] = (
+                                ".".join(li.split(".")[:2])
+                                if li.count(".") > 1 and isinstance(li, str)
+                                else li
+                            )
+
+                if mod_metadata.get("supportedversions", {}).get("li"):
+                    li = mod_metadata["supportedversions"]["li"]
+                    if isinstance(li, str):
+                        mod_metadata["supportedversions"]["li"] = li.strip()
+                    elif isinstance(li, list):
+                        for i, version in enumerate(li):
+                            if not isinstance(version, str):
+                                logger.error(f"Failed to parse {version} as a string")
+                                continue
+                            li[i] = version.strip()
+
+                if mod_metadata.get("targetversion"):
+                    mod_metadata["targetversion"] = mod_metadata["targetversion"]
+                    mod_metadata["targetversion"] = (
+                        ".".join(mod_metadata["targetversion"].split(".")[:2])
+                        if mod_metadata["targetversion"].count(".") > 1
+                        and isinstance(mod_metadata["targetversion"], str)
+                        else mod_metadata["targetversion"]
+                    )
+                # If we parsed a packageid from modmetadata...
+                if mod_metadata.get("packageid"):
+                    # ...check type of packageid, use first packageid parsed
+                    if isinstance(mod_metadata["packageid"], list):
+                        # Loop through the list and find str. If we find one, use it.
+                        for potential_packageid in mod_metadata["packageid"]:
+                            if potential_packageid and isinstance(
+                                potential_packageid, str
+                            ):
+                                mod_metadata["packageid"] = potential_packageid
+                                break
+                    # Normalize package ID in metadata
+                    mod_metadata["packageid"] = mod_metadata["packageid"].lower()
+                else:  # ...otherwise, we don't have one from About.xml, and we can check Steam DB...
+                    # ...this can be needed if a mod depends on a RW generated packageid via built-in hashing mechanism.
+                    if (
+                        pfid
+                        and external_steam_metadata
+                        and external_steam_metadata.get(pfid, {}).get("packageId")
+                    ):
+                        mod_metadata["packageid"] = external_steam_metadata[pfid][
+                            "packageId"
+                        ].lower()
+                    else:
+                        mod_metadata.setdefault("packageid", "missing.packageid")
+                # Track pfid if we parsed one earlier
+                if pfid:  # Make some assumptions if we have a pfid
+                    mod_metadata["publishedfileid"] = pfid
+                    mod_metadata["steam_uri"] = f"steam://url/CommunityFilePage/{pfid}"
+                    mod_metadata["steam_url"] = (
+                        f"https://steamcommunity.com/sharedfiles/filedetails/?id={pfid}"
+                    )
+                # If a mod contains C# assemblies, we want to tag the mod
+                if probe.csharp:
+                    mod_metadata["csharp"] = True
+                # data_source will be used with setIcon later
+                mod_metadata["data_source"] = data_source
+                mod_metadata["folder"] = directory_name
+                # This is overwritten if acf data is parsed for Steam/SteamCMD mods
+                mod_metadata["internal_time_touched"] = int(probe.mtime)
+                mod_metadata["path"] = mod_directory
+                mod_metadata["metadata_file_mtime"] = int(
+                    probe.about_file_mtime or os.path.getmtime(mod_data_path)
+                )
+                mod_metadata["metadata_file_path"] = mod_data_path
+                # Assign our metadata to the UUID
+                metadata[uuid] = mod_metadata
+            else:
+                logger.error(
+                    f"Key <modmetadata> does not exist in this data: {mod_data}"
+                )
+                data_malformed = True
+    # ...or, if we didn't find an About.xml, but we have a RimWorld scenario .rsc to parse...
+    elif invalid_about_file_path_found and scenario_rsc_found:
+        scenario_rsc_file = probe.scenario_file
+        scenario_data_path = str(probe.scenario_file_path)
+        logger.debug(f"Found scenario metadata at: {scenario_data_path}")
+        scenario_data = {}
+        try:
+            # Try to parse .rsc
+            scenario_data = xml_path_to_json(scenario_data_path)
+        except Exception:
+            # If there was an issue parsing the .rsc, track and exit
+            logger.error(
+                f"Unable to parse {scenario_rsc_file} with the exception: {traceback.format_exc()}"
+            )
+            data_malformed = True
+        else:
+            # Case-insensitive `savedscenario` key.
+            scenario_data = {k.lower(): v for k, v in scenario_data.items()}
+            if scenario_data.get("savedscenario", {}).get(
+                "scenario"
+            ):  # If our .rsc metadata has a packageid key
+                # Initialize our dict from the formatted .rsc metadata
+                scenario_metadata = scenario_data["savedscenario"]["scenario"]
+                # Case-insensitive keys.
+                scenario_metadata = {k.lower(): v for k, v in scenario_metadata.items()}
+                scenario_metadata.setdefault("packageid", "scenario.rsc")
+                scenario_metadata["scenario"] = True
+                scenario_metadata.pop("playerfaction", None)
+                scenario_metadata.pop("parts", None)
+                if scenario_data["savedscenario"].get("meta", {}).get("gameVersion"):
+                    scenario_metadata["supportedversions"] = {
+                        "li": scenario_data["savedscenario"]["meta"]["gameVersion"]
+                    }
+                else:
+                    logger.warning(
+                        f"Unable to parse [gameversion] from this scenario [meta] tag: {scenario_data}"
+                    )
+                # Track pfid if we parsed one earlier and don't already have one from metadata
+                if pfid and not scenario_data.get("publishedfileid"):
+                    scenario_data["publishedfileid"] = pfid
+                if scenario_metadata.get(
+                    "publishedfileid"
+                ):  # Make some assumptions if we have a pfid
+                    scenario_metadata["steam_uri"] = (
+                        f"steam://url/CommunityFilePage/{pfid}"
+                    )
+                    scenario_metadata["steam_url"] = (
+                        f"https://steamcommunity.com/sharedfiles/filedetails/?id={pfid}"
+                    )
+                # data_source will be used with setIcon later
+                scenario_metadata["data_source"] = data_source
+                scenario_metadata["folder"] = directory_name
+                scenario_metadata["path"] = mod_directory
+                # This is overwritten if acf data is parsed for Steam/SteamCMD mods
+                scenario_metadata["internal_time_touched"] = int(probe.mtime)
+                scenario_metadata["metadata_file_path"] = scenario_data_path
+                scenario_metadata["metadata_file_mtime"] = int(
+                    os.path.getmtime(scenario_data_path)
+                )
+                # Track source & uuid in case metadata becomes detached
+                scenario_metadata["uuid"] = uuid
+                # Assign our metadata to the UUID
+                metadata[uuid] = scenario_metadata
+            else:
+                logger.error(
+                    f"Key <savedscenario><scenario> does not exist in this data: {scenario_metadata}"
+                )
+                data_malformed = True
+    if (
+        (invalid_about_file_path_found and not scenario_rsc_found) or data_malformed
+    ):  # ...finally, if we don't have any metadata parsed, populate invalid mod entry for visibility
+        logger.debug(f"Invalid dir. Populating invalid mod for path: {mod_directory}")
+        # Assign our metadata to the UUID
+        metadata[uuid] = {
+            "invalid": True,
+            "name": "Invalid item",
+            "packageid": "invalid.item",
+            "authors": "Not found",
+            "description": (
+                "This mod is considered invalid by RimSort (and the RimWorld game)."
+                + "\n\nThis mod does NOT contain an ./About/About.xml and is likely leftover from previous usage."
+                + "\n\nThis can happen sometimes with Steam mods if there are leftover .dds textures or unexpected data."
+            ),
+            "data_source": data_source,
+            "folder": directory_name,
+            "path": mod_directory,
+            # This is overwritten if acf data is parsed for Steam/SteamCMD mods
+            "internal_time_touched": int(probe.mtime),
+            "uuid": uuid,
+        }
+        if pfid:
+            metadata[uuid].update({"publishedfileid": pfid})
+    # Additional checks for local mods
+    if data_source == "local":
+        local_mod_metadata = metadata[uuid]
+        # Check for git repository inside local mods, tag appropriately
+        if probe.git_repo:
+            local_mod_metadata["git_repo"] = True
+        # Check for local mods that are SteamCMD mods, tag appropriately
+        if local_mod_metadata.get("folder") == local_mod_metadata.get(
+            "publishedfileid"
+        ):
+            local_mod_metadata["steamcmd"] = True
+    # Remember where the preview image is so the mod info panel doesn't have to look
+    if probe.preview_file:
+        metadata[uuid]["preview_file_path"] = probe.preview_file_path
+    return metadata[uuid], steamdb_sensitive
+
+
+@dataclass
+class ParsedMod:
+    """
+    Result of parsing a mod directory in a parser process.
+
+    Only plain data is used here so that it can be sent back to the main process.
+    """
+
+    mod_directory: str
+    uuid: str
+    metadata: dict[str, Any]
+    steamdb_sensitive: bool
+    fingerprint: dict[str, tuple[int, int]] | None
+
+
+# Reduced Steam DB made available to each parser process by init_parser_process()
+_process_steam_metadata: Mapping[str, Any] | None = None
+# Compiled Steam DB to load on first use in the parser process, and the
+# publishedfileids removed from it in the main process
+_process_compiled_steam_db: tuple[str, list[str]] | None = None
+
+# Arguments of init_parser_process()
+ParserSteamMetadata = tuple[dict[str, dict[str, str]] | None, str | None, list[str]]
+
+
+def _reduce_steam_metadata(
+    entries: Iterable[tuple[str, Any]],
+) -> dict[str, dict[str, str]]:
+    return {
+        pfid: {
+            key: value
+            for key in ("steamName", "packageId")
+            if isinstance((value := entry.get(key)), str)
+        }
+        for pfid, entry in entries
+        if isinstance(entry, dict)
+    }
+
+
+def steam_metadata_for_parser(
+    external_steam_metadata: Mapping[str, Any] | None,
+) -> ParserSteamMetadata:
+    """
+    Reduce the Steam DB to the values parse_mod_metadata() reads, so that it is
+    cheap to send to parser processes.
+
+    A compiled Steam DB is sent as the path of its file, which each process
+    loads when it first needs it, and the entries changed since it was loaded.
+    Its other entries are not decoded.
+
+    :return: The arguments of init_parser_process()
+    """
+    if not external_steam_metadata:
+        return None, None, []
+    if (
+        isinstance(external_steam_metadata, CompiledSteamDb)
+        and external_steam_metadata.path is not None
+    ):
+        changed, removed = external_steam_metadata.changes()
+        return (
+            _reduce_steam_metadata(changed.items()),
+            str(external_steam_metadata.path),
+            sorted(removed),
+        )
+    return _reduce_steam_metadata(external_steam_metadata.items()), None, []
+
+
+def init_parser_process(
+    steam_metadata: dict[str, dict[str, str]] | None,
+    compiled_steam_db_path: str | None = None,
+    removed_publishedfileids: list[str] | None = None,
+) -> None:
+    """
+    Initializer for parser processes, see steam_metadata_for_parser().
+    """
+    global _process_steam_metadata, _process_compiled_steam_db
+    _process_steam_metadata = steam_metadata
+    _process_compiled_steam_db = (
+        (compiled_steam_db_path, removed_publishedfileids or [])
+        if compiled_steam_db_path is not None
+        else None
+    )
+
+
+def _parser_steam_metadata() -> Mapping[str, Any] | None:
+    """
+    :return: The Steam DB of this parser process, loading the compiled one if needed
+    """
+    global _process_steam_metadata, _process_compiled_steam_db
+    if _process_compiled_steam_db is None:
+        return _process_steam_metadata
+    path, removed_publishedfileids = _process_compiled_steam_db
+    _process_compiled_steam_db = None
+    try:
+        steam_db = open_compiled_steam_db(Path(path))
+    except (OSError, ValueError, msgspec.MsgspecError) as e:
+        logger.warning(f"Unable to load compiled Steam DB {path}: {e}")
+        steam_db = None
+    if steam_db is None:
+        logger.warning(f"Parsing without the compiled Steam DB {path}")
+        return _process_steam_metadata
+    for pfid, entry in (_process_steam_metadata or {}).items():
+        steam_db[pfid] = entry
+    for pfid in removed_publishedfileids:
+        steam_db.pop(pfid, None)
+    _process_steam_metadata = steam_db
+    return _process_steam_metadata
+
+
+def parse_mod_batch(data_source: str, batch: list[tuple[str, str]]) -> list[ParsedMod]:
+    """
+    Parse a batch of (mod directory, uuid) pairs. Runs inside a parser process.
+
+    Directories that fail to parse are logged and left out of the result.
+    """
+    results = []
+    for mod_directory, uuid in batch:
+        try:
+            probe = probe_mod_directory(mod_directory)
+            metadata, steamdb_sensitive = parse_mod_metadata(
+                data_source, mod_directory, uuid, _parser_steam_metadata(), probe
+            )
+        except Exception as e:
+            error_message = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
+            logger.error(f"ERROR: Unable to parse {mod_directory} {error_message}")
+            continue
+        try:
+            fingerprint = probe.fingerprint(metadata.get("metadata_file_path"))
+        except OSError:
+            fingerprint = None
+        results.append(
+            ParsedMod(mod_directory, uuid, metadata, steamdb_sensitive, fingerprint)
+        )
+    return results
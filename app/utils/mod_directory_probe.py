@@ -0,0 +1,163 @@
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+
+@dataclass
+class ModDirectoryProbe:
+    """
+    Everything about a mod directory's layout that metadata parsing needs.
+
+    Collected by probe_mod_directory() in a single walk, so that parsing,
+    C# detection, cache fingerprinting and the preview lookup do not each
+    list the same folders again. File and folder names are the names found
+    on disk, matched case-insensitively.
+    """
+
+    path: str
+    # st_mtime of the mod directory itself
+    mtime: float
+    about_folder: str | None = None
+    about_file: str | None = None
+    # st_mtime of About.xml, if found
+    about_file_mtime: float | None = None
+    pfid_file: str | None = None
+    preview_file: str | None = None
+    # First scenario .rsc found in the mod directory
+    scenario_file: str | None = None
+    csharp: bool = False
+    git_repo: bool = False
+    # Path -> (st_mtime_ns, st_size) for the files and folders the parse depends on
+    stats: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    def _about_path(self, name: str | None) -> str | None:
+        if self.about_folder is None or name is None:
+            return None
+        return str(Path(self.path) / self.about_folder / name)
+
+    @property
+    def about_file_path(self) -> str | None:
+        return self._about_path(self.about_file)
+
+    @property
+    def pfid_file_path(self) -> str | None:
+        return self._about_path(self.pfid_file)
+
+    @property
+    def preview_file_path(self) -> str | None:
+        return self._about_path(self.preview_file)
+
+    @property
+    def scenario_file_path(self) -> str | None:
+        if self.scenario_file is None:
+            return None
+        return str(Path(self.path) / self.scenario_file)
+
+    def fingerprint(
+        self, metadata_file_path: str | None = None
+    ) -> dict[str, tuple[int, int]]:
+        """
+        Fingerprint used by MetadataCache to tell whether the mod changed.
+
+        :param metadata_file_path: Path to the metadata file that was parsed, if any
+        :return: Mapping of path -> (st_mtime_ns, st_size)
+        """
+        fingerprint = dict(self.stats)
+        if metadata_file_path and metadata_file_path not in fingerprint:
+            stat = os.stat(metadata_file_path)
+            fingerprint[metadata_file_path] = (stat.st_mtime_ns, stat.st_size)
+        return fingerprint
+
+
+def _stat_key(entry: os.DirEntry[str]) -> tuple[int, int]:
+    stat = entry.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _contains_dll(assemblies_path: str) -> bool:
+    with os.scandir(assemblies_path) as it:
+        return any(entry.name.endswith((".dll", ".DLL")) for entry in it)
+
+
+def probe_mod_directory(mod_directory: str) -> ModDirectoryProbe:
+    """
+    Walk a mod directory once and collect its layout.
+
+    The mod folder and its About folder are listed once each. Assemblies
+    folders are only listed when present; version subfolders (e.g. 1.5/Assemblies)
+    are only checked when there is no top level Assemblies folder. The subfolders
+    and their Assemblies folders are then part of the fingerprint, so that adding
+    or removing an assembly is noticed.
+
+    :param mod_directory: Path to the mod directory
+    :return: The collected ModDirectoryProbe
+    """
+    stat = os.stat(mod_directory)
+    probe = ModDirectoryProbe(path=mod_directory, mtime=stat.st_mtime)
+    probe.stats[mod_directory] = (stat.st_mtime_ns, stat.st_size)
+
+    about_entry = None
+    assemblies_entry = None
+    subfolders: list[os.DirEntry[str]] = []
+    with os.scandir(mod_directory) as it:
+        for entry in it:
+            name = entry.name.lower()
+            if entry.name == ".git":
+                probe.git_repo = True
+            elif entry.is_dir():
+                if name == "about" and about_entry is None:
+                    about_entry = entry
+                elif name == "assemblies" and assemblies_entry is None:
+                    assemblies_entry = entry
+                subfolders.append(entry)
+            elif name.endswith(".rsc") and probe.scenario_file is None:
+                probe.scenario_file = entry.name
+
+    if about_entry is not None:
+        probe.about_folder = about_entry.name
+        probe.stats[about_entry.path] = _stat_key(about_entry)
+        with os.scandir(about_entry.path) as it:
+            for entry in it:
+                name = entry.name.lower()
+                if name not in ("about.xml", "publishedfileid.txt", "preview.png"):
+                    continue
+                if not entry.is_file():
+                    continue
+                if name == "about.xml" and probe.about_file is None:
+                    probe.about_file = entry.name
+                    about_stat = entry.stat()
+                    probe.about_file_mtime = about_stat.st_mtime
+                    probe.stats[entry.path] = (
+                        about_stat.st_mtime_ns,
+                        about_stat.st_size,
+                    )
+                elif name == "publishedfileid.txt" and probe.pfid_file is None:
+                    probe.pfid_file = entry.name
+                    probe.stats[entry.path] = _stat_key(entry)
+                elif name == "preview.png" and probe.preview_file is None:
+                    probe.preview_file = entry.name
+
+    if assemblies_entry is not None:
+        probe.stats[assemblies_entry.path] = _stat_key(assemblies_entry)
+        try:
+            probe.csharp = _contains_dll(assemblies_entry.path)
+        except OSError as e:
+            logger.error(f"Failed to list directory {assemblies_entry.path}: {e}")
+    else:
+        # No top level Assemblies folder, look for versioned ones instead
+        for subfolder in subfolders:
+            try:
+                probe.stats[subfolder.path] = _stat_key(subfolder)
+                assemblies_path = os.path.join(subfolder.path, "Assemblies")
+                assemblies_stat = os.stat(assemblies_path)
+                probe.stats[assemblies_path] = (
+                    assemblies_stat.st_mtime_ns,
+                    assemblies_stat.st_size,
+                )
+                if not probe.csharp:
+                    probe.csharp = _contains_dll(assemblies_path)
+            except OSError:
+                continue
+    return probe
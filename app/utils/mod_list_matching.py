@@ -0,0 +1,139 @@
+"""
+Match the active mods list of a ModsConfig.xml or mod list file against the
+installed mods. Kept free of Qt, so that the headless CLI picks the same mods as
+the app.
+"""
+
+from typing import Any, Iterable
+
+from loguru import logger
+from natsort import natsorted
+
+
+def select_duplicate_mod(
+    all_mods: dict[str, Any], duplicate_uuids: Iterable[str], prefer_workshop: bool
+) -> str | None:
+    """
+    Choose which of several installed copies of a mod to use.
+
+    :param all_mods: Installed mod metadata, keyed by uuid
+    :param duplicate_uuids: The uuids of the copies
+    :param prefer_workshop: Whether the mods list asked for the Steam copy with a
+    _steam suffix
+    :return: The uuid of the copy from the first data source by priority, the first
+    by natural path order within it, or None if no copy is from those sources
+    """
+    sources_order = (
+        # Prioritize workshop duplicate if _steam suffix used...
+        ["workshop", "local"]
+        if prefer_workshop
+        # ... otherwise, we use standard data source priority if suffix not used
+        else ["expansion", "local", "workshop"]
+    )
+    for source in sources_order:
+        paths_to_uuid = {
+            all_mods[uuid]["path"]: uuid
+            for uuid in duplicate_uuids
+            if source in all_mods[uuid]["data_source"]
+        }
+        if paths_to_uuid:
+            # Sort duplicate mod paths from current source priority using natsort
+            return paths_to_uuid[natsorted(paths_to_uuid.keys())[0]]
+        logger.debug(f"No paths returned for {source}")
+    return None
+
+
+def get_mods_from_package_ids(
+    all_mods: dict[str, Any], package_ids_to_import: list[str]
+) -> tuple[list[str], list[str], dict[str, Any], list[str]]:
+    """
+    Match a list of package ids from a RimWorld mods list against the installed mods.
+
+    Runs in linear time: installed mods are indexed by packageid once, and each
+    package id in the list is then resolved with dict lookups.
+
+    :param all_mods: Installed mod metadata, keyed by uuid
+    :param package_ids_to_import: Package ids in load order, optionally with a _steam suffix
+    :return: a tuple which contains the active mods uuids, inactive mods uuids,
+    duplicate mods dict, and missing mods list
+    """
+    active_mods_uuids: list[str] = []
+    duplicates_processed: set[str] = set()
+    populated_mods: set[str] = set()
+    to_populate = []
+    # Index installed mods by packageid, keeping the order of all_mods
+    packageid_to_uuids: dict[str, list[str]] = {}
+    for mod_uuid, mod_data in all_mods.items():
+        packageid_to_uuids.setdefault(mod_data["packageid"], []).append(mod_uuid)
+    # Calculate duplicate mods (SCHEMA: {str packageid: list[str duplicate uuids]})
+    duplicate_mods: dict[str, Any] = {
+        k: v for k, v in packageid_to_uuids.items() if len(v) > 1
+    }
+    # Position of each mod in all_mods, used to merge matches in a stable order
+    mod_positions: dict[str, int] = {}
+    # Parse the ModsConfig.xml data
+    logger.info("Generating active mod list")
+    for (
+        package_id
+    ) in package_ids_to_import:  # Go through active mods, handle packageids
+        package_id_normalized = package_id.lower()
+        package_id_steam_suffix = "_steam"
+        package_id_normalized_stripped = package_id_normalized.replace(
+            package_id_steam_suffix, ""
+        )
+        # bool to determine whether or not _steam suffix present in ModsConfig entry
+        is_steam = package_id_steam_suffix in package_id_normalized
+        # Determine target_id based on whether suffix exists
+        target_id = (
+            package_id_normalized_stripped
+            if is_steam  # Use suffix if _steam in our ModsConfig entry
+            else package_id_normalized
+        )
+        # Append our packageid to list, used to calculate missing mods later
+        to_populate.append(target_id)
+        # Find mods that match with or without _steam present
+        matching_uuids = packageid_to_uuids.get(package_id_normalized, [])
+        if package_id_normalized_stripped != package_id_normalized:
+            stripped_uuids = packageid_to_uuids.get(package_id_normalized_stripped)
+            if stripped_uuids:
+                if not mod_positions:
+                    mod_positions = {uuid: i for i, uuid in enumerate(all_mods)}
+                matching_uuids = sorted(
+                    matching_uuids + stripped_uuids, key=mod_positions.__getitem__
+                )
+        if not matching_uuids:
+            continue
+        # Add non-duplicates to active mods
+        if target_id not in duplicate_mods:
+            populated_mods.add(target_id)
+            active_mods_uuids.extend(matching_uuids)
+            continue
+        # Otherwise, duplicate needs calculated
+        if target_id in duplicates_processed:
+            # Skip duplicates that have already been processed
+            continue
+        logger.info(f"Found duplicate mod present in active mods list: {target_id}")
+        calculated_duplicate_uuid = select_duplicate_mod(
+            all_mods, duplicate_mods[target_id], prefer_workshop=is_steam
+        )
+        if calculated_duplicate_uuid is not None:
+            logger.debug(
+                f"Using duplicate mod for {target_id}: {all_mods[calculated_duplicate_uuid]['path']}"
+            )
+            populated_mods.add(target_id)
+            duplicates_processed.add(target_id)
+            active_mods_uuids.append(calculated_duplicate_uuid)
+    # Calculate missing mods from the difference
+    missing_mods = list(set(to_populate) - populated_mods)
+    logger.debug(f"Generated active mods dict with {len(active_mods_uuids)} mods")
+    # Get the inactive mods by subtracting active mods from workshop + expansions
+    logger.info("Generating inactive mod list")
+    active_mods_uuids_set = set(active_mods_uuids)
+    inactive_mods_uuids = [
+        uuid for uuid in all_mods.keys() if uuid not in active_mods_uuids_set
+    ]
+    logger.info(f"# active mods: {len(active_mods_uuids)}")
+    logger.info(f"# inactive mods: {len(inactive_mods_uuids)}")
+    logger.info(f"# duplicate mods: {len(duplicate_mods)}")
+    logger.info(f"# missing mods: {len(missing_mods)}")
+    return active_mods_uuids, inactive_mods_uuids, duplicate_mods, missing_mods
@@ -0,0 +1,65 @@
+from bisect import bisect_right
+from typing import Any
+
+STEAM_SUFFIX = "_steam"
+
+
+def inactive_sort_key(mod_data: dict[str, Any]) -> str:
+    """
+    The key the inactive mods list is sorted by, see uuid_to_mod_name().
+    """
+    name = mod_data.get("name")
+    return name.lower() if name is not None else "# unnamed mod"
+
+
+class ModListStream:
+    """
+    Places mods into the active and inactive mod lists as they are parsed,
+    before every mod is known.
+
+    Mods in the active mods list of ModsConfig.xml go into the active list, in
+    its load order, and the other mods into the inactive list, by name. Only
+    the first mod found for a package id is made active. Choosing between
+    duplicates, missing mods and dependencies are left to a final pass, once
+    every mod has been parsed (see get_mods_from_package_ids()).
+    """
+
+    def __init__(self, active_package_ids: list[str]) -> None:
+        """
+        :param active_package_ids: Package ids of the active mods, in load
+            order, optionally with a _steam suffix
+        """
+        # packageid -> position in the active mods list
+        self.active_positions: dict[str, int] = {}
+        for position, package_id in enumerate(active_package_ids):
+            normalized = package_id.lower().removesuffix(STEAM_SUFFIX)
+            self.active_positions.setdefault(normalized, position)
+        # Sort keys of the mods placed in each list, in list order
+        self.active_keys: list[int] = []
+        self.inactive_keys: list[str] = []
+        self.placed_uuids: set[str] = set()
+        self.active_package_ids: set[str] = set()
+
+    def place(self, uuid: str, mod_data: dict[str, Any]) -> tuple[bool, int] | None:
+        """
+        Place a mod into the lists.
+
+        :param uuid: The uuid of the mod
+        :param mod_data: The mod's metadata
+        :return: Whether the mod goes into the active list and its row there,
+            or None if the mod was already placed
+        """
+        if uuid in self.placed_uuids:
+            return None
+        self.placed_uuids.add(uuid)
+        package_id = str(mod_data.get("packageid", "")).lower()
+        position = self.active_positions.get(package_id)
+        if position is not None and package_id not in self.active_package_ids:
+            self.active_package_ids.add(package_id)
+            row = bisect_right(self.active_keys, position)
+            self.active_keys.insert(row, position)
+            return True, row
+        key = inactive_sort_key(mod_data)
+        row = bisect_right(self.inactive_keys, key)
+        self.inactive_keys.insert(row, key)
+        return False, row
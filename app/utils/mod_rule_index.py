@@ -0,0 +1,198 @@
+from bisect import bisect_left
+from typing import Any, Iterable
+
+from app.utils.constants import KNOWN_MOD_REPLACEMENTS
+
+
+def rule_package_ids(mod_data: dict[str, Any]) -> set[str]:
+    """
+    The package ids that the dependencies (and their known replacements),
+    incompatibilities and explicit load order rules of a mod refer to.
+
+    :param mod_data: The mod's metadata
+    :return: Package ids whose presence or position in a mod list can change
+        the errors and warnings of the mod
+    """
+    package_ids: set[str] = set()
+    for dependency in mod_data.get("dependencies", []):
+        package_ids.add(dependency)
+        package_ids.update(KNOWN_MOD_REPLACEMENTS.get(dependency, set()))
+    package_ids.update(mod_data.get("incompatibilities", []))
+    for key in ("loadTheseBefore", "loadTheseAfter"):
+        package_ids.update(
+            package_id for package_id, explicit in mod_data.get(key, []) if explicit
+        )
+    return package_ids
+
+
+def _longest_increasing_subsequence(values: list[int]) -> set[int]:
+    """
+    :return: The indexes of a longest strictly increasing subsequence of values
+    """
+    tails: list[int] = []
+    tail_indexes: list[int] = []
+    previous = [-1] * len(values)
+    for index, value in enumerate(values):
+        length = bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_indexes.append(index)
+        else:
+            tails[length] = value
+            tail_indexes[length] = index
+        previous[index] = tail_indexes[length - 1] if length else -1
+    indexes = set()
+    index = tail_indexes[-1] if tail_indexes else -1
+    while index != -1:
+        indexes.add(index)
+        index = previous[index]
+    return indexes
+
+
+class ModListRuleIndex:
+    """
+    Tracks which mods of a mod list need their errors and warnings recalculated
+    when the list changes.
+
+    The errors and warnings of a mod depend on which mods its rules refer to are
+    in the list, and on where they are relative to it. So when mods are added,
+    moved or removed, only those mods, the mods whose rules refer to their
+    package ids and the other mods with the same package ids need to be
+    recalculated. Mods that keep their order relative to each other when others
+    move around them are not considered moved.
+
+    The rules of a mod are read when it is added to the list. Call
+    :meth:`invalidate` without arguments when metadata changes, to start over.
+    """
+
+    def __init__(self) -> None:
+        # The uuids of the mods, in list order
+        self.uuids: list[str] = []
+        # uuid -> list position
+        self.positions: dict[str, int] = {}
+        # packageid -> uuid of the last mod in the list with the packageid
+        self.packageid_to_uuid: dict[str, str] = {}
+        self.packageid_to_uuids: dict[str, set[str]] = {}
+        # packageid -> uuids of the mods whose rules refer to it
+        self.dependents: dict[str, set[str]] = {}
+        # uuid -> (packageid, package ids its rules refer to)
+        self._indexed: dict[str, tuple[str, set[str]]] = {}
+        # uuids to recalculate on the next update, or None for every mod
+        self._invalid: set[str] | None = None
+
+    def invalidate(self, uuids: Iterable[str] | None = None) -> None:
+        """
+        Recalculate the given mods on the next :meth:`update`, e.g. when their
+        warnings are toggled. Without uuids, forget everything and recalculate
+        every mod, re-reading their rules.
+        """
+        if uuids is None:
+            self._invalid = None
+        elif self._invalid is not None:
+            self._invalid.update(uuids)
+
+    def _add(self, uuid: str, mod_data: dict[str, Any]) -> None:
+        package_id = mod_data["packageid"]
+        package_ids = rule_package_ids(mod_data)
+        self._indexed[uuid] = (package_id, package_ids)
+        self.packageid_to_uuids.setdefault(package_id, set()).add(uuid)
+        for rule_package_id in package_ids:
+            self.dependents.setdefault(rule_package_id, set()).add(uuid)
+
+    @staticmethod
+    def _discard(index: dict[str, set[str]], key: str, uuid: str) -> None:
+        uuids = index.get(key)
+        if uuids is not None:
+            uuids.discard(uuid)
+            if not uuids:
+                del index[key]
+
+    def _remove(self, uuid: str) -> None:
+        package_id, package_ids = self._indexed.pop(uuid)
+        self._discard(self.packageid_to_uuids, package_id, uuid)
+        for rule_package_id in package_ids:
+            self._discard(self.dependents, rule_package_id, uuid)
+
+    def _changes(self, uuids: list[str]) -> tuple[set[str], set[str], set[str]]:
+        """
+        :return: The added, removed and moved uuids, from the current list to uuids
+        """
+        old = self.uuids
+        # Skip the unchanged start and end of the list
+        start = 0
+        end = min(len(old), len(uuids))
+        while start < end and old[start] == uuids[start]:
+            start += 1
+        old_end = len(old)
+        new_end = len(uuids)
+        while (
+            old_end > start
+            and new_end > start
+            and old[old_end - 1] == uuids[new_end - 1]
+        ):
+            old_end -= 1
+            new_end -= 1
+        old_window = old[start:old_end]
+        new_window = uuids[start:new_end]
+        old_set = set(old_window)
+        new_set = set(new_window)
+        # Mods that kept their order relative to the most other mods did not move
+        kept = [uuid for uuid in new_window if uuid in old_set]
+        unmoved = _longest_increasing_subsequence(
+            [self.positions[uuid] for uuid in kept]
+        )
+        moved = {uuid for index, uuid in enumerate(kept) if index not in unmoved}
+        return new_set - old_set, old_set - new_set, moved
+
+    def update(
+        self, uuids: list[str], internal_local_metadata: dict[str, Any]
+    ) -> list[str]:
+        """
+        Update the index to the mods of the list.
+
+        :param uuids: The uuids of the mods in the list, in list order
+        :param internal_local_metadata: uuid -> mod metadata
+        :return: The uuids of the mods to recalculate, in list order
+        """
+        removed: set[str] = set()
+        moved: set[str] = set()
+        if self._invalid is None:
+            self._indexed = {}
+            self.packageid_to_uuids = {}
+            self.dependents = {}
+            added = set(uuids)
+            dirty = set(uuids)
+        else:
+            added, removed, moved = self._changes(uuids)
+            dirty = added | moved | self._invalid
+        # Mods that left the list still affect the mods that refer to them
+        changed_package_ids = {self._indexed[uuid][0] for uuid in removed | moved}
+        for uuid in removed:
+            self._remove(uuid)
+        for uuid in added:
+            self._add(uuid, internal_local_metadata[uuid])
+            changed_package_ids.add(self._indexed[uuid][0])
+        self.uuids = list(uuids)
+        self.positions = {uuid: index for index, uuid in enumerate(uuids)}
+        positions = self.positions
+        if self._invalid is None:
+            self.packageid_to_uuid = {self._indexed[uuid][0]: uuid for uuid in uuids}
+        else:
+            for package_id in changed_package_ids:
+                if package_id in self.packageid_to_uuids:
+                    self.packageid_to_uuid[package_id] = max(
+                        self.packageid_to_uuids[package_id], key=positions.__getitem__
+                    )
+                else:
+                    self.packageid_to_uuid.pop(package_id, None)
+            for package_id in changed_package_ids:
+                dirty.update(self.dependents.get(package_id, ()))
+                dirty.update(self.packageid_to_uuids.get(package_id, ()))
+            # Mods with the same packageid share their ignored warnings
+            for uuid in list(dirty):
+                if uuid in positions:
+                    dirty.update(self.packageid_to_uuids[self._indexed[uuid][0]])
+        self._invalid = set()
+        return sorted(
+            (uuid for uuid in dirty if uuid in positions), key=positions.__getitem__
+        )
@@ -0,0 +1,158 @@
+from operator import attrgetter
+from typing import Any, NamedTuple
+
+# Search filter combo box text -> metadata key searched
+SEARCH_FIELDS: dict[str, str] = {
+    "Name": "name",
+    "PackageId": "packageid",
+    "Author(s)": "authors",
+    "PublishedFileId": "publishedfileid",
+}
+
+
+class ModSearchRow(NamedTuple):
+    """
+    The metadata of a mod used to search and filter a mod list. Searched values
+    are lowercased, and None when the mod does not have them.
+    """
+
+    name: str | None
+    packageid: str | None
+    authors: str | None
+    publishedfileid: str | None
+    data_source: Any
+    git_repo: bool
+    steamcmd: bool
+    csharp: bool
+
+
+class ModSearchTable:
+    """
+    Search table of a mod list: one :class:`ModSearchRow` per mod, in list order.
+
+    Rows are built once per mod and reused until its metadata is replaced or
+    :meth:`invalidate` is called, so searching does not read the metadata of
+    every mod on every keystroke. When a search pattern extends the previous
+    one, only the mods that matched the previous pattern are searched again.
+    """
+
+    def __init__(self) -> None:
+        self.uuids: list[str] = []
+        self.rows: list[ModSearchRow] = []
+        # uuid -> (metadata the row was built from, row)
+        self._rows: dict[str, tuple[dict[str, Any], ModSearchRow]] = {}
+        # Searched field, pattern and indexes of the matching rows of the last search
+        self._last_search: tuple[str, str, list[int]] | None = None
+
+    @staticmethod
+    def _row(metadata: dict[str, Any]) -> ModSearchRow:
+        def searched(key: str) -> str | None:
+            value = metadata.get(key)
+            return str(value).lower() if value else None
+
+        return ModSearchRow(
+            name=searched("name"),
+            packageid=searched("packageid"),
+            authors=searched("authors"),
+            publishedfileid=searched("publishedfileid"),
+            data_source=metadata.get("data_source"),
+            git_repo=bool(metadata.get("git_repo")),
+            steamcmd=bool(metadata.get("steamcmd")),
+            csharp=bool(metadata.get("csharp")),
+        )
+
+    def invalidate(self, uuid: str) -> None:
+        """
+        Rebuild the row of a mod on the next :meth:`update`, for when its
+        metadata changed in place.
+        """
+        self._rows.pop(uuid, None)
+
+    def update(self, uuids: list[str], internal_local_metadata: dict[str, Any]) -> None:
+        """
+        Update the table to the mods of the list, in list order.
+
+        :param uuids: The uuids of the mods in the list
+        :param internal_local_metadata: uuid -> mod metadata
+        """
+        changed = uuids != self.uuids
+        rows = {}
+        for uuid in uuids:
+            metadata = internal_local_metadata[uuid]
+            entry = self._rows.get(uuid)
+            if entry is None or entry[0] is not metadata:
+                entry = (metadata, self._row(metadata))
+                changed = True
+            rows[uuid] = entry
+        self._rows = rows
+        if changed:
+            self.uuids = list(uuids)
+            self.rows = [row for _, row in rows.values()]
+            self._last_search = None
+
+    def search(self, search_field: str, pattern: str) -> list[bool]:
+        """
+        Search a column of the table for a pattern, case insensitively. Mods
+        without a value for the column always match.
+
+        :param search_field: The metadata key to search, see SEARCH_FIELDS
+        :param pattern: The pattern to search for
+        :return: For each row, whether the mod does not match the pattern
+        """
+        rows = self.rows
+        if not pattern:
+            self._last_search = None
+            return [False] * len(rows)
+        value_of = attrgetter(search_field)
+        pattern = pattern.lower()
+        candidates: range | list[int] = range(len(rows))
+        if self._last_search is not None:
+            last_field, last_pattern, last_matches = self._last_search
+            # Mods that did not match a pattern do not match a longer one either
+            if last_field == search_field and pattern.startswith(last_pattern):
+                candidates = last_matches
+        matches = [
+            index
+            for index in candidates
+            if not (value := value_of(rows[index])) or pattern in value
+        ]
+        self._last_search = (search_field, pattern, matches)
+        mismatches = [True] * len(rows)
+        for index in matches:
+            mismatches[index] = False
+        return mismatches
+
+    def filter(
+        self,
+        search_field: str,
+        pattern: str,
+        source_filter: str,
+        type_filter_index: int,
+    ) -> list[bool]:
+        """
+        Apply the search and the data source and mod type filters of a mod list.
+
+        :param search_field: The metadata key to search, see SEARCH_FIELDS
+        :param pattern: The pattern to search for
+        :param source_filter: The data source filter, see SEARCH_DATA_SOURCE_FILTER_INDEXES
+        :param type_filter_index: 0 for all mods, 1 for C# mods only, 2 for XML mods only
+        :return: For each row, whether the mod is filtered out
+        """
+        filtered = self.search(search_field, pattern)
+        for index, row in enumerate(self.rows):
+            if filtered[index]:
+                continue
+            if source_filter == "all":
+                item_filtered = False
+            elif source_filter == "git_repo":
+                item_filtered = not row.git_repo
+            elif source_filter == "steamcmd":
+                item_filtered = not row.steamcmd
+            else:
+                item_filtered = source_filter != row.data_source
+            if type_filter_index == 1 and not row.csharp:
+                item_filtered = True
+            elif type_filter_index == 2 and row.csharp:
+                item_filtered = True
+            filtered[index] = item_filtered
+        return filtered
@@ -0,0 +1,202 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable
+
+from loguru import logger
+from PySide6.QtCore import QObject, QRunnable, Qt, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageReader, QImageWriter
+
+# Previews are scaled down to fit in a square of this size
+PREVIEW_THUMBNAIL_SIZE = 640
+# Number of decoded previews kept in memory
+PREVIEW_MEMORY_CACHE_SIZE = 64
+
+
+def preview_thumbnail_path(
+    image_path: str, mtime_ns: int, size: int, thumbnail_folder: Path
+) -> Path:
+    """
+    :return: The path of the cached thumbnail of a preview image, for the
+        given modification time of the image and thumbnail size
+    """
+    digest = hashlib.sha1(f"{image_path}\0{mtime_ns}\0{size}".encode()).hexdigest()
+    return thumbnail_folder / f"{digest}.png"
+
+
+def load_preview_thumbnail(
+    image_path: str,
+    thumbnail_folder: Path,
+    size: int = PREVIEW_THUMBNAIL_SIZE,
+) -> QImage:
+    """
+    Read a preview image scaled down to fit in a size x size square.
+
+    The scaled image is cached as a PNG in thumbnail_folder, keyed by the path
+    and modification time of the image, so that large previews are only
+    decoded once. Uses QImage rather than QPixmap, so it can be called off the
+    GUI thread.
+
+    :param image_path: Path to the preview image
+    :param thumbnail_folder: Folder of the cached thumbnails
+    :param size: Largest width and height of the thumbnail
+    :return: The thumbnail, a null image if the preview could not be read
+    """
+    try:
+        mtime_ns = os.stat(image_path).st_mtime_ns
+    except OSError:
+        return QImage()
+    thumbnail_path = preview_thumbnail_path(
+        image_path, mtime_ns, size, thumbnail_folder
+    )
+    if thumbnail_path.exists():
+        image = QImage(str(thumbnail_path))
+        if not image.isNull():
+            return image
+
+    reader = QImageReader(image_path)
+    reader.setAutoTransform(True)
+    image_size = reader.size()
+    if image_size.isValid() and (
+        image_size.width() > size or image_size.height() > size
+    ):
+        reader.setScaledSize(
+            image_size.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio)
+        )
+    image = reader.read()
+    if image.isNull():
+        logger.warning(
+            f"Unable to read preview image {image_path}: {reader.errorString()}"
+        )
+        return image
+
+    # Write to a temporary file first, other threads may read the thumbnail
+    temp_path = thumbnail_path.with_name(
+        f"{thumbnail_path.stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        thumbnail_folder.mkdir(parents=True, exist_ok=True)
+        writer = QImageWriter(str(temp_path), b"png")
+        if writer.write(image):
+            os.replace(temp_path, thumbnail_path)
+        else:
+            logger.warning(
+                f"Unable to write preview thumbnail {thumbnail_path}: {writer.errorString()}"
+            )
+    except OSError as e:
+        logger.warning(f"Unable to write preview thumbnail {thumbnail_path}: {e}")
+    return image
+
+
+class PreviewLoader(QObject):
+    """
+    Loads mod preview images on a thread pool, see load_preview_thumbnail(),
+    and keeps the most recently used ones in memory.
+
+    Each call to :meth:`request` cancels the loads of the previous request that
+    have not started yet, so moving through a mod list only loads the previews
+    of the mods that are (or are about to be) selected. Previews that are
+    being loaded are not loaded again.
+    """
+
+    preview_loaded = Signal(str, QImage)
+    # (image path, st_mtime_ns), image
+    _thumbnail_loaded = Signal(object, QImage)
+
+    def __init__(
+        self,
+        thumbnail_folder: Path,
+        memory_cache_size: int = PREVIEW_MEMORY_CACHE_SIZE,
+    ) -> None:
+        super().__init__()
+        self.thumbnail_folder = thumbnail_folder
+        self.memory_cache_size = memory_cache_size
+        # (image path, st_mtime_ns) -> image, least recently used first
+        self.images: OrderedDict[tuple[str, int], QImage] = OrderedDict()
+        self.threadpool = QThreadPool(self)
+        self.threadpool.setMaxThreadCount(2)
+        # Image paths of the latest request, and of the previews being loaded
+        self._wanted: set[str] = set()
+        self._loading: set[str] = set()
+        self._lock = threading.Lock()
+        # Emitted from the tasks, received on the thread of the loader
+        self._thumbnail_loaded.connect(self._on_thumbnail_loaded)
+
+    @staticmethod
+    def _key(image_path: str) -> tuple[str, int] | None:
+        try:
+            return image_path, os.stat(image_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def request(
+        self, image_path: str | None, prefetch_paths: Iterable[str] = ()
+    ) -> QImage | None:
+        """
+        Load a preview image, and prefetch others in the background.
+
+        :param image_path: Path to the preview image to show, if any
+        :param prefetch_paths: Paths to preview images likely to be shown next,
+            e.g. those of the neighbouring mods
+        :return: The preview if it is in memory. Otherwise, preview_loaded is
+            emitted with the path and image once it is loaded.
+        """
+        image = None
+        paths = []
+        for path in dict.fromkeys([image_path, *prefetch_paths]):
+            if not path:
+                continue
+            key = self._key(path)
+            if key is not None and key in self.images:
+                self.images.move_to_end(key)
+                if path == image_path:
+                    image = self.images[key]
+            else:
+                paths.append(path)
+        with self._lock:
+            self._wanted = set(paths)
+        # Cancel the loads of the previous request that have not started
+        self.threadpool.clear()
+        for priority, path in enumerate(reversed(paths)):
+            self.threadpool.start(_PreviewTask(self, path), priority)
+        return image
+
+    def _start_loading(self, image_path: str) -> bool:
+        """
+        :return: Whether a task should load the preview: it is still wanted,
+            and not being loaded by another task
+        """
+        with self._lock:
+            if image_path not in self._wanted or image_path in self._loading:
+                return False
+            self._loading.add(image_path)
+            return True
+
+    def _on_thumbnail_loaded(self, key: tuple[str, int], image: QImage) -> None:
+        with self._lock:
+            self._loading.discard(key[0])
+        self.images[key] = image
+        self.images.move_to_end(key)
+        while len(self.images) > self.memory_cache_size:
+            self.images.popitem(last=False)
+        self.preview_loaded.emit(key[0], image)
+
+
+class _PreviewTask(QRunnable):
+    def __init__(self, loader: PreviewLoader, image_path: str) -> None:
+        super().__init__()
+        self.loader = loader
+        self.image_path = image_path
+
+    def run(self) -> None:
+        # Skip loads a newer request no longer needs
+        if not self.loader._start_loading(self.image_path):
+            return
+        try:
+            mtime_ns = os.stat(self.image_path).st_mtime_ns
+        except OSError:
+            mtime_ns = 0
+        image = load_preview_thumbnail(self.image_path, self.loader.thumbnail_folder)
+        self.loader._thumbnail_loaded.emit((self.image_path, mtime_ns), image)
@@ -588,8 +588,6 @@ class SteamBrowser(QWidget):
 
     def _is_mod_installed(self, publishedfileid: str) -> bool:
         """Check if a mod is installed by looking through local and workshop folders"""
-        # check all mods in internal metadata
-        for metadata in self.metadata_manager.internal_local_metadata.values():
-            if metadata.get("publishedfileid") == publishedfileid:
-                return True
-        return False
+        return bool(
+            self.metadata_manager.mod_index.uuids_by_publishedfileid(publishedfileid)
+        )
@@ -0,0 +1,339 @@
+"""
+Reader and writer for Valve's text KeyValues (VDF) format, used by Steam
+client / SteamCMD .acf files.
+
+steamfiles parses a decoded str line by line in Python. Here, files as Steam
+writes them (every token quoted, no escapes) are split on their quotes and
+handed to the json module, so that Python only looks at the few distinct
+separators between strings. Anything else goes through a regular expression
+tokenizer. The writer can also replace or remove single entries of a section,
+copying the rest of the file as is.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Mapping, Sequence, cast
+
+_STRING = rb'"([^"\\]*(?:\\.[^"\\]*)*)"'
+# A quoted string, a brace, a // comment or an unquoted string
+_TOKEN = re.compile(_STRING + rb'|([{}])|//[^\n]*|([^\s{}"]+)')
+# As _TOKEN, matching a quoted key and its section as one token if the section
+# has no nested sections, e.g. the entry of a mod in an .acf file
+_ENTRY_TOKEN = re.compile(
+    _STRING
+    + rb'(\s*\{[^{}"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^{}"]*)*\})?|([{}])|//[^\n]*|([^\s{}"]+)'
+)
+_ESCAPE = re.compile(rb"\\(.)", re.DOTALL)
+_ESCAPES = {b"n": b"\n", b"t": b"\t", b"\\": b"\\", b'"': b'"'}
+
+
+def _unescape(match: re.Match[bytes]) -> bytes:
+    return _ESCAPES.get(match.group(1), match.group(0))
+
+
+def _decode(token: bytes) -> str:
+    if b"\\" in token:
+        token = _ESCAPE.sub(_unescape, token)
+    return token.decode("utf-8", errors="replace")
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _json_separator(separator: str) -> str | None:
+    """
+    Translate the text between two strings of VDF data to JSON.
+
+    Whitespace without a newline separates a key from its value, and with a
+    newline a value from the next key, as Steam writes them. Other layouts
+    make invalid JSON, and are left to the tokenizer.
+
+    :return: The JSON separator, or None if the text is not whitespace and braces
+    """
+    translated = []
+    previous = "string"
+    for char in separator:
+        if char == "{":
+            if previous != "string":
+                return None
+            translated.append(":{")
+            previous = char
+        elif char == "}":
+            translated.append("}")
+            previous = char
+        elif not char.isspace():
+            return None
+    if previous == "string":
+        return "," if "\n" in separator else ":"
+    if previous == "}":
+        translated.append(",")
+    return "".join(translated)
+
+
+def _loads_quoted(data: bytes) -> dict[str, Any] | None:
+    """
+    Parse VDF data in which every token is quoted and nothing is escaped.
+
+    :return: The parsed data, or None if the data has to be tokenized
+    """
+    if b"\\" in data:
+        return None
+    parts = data.decode("utf-8", errors="replace").split('"')
+    # Strings are at odd indices, and the text between them at even indices
+    if len(parts) % 2 == 0 or parts[0].strip():
+        return None
+    last = parts[-1]
+    if last.replace("}", "").strip():
+        return None
+    separators = parts[2:-1:2]
+    translations = {
+        separator: _json_separator(separator) for separator in set(separators)
+    }
+    if None in translations.values():
+        return None
+    parts[2:-1:2] = map(cast(dict[str, str], translations).__getitem__, separators)
+    parts[0] = "{"
+    parts[-1] = "}" * last.count("}") + "}"
+    try:
+        parsed = json.loads('"'.join(parts), strict=False)
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _loads_tokens(data: bytes) -> dict[str, Any]:
+    root: dict[str, Any] = {}
+    stack = [root]
+    current = root
+    key: str | None = None
+    for match in _TOKEN.finditer(data):
+        quoted, brace, unquoted = match.groups()
+        if quoted is not None or unquoted is not None:
+            token = _decode(quoted if quoted is not None else unquoted)
+            if key is None:
+                key = token
+            else:
+                current[key] = token
+                key = None
+        elif brace == b"{":
+            if key is None:
+                raise ValueError(f"Section without a key at byte {match.start()}")
+            section: dict[str, Any] = {}
+            current[key] = section
+            current = section
+            stack.append(section)
+            key = None
+        elif brace == b"}":
+            if key is not None or len(stack) == 1:
+                raise ValueError(f"Unexpected '}}' at byte {match.start()}")
+            stack.pop()
+            current = stack[-1]
+    if key is not None or len(stack) != 1:
+        raise ValueError("Unexpected end of VDF data")
+    return root
+
+
+def loads(data: bytes) -> dict[str, Any]:
+    """
+    Parse VDF data. Sections become dicts and values strs, later keys
+    replacing earlier ones, as with steamfiles.acf.loads().
+
+    :param data: The VDF data, UTF-8 encoded
+    :return: The parsed data
+    :raises ValueError: If the data is not valid VDF, e.g. it was truncated
+    """
+    data = data.removeprefix(codecs.BOM_UTF8)
+    parsed = _loads_quoted(data)
+    if parsed is not None:
+        return parsed
+    return _loads_tokens(data)
+
+
+def _dump_lines(
+    obj: Mapping[str, Any], indent: str, lines: list[str], escape: bool
+) -> tuple[int, int]:
+    """
+    :return: The number of strings and of sections written
+    """
+    strings = 2 * len(obj)
+    sections = 0
+    for key, value in obj.items():
+        if escape:
+            key = _escape(key)
+        if isinstance(value, Mapping):
+            lines.append(f'{indent}"{key}"\n{indent}{{')
+            nested_strings, nested_sections = _dump_lines(
+                value, indent + "\t", lines, escape
+            )
+            strings += nested_strings - 1
+            sections += nested_sections + 1
+            lines.append(f"{indent}}}")
+        else:
+            if escape:
+                value = _escape(value)
+            lines.append(f'{indent}"{key}"\t\t"{value}"')
+    return strings, sections
+
+
+def _dumps_text(obj: Mapping[str, Any], indent: str = "") -> str:
+    lines: list[str] = []
+    strings, sections = _dump_lines(obj, indent, lines, escape=False)
+    text = "\n".join(lines) + "\n"
+    # Escaping every string is slow, only do it if a string needs it, which
+    # adds quotes, backslashes or newlines
+    if (
+        "\\" in text
+        or text.count('"') != 2 * strings
+        or text.count("\n") != len(lines) + sections
+    ):
+        lines = []
+        _dump_lines(obj, indent, lines, escape=True)
+        text = "\n".join(lines) + "\n"
+    return text
+
+
+def dumps(obj: Mapping[str, Any]) -> bytes:
+    """
+    Serialize data to VDF, in the same layout as steamfiles.acf.dumps() and Steam.
+
+    :param obj: The data, sections being dicts
+    :return: The VDF data, UTF-8 encoded
+    """
+    return _dumps_text(obj).encode("utf-8")
+
+
+def _section_entries(
+    data: bytes, section: Sequence[str]
+) -> tuple[int, dict[str, tuple[int, int]]]:
+    """
+    Find the entries of a section.
+
+    :return: The offset of the closing brace of the section, and the key ->
+        (start, end) offsets of each of its entries
+    :raises KeyError: If the section does not exist
+    """
+    target = list(section)
+    path: list[str] = []
+    # Offsets of the keys of the open sections
+    starts: list[int] = []
+    entries: dict[str, tuple[int, int]] = {}
+    key: str | None = None
+    key_start = 0
+    position = 0
+    while (match := _ENTRY_TOKEN.search(data, position)) is not None:
+        position = match.end()
+        quoted, flat_section, brace, unquoted = match.groups()
+        if quoted is not None or unquoted is not None:
+            token = _decode(quoted if quoted is not None else unquoted)
+            if key is None and flat_section is not None:
+                if path == target:
+                    entries[token] = match.span()
+                    continue
+                if [*path, token] != target[: len(path) + 1]:
+                    continue
+                # The section leads to the target section, e.g. an empty target
+                # section, tokenize it instead: continue after the key
+                position = match.end(1) + 1
+            if key is None:
+                key = token
+                key_start = match.start()
+            else:
+                if path == target:
+                    entries[key] = (key_start, match.end())
+                key = None
+        elif brace == b"{":
+            if key is None:
+                raise ValueError(f"Section without a key at byte {match.start()}")
+            path.append(key)
+            starts.append(key_start)
+            key = None
+        elif brace == b"}" and path:
+            if path == target:
+                return match.start(), entries
+            entry_key = path.pop()
+            entry_start = starts.pop()
+            if path == target:
+                entries[entry_key] = (entry_start, match.end())
+    raise KeyError("/".join(section))
+
+
+def _line_start(data: bytes, offset: int) -> int:
+    """
+    :return: The start of the line of offset, if only indentation precedes it
+    """
+    start = offset
+    while start > 0 and data[start - 1 : start] in (b" ", b"\t"):
+        start -= 1
+    if start == 0 or data[start - 1 : start] == b"\n":
+        return start
+    return offset
+
+
+def _line_end(data: bytes, offset: int) -> int:
+    """
+    :return: The end of the line of offset, past its newline, if only
+        whitespace follows it
+    """
+    end = offset
+    while data[end : end + 1] in (b" ", b"\t", b"\r"):
+        end += 1
+    if data[end : end + 1] == b"\n":
+        return end + 1
+    return offset
+
+
+def patch(
+    data: bytes, section: Sequence[str], entries: Mapping[str, Any | None]
+) -> bytes:
+    """
+    Replace, add or remove entries of a section of VDF data, without
+    rewriting the rest of the data.
+
+    :param data: The VDF data
+    :param section: The keys leading to the section, e.g.
+        ("AppWorkshop", "WorkshopItemsInstalled")
+    :param entries: key -> new value of each entry to change, a dict for a
+        section, or None to remove the entry. New entries are added at the end
+        of the section.
+    :return: The patched data
+    :raises KeyError: If the section does not exist
+    """
+    closing, spans = _section_entries(data, section)
+    indent = b"\t" * len(section)
+    edits: list[tuple[int, int, bytes]] = []
+    added: list[bytes] = []
+    for key, value in entries.items():
+        replacement = (
+            b""
+            if value is None
+            else _dumps_text({key: value}, indent.decode()).encode("utf-8")
+        )
+        span = spans.get(key)
+        if span is None:
+            added.append(replacement)
+            continue
+        start = _line_start(data, span[0])
+        end = _line_end(data, span[1])
+        if start == span[0]:
+            # The entry did not start its line
+            replacement = replacement.removeprefix(indent)
+        if end == span[1]:
+            replacement = replacement.removesuffix(b"\n")
+        edits.append((start, end, replacement))
+    if added:
+        start = _line_start(data, closing)
+        newline = (
+            b"\n" if start == closing and data[closing - 1 : closing] != b"\n" else b""
+        )
+        edits.append((start, start, newline + b"".join(added)))
+
+    patched: list[bytes] = []
+    position = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0]):
+        patched.append(data[position:start])
+        patched.append(replacement)
+        position = end
+    patched.append(data[position:])
+    return b"".join(patched)
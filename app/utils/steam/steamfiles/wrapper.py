@@ -1,23 +1,49 @@
-from typing import Any, Dict
+import os
+from typing import Any, Dict, Mapping
 
-from steamfiles import acf
+from app.utils.steam.steamfiles import vdf
 
 
 def acf_to_dict(path: str) -> Dict[str, Any]:
     """
-    Uses steamfiles module to load a Steam client .acf file to a Dict
+    Load a Steam client .acf file to a Dict, see vdf.loads()
     Example: "$STEAM_INSTALL/steamapps/workshop/appworkshop_294100.acfappworkshop_294100.acf"
     """
     with open(
         path,
         "rb",
     ) as f:
-        return acf.loads(str(f.read(), encoding="utf=8"))
+        return vdf.loads(f.read())
 
 
 def dict_to_acf(data: Dict[str, Any], path: str) -> None:
     """
-    Uses steamfiles module to dump a dict of data to a Steam client .acf file in a SteamCMD/Steam format
+    Dump a dict of data to a Steam client .acf file in a SteamCMD/Steam format
     """
-    with open(path, "w") as f:
-        acf.dump(data, f)
+    with open(path, "wb") as f:
+        f.write(vdf.dumps(data))
+
+
+def update_acf_entries(
+    path: str, sections: Mapping[tuple[str, ...], Mapping[str, Any | None]]
+) -> None:
+    """
+    Replace, add or remove entries of sections of a Steam client .acf file,
+    leaving the rest of the file untouched, see vdf.patch()
+    Example: {("AppWorkshop", "WorkshopItemsInstalled"): {publishedfileid: None}}
+    removes a mod's entry from WorkshopItemsInstalled.
+
+    :raises KeyError: If a section does not exist
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    patched = data
+    for section, entries in sections.items():
+        patched = vdf.patch(patched, section, entries)
+    if patched == data:
+        return
+    # Steam may read the file at any time, replace it in one go
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(patched)
+    os.replace(temp_path, path)
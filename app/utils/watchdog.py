@@ -1,8 +1,5 @@
 import os
-from functools import partial
 from pathlib import Path
-from threading import Timer
-from typing import Any
 from uuid import uuid4
 
 from loguru import logger
@@ -14,13 +11,13 @@ from watchdog.observers.polling import PollingObserver
 
 from app.controllers.settings_controller import SettingsController
 from app.utils.metadata import MetadataManager
+from app.utils.watchdog_scheduler import WatchdogEventScheduler
 
 
 class WatchdogHandler(FileSystemEventHandler, QObject):
     acf_changed = Signal(bool, bool)
-    mod_created = Signal(str, str, str)
-    mod_deleted = Signal(str, str, str)
-    mod_updated = Signal(bool, bool, str, str, str)
+    # WatchdogBatch of the mods created, updated and deleted
+    mods_changed = Signal(object)
 
     def __init__(
         self, settings_controller: SettingsController, targets: list[str]
@@ -54,8 +51,8 @@ class WatchdogHandler(FileSystemEventHandler, QObject):
         # Mod directory monitoring
         self.watchdog_mods_observer: BaseObserver | None
         self.watchdog_mods_observer = Observer()
-        # Keep track of cooldowns for each uuid
-        self.cooldown_timers: dict[str, Any] = {}
+        # Merges mod changes into batches, see WatchdogEventScheduler
+        self.scheduler = WatchdogEventScheduler(on_batch=self.mods_changed.emit)
         self.__add_acf_observers()
         self.__add_mod_observers(self.settings_controller.get_mod_paths())
 
@@ -133,60 +130,36 @@ class WatchdogHandler(FileSystemEventHandler, QObject):
             return True
         return False
 
-    def __cooldown_uuid_change(
-        self, callback: dict[str, str], delay: float = 3.0
+    def __schedule_mod_change(
+        self,
+        operation: str,
+        mod_directory: str,
+        uuid: str,
+        data_source: str | None = None,
     ) -> None:
-        """Execute a callback after a cooldown period. A cooldown period is used
-        to prevent rapid-fire events from triggering multiple callbacks.
-
-        :param callback: A dictionary containing the operation, mod directory, and UUID to be passed to the callback.
-        :type callback: dict[str, str]
-        :param delay: The number of seconds to wait before executing the callback. Defaults to 3.0.
-        :type delay: float
+        """Add a mod change to the next batch of the scheduler. Changes are
+        merged per uuid, to prevent rapid-fire events from parsing a mod many times.
+
+        :param operation: "created", "updated" or "deleted"
+        :type operation: str
+        :param mod_directory: The directory of the mod
+        :type mod_directory: str
+        :param uuid: The UUID of the mod
+        :type uuid: str
+        :param data_source: The data source of the mod. Resolved from the existing metadata if None.
+        :type data_source: str | None
 
         :return: None
         """
-        operation = callback["operation"]
-        mod_directory = callback["path"]
-        uuid = callback["uuid"]
-        data_source = (
-            callback.get(
-                "data_source"  # This is resolved upon new mod creation, or we use the existing value for
-            )
-            or self.metadata_manager.internal_local_metadata.get(
-                uuid, {}
-            ).get(  # an existing mod
+        self.scheduler.schedule(
+            uuid=uuid,
+            operation=operation,
+            data_source=data_source
+            or self.metadata_manager.internal_local_metadata.get(uuid, {}).get(
                 "data_source"
-            )
+            ),
+            mod_directory=mod_directory,
         )
-        # Cancel any existing timers for this key
-        timer = self.cooldown_timers.get(uuid)
-        if timer:
-            timer.cancel()
-        # Construct cooldown timer for the given operation from the callback and start it
-        if operation == "updated":
-            self.cooldown_timers[uuid] = Timer(
-                delay,
-                partial(
-                    self.mod_updated.emit,
-                    False,
-                    True,
-                    data_source,
-                    mod_directory,
-                    uuid,
-                ),
-            )
-        else:
-            self.cooldown_timers[uuid] = Timer(
-                delay,
-                partial(
-                    getattr(self, f"mod_{operation}").emit,
-                    data_source,
-                    mod_directory,
-                    uuid,
-                ),
-            )
-        self.cooldown_timers[uuid].start()
 
     def on_created(self, event: FileSystemEvent) -> None:
         """A function called when a file or directory is created.
@@ -219,13 +192,11 @@ class WatchdogHandler(FileSystemEventHandler, QObject):
             # Add the mod directory to our mapper
             self.metadata_manager.mod_metadata_dir_mapper[event_scr_path_str] = uuid
             # Signal mod creation
-            self.__cooldown_uuid_change(
-                callback={
-                    "operation": "created",
-                    "data_source": data_source,
-                    "path": event_scr_path_str,
-                    "uuid": uuid,
-                }
+            self.__schedule_mod_change(
+                operation="created",
+                mod_directory=event_scr_path_str,
+                uuid=uuid,
+                data_source=data_source,
             )
 
     def on_deleted(self, event: FileSystemEvent) -> None:
@@ -258,12 +229,8 @@ class WatchdogHandler(FileSystemEventHandler, QObject):
             # Remove the mod directory from our mod mapper
             self.metadata_manager.mod_metadata_dir_mapper.pop(event_scr_path_str, None)
             logger.debug(f"Mod directory deleted: {event_scr_path_str}")
-            self.__cooldown_uuid_change(
-                callback={
-                    "operation": "deleted",
-                    "path": event_scr_path_str,
-                    "uuid": uuid,
-                }
+            self.__schedule_mod_change(
+                operation="deleted", mod_directory=event_scr_path_str, uuid=uuid
             )
 
     def on_modified(self, event: FileSystemEvent) -> None:
@@ -290,13 +257,11 @@ class WatchdogHandler(FileSystemEventHandler, QObject):
                 "path"
             )
             # If we have a UUID and mod path resolved, proceed to update the mod
+            if mod_path is None:
+                return
             logger.debug(f"Mod metadata modified: {event_scr_path_str}")
-            self.__cooldown_uuid_change(
-                callback={
-                    "operation": "updated",
-                    "path": mod_path,
-                    "uuid": uuid,
-                }
+            self.__schedule_mod_change(
+                operation="updated", mod_directory=mod_path, uuid=uuid
             )
         else:
             # logger.debug(
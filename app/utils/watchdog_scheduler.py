@@ -0,0 +1,179 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from loguru import logger
+
+# Seconds without a new event before the pending mod changes are emitted
+WATCHDOG_COALESCE_DELAY = 3.0
+# Longest a mod change waits while events keep coming, e.g. during a large
+# Steam or SteamCMD download
+WATCHDOG_MAX_DELAY = 30.0
+
+
+@dataclass
+class ModChange:
+    # "created", "updated" or "deleted"
+    operation: str
+    data_source: str | None
+    mod_directory: str
+
+
+def merge_mod_change(previous: ModChange | None, change: ModChange) -> ModChange | None:
+    """
+    Merge two changes to the same mod into one.
+
+    A mod created then updated is still created, and a mod created then deleted
+    never has to be parsed. Otherwise the latest change wins, an existing mod
+    that is deleted and shows up again being updated.
+
+    :param previous: The pending change to the mod, if any
+    :param change: The new change to the mod
+    :return: The merged change, or None if the changes cancel out
+    """
+    if previous is None:
+        return change
+    data_source = change.data_source or previous.data_source
+    if previous.operation == "created":
+        if change.operation == "deleted":
+            return None
+        return ModChange("created", data_source, change.mod_directory)
+    if change.operation == "deleted":
+        return ModChange("deleted", data_source, change.mod_directory)
+    return ModChange("updated", data_source, change.mod_directory)
+
+
+@dataclass
+class WatchdogBatch:
+    """
+    The changes to mods seen by the watchdog over a window, merged per uuid.
+    """
+
+    # uuid -> change
+    changes: dict[str, ModChange]
+
+    def _operation(self, operation: str) -> dict[str, ModChange]:
+        return {
+            uuid: change
+            for uuid, change in self.changes.items()
+            if change.operation == operation
+        }
+
+    @property
+    def created(self) -> dict[str, ModChange]:
+        return self._operation("created")
+
+    @property
+    def updated(self) -> dict[str, ModChange]:
+        return self._operation("updated")
+
+    @property
+    def deleted(self) -> dict[str, ModChange]:
+        return self._operation("deleted")
+
+
+class WatchdogEventScheduler:
+    """
+    Merges the mod changes seen by the watchdog, and passes them on in batches
+    from a single thread.
+
+    A batch is emitted once no event has been received for `delay` seconds, or
+    `max_delay` seconds after its first event, so that hundreds of mods updated
+    at once are parsed and compiled together rather than one by one.
+    """
+
+    def __init__(
+        self,
+        on_batch: Callable[[WatchdogBatch], None],
+        delay: float = WATCHDOG_COALESCE_DELAY,
+        max_delay: float = WATCHDOG_MAX_DELAY,
+    ) -> None:
+        """
+        :param on_batch: Called with every batch, from the scheduler thread
+        :param delay: Seconds without a new event before a batch is emitted
+        :param max_delay: Longest a batch waits for events to stop
+        """
+        self.on_batch = on_batch
+        self.delay = delay
+        self.max_delay = max_delay
+        # Counters, for the logs and to check how well events are merged
+        self.events_received = 0
+        self.batches_emitted = 0
+        self._pending: dict[str, ModChange] = {}
+        self._first_event_time = 0.0
+        self._last_event_time = 0.0
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="WatchdogEventScheduler", daemon=True
+        )
+        self._thread.start()
+
+    def schedule(
+        self,
+        uuid: str,
+        operation: str,
+        data_source: str | None,
+        mod_directory: str,
+    ) -> None:
+        """
+        Add a change to a mod to the next batch.
+
+        :param uuid: The uuid of the mod
+        :param operation: "created", "updated" or "deleted"
+        :param data_source: The data source of the mod, if known
+        :param mod_directory: The directory of the mod
+        """
+        with self._condition:
+            self.events_received += 1
+            now = time.monotonic()
+            if not self._pending:
+                self._first_event_time = now
+            self._last_event_time = now
+            change = merge_mod_change(
+                self._pending.get(uuid),
+                ModChange(operation, data_source, mod_directory),
+            )
+            if change is None:
+                self._pending.pop(uuid, None)
+            else:
+                self._pending[uuid] = change
+            self._condition.notify()
+
+    def stop(self) -> None:
+        """
+        Stop the scheduler thread, dropping the pending changes.
+        """
+        with self._condition:
+            self._stopped = True
+            self._pending = {}
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped and not self._pending:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                deadline = min(
+                    self._last_event_time + self.delay,
+                    self._first_event_time + self.max_delay,
+                )
+                now = time.monotonic()
+                if now < deadline:
+                    self._condition.wait(deadline - now)
+                    continue
+                batch = WatchdogBatch(self._pending)
+                self._pending = {}
+                self.batches_emitted += 1
+                logger.debug(
+                    f"Emitting {len(batch.changes)} mod changes [events received: "
+                    f"{self.events_received}, batches emitted: {self.batches_emitted}]"
+                )
+            try:
+                self.on_batch(batch)
+            except Exception:
+                logger.exception("Unable to process watchdog mod changes")
@@ -1,9 +1,42 @@
 import os
+import threading
 from typing import Any
 
 import xmltodict
 from bs4 import BeautifulSoup
 from loguru import logger
+from lxml import etree
+
+# About.xml fields read by ModParser, compile_metadata(), the UI and metadata_factory.
+# Stored lowercased, matching is case-insensitive like the rest of the parser.
+ABOUT_XML_FIELDS = frozenset(
+    field.lower()
+    for field in (
+        "name",
+        "author",
+        "authors",
+        "packageId",
+        "publishedFileId",
+        "steamAppId",
+        "supportedVersions",
+        "targetVersion",
+        "description",
+        "descriptionsByVersion",
+        "url",
+        "modVersion",
+        "modIconPath",
+        "modDependencies",
+        "modDependenciesByVersion",
+        "loadBefore",
+        "loadBeforeByVersion",
+        "forceLoadBefore",
+        "loadAfter",
+        "loadAfterByVersion",
+        "forceLoadAfter",
+        "incompatibleWith",
+        "incompatibleWithByVersion",
+    )
+)
 
 
 def xml_path_to_json(path: str) -> dict[str, Any]:
@@ -45,6 +78,138 @@ def xml_path_to_json(path: str) -> dict[str, Any]:
         return data
 
 
+_about_xml_parsers = threading.local()
+
+
+def _about_xml_parser(recover: bool) -> etree.XMLParser:
+    # lxml parsers must not be used by several threads at once, so keep one per thread
+    name = "recover" if recover else "strict"
+    parser = getattr(_about_xml_parsers, name, None)
+    if parser is None:
+        parser = etree.XMLParser(
+            recover=recover,
+            resolve_entities=False,
+            no_network=True,
+            remove_pis=True,
+        )
+        setattr(_about_xml_parsers, name, parser)
+    return parser
+
+
+def _qualified_name(name: str, nsmap: dict[str | None, str]) -> str:
+    """
+    Turn an lxml "{uri}local" name back into the "prefix:local" form xmltodict uses.
+    """
+    if not name.startswith("{"):
+        return name
+    uri, local = name[1:].split("}", 1)
+    for prefix, prefix_uri in nsmap.items():
+        if prefix and prefix_uri == uri:
+            return f"{prefix}:{local}"
+    return local
+
+
+def _is_blank(element: etree._Element) -> bool:
+    return not "".join(element.itertext()).strip()
+
+
+def _element_to_json(element: etree._Element, drop_blank: bool) -> Any:
+    """
+    Convert an element the same way xmltodict.parse(..., dict_constructor=dict) does.
+
+    :param element: The element to convert
+    :param drop_blank: Skip child elements without any text, like the BeautifulSoup fallback in xml_path_to_json
+    """
+    result: dict[str, Any] = {}
+    parent = element.getparent()
+    parent_nsmap = parent.nsmap if parent is not None else {}
+    for prefix, uri in element.nsmap.items():
+        if parent_nsmap.get(prefix) != uri:
+            result[f"@xmlns:{prefix}" if prefix else "@xmlns"] = uri
+    for key, value in element.attrib.items():
+        result[f"@{_qualified_name(key, element.nsmap)}"] = value
+    text = [element.text] if element.text else []
+    for child in element:
+        if child.tail:
+            text.append(child.tail)
+        # Comments and processing instructions only contribute their tail text
+        if not isinstance(child.tag, str) or (drop_blank and _is_blank(child)):
+            continue
+        key = _qualified_name(child.tag, child.nsmap)
+        value = _element_to_json(child, drop_blank)
+        if key not in result:
+            result[key] = value
+        elif isinstance(result[key], list):
+            result[key].append(value)
+        else:
+            result[key] = [result[key], value]
+    stripped_text = "".join(text).strip()
+    if stripped_text:
+        if not result:
+            return stripped_text
+        result["#text"] = stripped_text
+    return result or None
+
+
+def _about_xml_root_to_json(root: etree._Element, drop_blank: bool) -> dict[str, Any]:
+    fields: dict[str, Any] = {}
+    for child in root:
+        if not isinstance(child.tag, str):
+            continue
+        key = _qualified_name(child.tag, child.nsmap)
+        if key.lower() not in ABOUT_XML_FIELDS or (drop_blank and _is_blank(child)):
+            continue
+        value = _element_to_json(child, drop_blank)
+        if key not in fields:
+            fields[key] = value
+        elif isinstance(fields[key], list):
+            fields[key].append(value)
+        else:
+            fields[key] = [fields[key], value]
+    root_key = _qualified_name(str(root.tag), root.nsmap)
+    if not fields:
+        # Keep the root truthy exactly when xml_path_to_json() would, as callers
+        # use that to tell an empty <ModMetaData> apart from one with unknown tags
+        return {root_key: _element_to_json(root, drop_blank)}
+    return {root_key: fields}
+
+
+def about_xml_to_json(path: str) -> dict[str, Any]:
+    """
+    Return the fields of an About.xml that RimSort uses, in the same shape as
+    xml_path_to_json() would.
+
+    The file is parsed by lxml in C and only the fields in ABOUT_XML_FIELDS are
+    converted to Python objects, which is considerably faster than converting
+    the whole document. Malformed files are re-parsed in lxml's recovery mode,
+    dropping elements without text like the BeautifulSoup fallback does.
+    If the file does not exist or cannot be recovered, return an empty dict.
+
+    :param path: Path to the About.xml file.
+    :return: JSON dict of the used About.xml fields.
+    """
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+    except OSError as e:
+        logger.error(f"Unable to read XML file at: {path}: {e}")
+        return {}
+    try:
+        root = etree.fromstring(content, _about_xml_parser(recover=False))
+        drop_blank = False
+    except etree.XMLSyntaxError as e:
+        logger.debug(f"Error parsing XML file {path}: {e}. Retrying in recovery mode")
+        try:
+            root = etree.fromstring(content, _about_xml_parser(recover=True))
+        except etree.XMLSyntaxError:
+            root = None
+        drop_blank = True
+    if root is None:
+        logger.error(f"Error parsing XML file: {path}")
+        return {}
+    return _about_xml_root_to_json(root, drop_blank)
+
+
 def json_to_xml_write(
     data: dict[str, Any], path: str, raise_errs: bool = False
 ) -> None:
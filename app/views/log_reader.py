@@ -417,16 +417,12 @@ class LogReader(QDialog):
                 self.metadata_manager = MetadataManager.instance()
 
             # First check internal local metadata
-            if hasattr(self.metadata_manager, "internal_local_metadata"):
-                for (
-                    uuid,
-                    metadata,
-                ) in self.metadata_manager.internal_local_metadata.items():
-                    if (
-                        metadata
-                        and isinstance(metadata, dict)
-                        and metadata.get("publishedfileid") == pfid
-                    ):
+            if hasattr(self.metadata_manager, "mod_index"):
+                for uuid in self.metadata_manager.mod_index.uuids_by_publishedfileid(
+                    pfid
+                ):
+                    metadata = self.metadata_manager.internal_local_metadata.get(uuid)
+                    if metadata and isinstance(metadata, dict):
                         return metadata
 
             # Then check external steam metadata if available
@@ -14,27 +14,29 @@ from math import ceil
 from multiprocessing import Pool, cpu_count
 from pathlib import Path
 from tempfile import gettempdir
-from typing import TYPE_CHECKING, Any, Callable, Self
+from typing import TYPE_CHECKING, Any, Callable, Self, Sequence
 from urllib.parse import urlparse
 from zipfile import ZipFile
 
 from github import Github
 from loguru import logger
 from PySide6.QtCore import (
+    QCoreApplication,
     QEventLoop,
     QObject,
     QProcess,
     Qt,
+    QTimer,
     Signal,
     Slot,
 )
-from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel
+from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QWidget
 from requests import get as requests_get
 
 import app.utils.constants as app_constants
 import app.utils.metadata as metadata
 import app.views.dialogue as dialogue
-from app.controllers.sort_controller import Sorter
+from app.controllers.sort_controller import Sorter, SortResultCache, sort_cache_key
 from app.models.animations import LoadingAnimation
 from app.utils.app_info import AppInfo
 from app.utils.event_bus import EventBus
@@ -51,6 +53,8 @@ from app.utils.generic import (
     upload_data_to_0x0_st,
 )
 from app.utils.metadata import MetadataManager, SettingsController
+from app.utils.mod_list_matching import select_duplicate_mod
+from app.utils.mod_list_stream import ModListStream
 from app.utils.rentry.wrapper import RentryImport, RentryUpload
 from app.utils.schema import generate_rimworld_mods_list
 from app.utils.steam.browser import SteamBrowser
@@ -92,6 +96,11 @@ except ImportError:
         from git.exc import GitCommandError
 
 
+# Milliseconds between inserting parsed mods into the mod lists during a
+# progressive refresh
+PROGRESSIVE_REFRESH_INTERVAL = 100
+
+
 class MainContent(QObject):
     """
     This class controls the layout and functionality of the main content
@@ -124,6 +133,10 @@ class MainContent(QObject):
 
             self.settings_controller = settings_controller
             self.main_window = None  # Will be set by set_main_window
+            # Places mods into the lists during a progressive refresh, and the
+            # uuids of the mods parsed since the lists were last filled
+            self.mod_list_stream: ModListStream | None = None
+            self.parsed_uuids: list[str] = []
 
             EventBus().settings_have_changed.connect(self._on_settings_have_changed)
             EventBus().do_check_for_application_update.connect(
@@ -261,6 +274,24 @@ class MainContent(QObject):
             # Initialize MetadataManager
             self.metadata_manager = metadata.MetadataManager.instance()
 
+            # Result of the last sort: sort method, sorted uuids and the
+            # dependency graphs used, for incremental sorting. The graphs are
+            # None if the result came from the sort cache.
+            self.last_sort: (
+                tuple[
+                    app_constants.SortMethod,
+                    list[str],
+                    list[dict[str, set[str]]] | None,
+                ]
+                | None
+            ) = None
+            self.sort_cache = SortResultCache(
+                AppInfo().cache_folder / "sort_cache.json"
+            )
+            app_instance = QCoreApplication.instance()
+            if app_instance is not None:
+                app_instance.aboutToQuit.connect(self.sort_cache.flush)
+
             # BASE LAYOUT
             self.main_layout = QHBoxLayout()
             self.main_layout.setContentsMargins(
@@ -311,6 +342,12 @@ class MainContent(QObject):
             self.mods_panel.inactive_mods_list.item_added_signal.connect(
                 self.mods_panel.active_mods_list.handle_other_list_row_added
             )
+            self.mods_panel.active_mods_list.items_added_signal.connect(
+                self.mods_panel.inactive_mods_list.handle_other_list_rows_added
+            )
+            self.mods_panel.inactive_mods_list.items_added_signal.connect(
+                self.mods_panel.active_mods_list.handle_other_list_rows_added
+            )
             self.mods_panel.active_mods_list.edit_rules_signal.connect(
                 self._do_open_rule_editor
             )
@@ -607,9 +644,14 @@ class MainContent(QObject):
 
         :param uuid: uuid of mod
         """
+        distance = self.mod_info_panel.PREVIEW_PREFETCH_ROWS
+        prefetch_uuids = self.mods_panel.active_mods_list.neighbour_uuids(
+            uuid, distance
+        ) or self.mods_panel.inactive_mods_list.neighbour_uuids(uuid, distance)
         self.mod_info_panel.display_mod_info(
             uuid=uuid,
             render_unity_rt=self.settings_controller.settings.render_unity_rich_text,
+            prefetch_uuids=prefetch_uuids,
         )
 
     def __repopulate_lists(self, is_initial: bool = False) -> None:
@@ -989,12 +1031,36 @@ class MainContent(QObject):
     # INFO PANEL ANIMATIONS
 
     def do_threaded_loading_animation(
-        self, gif_path: str, target: Callable[..., Any], text: str | None = None
+        self,
+        gif_path: str,
+        target: Callable[..., Any],
+        text: str | None = None,
+        interactive_widgets: Sequence[QWidget] = (),
     ) -> Any:
+        """
+        Run target on a thread while showing a loading animation in the mod
+        info panel, with the other widgets disabled.
+
+        :param gif_path: Path to the animation
+        :param target: The function to run
+        :param text: A message to show below the animation
+        :param interactive_widgets: Widgets to keep enabled while loading,
+            along with their children
+        :return: The data returned by target
+        """
         # Hide the info panel widgets
         self.mod_info_panel.info_panel_frame.hide()
         # Disable widgets while loading
         self.disable_enable_widgets_signal.emit(False)
+        for widget in interactive_widgets:
+            # A widget is only enabled if its parents are
+            parent = widget.parentWidget()
+            while parent is not None:
+                parent.setEnabled(True)
+                parent = parent.parentWidget()
+            widget.setEnabled(True)
+            for child in widget.findChildren(QWidget):
+                child.setEnabled(True)
         # Encapsulate mod parsing inside a nice lil animation
         loading_animation = LoadingAnimation(
             gif_path=gif_path,
@@ -1054,17 +1120,21 @@ class MainContent(QObject):
         # Check if paths are set
         if self.check_if_essential_paths_are_set(prompt=is_initial):
             # Run expensive calculations to set cache data
-            self.do_threaded_loading_animation(
-                gif_path=str(
-                    AppInfo().theme_data_folder / "default-icons" / "rimsort.gif"
-                ),
-                target=partial(
-                    self.metadata_manager.refresh_cache, is_initial=is_initial
-                ),
-                text="Scanning mod sources and populating metadata...",
-            )
+            if self.settings_controller.settings.progressive_refresh:
+                self.__refresh_cache_progressively(is_initial=is_initial)
+            else:
+                self.do_threaded_loading_animation(
+                    gif_path=str(
+                        AppInfo().theme_data_folder / "default-icons" / "rimsort.gif"
+                    ),
+                    target=partial(
+                        self.metadata_manager.refresh_cache, is_initial=is_initial
+                    ),
+                    text="Scanning mod sources and populating metadata...",
+                )
 
-            # Insert mod data into list
+            # Insert mod data into list. After a progressive refresh, this
+            # settles duplicate and missing mods, dependencies and warnings
             self.__repopulate_lists(is_initial=is_initial)
 
             # If we have duplicate mods, prompt user
@@ -1110,6 +1180,90 @@ class MainContent(QObject):
 
         EventBus().refresh_finished.emit()
 
+    def __refresh_cache_progressively(self, is_initial: bool = False) -> None:
+        """
+        Refresh the metadata cache like _do_refresh(), but insert mods into the
+        mod lists as they are parsed, so they can be browsed while the rest are
+        parsed. The lists are browse only until the refresh is done.
+
+        Mods are placed by package id only, see ModListStream. The lists
+        should be repopulated afterwards.
+        """
+        mod_list = (
+            Path(
+                self.settings_controller.settings.instances[
+                    self.settings_controller.settings.current_instance
+                ].config_folder
+            )
+            / "ModsConfig.xml"
+        )
+        active_package_ids = (
+            metadata.get_package_ids_from_list(str(mod_list))
+            if mod_list.exists()
+            else []
+        )
+        self.mod_list_stream = ModListStream(active_package_ids)
+        self.parsed_uuids = []
+        self.__insert_data_into_lists([], [])
+
+        mod_lists = [
+            self.mods_panel.active_mods_list,
+            self.mods_panel.inactive_mods_list,
+        ]
+        for mod_list_widget in mod_lists:
+            mod_list_widget.set_browse_only(True)
+        # Emitted from the refresh thread, received on this one
+        self.metadata_manager.mod_parsed_signal.connect(self.__on_mod_parsed)
+        timer = QTimer(self)
+        timer.setInterval(PROGRESSIVE_REFRESH_INTERVAL)
+        timer.timeout.connect(self.__insert_parsed_mods)
+        timer.start()
+        try:
+            self.do_threaded_loading_animation(
+                gif_path=str(
+                    AppInfo().theme_data_folder / "default-icons" / "rimsort.gif"
+                ),
+                target=partial(
+                    self.metadata_manager.refresh_cache, is_initial=is_initial
+                ),
+                text="Scanning mod sources and populating metadata...",
+                interactive_widgets=mod_lists,
+            )
+        finally:
+            timer.stop()
+            self.metadata_manager.mod_parsed_signal.disconnect(self.__on_mod_parsed)
+            self.mod_list_stream = None
+            self.parsed_uuids = []
+            for mod_list_widget in mod_lists:
+                mod_list_widget.set_browse_only(False)
+
+    def __on_mod_parsed(self, uuid: str) -> None:
+        if self.mod_list_stream is not None:
+            self.parsed_uuids.append(uuid)
+
+    def __insert_parsed_mods(self) -> None:
+        """
+        Insert the mods parsed since the last call into the mod lists.
+        """
+        if self.mod_list_stream is None or not self.parsed_uuids:
+            return
+        parsed_uuids, self.parsed_uuids = self.parsed_uuids, []
+        active_rows: list[tuple[int, str]] = []
+        inactive_rows: list[tuple[int, str]] = []
+        for uuid in parsed_uuids:
+            mod_data = self.metadata_manager.internal_local_metadata.get(uuid)
+            if mod_data is None:
+                continue
+            placement = self.mod_list_stream.place(uuid, mod_data)
+            if placement is None:
+                continue
+            active, row = placement
+            (active_rows if active else inactive_rows).append((row, uuid))
+        self.mods_panel.active_mods_list.insert_uuids(active_rows)
+        self.mods_panel.inactive_mods_list.insert_uuids(inactive_rows)
+        self.mods_panel.update_count("Active")
+        self.mods_panel.update_count("Inactive")
+
     def _do_clear(self) -> None:
         """
         Method to clear all the non-base, non-DLC mods from the active
@@ -1196,14 +1350,19 @@ class MainContent(QObject):
                     # Add selected mods to active mods
                     for mod_id in selected_deps:
                         # Find the UUID for this package ID
-                        for (
-                            uuid,
-                            mod_data,
-                        ) in self.metadata_manager.internal_local_metadata.items():
-                            if mod_data.get("packageid") == mod_id:
-                                if uuid not in active_mods:
-                                    active_mods.add(uuid)
-                                break
+                        uuids = self.metadata_manager.mod_index.uuids_by_packageid(
+                            mod_id
+                        )
+                        if not uuids or uuids & active_mods:
+                            continue
+                        # Pick between copies as when importing a mods list
+                        uuid = select_duplicate_mod(
+                            self.metadata_manager.internal_local_metadata,
+                            uuids,
+                            prefer_workshop=False,
+                        )
+                        if uuid is not None:
+                            active_mods.add(uuid)
 
         # Get package IDs for active mods
         active_package_ids = set()
@@ -1234,7 +1393,52 @@ class MainContent(QObject):
             logger.error(f"Sort failed. Sorting algorithm not implemented: {e}")
             return
 
-        success, new_order = sorter.sort()
+        sorting_algorithm = self.settings_controller.settings.sorting_algorithm
+        cache_key = sort_cache_key(
+            sorting_algorithm,
+            active_mods,
+            self.metadata_manager.internal_local_metadata,
+            [
+                self.metadata_manager.external_community_rules_path,
+                self.metadata_manager.external_user_rules_path,
+            ],
+        )
+        cached_order = (
+            self.sort_cache.get(
+                cache_key, active_mods, self.metadata_manager.internal_local_metadata
+            )
+            if cache_key is not None
+            else None
+        )
+        # Only full sort results are cached, incremental ones depend on the last sort
+        cache_result = False
+        # The dependency graphs are only built if a sort runs
+        dependency_graphs: list[dict[str, set[str]]] | None = None
+        if cached_order is not None:
+            logger.info("Using cached sort result for the active mods")
+            success, new_order = True, cached_order
+        elif (
+            self.settings_controller.settings.incremental_sort
+            and self.last_sort is not None
+            and self.last_sort[0] == sorting_algorithm
+            and self.last_sort[2] is not None
+            and self.__is_unchanged_since_last_sort(active_mods)
+        ):
+            logger.info("Sorting mods affected by changes since the last sort")
+            dependency_graphs = sorter.generate_dependency_graphs()
+            success, new_order = sorter.sort_incremental(
+                self.last_sort[1], self.last_sort[2], dependency_graphs
+            )
+        else:
+            dependency_graphs = sorter.generate_dependency_graphs()
+            success, new_order = sorter.sort(dependency_graphs)
+            cache_result = True
+        if success:
+            self.last_sort = (sorting_algorithm, new_order, dependency_graphs)
+        if success and cache_result and cache_key is not None:
+            self.sort_cache.put(
+                cache_key, new_order, self.metadata_manager.internal_local_metadata
+            )
 
         # Check if the order has changed
         if success and new_order == current_order:
@@ -1263,6 +1467,21 @@ class MainContent(QObject):
         else:
             logger.warning("Unknown error occurred. Skipping insertion.")
 
+    def __is_unchanged_since_last_sort(self, active_mods: set[str]) -> bool:
+        """
+        Check that the mods in both the active mods list and the last sort
+        result are still in the sorted order, i.e. that the list was not
+        reordered by hand since then.
+        """
+        assert self.last_sort is not None
+        last_order = self.last_sort[1]
+        last_uuids = set(last_order)
+        return [
+            uuid
+            for uuid in self.mods_panel.active_mods_list.uuids
+            if uuid in last_uuids
+        ] == [uuid for uuid in last_order if uuid in active_mods]
+
     def _do_import_list_file_xml(self) -> None:
         """
         Open a user-selected XML file. Calculate
@@ -2928,7 +3147,7 @@ class MainContent(QObject):
                             time.time()
                             + self.settings_controller.settings.database_expiry
                         ),
-                        "database": self.metadata_manager.external_steam_metadata,
+                        "database": dict(self.metadata_manager.external_steam_metadata),
                     },
                     output,
                     indent=4,
@@ -964,14 +964,8 @@ class MainWindow(QMainWindow):
         self.watchdog_event_handler.acf_changed.connect(
             self.main_content_panel.metadata_manager.refresh_acf_metadata
         )
-        self.watchdog_event_handler.mod_created.connect(
-            self.main_content_panel.metadata_manager.process_creation
-        )
-        self.watchdog_event_handler.mod_deleted.connect(
-            self.main_content_panel.metadata_manager.process_deletion
-        )
-        self.watchdog_event_handler.mod_updated.connect(
-            self.main_content_panel.metadata_manager.process_update
+        self.watchdog_event_handler.mods_changed.connect(
+            self.main_content_panel.metadata_manager.process_changes
         )
         # Connect main content signal so it can stop watchdog
         self.main_content_panel.stop_watchdog_signal.connect(self.shutdown_watchdog)
@@ -1014,6 +1008,5 @@ class MainWindow(QMainWindow):
                 self.watchdog_event_handler.watchdog_mods_observer.stop()
                 self.watchdog_event_handler.watchdog_mods_observer.join()
                 self.watchdog_event_handler.watchdog_mods_observer = None
-                for timer in self.watchdog_event_handler.cooldown_timers.values():
-                    timer.cancel()
+            self.watchdog_event_handler.scheduler.stop()
             self.watchdog_event_handler = None
@@ -1,15 +1,14 @@
-import os
-from pathlib import Path
 from re import match
 
 from loguru import logger
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
+from PySide6.QtGui import QImage, QPixmap
 from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QSizePolicy, QVBoxLayout
 
 from app.models.image_label import ImageLabel
 from app.utils.app_info import AppInfo
 from app.utils.metadata import MetadataManager
+from app.utils.preview_loader import PreviewLoader
 from app.views.description_widget import DescriptionWidget
 
 
@@ -19,6 +18,9 @@ class ModInfo:
     mod information panel on the GUI.
     """
 
+    # Rows above and below the selected mod whose previews are prefetched
+    PREVIEW_PREFETCH_ROWS = 2
+
     def __init__(self) -> None:
         """
         Initialize the class.
@@ -28,6 +30,12 @@ class ModInfo:
         # Cache MetadataManager instance
         self.metadata_manager = MetadataManager.instance()
 
+        # Preview images are loaded and scaled down in the background
+        self.preview_loader = PreviewLoader(AppInfo().cache_folder / "previews")
+        self.preview_loader.preview_loaded.connect(self._on_preview_loaded)
+        # The preview image of the mod being displayed, if any
+        self.preview_file_path: str | None = None
+
         # Base layout type
         self.panel = QVBoxLayout()
         self.info_panel_frame = QFrame()
@@ -195,13 +203,21 @@ class ModInfo:
 
         logger.debug("Finished ModInfo initialization")
 
-    def display_mod_info(self, uuid: str, render_unity_rt: bool) -> None:
+    def display_mod_info(
+        self,
+        uuid: str,
+        render_unity_rt: bool,
+        prefetch_uuids: list[str] | None = None,
+    ) -> None:
         """
         This slot receives a the complete mod data json for
         the mod that was just clicked on. It will set the relevant
         information on the info panel.
 
-        :param mod_info: complete json info for the mod
+        :param uuid: uuid of the mod
+        :param render_unity_rt: whether to render Unity rich text in the description
+        :param prefetch_uuids: uuids of the mods likely to be displayed next,
+            whose preview images are loaded in the background
         """
         mod_info = self.metadata_manager.internal_local_metadata.get(uuid, {})
         # Style summary values based on validity
@@ -328,79 +344,57 @@ class ModInfo:
         # It is OK for the description value to be None (was not provided)
         # It is OK for the description key to not be in mod_info
         if mod_info.get("scenario"):
-            pixmap = QPixmap(self.scenario_image_path)
-            self.preview_picture.setPixmap(
-                pixmap.scaled(
-                    self.preview_picture.size(), Qt.AspectRatioMode.KeepAspectRatio
-                )
-            )
+            self.preview_file_path = None
+            # Cancel the loads of previous previews
+            self.preview_loader.request(None)
+            self._show_preview(QPixmap(self.scenario_image_path))
         else:
-            # Get Preview.png
-            workshop_folder_path = mod_info.get("path", "")
-            logger.debug(
-                f"Retrieved mod path to parse preview image: {workshop_folder_path}"
-            )
-            if os.path.exists(workshop_folder_path):
-                about_folder_name = "About"
-                about_folder_target_path = str(
-                    (Path(workshop_folder_path) / about_folder_name)
-                )
-                if os.path.exists(about_folder_target_path):
-                    # Look for a case-insensitive About folder
-                    invalid_folder_path_found = True
-                    for temp_file in os.scandir(workshop_folder_path):
-                        if (
-                            temp_file.name.lower() == about_folder_name.lower()
-                            and temp_file.is_dir()
-                        ):
-                            about_folder_name = temp_file.name
-                            invalid_folder_path_found = False
-                            break
-                    # Look for a case-insensitive "Preview.png" file
-                    invalid_file_path_found = True
-                    preview_file_name = "Preview.png"
-                    for temp_file in os.scandir(
-                        str((Path(workshop_folder_path) / about_folder_name))
-                    ):
-                        if (
-                            temp_file.name.lower() == preview_file_name.lower()
-                            and temp_file.is_file()
-                        ):
-                            preview_file_name = temp_file.name
-                            invalid_file_path_found = False
-                            break
-                    # If there was an issue getting the expected path, track and exit
-                    if invalid_folder_path_found or invalid_file_path_found:
-                        logger.debug("No preview image found for the mod")
-                        pixmap = QPixmap(self.missing_image_path)
-                        self.preview_picture.setPixmap(
-                            pixmap.scaled(
-                                self.preview_picture.size(),
-                                Qt.AspectRatioMode.KeepAspectRatio,
-                            )
-                        )
-                    else:
-                        logger.debug("Preview image found")
-                        image_path = str(
-                            (
-                                Path(workshop_folder_path)
-                                / about_folder_name
-                                / preview_file_name
-                            )
-                        )
-                        pixmap = QPixmap(image_path)
-                        self.preview_picture.setPixmap(
-                            pixmap.scaled(
-                                self.preview_picture.size(),
-                                Qt.AspectRatioMode.KeepAspectRatio,
-                            )
-                        )
-                else:
-                    pixmap = QPixmap(self.missing_image_path)
-                    self.preview_picture.setPixmap(
-                        pixmap.scaled(
-                            self.preview_picture.size(),
-                            Qt.AspectRatioMode.KeepAspectRatio,
-                        )
+            # Preview.png was located when the mod was parsed
+            preview_file_path = mod_info.get("preview_file_path")
+            logger.debug(f"Retrieved preview image path: {preview_file_path}")
+            self.preview_file_path = preview_file_path
+            internal_local_metadata = self.metadata_manager.internal_local_metadata
+            prefetch_paths = [
+                path
+                for prefetch_uuid in prefetch_uuids or []
+                if (
+                    path := internal_local_metadata.get(prefetch_uuid, {}).get(
+                        "preview_file_path"
                     )
+                )
+            ]
+            image = self.preview_loader.request(preview_file_path, prefetch_paths)
+            if not preview_file_path:
+                logger.debug("No preview image found for the mod")
+                self._show_preview(QPixmap(self.missing_image_path))
+            elif image is not None:
+                self._on_preview_loaded(preview_file_path, image)
+            else:
+                # Shown by _on_preview_loaded once loaded
+                self.preview_picture.clear()
         logger.debug("Finished displaying mod info")
+
+    def _on_preview_loaded(self, preview_file_path: str, image: QImage) -> None:
+        """
+        Show a preview image loaded by the preview loader, if it is the preview
+        of the mod being displayed.
+
+        :param preview_file_path: path to the preview image
+        :param image: the scaled down preview, null if it could not be read
+        """
+        if preview_file_path != self.preview_file_path:
+            return
+        if image.isNull():
+            logger.debug("Preview image could not be read")
+            self._show_preview(QPixmap(self.missing_image_path))
+        else:
+            logger.debug("Preview image found")
+            self._show_preview(QPixmap.fromImage(image))
+
+    def _show_preview(self, pixmap: QPixmap) -> None:
+        self.preview_picture.setPixmap(
+            pixmap.scaled(
+                self.preview_picture.size(),
+                Qt.AspectRatioMode.KeepAspectRatio,
+            )
+        )
@@ -1,27 +1,43 @@
 import json
 import os
+from contextlib import contextmanager
 from enum import Enum
 from functools import partial
 from pathlib import Path
 from shutil import copy2, copytree
 from traceback import format_exc
-from typing import cast
+from typing import AbstractSet, Any, Iterator, cast
 
 from loguru import logger
-from PySide6.QtCore import QEvent, QModelIndex, QObject, QRectF, QSize, Qt, Signal
+from PySide6.QtCore import (
+    QAbstractItemModel,
+    QEvent,
+    QModelIndex,
+    QObject,
+    QPersistentModelIndex,
+    QRect,
+    QSize,
+    Qt,
+    QTimer,
+    Signal,
+)
 from PySide6.QtGui import (
     QAction,
+    QColor,
     QCursor,
     QDropEvent,
     QFocusEvent,
     QFontMetrics,
+    QHelpEvent,
     QIcon,
     QKeyEvent,
     QKeySequence,
-    QResizeEvent,
+    QMouseEvent,
+    QPainter,
 )
 from PySide6.QtWidgets import (
     QAbstractItemView,
+    QApplication,
     QComboBox,
     QFrame,
     QHBoxLayout,
@@ -30,7 +46,11 @@ from PySide6.QtWidgets import (
     QListWidget,
     QMenu,
     QPushButton,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QToolButton,
+    QToolTip,
     QVBoxLayout,
     QWidget,
 )
@@ -43,7 +63,7 @@ from app.utils.constants import (
 )
 from app.utils.custom_list_widget_item import CustomListWidgetItem
 from app.utils.custom_list_widget_item_metadata import CustomListWidgetItemMetadata
-from app.utils.custom_qlabels import AdvancedClickableQLabel, ClickableQLabel
+from app.utils.custom_qlabels import AdvancedClickableQLabel
 from app.utils.event_bus import EventBus
 from app.utils.generic import (
     copy_to_clipboard_safely,
@@ -54,6 +74,8 @@ from app.utils.generic import (
     sanitize_filename,
 )
 from app.utils.metadata import MetadataManager, ModMetadata
+from app.utils.mod_rule_index import ModListRuleIndex
+from app.utils.mod_search import SEARCH_FIELDS, ModSearchTable
 from app.views.deletion_menu import ModDeletionMenu
 from app.views.dialogue import (
     show_dialogue_conditional,
@@ -110,369 +132,51 @@ def sort_uuids(uuids: list[str], key: ModsPanelSortKey) -> list[str]:
     return sorted(uuids, key=key_function)
 
 
-class ModListItemInner(QWidget):
-    """
-    Subclass for QWidget. Used to store data for a single
-    mod and display relevant data on a mod list.
+def get_mod_tool_tip_text(metadata: ModMetadata) -> str:
     """
+    Compose the tool tip of a mod list row
 
-    toggle_warning_signal = Signal(str, str)
-    toggle_error_signal = Signal(str, str)
-
-    def __init__(
-        self,
-        errors_warnings: str,
-        errors: str,
-        warnings: str,
-        filtered: bool,
-        invalid: bool,
-        mismatch: bool,
-        alternative: bool,
-        settings_controller: SettingsController,
-        uuid: str,
-    ) -> None:
-        """
-        Initialize the QWidget with mod uuid. Metadata can be accessed via MetadataManager.
-
-        All metadata tags are set to the corresponding field if it
-        exists in the metadata dict. See tags:
-        https://rimworldwiki.com/wiki/About.xml
-
-        :param errors_warnings: a string of errors and warnings
-        :param errors: a string of errors for the notification tooltip
-        :param warnings: a string of warnings for the notification tooltip
-        :param filtered: a bool representing whether the widget's item is filtered
-        :param invalid: a bool representing whether the widget's item is an invalid mod
-        :param mismatch: a bool representing whether the widget's item has a version mismatch
-        :param alternative: a bool representing whether the widget's item has a recommended alternative mod
-        :param settings_controller: an instance of SettingsController for accessing settings
-        :param uuid: str, the uuid of the mod which corresponds to a mod's metadata
-        """
-
-        super(ModListItemInner, self).__init__()
-
-        # Cache MetadataManager instance
-        self.metadata_manager = MetadataManager.instance()
-        # Cache error and warning strings for tooltips
-        self.errors_warnings = errors_warnings
-        self.errors = errors
-        self.warnings = warnings
-        # Cache filtered state of widget's item - used to determine styling of widget
-        self.filtered = filtered
-        # Cache invalid state of widget's item - used to determine styling of widget
-        self.invalid = invalid
-        # Cache mismatch state of widget's item - used to determine warning icon visibility
-        self.mismatch = mismatch
-        # Cache alternative state of widget's item - used to determine warning icon visibility
-        self.alternative = alternative
-        # Cache SettingsManager instance
-        self.settings_controller = settings_controller
-
-        # All data, including name, author, package id, dependencies,
-        # whether the mod is a workshop mod or expansion, etc is encapsulated
-        # in this variable. This is exactly equal to the dict value of a
-        # single all_mods key-value
-        self.uuid = uuid
-        self.list_item_name = (
-            self.metadata_manager.internal_local_metadata.get(self.uuid, {}).get("name")
-            or "METADATA ERROR"
-        )
-        self.main_label = QLabel()
-
-        # Visuals
-        self.setToolTip(self.get_tool_tip_text())
-        self.main_item_layout = QHBoxLayout()
-        self.main_item_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_item_layout.setSpacing(0)
-        self.font_metrics = QFontMetrics(self.font())
-
-        # Icons that are conditional
-        self.csharp_icon = None
-        self.xml_icon = None
-        if self.settings_controller.settings.mod_type_filter_toggle:
-            if (
-                self.metadata_manager.internal_local_metadata.get(self.uuid, {}).get(
-                    "csharp"
-                )
-            ) is not None:
-                self.csharp_icon = QLabel()
-                self.csharp_icon.setPixmap(
-                    ModListIcons.csharp_icon().pixmap(QSize(20, 20))
-                )
-                self.csharp_icon.setToolTip(
-                    "Contains custom C# assemblies (custom code)"
-                )
-            else:
-                self.xml_icon = QLabel()
-                self.xml_icon.setPixmap(ModListIcons.xml_icon().pixmap(QSize(20, 20)))
-                self.xml_icon.setToolTip("Contains custom content (textures / XML)")
-        self.git_icon = None
-        if (
-            self.metadata_manager.internal_local_metadata[self.uuid]["data_source"]
-            == "local"
-            and self.metadata_manager.internal_local_metadata[self.uuid].get("git_repo")
-            and not self.metadata_manager.internal_local_metadata[self.uuid].get(
-                "steamcmd"
-            )
-        ):
-            self.git_icon = QLabel()
-            self.git_icon.setPixmap(ModListIcons.git_icon().pixmap(QSize(20, 20)))
-            self.git_icon.setToolTip("Local mod that contains a git repository")
-        self.steamcmd_icon = None
-        if self.metadata_manager.internal_local_metadata[self.uuid][
-            "data_source"
-        ] == "local" and self.metadata_manager.internal_local_metadata[self.uuid].get(
-            "steamcmd"
-        ):
-            self.steamcmd_icon = QLabel()
-            self.steamcmd_icon.setPixmap(
-                ModListIcons.steamcmd_icon().pixmap(QSize(20, 20))
-            )
-            self.steamcmd_icon.setToolTip("Local mod that can be used with SteamCMD")
-        # Warning icon hidden by default
-        self.warning_icon_label = ClickableQLabel()
-        self.warning_icon_label.clicked.connect(
-            partial(
-                self.toggle_warning_signal.emit,
-                self.metadata_manager.internal_local_metadata[self.uuid]["packageid"],
-                self.uuid,
-            )
-        )
-        self.warning_icon_label.setPixmap(
-            ModListIcons.warning_icon().pixmap(QSize(20, 20))
-        )
-        # Default to hidden to avoid showing early
-        self.warning_icon_label.setHidden(True)
-        # Error icon hidden by default
-        self.error_icon_label = ClickableQLabel()
-        self.error_icon_label.clicked.connect(
-            partial(
-                self.toggle_error_signal.emit,
-                self.metadata_manager.internal_local_metadata[self.uuid]["packageid"],
-                self.uuid,
-            )
-        )
-        self.error_icon_label.setPixmap(ModListIcons.error_icon().pixmap(QSize(20, 20)))
-        # Default to hidden to avoid showing early
-        self.error_icon_label.setHidden(True)
-        # Icons by mod source
-        self.mod_source_icon = None
-        if not self.git_icon and not self.steamcmd_icon:
-            self.mod_source_icon = QLabel()
-            self.mod_source_icon.setPixmap(self.get_icon().pixmap(QSize(20, 20)))
-            # Set tooltip based on mod source
-            data_source = self.metadata_manager.internal_local_metadata[self.uuid].get(
-                "data_source"
-            )
-            if data_source == "expansion":
-                self.mod_source_icon.setObjectName("expansion")
-                self.mod_source_icon.setToolTip(
-                    "Official RimWorld content by Ludeon Studios"
-                )
-            elif data_source == "local":
-                if self.metadata_manager.internal_local_metadata[self.uuid].get(
-                    "git_repo"
-                ):
-                    self.mod_source_icon.setObjectName("git_repo")
-                elif self.metadata_manager.internal_local_metadata[self.uuid].get(
-                    "steamcmd"
-                ):
-                    self.mod_source_icon.setObjectName("steamcmd")
-                else:
-                    self.mod_source_icon.setObjectName("local")
-                    self.mod_source_icon.setToolTip("Installed locally")
-            elif data_source == "workshop":
-                self.mod_source_icon.setObjectName("workshop")
-                self.mod_source_icon.setToolTip("Subscribed via Steam")
-        # Set label color if mod has errors/warnings
-        if self.filtered:
-            self.main_label.setObjectName("ListItemLabelFiltered")
-        elif errors_warnings:
-            self.main_label.setObjectName("ListItemLabelInvalid")
-        else:
-            self.main_label.setObjectName("ListItemLabel")
-        # Add icons
-        if self.git_icon:
-            self.main_item_layout.addWidget(self.git_icon, Qt.AlignmentFlag.AlignRight)
-        if self.steamcmd_icon:
-            self.main_item_layout.addWidget(
-                self.steamcmd_icon, Qt.AlignmentFlag.AlignRight
-            )
-        if self.mod_source_icon:
-            self.main_item_layout.addWidget(
-                self.mod_source_icon, Qt.AlignmentFlag.AlignRight
-            )
-        if self.csharp_icon:
-            self.main_item_layout.addWidget(
-                self.csharp_icon, Qt.AlignmentFlag.AlignRight
-            )
-        if self.xml_icon:
-            self.main_item_layout.addWidget(self.xml_icon, Qt.AlignmentFlag.AlignRight)
-        # Compose the layout of our widget and set it to the main layout
-        self.main_item_layout.addWidget(self.main_label, Qt.AlignmentFlag.AlignCenter)
-        self.main_item_layout.addWidget(
-            self.warning_icon_label, Qt.AlignmentFlag.AlignRight
-        )
-        self.main_item_layout.addWidget(
-            self.error_icon_label, Qt.AlignmentFlag.AlignRight
-        )
-        self.main_item_layout.addStretch()
-        self.setLayout(self.main_item_layout)
-
-        # Reveal if errors or warnings exist
-        if self.warnings:
-            self.warning_icon_label.setToolTip(self.warnings)
-            self.warning_icon_label.setHidden(False)
-        if self.errors:
-            self.error_icon_label.setToolTip(self.errors)
-            self.error_icon_label.setHidden(False)
-
-    def count_icons(self, widget: QObject) -> int:
-        count = 0
-        if isinstance(widget, QLabel):
-            pixmap = widget.pixmap()
-            if pixmap and not pixmap.isNull():
-                count += 1
-
-        if isinstance(widget, QWidget):
-            for child in widget.children():
-                count += self.count_icons(child)
-
-        return count
-
-    def get_tool_tip_text(self) -> str:
-        """
-        Compose a mod_list_item's tool_tip_text
-
-        :return: string containing the tool_tip_text
-        """
-        metadata = self.metadata_manager.internal_local_metadata.get(self.uuid, {})
-
-        name_line = f"Mod: {metadata.get('name', 'Not specified')}\n"
-
-        authors_tag = metadata.get("authors")
-        authors_text = (
-            ", ".join(authors_tag.get("li", ["Not specified"]))
-            if isinstance(authors_tag, dict)
-            else authors_tag or "Not specified"
-        )
-        author_line = f"Authors: {authors_text}\n"
-
-        package_id = metadata.get("packageid", "Not specified")
-        package_id_line = f"PackageID: {package_id}\n"
-
-        mod_version = metadata.get("modversion", "Not specified")
-        modversion_line = f"Mod Version: {mod_version}\n"
-
-        supported_versions_tag = metadata.get("supportedversions", {})
-        supported_versions_list = supported_versions_tag.get("li")
-        supported_versions_text = (
-            ", ".join(supported_versions_list)
-            if isinstance(supported_versions_list, list)
-            else supported_versions_list or "Not specified"
-        )
-        supported_versions_line = f"Supported Versions: {supported_versions_text}\n"
-
-        path = metadata.get("path", "Not specified")
-        path_line = f"Path: {path}"
-
-        return "".join(
-            [
-                name_line,
-                author_line,
-                package_id_line,
-                modversion_line,
-                supported_versions_line,
-                path_line,
-            ]
-        )
-
-    def get_icon(self) -> QIcon:  # type: ignore
-        """
-        Check custom tags added to mod metadata upon initialization, and return the corresponding
-        QIcon for the mod's source type (expansion, workshop, or local mod?)
-
-        :return: QIcon object set to the path of the corresponding icon image
-        """
-        if (
-            self.metadata_manager.internal_local_metadata[self.uuid].get("data_source")
-            == "expansion"
-        ):
-            return ModListIcons.ludeon_icon()
-        elif (
-            self.metadata_manager.internal_local_metadata[self.uuid].get("data_source")
-            == "local"
-        ):
-            return ModListIcons.local_icon()
-        elif (
-            self.metadata_manager.internal_local_metadata[self.uuid].get("data_source")
-            == "workshop"
-        ):
-            return ModListIcons.steam_icon()
-        else:
-            logger.error(
-                f"No type found for ModListItemInner with package id {self.metadata_manager.internal_local_metadata[self.uuid].get('packageid')}"
-            )
-
-    def resizeEvent(self, event: QResizeEvent) -> None:
-        """
-        When the label is resized (as the window is resized),
-        also elide the label if needed.
-
-        :param event: the resize event
-        """
-
-        # Count the number of QLabel widgets with QIcon and calculate total icon width
-        icon_count = self.count_icons(self)
-        icon_width = icon_count * 20
-        self.item_width = super().width()
-        text_width_needed = QRectF(
-            self.font_metrics.boundingRect(self.list_item_name)
-        ).width()
-        if text_width_needed > self.item_width - icon_width:
-            available_width = self.item_width - icon_width
-            shortened_text = self.font_metrics.elidedText(
-                self.list_item_name, Qt.TextElideMode.ElideRight, int(available_width)
-            )
-            self.main_label.setText(str(shortened_text))
-        else:
-            self.main_label.setText(self.list_item_name)
-        return super().resizeEvent(event)
-
-    def repolish(self, item: CustomListWidgetItem) -> None:
-        """
-        Repolish the widget items
-        """
-        item_data = item.data(Qt.ItemDataRole.UserRole)
-        error_tooltip = item_data["errors"]
-        warning_tooltip = item_data["warnings"]
-        # If an error exists we show an error icon with error tooltip
-        # If a warning exists we show a warning icon with warning tooltip
-        if error_tooltip:
-            self.error_icon_label.setHidden(False)
-            self.error_icon_label.setToolTip(error_tooltip)
-        else:  # Hide the error icon if no error tool tip text
-            self.error_icon_label.setHidden(True)
-            self.error_icon_label.setToolTip("")
-        if warning_tooltip:
-            self.warning_icon_label.setHidden(False)
-            self.warning_icon_label.setToolTip(warning_tooltip)
-        else:  # Hide the warning icon if no warning tool tip text
-            self.warning_icon_label.setHidden(True)
-            self.warning_icon_label.setToolTip("")
-        # Recalculate the widget label's styling based on item data
-        widget_object_name = self.main_label.objectName()
-        if item_data["filtered"]:
-            new_widget_object_name = "ListItemLabelFiltered"
-        elif error_tooltip or warning_tooltip:
-            new_widget_object_name = "ListItemLabelInvalid"
-        else:
-            new_widget_object_name = "ListItemLabel"
-        if widget_object_name != new_widget_object_name:
-            logger.debug("Repolishing: " + new_widget_object_name)
-            self.main_label.setObjectName(new_widget_object_name)
-            self.main_label.style().unpolish(self.main_label)
-            self.main_label.style().polish(self.main_label)
+    :param metadata: the mod's metadata
+    :return: string containing the tool_tip_text
+    """
+    name_line = f"Mod: {metadata.get('name', 'Not specified')}\n"
+
+    authors_tag = metadata.get("authors")
+    authors_text = (
+        ", ".join(authors_tag.get("li", ["Not specified"]))
+        if isinstance(authors_tag, dict)
+        else authors_tag or "Not specified"
+    )
+    author_line = f"Authors: {authors_text}\n"
+
+    package_id = metadata.get("packageid", "Not specified")
+    package_id_line = f"PackageID: {package_id}\n"
+
+    mod_version = metadata.get("modversion", "Not specified")
+    modversion_line = f"Mod Version: {mod_version}\n"
+
+    supported_versions_tag = metadata.get("supportedversions", {})
+    supported_versions_list = supported_versions_tag.get("li")
+    supported_versions_text = (
+        ", ".join(supported_versions_list)
+        if isinstance(supported_versions_list, list)
+        else supported_versions_list or "Not specified"
+    )
+    supported_versions_line = f"Supported Versions: {supported_versions_text}\n"
+
+    path = metadata.get("path", "Not specified")
+    path_line = f"Path: {path}"
+
+    return "".join(
+        [
+            name_line,
+            author_line,
+            package_id_line,
+            modversion_line,
+            supported_versions_line,
+            path_line,
+        ]
+    )
 
 
 class ModListIcons:
@@ -552,6 +256,325 @@ class ModListIcons:
         return cls._error_icon
 
 
+class ModListItemDelegate(QStyledItemDelegate):
+    """
+    Subclass for QStyledItemDelegate. Paints the rows of a ModListWidget:
+    the icons for the mod's source and type, its name, and the warning and
+    error icons. Rows are painted from the item's CustomListWidgetItemMetadata
+    and the mod's metadata, so no widget is created per row.
+
+    The layout of the painted rows is cached, so repainting a row (e.g. when
+    scrolling, hovering or selecting) does not elide its name again. The
+    ModListWidget evicts the rows that are scrolled far out of view.
+
+    Clicking the warning or error icon emits toggle_warning_signal.
+    """
+
+    ICON_SIZE = 20
+
+    toggle_warning_signal = Signal(str, str)
+
+    def __init__(
+        self, mod_list: QListWidget, settings_controller: SettingsController
+    ) -> None:
+        super(ModListItemDelegate, self).__init__(mod_list)
+
+        # Cache MetadataManager instance
+        self.metadata_manager = MetadataManager.instance()
+        self.settings_controller = settings_controller
+
+        # Hidden labels styled by the theme, used for the colors of mod names
+        self.name_labels: dict[str, QLabel] = {}
+        for object_name in [
+            "ListItemLabel",
+            "ListItemLabelFiltered",
+            "ListItemLabelInvalid",
+        ]:
+            label = QLabel(mod_list)
+            label.setObjectName(object_name)
+            label.setHidden(True)
+            self.name_labels[object_name] = label
+
+        # uuid -> (mod metadata, layout key, layout relative to the row) of the
+        # rows laid out since they were last evicted
+        self.row_layouts: dict[
+            str,
+            tuple[
+                ModMetadata,
+                tuple[Any, ...],
+                tuple[
+                    list[tuple[QRect, QIcon, str]],
+                    QRect,
+                    str,
+                    list[tuple[QRect, QIcon, str]],
+                ],
+            ],
+        ] = {}
+
+    def get_icons(self, mod_data: ModMetadata) -> list[tuple[QIcon, str]]:
+        """
+        The icons shown before a mod's name, with their tooltips.
+
+        :param mod_data: the mod's metadata
+        :return: list of (icon, tooltip)
+        """
+        icons = []
+        data_source = mod_data.get("data_source")
+        git_repo = data_source == "local" and mod_data.get("git_repo")
+        steamcmd = data_source == "local" and mod_data.get("steamcmd")
+        if git_repo and not steamcmd:
+            icons.append(
+                (ModListIcons.git_icon(), "Local mod that contains a git repository")
+            )
+        if steamcmd:
+            icons.append(
+                (
+                    ModListIcons.steamcmd_icon(),
+                    "Local mod that can be used with SteamCMD",
+                )
+            )
+        # Icons by mod source
+        if not git_repo and not steamcmd:
+            if data_source == "expansion":
+                icons.append(
+                    (
+                        ModListIcons.ludeon_icon(),
+                        "Official RimWorld content by Ludeon Studios",
+                    )
+                )
+            elif data_source == "local":
+                icons.append((ModListIcons.local_icon(), "Installed locally"))
+            elif data_source == "workshop":
+                icons.append((ModListIcons.steam_icon(), "Subscribed via Steam"))
+        if self.settings_controller.settings.mod_type_filter_toggle:
+            if mod_data.get("csharp") is not None:
+                icons.append(
+                    (
+                        ModListIcons.csharp_icon(),
+                        "Contains custom C# assemblies (custom code)",
+                    )
+                )
+            else:
+                icons.append(
+                    (
+                        ModListIcons.xml_icon(),
+                        "Contains custom content (textures / XML)",
+                    )
+                )
+        return icons
+
+    def get_row_layout(
+        self,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> tuple[
+        list[tuple[QRect, QIcon, str]], QRect, str, list[tuple[QRect, QIcon, str]]
+    ]:
+        """
+        Lay out a row like the mod list rows were before: icons, the name
+        elided to fit, then the warning and error icons.
+
+        :param option: the style option of the row
+        :param index: the model index of the row
+        :return: the icons as (rect, icon, tooltip), the rect and text of the name,
+            and the warning and error icons as (rect, icon, tooltip)
+        """
+        item_data = index.data(Qt.ItemDataRole.UserRole)
+        uuid = item_data["uuid"]
+        mod_data = self.metadata_manager.internal_local_metadata.get(uuid, {})
+        rect: QRect = option.rect  # type: ignore[attr-defined]
+        key = (
+            rect.width(),
+            rect.height(),
+            option.font.key(),  # type: ignore[attr-defined]
+            item_data["warnings"],
+            item_data["errors"],
+            self.settings_controller.settings.mod_type_filter_toggle,
+        )
+        cached = self.row_layouts.get(uuid)
+        if cached is not None and cached[0] is mod_data and cached[1] == key:
+            layout = cached[2]
+        else:
+            layout = self._lay_out_row(
+                item_data,
+                mod_data,
+                rect.width(),
+                rect.height(),
+                option.fontMetrics,  # type: ignore[attr-defined]
+            )
+            self.row_layouts[uuid] = (mod_data, key, layout)
+
+        icons, name_rect, name, badges = layout
+        x, y = rect.left(), rect.top()
+        return (
+            [(icon_rect.translated(x, y), icon, tip) for icon_rect, icon, tip in icons],
+            name_rect.translated(x, y),
+            name,
+            [
+                (badge_rect.translated(x, y), icon, tip)
+                for badge_rect, icon, tip in badges
+            ],
+        )
+
+    def _lay_out_row(
+        self,
+        item_data: CustomListWidgetItemMetadata,
+        mod_data: ModMetadata,
+        width: int,
+        height: int,
+        font_metrics: QFontMetrics,
+    ) -> tuple[
+        list[tuple[QRect, QIcon, str]], QRect, str, list[tuple[QRect, QIcon, str]]
+    ]:
+        """
+        Lay out a row of the given size at (0, 0), see get_row_layout().
+        """
+        size = self.ICON_SIZE
+        top = (height - size) // 2
+
+        icons = []
+        left = 0
+        for icon, tooltip in self.get_icons(mod_data):
+            icons.append((QRect(left, top, size, size), icon, tooltip))
+            left += size
+
+        badges = []
+        for icon, tooltip in [
+            (ModListIcons.warning_icon(), item_data["warnings"]),
+            (ModListIcons.error_icon(), item_data["errors"]),
+        ]:
+            if tooltip:
+                badges.append((icon, tooltip))
+
+        name = mod_data.get("name") or "METADATA ERROR"
+        available_width = max(0, width - left - len(badges) * size)
+        name = font_metrics.elidedText(
+            name, Qt.TextElideMode.ElideRight, available_width
+        )
+        name_width = min(font_metrics.horizontalAdvance(name), available_width)
+        name_rect = QRect(left, 0, name_width, height)
+
+        left += name_width
+        badge_rects = []
+        for icon, tooltip in badges:
+            badge_rects.append((QRect(left, top, size, size), icon, tooltip))
+            left += size
+        return icons, name_rect, name, badge_rects
+
+    def get_name_color(self, item_data: CustomListWidgetItemMetadata) -> QColor:
+        """
+        The theme's color for a mod name: filtered, with errors or warnings, or normal.
+        """
+        if item_data["filtered"]:
+            object_name = "ListItemLabelFiltered"
+        elif item_data["errors"] or item_data["warnings"]:
+            object_name = "ListItemLabelInvalid"
+        else:
+            object_name = "ListItemLabel"
+        label = self.name_labels[object_name]
+        label.ensurePolished()
+        return label.palette().color(label.foregroundRole())
+
+    def paint(
+        self,
+        painter: QPainter,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> None:
+        item_data = index.data(Qt.ItemDataRole.UserRole)
+        if item_data is None:
+            return super().paint(painter, option, index)
+
+        # Background, selection and hover from the theme
+        style_option = QStyleOptionViewItem(option)
+        self.initStyleOption(style_option, index)
+        widget = option.widget  # type: ignore[attr-defined]
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(
+            QStyle.ControlElement.CE_ItemViewItem, style_option, painter, widget
+        )
+
+        icons, name_rect, name, badges = self.get_row_layout(option, index)
+        for rect, icon, _ in icons + badges:
+            icon.paint(painter, rect)
+        painter.save()
+        painter.setFont(option.font)  # type: ignore[attr-defined]
+        painter.setPen(self.get_name_color(item_data))
+        painter.drawText(
+            name_rect,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            name,
+        )
+        painter.restore()
+
+    def sizeHint(
+        self,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> QSize:
+        # All rows have the same height, see ModListWidget.setUniformItemSizes
+        return QSize(
+            self.ICON_SIZE,
+            max(self.ICON_SIZE, option.fontMetrics.height()),  # type: ignore[attr-defined]
+        )
+
+    def editorEvent(
+        self,
+        event: QEvent,
+        model: QAbstractItemModel,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> bool:
+        """
+        Toggle the warnings of a mod when its warning or error icon is clicked.
+        """
+        if (
+            isinstance(event, QMouseEvent)
+            and event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+        ):
+            item_data = index.data(Qt.ItemDataRole.UserRole)
+            if item_data is not None:
+                position = event.position().toPoint()
+                if any(
+                    rect.contains(position)
+                    for rect, _, _ in self.get_row_layout(option, index)[3]
+                ):
+                    uuid = item_data["uuid"]
+                    self.toggle_warning_signal.emit(
+                        self.metadata_manager.internal_local_metadata[uuid][
+                            "packageid"
+                        ],
+                        uuid,
+                    )
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(
+        self,
+        event: QHelpEvent,
+        view: QAbstractItemView,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> bool:
+        """
+        Show the tooltip of the icon under the cursor, or of the mod.
+        """
+        item_data = index.data(Qt.ItemDataRole.UserRole)
+        if event.type() != QEvent.Type.ToolTip or item_data is None:
+            return super().helpEvent(event, view, option, index)
+        icons, _, _, badges = self.get_row_layout(option, index)
+        for rect, _, tooltip in icons + badges:
+            if rect.contains(event.pos()):
+                break
+        else:
+            tooltip = get_mod_tool_tip_text(
+                self.metadata_manager.internal_local_metadata.get(item_data["uuid"], {})
+            )
+        QToolTip.showText(event.globalPos(), tooltip, view)
+        return True
+
+
 class ModListWidget(QListWidget):
     """
     Subclass for QListWidget. Used to store lists for
@@ -561,6 +584,7 @@ class ModListWidget(QListWidget):
 
     edit_rules_signal = Signal(bool, str, str)
     item_added_signal = Signal(str)
+    items_added_signal = Signal(list)
     key_press_signal = Signal(str)
     list_update_signal = Signal(str)
     mod_info_signal = Signal(str)
@@ -571,6 +595,9 @@ class ModListWidget(QListWidget):
     steamcmd_downloader_signal = Signal(list)
     steamworks_subscription_signal = Signal(list)
 
+    # Rows above and below the viewport whose layouts are kept when scrolling
+    ROW_LAYOUT_OVERSCAN = 20
+
     def __init__(self, list_type: str, settings_controller: SettingsController) -> None:
         """
         Initialize the ListWidget with a dict of mods.
@@ -588,6 +615,9 @@ class ModListWidget(QListWidget):
 
         self.settings_controller = settings_controller
 
+        # Whether mods can only be browsed, not moved, see set_browse_only()
+        self.browse_only = False
+
         super(ModListWidget, self).__init__()
 
         # Allow for dragging and dropping between lists
@@ -611,10 +641,17 @@ class ModListWidget(QListWidget):
         self.horizontalScrollBar().setEnabled(False)
         self.horizontalScrollBar().setVisible(False)
 
-        # Optimizes performance
-        # self.setUniformItemSizes(True)
+        # Rows are painted by a delegate instead of a widget per row, and all
+        # rows have the same height
+        self.item_delegate = ModListItemDelegate(self, settings_controller)
+        self.item_delegate.toggle_warning_signal.connect(self.toggle_warning)
+        self.setItemDelegate(self.item_delegate)
+        self.setUniformItemSizes(True)
+
+        # Forget the layouts of rows scrolled far out of view
+        self.verticalScrollBar().valueChanged.connect(self.evict_row_layouts)
 
-        # Slot to handle item widgets when itemChanged()
+        # Repaint rows when their item data changes
         self.itemChanged.connect(self.handle_item_data_changed)
 
         # Allow inserting custom list items
@@ -627,13 +664,14 @@ class ModListWidget(QListWidget):
             self.handle_rows_removed, Qt.ConnectionType.QueuedConnection
         )
 
-        # Lazy load ModListItemInner
-        self.verticalScrollBar().valueChanged.connect(self.check_widgets_visible)
-
-        # This set is used to keep track of mods that have been loaded
-        # into widgets. Used for an optimization strategy for `handle_rows_inserted`
+        # The uuids of the items, in list order. Used for an optimization
+        # strategy for `handle_rows_inserted`
         self.uuids: list[str] = []
         self.ignore_warning_list: list[str] = []
+        # Finds the mods to recalculate errors and warnings for as the list changes
+        self.rule_index = ModListRuleIndex()
+        # uuid -> (error summary, warning summary) of the mods with errors or warnings
+        self.errors_warnings_summaries: dict[str, tuple[str, str]] = {}
 
         self.deletion_sub_menu = ModDeletionMenu(
             self._get_selected_metadata,
@@ -711,7 +749,11 @@ class ModListWidget(QListWidget):
         :param object: the source object returned from the event
         :param event: the QEvent type
         """
-        if event.type() == QEvent.Type.ContextMenu and object is self:
+        if (
+            event.type() == QEvent.Type.ContextMenu
+            and object is self
+            and not self.browse_only
+        ):
             # Get the position of the right-click event
             pos = QCursor.pos()
             # Convert the global position to the list widget's coordinate system
@@ -1481,7 +1523,7 @@ class ModListWidget(QListWidget):
         list is in focus.
         """
         key_pressed = QKeySequence(event.key()).toString()
-        if (
+        if not self.browse_only and (
             key_pressed == "Left"
             or key_pressed == "Right"
             or key_pressed == "Return"
@@ -1491,16 +1533,6 @@ class ModListWidget(QListWidget):
         else:
             return super().keyPressEvent(event)
 
-    def resizeEvent(self, e: QResizeEvent) -> None:
-        """
-        When the list widget is resized (as the window is resized),
-        ensure that all visible items have widgets loaded.
-
-        :param event: the resize event
-        """
-        self.check_widgets_visible()
-        return super().resizeEvent(e)
-
     def append_new_item(self, uuid: str) -> None:
         data = CustomListWidgetItemMetadata(uuid=uuid)
         item = CustomListWidgetItem(self)
@@ -1519,21 +1551,6 @@ class ModListWidget(QListWidget):
             mod_list_items.append(item)
         return mod_list_items
 
-    def get_all_loaded_mod_list_items(self) -> list[ModListItemInner]:
-        """
-        This gets all modlist items as ModListItemInner.
-        Mods that have not been loaded or lazy loaded will not be returned.
-
-        :return: List of all modlist items as ModListItemInner
-        """
-        mod_list_items = []
-        for index in range(self.count()):
-            item = self.item(index)
-            widget = self.itemWidget(item)
-            if isinstance(widget, ModListItemInner):
-                mod_list_items.append(widget)
-        return mod_list_items
-
     def get_all_loaded_and_toggled_mod_list_items(self) -> list[CustomListWidgetItem]:
         """
         This returns all modlist items that have their warnings toggled.
@@ -1548,56 +1565,13 @@ class ModListWidget(QListWidget):
                 mod_list_items.append(item)
         return mod_list_items
 
-    def check_item_visible(self, item: CustomListWidgetItem) -> bool:
-        # Determines if the item is currently visible in the viewport.
-        rect = self.visualItemRect(item)
-        return rect.top() < self.viewport().height() and rect.bottom() > 0
-
-    def create_widget_for_item(self, item: CustomListWidgetItem) -> None:
-        data = item.data(Qt.ItemDataRole.UserRole)
-        if data is None:
-            logger.debug("Attempted to create widget for item with None data")
-            return
-        errors_warnings = data["errors_warnings"]
-        errors = data["errors"]
-        warnings = data["warnings"]
-        filtered = data["filtered"]
-        invalid = data["invalid"]
-        mismatch = data["mismatch"]
-        alternative = data["alternative"]
-        uuid = data["uuid"]
-        if uuid:
-            widget = ModListItemInner(
-                errors_warnings=errors_warnings,
-                errors=errors,
-                warnings=warnings,
-                filtered=filtered,
-                invalid=invalid,
-                mismatch=mismatch,
-                alternative=alternative,
-                settings_controller=self.settings_controller,
-                uuid=uuid,
-            )
-            widget.toggle_warning_signal.connect(self.toggle_warning)
-            widget.toggle_error_signal.connect(self.toggle_warning)
-            item.setSizeHint(widget.sizeHint())
-            self.setItemWidget(item, widget)
-
-    def check_widgets_visible(self) -> None:
-        # This function checks the visibility of each item and creates a widget if the item is visible and not already setup.
-        for idx in range(self.count()):
-            item = self.item(idx)
-            # Check for visible item without a widget set
-            if item and self.check_item_visible(item) and self.itemWidget(item) is None:
-                self.create_widget_for_item(item)
-
     def handle_item_data_changed(self, item: CustomListWidgetItem) -> None:
         """
         This slot is called when an item's data changes
         """
-        widget = self.itemWidget(item)
-        if widget is not None and isinstance(widget, ModListItemInner):
-            widget.repolish(item)
+        # While the list is recreated, it is repainted once at the end instead
+        if self.updatesEnabled():
+            self.update(self.indexFromItem(item))
 
     def handle_other_list_row_added(self, uuid: str) -> None:
         """
@@ -1608,43 +1582,45 @@ class ModListWidget(QListWidget):
         if uuid in self.uuids:
             self.uuids.remove(uuid)
 
+    def handle_other_list_rows_added(self, uuids: list[str]) -> None:
+        """
+        When the other list is recreated, its uuids are removed from this list,
+        as in `handle_other_list_row_added`, in a single pass.
+
+        :param uuids: the uuids of the mods in the other list
+        """
+        added = set(uuids)
+        if not added.isdisjoint(self.uuids):
+            self.uuids[:] = [uuid for uuid in self.uuids if uuid not in added]
+
     def handle_rows_inserted(self, parent: QModelIndex, first: int, last: int) -> None:
         """
         This slot is called when rows are inserted.
 
-        When mods are inserted into the mod list, either through the
-        `recreate_mod_list` method above or automatically through dragging
-        and dropping on the UI, this function is called. For single-item
-        inserts, which happens through the above method or through dragging
-        and dropping individual mods, `first` equals `last` and the below
-        loop is just run once. In this loop, a custom widget is created,
-        which displays the text, icons, etc, and is added to the list item.
+        When mods are inserted into the mod list by dragging and dropping on
+        the UI, or by moving them between lists, this function is called.
+        (`recreate_mod_list` inserts its items in bulk without it.) For
+        single-item inserts, `first` equals `last` and the below loop is just
+        run once. In this loop, the uuid of the item is recorded in
+        `self.uuids`. The row itself is painted by ModListItemDelegate.
 
         For dragging and dropping multiple items, the loop is run multiple
         times. Importantly, even for multiple items, the number of list items
         is set BEFORE the loop starts running, e.g. if we were dragging 3 mods
         onto a list of 100 mods, this method is called once and by the start
-        of this method, `self.count()` is already 103; there are 3 "empty"
-        list items that do not have widgets assigned to them.
-
-        However, inserting the initial `n` mods with `recreate_mod_list` has
-        an inefficiency: it is only able to insert one at a time. This means
-        this method is called `n` times for the first `n` mods.
-        One optimization here (saving about 1 second with a 200 mod list) is
-        to not emit the list update signal until the number of widgets is
-        equal to the number of items. If widgets < items, that means
-        widgets are still being added. Only when widgets == items does it mean
-        we are done with adding the initial set of mods. We can do this
-        by keeping track of the number of widgets currently loaded in the list
-        through a set of UUIDs which we can compare to the number of items
-        directly, as this set will equate to the items in the list.
+        of this method, `self.count()` is already 103; there are 3 list
+        items whose uuids are not recorded yet.
+
+        The list update signal is not emitted until the number of recorded
+        uuids is equal to the number of items. If uuids < items, that means
+        items are still being added.
 
         :param parent: parent to get rows under (not used)
         :param first: index of first item inserted
         :param last: index of last item inserted
         """
-        # Loop through the indexes of inserted items, load widgets if not
-        # already loaded. Each item index corresponds to a UUID index.
+        # Loop through the indexes of inserted items. Each item index
+        # corresponds to a UUID index.
         for idx in range(first, last + 1):
             item = self.item(idx)
             if item:
@@ -1670,11 +1646,9 @@ class ModListWidget(QListWidget):
         the count label. For some reason this seems to call twice on
         dragging and dropping multiple mods.
 
-        The condition is required because when we `do_clear` or `do_import`,
-        the existing list needs to be "wiped", and this counts as `n`
-        calls to this function. When this happens, `self.uuids` is
-        cleared and `self.count()` remains at the previous number, so we can
-        just check for equality here.
+        The condition skips the calls made while `self.uuids` does not match
+        the items yet. (`recreate_mod_list`, used by `do_clear` and
+        `do_import`, wipes the list without calling this function.)
 
         :param parent: parent to get rows under (not used)
         :param first: index of first item removed (not used)
@@ -1688,12 +1662,6 @@ class ModListWidget(QListWidget):
             )
             self.list_update_signal.emit(str(self.count()))
 
-    def get_item_widget_at_index(self, idx: int) -> QWidget | None:
-        item = self.item(idx)
-        if item:
-            return self.itemWidget(item)
-        return None
-
     def mod_changed_to(
         self, current: CustomListWidgetItem, previous: CustomListWidgetItem
     ) -> None:
@@ -1727,20 +1695,82 @@ class ModListWidget(QListWidget):
         """
         Method to handle double clicking on a row.
         """
-        # widget = ModListItemInner = self.itemWidget(item)
-        self.key_press_signal.emit("DoubleClick")
+        if not self.browse_only:
+            self.key_press_signal.emit("DoubleClick")
+
+    def set_browse_only(self, browse_only: bool) -> None:
+        """
+        Allow mods to be selected and scrolled through, but not moved between
+        lists or acted on, e.g. while the lists are filled during a refresh.
+
+        :param browse_only: Whether the list is browse only
+        """
+        self.browse_only = browse_only
+        self.setDragDropMode(
+            QAbstractItemView.DragDropMode.NoDragDrop
+            if browse_only
+            else QAbstractItemView.DragDropMode.DragDrop
+        )
+
+    def visible_rows(self) -> range:
+        """
+        The rows shown in the viewport, found from the rows at its top and
+        bottom edges rather than from the rect of every row.
+
+        :return: range of the visible rows, empty if the list is empty
+        """
+        viewport_rect = self.viewport().rect()
+        top = self.indexAt(viewport_rect.topLeft())
+        if not top.isValid():
+            return range(0)
+        bottom = self.indexAt(viewport_rect.bottomLeft())
+        last = bottom.row() if bottom.isValid() else self.count() - 1
+        return range(top.row(), last + 1)
+
+    def evict_row_layouts(self) -> None:
+        """
+        Keep the cached row layouts of the delegate bounded while scrolling:
+        once it holds about twice the rows in and around the viewport, drop the
+        layouts of the rows outside of ROW_LAYOUT_OVERSCAN rows of it.
+        """
+        row_layouts = self.item_delegate.row_layouts
+        rows = self.visible_rows()
+        overscan = self.ROW_LAYOUT_OVERSCAN
+        if len(row_layouts) <= 2 * (len(rows) + 2 * overscan):
+            return
+        start = max(0, rows.start - overscan)
+        kept = set(self.uuids[start : rows.stop + overscan])
+        for uuid in [uuid for uuid in row_layouts if uuid not in kept]:
+            del row_layouts[uuid]
+
+    def neighbour_uuids(self, uuid: str, distance: int) -> list[str]:
+        """
+        The uuids of the mods up to `distance` rows below and above a mod,
+        nearest first, e.g. to prefetch their previews.
 
-    def rebuild_item_widget_from_uuid(self, uuid: str) -> None:
+        :param uuid: the uuid of the mod, usually the current item
+        :param distance: the number of rows on each side
+        :return: the uuids, empty if the mod is not in this list
+        """
+        row = self.currentRow()
+        if not (0 <= row < len(self.uuids) and self.uuids[row] == uuid):
+            if uuid not in self.uuids:
+                return []
+            row = self.uuids.index(uuid)
+        neighbours = []
+        for offset in range(1, distance + 1):
+            for neighbour in (row + offset, row - offset):
+                if 0 <= neighbour < len(self.uuids):
+                    neighbours.append(self.uuids[neighbour])
+        return neighbours
+
+    def update_item_from_uuid(self, uuid: str) -> None:
         item_index = self.uuids.index(uuid)
         item = self.item(item_index)
-        logger.debug(f"Rebuilding widget for item {uuid} at index {item_index}")
-        # Destroy the item's previous widget immediately. Recreate if the item is visible.
-        widget = self.itemWidget(item)
-        if widget:
-            self.removeItemWidget(item)
-        # If it is visible, create a new widget. Otherwise, allow lazy loading to handle this.
-        if self.check_item_visible(item):
-            self.create_widget_for_item(item)
+        logger.debug(f"Updating item {uuid} at index {item_index}")
+        # Repaint the row with the mod's new metadata
+        self.item_delegate.row_layouts.pop(uuid, None)
+        self.update(self.indexFromItem(item))
         # If the current item is selected, update the info panel
         if self.currentItem() == item:
             self.mod_info_signal.emit(uuid)
@@ -1750,18 +1780,23 @@ class ModListWidget(QListWidget):
         Whenever the respective mod list has items added to it, or has
         items removed from it, or has items rearranged around within it,
         calculate the internal list errors / warnings for the mod list
+
+        Only the mods affected by the changes since the last calculation are
+        recalculated, see ModListRuleIndex, and only the rows whose errors or
+        warnings changed are repainted.
         """
         logger.info(f"Recalculating {self.list_type} list errors / warnings")
 
         internal_local_metadata = self.metadata_manager.internal_local_metadata
 
-        packageid_to_uuid = {
-            internal_local_metadata[uuid]["packageid"]: uuid for uuid in self.uuids
-        }
-        package_ids_set = set(packageid_to_uuid.keys())
+        uuids = self.rule_index.update(self.uuids, internal_local_metadata)
+        positions = self.rule_index.positions
+        packageid_to_uuid = self.rule_index.packageid_to_uuid
+        package_ids_set = packageid_to_uuid.keys()
+        summaries = self.errors_warnings_summaries
 
-        package_id_to_errors: dict[str, dict[str, None | set[str] | bool]] = {
-            uuid: {
+        for uuid in uuids:
+            mod_errors: dict[str, None | set[str] | bool] = {
                 "missing_dependencies": set() if self.list_type == "Active" else None,
                 "conflicting_incompatibilities": (
                     set() if self.list_type == "Active" else None
@@ -1774,20 +1809,18 @@ class ModListWidget(QListWidget):
                 != "None"
                 else None,
             }
-            for uuid in self.uuids
-        }
-
-        num_warnings = 0
-        total_warning_text = ""
-        num_errors = 0
-        total_error_text = ""
-
-        for uuid, mod_errors in package_id_to_errors.items():
-            current_mod_index = self.uuids.index(uuid)
+            summaries.pop(uuid, None)
+            current_mod_index = positions[uuid]
             current_item = self.item(current_mod_index)
             if current_item is None:
                 continue
             current_item_data = current_item.data(Qt.ItemDataRole.UserRole)
+            previous_errors_warnings = (
+                current_item_data["mismatch"],
+                current_item_data["errors"],
+                current_item_data["warnings"],
+                current_item_data["errors_warnings"],
+            )
             current_item_data["mismatch"] = False
             current_item_data["errors"] = ""
             current_item_data["warnings"] = ""
@@ -1843,7 +1876,7 @@ class ModListWidget(QListWidget):
                         load_this_before[1]
                         and load_this_before[0] in packageid_to_uuid
                         and current_mod_index
-                        <= self.uuids.index(packageid_to_uuid[load_this_before[0]])
+                        <= positions[packageid_to_uuid[load_this_before[0]]]
                     ):
                         assert isinstance(mod_errors["load_before_violations"], set)
                         mod_errors["load_before_violations"].add(load_this_before[0])
@@ -1854,7 +1887,7 @@ class ModListWidget(QListWidget):
                         load_this_after[1]
                         and load_this_after[0] in packageid_to_uuid
                         and current_mod_index
-                        >= self.uuids.index(packageid_to_uuid[load_this_after[0]])
+                        >= positions[packageid_to_uuid[load_this_after[0]]]
                     ):
                         assert isinstance(mod_errors["load_after_violations"], set)
                         mod_errors["load_after_violations"].add(load_this_after[0])
@@ -1913,6 +1946,7 @@ class ModListWidget(QListWidget):
             ):
                 tool_tip_text += f"\nAn alternative updated mod is recommended:\n{current_item_data['alternative']}"
             # Add to error summary if any missing dependencies or incompatibilities
+            error_summary = ""
             if self.list_type == "Active" and any(
                 [
                     mod_errors[key]
@@ -1922,14 +1956,14 @@ class ModListWidget(QListWidget):
                     ]
                 ]
             ):
-                num_errors += 1
-                total_error_text += f"\n\n{mod_data['name']}"
-                total_error_text += "\n" + "=" * len(mod_data["name"])
-                total_error_text += tool_tip_text
+                error_summary = f"\n\n{mod_data['name']}"
+                error_summary += "\n" + "=" * len(mod_data["name"])
+                error_summary += tool_tip_text
 
             # Add to warning summary if any loadBefore or loadAfter violations, or version mismatch
             # Version mismatch is determined earlier without checking if the mod is in ignore_warning_list
             # so we have to check it again here in order to not display a faulty, empty version warning
+            warning_summary = ""
             if (
                 self.list_type == "Active"
                 and mod_data["packageid"] not in self.ignore_warning_list
@@ -1945,22 +1979,48 @@ class ModListWidget(QListWidget):
                     ]
                 )
             ):
-                num_warnings += 1
-                total_warning_text += f"\n\n{mod_data['name']}"
-                total_warning_text += "\n============================="
-                total_warning_text += tool_tip_text
+                warning_summary = f"\n\n{mod_data['name']}"
+                warning_summary += "\n============================="
+                warning_summary += tool_tip_text
+            if error_summary or warning_summary:
+                summaries[uuid] = (error_summary, warning_summary)
             # Add tooltip to item data and set the data back to the item
             current_item_data["errors_warnings"] = tool_tip_text.strip()
             current_item_data["warnings"] = tool_tip_text[
                 len(current_item_data["errors"]) :
             ].strip()
             current_item_data["errors"] = current_item_data["errors"].strip()
-            current_item.setData(Qt.ItemDataRole.UserRole, current_item_data)
-        logger.info(f"Finished recalculating {self.list_type} list errors and warnings")
+            # Only repaint the rows whose errors or warnings changed
+            if previous_errors_warnings != (
+                current_item_data["mismatch"],
+                current_item_data["errors"],
+                current_item_data["warnings"],
+                current_item_data["errors_warnings"],
+            ):
+                current_item.setData(Qt.ItemDataRole.UserRole, current_item_data)
+
+        # Drop the mods that left the list, and sum up the rest in list order
+        for uuid in [uuid for uuid in summaries if uuid not in positions]:
+            del summaries[uuid]
+        num_warnings = 0
+        total_warning_text = ""
+        num_errors = 0
+        total_error_text = ""
+        for uuid in sorted(summaries, key=positions.__getitem__):
+            error_summary, warning_summary = summaries[uuid]
+            if error_summary:
+                num_errors += 1
+                total_error_text += error_summary
+            if warning_summary:
+                num_warnings += 1
+                total_warning_text += warning_summary
+        logger.info(
+            f"Finished recalculating {self.list_type} list errors and warnings ({len(uuids)} of {len(self.uuids)} mods)"
+        )
         return total_error_text, total_warning_text, num_errors, num_warnings
 
     def _has_replacement(
-        self, package_id: str, dep: str, package_ids_set: set[str]
+        self, package_id: str, dep: str, package_ids_set: AbstractSet[str]
     ) -> bool:
         # Get a list of mods that can replace this mod
         replacements = KNOWN_MOD_REPLACEMENTS.get(dep, set())
@@ -2001,28 +2061,84 @@ class ModListWidget(QListWidget):
 
     def recreate_mod_list(self, list_type: str, uuids: list[str]) -> None:
         """
-        Clear all mod items and add new ones from a dict.
+        Clear all mod items and add new ones, in bulk.
 
-        :param mods: dict of mod data
+        The items are removed and inserted with the list's signals blocked, and
+        without `handle_rows_removed` and `handle_rows_inserted` being called
+        for every row: `self.uuids` is rebuilt at once, and the list update
+        signal is emitted once at the end.
+
+        :param list_type: the type of the list, for logging
+        :param uuids: the uuids of the mods to add, in list order
         """
         logger.info(f"Internally recreating {list_type} mod list")
         # Disable updates
         self.setUpdatesEnabled(False)
-        # Clear list
-        self.clear()
-        self.uuids = list()
-        if uuids:  # Insert data...
+        with self._bulk_update():
+            # Clear list
+            self.clear()
             for uuid_key in uuids:
-                list_item = CustomListWidgetItem(self)
-                data = CustomListWidgetItemMetadata(uuid=uuid_key)
-                list_item.setData(Qt.ItemDataRole.UserRole, data)
-                self.addItem(list_item)
-        else:  # ...unless we don't have mods, at which point reenable updates and exit
-            self.setUpdatesEnabled(True)
-            return
+                self.addItem(self._new_item(uuid_key))
+        self.uuids = list(uuids)
+        # The new items have no errors or warnings yet
+        self.rule_index.invalidate()
+        self.item_delegate.row_layouts.clear()
         # Enable updates and repaint
         self.setUpdatesEnabled(True)
         self.repaint()
+        if uuids:
+            self.items_added_signal.emit(self.uuids)
+        logger.debug(
+            f"Emitting {self.list_type} list update signal after recreating list [{self.count()}]"
+        )
+        self.list_update_signal.emit(str(self.count()))
+
+    @contextmanager
+    def _bulk_update(self) -> Iterator[None]:
+        """
+        Add or remove items with the list's signals blocked, and without
+        `handle_rows_inserted` and `handle_rows_removed` being called for every
+        row. The caller keeps `self.uuids` in sync with the items.
+        """
+        self.model().rowsInserted.disconnect(self.handle_rows_inserted)
+        self.model().rowsAboutToBeRemoved.disconnect(self.handle_rows_removed)
+        signals_blocked = self.blockSignals(True)
+        try:
+            yield
+        finally:
+            self.blockSignals(signals_blocked)
+            self.model().rowsInserted.connect(
+                self.handle_rows_inserted, Qt.ConnectionType.QueuedConnection
+            )
+            self.model().rowsAboutToBeRemoved.connect(
+                self.handle_rows_removed, Qt.ConnectionType.QueuedConnection
+            )
+
+    @staticmethod
+    def _new_item(uuid: str) -> CustomListWidgetItem:
+        list_item = CustomListWidgetItem()
+        data = CustomListWidgetItemMetadata(uuid=uuid)
+        list_item.setData(Qt.ItemDataRole.UserRole, data, avoid_emit=True)
+        return list_item
+
+    def insert_uuids(self, rows: list[tuple[int, str]]) -> None:
+        """
+        Insert mods at the given rows, in bulk, e.g. as they are parsed during a
+        progressive refresh.
+
+        Unlike `recreate_mod_list`, the list update signal is not emitted, so
+        the errors and warnings of the list are not recalculated.
+
+        :param rows: (row, uuid) of the mods, each row counting the mods
+            inserted before it
+        """
+        if not rows:
+            return
+        with self._bulk_update():
+            for row, uuid in rows:
+                self.insertItem(row, self._new_item(uuid))
+                self.uuids.insert(row, uuid)
+        self.items_added_signal.emit([uuid for _, uuid in rows])
 
     def toggle_warning(self, packageid: str, uuid: str) -> None:
         logger.debug(f"Toggled warning icon for: {packageid}")
@@ -2036,6 +2152,7 @@ class ModListWidget(QListWidget):
             self.ignore_warning_list.remove(packageid)
             item_data["warning_toggled"] = False
         item.setData(Qt.ItemDataRole.UserRole, item_data)
+        self.rule_index.invalidate([uuid])
         self.recalculate_warnings_signal.emit()
 
     def replaceItemAtIndex(self, index: int, item: CustomListWidgetItem) -> None:
@@ -2074,6 +2191,9 @@ class ModsPanel(QWidget):
     save_btn_animation_signal = Signal()
     check_dependencies_signal = Signal()
 
+    # Milliseconds to wait after the last keystroke before searching
+    SEARCH_DELAY = 150
+
     def __init__(self, settings_controller: SettingsController) -> None:
         """
         Initialize the class.
@@ -2216,6 +2336,13 @@ class ModsPanel(QWidget):
         self.active_mods_search_mode_filter_button.clicked.connect(
             self.on_active_mods_mode_filter_toggle
         )
+        self.active_mods_search_table = ModSearchTable()
+        self.active_mods_search_timer = QTimer(self)
+        self.active_mods_search_timer.setSingleShot(True)
+        self.active_mods_search_timer.setInterval(self.SEARCH_DELAY)
+        self.active_mods_search_timer.timeout.connect(
+            self.on_active_mods_search_timeout
+        )
         self.active_mods_search = QLineEdit()
         self.active_mods_search.setClearButtonEnabled(True)
         self.active_mods_search.textChanged.connect(self.on_active_mods_search)
@@ -2347,6 +2474,13 @@ class ModsPanel(QWidget):
         self.inactive_mods_search_mode_filter_button.clicked.connect(
             self.on_inactive_mods_mode_filter_toggle
         )
+        self.inactive_mods_search_table = ModSearchTable()
+        self.inactive_mods_search_timer = QTimer(self)
+        self.inactive_mods_search_timer.setSingleShot(True)
+        self.inactive_mods_search_timer.setInterval(self.SEARCH_DELAY)
+        self.inactive_mods_search_timer.timeout.connect(
+            self.on_inactive_mods_search_timeout
+        )
         self.inactive_mods_search = QLineEdit()
         self.inactive_mods_search.setClearButtonEnabled(True)
         self.inactive_mods_search.textChanged.connect(self.on_inactive_mods_search)
@@ -2421,7 +2555,16 @@ class ModsPanel(QWidget):
         self.mod_list_updated(count=count, list_type="Active")
 
     def on_active_mods_search(self, pattern: str) -> None:
-        self.signal_search_and_filters(list_type="Active", pattern=pattern)
+        # Search once typing pauses, rather than on every keystroke
+        self.active_mods_search_timer.start()
+
+    def on_active_mods_search_timeout(self) -> None:
+        # Searching does not change the errors and warnings of the mods
+        self.signal_search_and_filters(
+            list_type="Active",
+            pattern=self.active_mods_search.text(),
+            recalculate_list_errors_warnings=False,
+        )
 
     def on_active_mods_search_clear(self) -> None:
         self.signal_clear_search(list_type="Active")
@@ -2439,7 +2582,16 @@ class ModsPanel(QWidget):
         self.mod_list_updated(count=count, list_type="Inactive")
 
     def on_inactive_mods_search(self, pattern: str) -> None:
-        self.signal_search_and_filters(list_type="Inactive", pattern=pattern)
+        # Search once typing pauses, rather than on every keystroke
+        self.inactive_mods_search_timer.start()
+
+    def on_inactive_mods_search_timeout(self) -> None:
+        # Searching does not change the errors and warnings of the mods
+        self.signal_search_and_filters(
+            list_type="Inactive",
+            pattern=self.inactive_mods_search.text(),
+            recalculate_list_errors_warnings=False,
+        )
 
     def on_inactive_mods_search_clear(self) -> None:
         self.signal_clear_search(list_type="Inactive")
@@ -2457,8 +2609,6 @@ class ModsPanel(QWidget):
         self.inactive_mods_list.append_new_item(uuid)
 
     def apply_mods_filter_type(self, list_type: str) -> None:
-        # Define the mod types
-        mod_types = ["csharp", "xml"]
         source_filter_index: int = (
             self.active_data_source_filter_type_index
             or self.inactive_data_source_filter_type_index
@@ -2496,26 +2646,6 @@ class ModsPanel(QWidget):
                 SEARCH_DATA_SOURCE_FILTER_INDEXES[source_index]
             )
 
-        mod_list = (
-            self.active_mods_list if list_type == "Active" else self.inactive_mods_list
-        )
-
-        # Apply filtering based on the selected type
-        for uuid in mod_list.uuids:
-            item = mod_list.item(mod_list.uuids.index(uuid))
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-
-            # Determine the mod type
-            mod_type = (
-                "csharp"
-                if self.metadata_manager.internal_local_metadata.get(uuid, {}).get(
-                    "csharp"
-                )
-                else "xml"
-            )
-            if mod_type and mod_types:
-                item.setData(Qt.ItemDataRole.UserRole, item_data)
-
         if source_index == 0:
             filters_active = False
         else:
@@ -2540,15 +2670,18 @@ class ModsPanel(QWidget):
             self.update_count(list_type="Inactive")
 
     def on_mod_metadata_updated(self, uuid: str) -> None:
+        self.active_mods_search_table.invalidate(uuid)
+        self.inactive_mods_search_table.invalidate(uuid)
+        # The rules of the mod, and of the mods it refers to, may have changed
+        self.active_mods_list.rule_index.invalidate()
+        self.inactive_mods_list.rule_index.invalidate()
         if uuid in self.active_mods_list.uuids:
-            self.active_mods_list.rebuild_item_widget_from_uuid(uuid=uuid)
+            self.active_mods_list.update_item_from_uuid(uuid=uuid)
         elif uuid in self.inactive_mods_list.uuids:
-            self.inactive_mods_list.rebuild_item_widget_from_uuid(uuid=uuid)
+            self.inactive_mods_list.update_item_from_uuid(uuid=uuid)
 
     def recalculate_list_errors_warnings(self, list_type: str) -> None:
         if list_type == "Active":
-            # Check if all visible items have their widgets loaded
-            self.active_mods_list.check_widgets_visible()
             # Calculate internal errors and warnings for all mods in the respective mod list
             total_error_text, total_warning_text, num_errors, num_warnings = (
                 self.active_mods_list.recalculate_internal_errors_warnings()
@@ -2575,8 +2708,6 @@ class ModsPanel(QWidget):
             # The purpose of this is for the _do_save_animation slot in the main_content_panel
             EventBus().list_updated_signal.emit()
         else:
-            # Check if all visible items have their widgets loaded
-            self.inactive_mods_list.check_widgets_visible()
             # Calculate internal errors and warnings for all mods in the respective mod list
             self.inactive_mods_list.recalculate_internal_errors_warnings()
 
@@ -2619,10 +2750,6 @@ class ModsPanel(QWidget):
             recalculate_list_errors_warnings (bool): If the list errors and warnings should be recalculated, defaults to True.
         """
 
-        _filter = None
-        filter_state = None  # The 'Hide Filter' state
-        source_filter = None
-        uuids = None
         # Notify controller when search bar text or any filters change
         if list_type == "Active":
             EventBus().filters_changed_in_active_modlist.emit()
@@ -2633,94 +2760,74 @@ class ModsPanel(QWidget):
             _filter = self.active_mods_search_filter
             filter_state = self.active_mods_search_filter_state
             source_filter = self.active_mods_data_source_filter
-            uuids = self.active_mods_list.uuids
+            type_filter_index = self.active_data_source_filter_type_index
+            mod_list = self.active_mods_list
+            search_table = self.active_mods_search_table
+            search_timer = self.active_mods_search_timer
         elif list_type == "Inactive":
             _filter = self.inactive_mods_search_filter
             filter_state = self.inactive_mods_search_filter_state
             source_filter = self.inactive_mods_data_source_filter
-            uuids = self.inactive_mods_list.uuids
+            type_filter_index = self.inactive_data_source_filter_type_index
+            mod_list = self.inactive_mods_list
+            search_table = self.inactive_mods_search_table
+            search_timer = self.inactive_mods_search_timer
         else:
             raise NotImplementedError(f"Unknown list type: {list_type}")
-        # Evaluate the search filter state for the list
-        search_filter = None
-        if _filter.currentText() == "Name":
-            search_filter = "name"
-        elif _filter.currentText() == "PackageId":
-            search_filter = "packageid"
-        elif _filter.currentText() == "Author(s)":
-            search_filter = "authors"
-        elif _filter.currentText() == "PublishedFileId":
-            search_filter = "publishedfileid"
-        # Filter the list using any search and filter state
-        for uuid in uuids:
-            item = (
-                self.active_mods_list.item(uuids.index(uuid))
-                if list_type == "Active"
-                else self.inactive_mods_list.item(uuids.index(uuid))
-            )
+        # This search replaces any search still waiting for typing to pause
+        search_timer.stop()
+        if pattern != "":
+            filters_active = True
+        hide_invalid = (
+            self.settings_controller.settings.hide_invalid_mods_when_filtering_toggle
+        )
+        # Evaluate the search and filters for the whole list at once
+        search_table.update(
+            mod_list.uuids, self.metadata_manager.internal_local_metadata
+        )
+        filtered = search_table.filter(
+            SEARCH_FIELDS.get(_filter.currentText(), "name"),
+            pattern,
+            source_filter,
+            type_filter_index,
+        )
+        # Only update the items whose visibility or filter state changed
+        for row, item_filtered in enumerate(filtered):
+            item = mod_list.item(row)
             if item is None:
                 continue
             item_data = item.data(Qt.ItemDataRole.UserRole)
-            metadata = self.metadata_manager.internal_local_metadata[uuid]
-            if pattern != "":
-                filters_active = True
+            hidden = item.isHidden()
+            hidden_by_filter = item_data["hidden_by_filter"]
             # Hide invalid items if enabled in settings
-            if self.settings_controller.settings.hide_invalid_mods_when_filtering_toggle:
-                invalid = item_data["invalid"]
-                # TODO: I dont think filtered should be set at all for invalid items... I misunderstood what it represents
-                if invalid and filters_active:
-                    item_data["filtered"] = True
-                    item.setHidden(True)
-                    continue
-                elif invalid and not filters_active:
-                    item_data["filtered"] = False
-                    item.setHidden(False)
-            # Check if the item is filtered
-            item_filtered = item_data["filtered"]
-            # Check if the item should be filtered or not based on search filter
-            if (
-                pattern
-                and metadata.get(search_filter)
-                and pattern.lower() not in str(metadata.get(search_filter)).lower()
-            ):
-                item_filtered = True
-            elif source_filter == "all":  # or data source
-                item_filtered = False
-            elif source_filter == "git_repo":
-                item_filtered = not metadata.get("git_repo")
-            elif source_filter == "steamcmd":
-                item_filtered = not metadata.get("steamcmd")
-            elif source_filter != metadata.get("data_source"):
-                item_filtered = True
-
-            type_filter_index = (
-                self.active_data_source_filter_type_index
-                if list_type == "Active"
-                else self.inactive_data_source_filter_type_index
-            )
-
-            if type_filter_index == 1 and not metadata.get("csharp"):
-                item_filtered = True
-            elif type_filter_index == 2 and metadata.get("csharp"):
+            # TODO: I dont think filtered should be set at all for invalid items... I misunderstood what it represents
+            if hide_invalid and item_data["invalid"] and filters_active:
                 item_filtered = True
-
-            # Check if the item should be filtered or hidden based on filter state
-            if filter_state:
-                item.setHidden(item_filtered)
-                if item_filtered:
-                    item_data["hidden_by_filter"] = True
+                hide = True
+            else:
+                if hide_invalid and item_data["invalid"]:
+                    hidden = False
+                # Check if the item should be filtered or hidden based on filter state
+                if filter_state:
+                    hide = item_filtered
+                    hidden_by_filter = item_filtered
                     item_filtered = False
+                elif item_filtered and hidden:
+                    hide = False
+                    hidden_by_filter = False
                 else:
-                    item_data["hidden_by_filter"] = False
-            else:
-                if item_filtered and item.isHidden():
-                    item.setHidden(False)
-                    item_data["hidden_by_filter"] = False
-            # Update item data
-            item_data["filtered"] = item_filtered
-            item.setData(Qt.ItemDataRole.UserRole, item_data)
+                    hide = hidden
+            if hide != item.isHidden():
+                item.setHidden(hide)
+            if (
+                item_filtered != item_data["filtered"]
+                or hidden_by_filter != item_data["hidden_by_filter"]
+            ):
+                item_data["filtered"] = item_filtered
+                item_data["hidden_by_filter"] = hidden_by_filter
+                item.setData(Qt.ItemDataRole.UserRole, item_data)
         self.mod_list_updated(
-            str(len(uuids)),
+            str(len(mod_list.uuids)),
             list_type,
             recalculate_list_errors_warnings=recalculate_list_errors_warnings,
         )
@@ -2822,19 +2929,13 @@ class ModsPanel(QWidget):
             if list_type == "Active"
             else self.inactive_mods_search
         )
-        uuids = (
-            self.active_mods_list.uuids
-            if list_type == "Active"
-            else self.inactive_mods_list.uuids
+        mod_list = (
+            self.active_mods_list if list_type == "Active" else self.inactive_mods_list
         )
         num_filtered = 0
         num_unfiltered = 0
-        for uuid in uuids:
-            item = (
-                self.active_mods_list.item(uuids.index(uuid))
-                if list_type == "Active"
-                else self.inactive_mods_list.item(uuids.index(uuid))
-            )
+        for row in range(len(mod_list.uuids)):
+            item = mod_list.item(row)
             if item is None:
                 continue
             item_data = item.data(Qt.ItemDataRole.UserRole)
@@ -468,6 +468,16 @@ class SettingsDialog(QDialog):
         self.sorting_topological_radio = QRadioButton("Topologically")
         sort_group_box_layout.addWidget(self.sorting_topological_radio)
 
+        self.incremental_sort_checkbox = QCheckBox(
+            "Only re-sort mods affected by changes since the last sort"
+        )
+        self.incremental_sort_checkbox.setToolTip(
+            "Mods that were added, removed or had their rules changed are sorted again\n"
+            "together with the mods they are connected to, the rest keep their place.\n"
+            "Falls back to a full sort if the list was reordered by hand."
+        )
+        sort_group_box_layout.addWidget(self.incremental_sort_checkbox)
+
         # Dependencies group
         deps_group_box = QGroupBox("Sort Dependencies")
         tab_layout.addWidget(deps_group_box)
@@ -849,6 +859,48 @@ class SettingsDialog(QDialog):
         )
         group_layout.addWidget(self.render_unity_rich_text_checkbox)
 
+        self.use_compiled_steam_db_checkbox = QCheckBox(
+            "Load Steam DB from a compiled cache"
+        )
+        self.use_compiled_steam_db_checkbox.setToolTip(
+            "Converts steamDB.json to a compact binary file whenever it changes, and only\n"
+            "reads the entries RimSort needs. Uses much less memory with large databases."
+        )
+        group_layout.addWidget(self.use_compiled_steam_db_checkbox)
+
+        self.progressive_refresh_checkbox = QCheckBox(
+            "Fill mod lists while mods are being parsed"
+        )
+        self.progressive_refresh_checkbox.setToolTip(
+            "Mods appear in the mod lists as soon as they are parsed when refreshing, and\n"
+            "can be browsed right away. Dependencies, errors and warnings are filled in\n"
+            "once every mod has been parsed."
+        )
+        group_layout.addWidget(self.progressive_refresh_checkbox)
+
+        parser_backend_group = QGroupBox()
+        tab_layout.addWidget(parser_backend_group)
+
+        parser_backend_layout = QHBoxLayout()
+        parser_backend_group.setLayout(parser_backend_layout)
+
+        parser_backend_label = QLabel("Parse mod metadata using:")
+        parser_backend_layout.addWidget(parser_backend_label)
+
+        self.metadata_parser_threads_radio = QRadioButton("Threads")
+        self.metadata_parser_threads_radio.setToolTip(
+            "Parse mods on a thread pool. Starts instantly; best for small mod lists."
+        )
+        parser_backend_layout.addWidget(self.metadata_parser_threads_radio)
+
+        self.metadata_parser_processes_radio = QRadioButton("Processes")
+        self.metadata_parser_processes_radio.setToolTip(
+            "Parse mods on a pool of worker processes, using every CPU core.\n"
+            "Faster for large mod lists when mods are not already cached."
+        )
+        parser_backend_layout.addWidget(self.metadata_parser_processes_radio)
+        parser_backend_layout.addStretch()
+
         auth_group = QGroupBox()
         tab_layout.addWidget(auth_group)
 
@@ -905,6 +957,12 @@ class SettingsDialog(QDialog):
 
         buttons_layout.addStretch()
 
+        self.clear_metadata_cache_button = QPushButton("Clear metadata cache")
+        self.clear_metadata_cache_button.setToolTip(
+            "Forget cached mod metadata so that every mod is parsed again on the next refresh."
+        )
+        buttons_layout.addWidget(self.clear_metadata_cache_button)
+
         run_args_group = QGroupBox()
         tab_layout.addWidget(run_args_group)
 
@@ -1,7 +1,7 @@
 import os
 from platform import system
 from re import compile, findall, search
-from typing import Any, Sequence
+from typing import Any, Mapping, Sequence
 
 import psutil
 from loguru import logger
@@ -40,7 +40,7 @@ class RunnerPanel(QWidget):
         self,
         todds_dry_run_support: bool = False,
         steamcmd_download_tracking: list[str] = [],
-        steam_db: dict[str, Any] = {},
+        steam_db: Mapping[str, Any] = {},
     ):
         super().__init__()
 
@@ -0,0 +1,75 @@
+"""
+Compare xml_path_to_json with the targeted about_xml_to_json extractor.
+
+Usage: python -m tests.benchmarks.about_xml_parsing [--iterations 200] [--synthetic 0]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from app.utils.xml import about_xml_to_json, xml_path_to_json
+from tests.reference.synthetic_mods import generate_mod_tree
+
+MOD_EXAMPLES = Path("tests/data/mod_examples")
+
+
+def find_about_xml_files(root: Path) -> list[str]:
+    return sorted(
+        str(path) for path in root.rglob("*") if path.name.lower() == "about.xml"
+    )
+
+
+def time_parser(
+    parser: Callable[[str], dict[str, Any]], files: list[str], iterations: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for file in files:
+            parser(file)
+    return time.perf_counter() - start
+
+
+def report(label: str, files: list[str], iterations: int) -> None:
+    # Warm the OS file cache so both parsers see the same conditions
+    time_parser(xml_path_to_json, files, 1)
+    generic = time_parser(xml_path_to_json, files, iterations)
+    targeted = time_parser(about_xml_to_json, files, iterations)
+    parsed = len(files) * iterations
+    print(f"\n{label}: {len(files)} files x {iterations} iterations")
+    print("-" * 40)
+    print(f"{'xml_path_to_json':<20} {generic / parsed * 1e6:>10.1f} us/file")
+    print(f"{'about_xml_to_json':<20} {targeted / parsed * 1e6:>10.1f} us/file")
+    print(f"{'speedup':<20} {generic / targeted:>10.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="Also benchmark N synthetic mods"
+    )
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+
+    report(
+        "tests/data/mod_examples", find_about_xml_files(MOD_EXAMPLES), args.iterations
+    )
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generate_mod_tree(Path(temp_dir), args.synthetic)
+            report(
+                f"{args.synthetic} synthetic mods",
+                find_about_xml_files(Path(temp_dir)),
+                max(1, args.iterations // 100),
+            )
+
+
+if __name__ == "__main__":
+    main()
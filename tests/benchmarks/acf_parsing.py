@@ -0,0 +1,101 @@
+"""
+Compare reading and writing appworkshop_294100.acf with steamfiles, as
+acf_to_dict() and dict_to_acf() used to, and with the vdf module.
+
+Times parsing a synthetic SteamCMD .acf file, writing it back, and removing a
+few mods from it as steamcmd_purge_mods() does: by parsing, editing and
+rewriting the whole file, or by patching only the entries of those mods.
+
+Usage: python -m tests.benchmarks.acf_parsing [--items 10000] [--remove 10]
+    [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable
+
+from tests.reference.synthetic_mods import generate_acf
+
+SECTIONS = ("WorkshopItemsInstalled", "WorkshopItemDetails")
+
+
+def best_of(repeat: int, target: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        target()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--remove", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from steamfiles import acf
+
+    from app.utils.steam.steamfiles import vdf
+
+    acf_data = generate_acf(args.items)
+    data = acf.dumps(acf_data).encode("utf-8")
+    assert vdf.dumps(acf_data) == data
+    assert vdf.loads(data) == acf.loads(data.decode("utf-8")) == acf_data
+    removed = random.Random(1).sample(
+        sorted(acf_data["AppWorkshop"]["WorkshopItemsInstalled"]), args.remove
+    )
+
+    def steamfiles_remove() -> bytes:
+        parsed = acf.loads(str(data, encoding="utf-8"))
+        for section in SECTIONS:
+            for publishedfileid in removed:
+                parsed["AppWorkshop"][section].pop(publishedfileid, None)
+        return acf.dumps(parsed).encode("utf-8")
+
+    def vdf_remove() -> bytes:
+        # steamcmd_purge_mods() parses the file for the manifests to delete
+        vdf.loads(data)
+        patched = data
+        for section in SECTIONS:
+            patched = vdf.patch(
+                patched, ("AppWorkshop", section), dict.fromkeys(removed)
+            )
+        return patched
+
+    assert vdf_remove() == steamfiles_remove()
+
+    results = [
+        (
+            "parse",
+            best_of(args.repeat, lambda: acf.loads(str(data, encoding="utf-8"))),
+            best_of(args.repeat, lambda: vdf.loads(data)),
+        ),
+        (
+            "write",
+            best_of(args.repeat, lambda: acf.dumps(acf_data).encode("utf-8")),
+            best_of(args.repeat, lambda: vdf.dumps(acf_data)),
+        ),
+        (
+            f"remove {args.remove} mods",
+            best_of(args.repeat, steamfiles_remove),
+            best_of(args.repeat, vdf_remove),
+        ),
+    ]
+
+    print(
+        f"\nappworkshop .acf with {args.items} mods ({len(data) / 1024**2:.1f} MB), "
+        f"best of {args.repeat}:"
+    )
+    print(f"{'':<16} {'steamfiles':>12} {'vdf':>10} {'speedup':>8}")
+    print("-" * 50)
+    for name, before, after in results:
+        print(f"{name:<16} {before:>10.3f} s {after:>8.3f} s {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compare alphabetical_sort() with the previous list.index()/list.insert() implementation.
+
+Usage: python -m tests.benchmarks.alphabetical_sort [--mods 500 2000 10000] [--max-reference 2000]
+"""
+
+import argparse
+import sys
+import time
+
+from app.sort.alphabetical_sort import alphabetical_sort
+from tests.reference.alphabetical_sort import (
+    generate_sort_input,
+    reference_alphabetical_sort,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mods", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument(
+        "--max-reference",
+        type=int,
+        default=2000,
+        help="Skip the previous implementation above this many mods",
+    )
+    args = parser.parse_args()
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max(args.mods)))
+
+    print(f"\n{'mods':>8} {'previous':>12} {'tracked':>12} {'speedup':>10}")
+    print("-" * 46)
+    for mods in args.mods:
+        sort_input = generate_sort_input(mods)
+
+        start = time.perf_counter()
+        result = alphabetical_sort(*sort_input)
+        tracked = time.perf_counter() - start
+
+        if mods > args.max_reference:
+            print(f"{mods:>8} {'-':>12} {tracked:>10.3f} s")
+            continue
+
+        start = time.perf_counter()
+        expected = reference_alphabetical_sort(*sort_input)
+        reference = time.perf_counter() - start
+
+        assert result == expected, "Implementations produced different output"
+        print(
+            f"{mods:>8} {reference:>10.3f} s {tracked:>10.3f} s {reference / tracked:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
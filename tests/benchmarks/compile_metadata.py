@@ -0,0 +1,83 @@
+"""
+Compare the About.xml part of compile_metadata() with the previous version, which
+read every rule tag of every mod on each compile, re-split the game version for
+each version specific tag and collected the installed package ids for every
+incompatibility.
+
+Usage: python -m tests.benchmarks.compile_metadata [--mods 3000] [--repeat 3] [--profile]
+"""
+
+import argparse
+import copy
+import cProfile
+import pstats
+import time
+from typing import Any
+
+from loguru import logger
+
+from app.utils.metadata import (
+    MetadataManager,
+)
+from tests.reference.metadata import (
+    generate_compile_input,
+    reference_compile_about_xml_rules,
+)
+from tests.reference.synthetic_mods import metadata_manager_state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mods", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--profile", action="store_true", help="Print the top functions of each"
+    )
+    args = parser.parse_args()
+
+    logger.remove()
+
+    corpus, uuids = generate_compile_input(args.mods)
+
+    def reference(state: Any) -> None:
+        reference_compile_about_xml_rules(state, uuids)
+
+    def compiled(state: Any) -> None:
+        MetadataManager.compile_metadata(state, uuids)
+
+    # Rule tables compiled before, as after a refresh of unchanged mods
+    warm_state = metadata_manager_state(copy.deepcopy(corpus))
+    compiled(warm_state)
+
+    def new_state(warm: bool) -> Any:
+        state = metadata_manager_state(copy.deepcopy(corpus))
+        if warm:
+            state.mod_rule_tables = warm_state.mod_rule_tables
+        return state
+
+    print(f"\nCompiling About.xml rules of {len(uuids)} mods:")
+    print("-" * 40)
+    timings = {}
+    for name, function, warm in [
+        ("previous", reference, False),
+        ("rule tables", compiled, False),
+        ("cached tables", compiled, True),
+    ]:
+        best = float("inf")
+        for _ in range(args.repeat):
+            state = new_state(warm)
+            start = time.perf_counter()
+            function(state)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+        print(f"{name:<16} {best:>10.3f} s")
+        if args.profile:
+            profiler = cProfile.Profile()
+            profiler.runcall(function, new_state(warm))
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(12)
+    for name in ["rule tables", "cached tables"]:
+        print(f"{'speedup':<16} {timings['previous'] / timings[name]:>10.1f}x ({name})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Compare gen_tier_deps_graphs() with the previous graph builders used by
+Sorter.generate_dependency_graphs().
+
+Usage: python -m tests.benchmarks.dependency_graphs [--mods 500 2000 10000] [--tail 24]
+"""
+
+import argparse
+import time
+
+from app.sort.dependencies import (
+    gen_tier_deps_graphs,
+)
+from tests.reference.dependencies import (
+    generate_sort_metadata,
+    reference_gen_tier_deps_graphs,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mods", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument(
+        "--tail", type=int, default=24, help="Length of the loadTheseAfter chain"
+    )
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+
+    print(f"\n{'mods':>8} {'previous':>12} {'one pass':>12} {'speedup':>10}")
+    print("-" * 46)
+    for mods in args.mods:
+        active_uuids, active_package_ids, metadata = generate_sort_metadata(
+            mods, args.tail
+        )
+
+        start = time.perf_counter()
+        expected = reference_gen_tier_deps_graphs(
+            active_uuids, list(active_package_ids), metadata
+        )
+        reference = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = gen_tier_deps_graphs(active_uuids, active_package_ids, metadata)
+        fused = time.perf_counter() - start
+
+        assert result == expected, "Implementations produced different output"
+        print(
+            f"{mods:>8} {reference:>10.3f} s {fused:>10.3f} s {reference / fused:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
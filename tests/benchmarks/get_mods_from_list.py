@@ -0,0 +1,47 @@
+"""
+Compare get_mods_from_package_ids() with the previous nested-loop implementation.
+
+Usage: python -m tests.benchmarks.get_mods_from_list [--active 3000] [--installed 8000]
+"""
+
+import argparse
+import time
+
+from app.utils.metadata import get_mods_from_package_ids
+from tests.reference.metadata import (
+    generate_mods,
+    reference_get_mods_from_package_ids,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--active", type=int, default=3000)
+    parser.add_argument("--installed", type=int, default=8000)
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+
+    all_mods, package_ids = generate_mods(args.installed, args.active)
+
+    start = time.perf_counter()
+    expected = reference_get_mods_from_package_ids(all_mods, package_ids)
+    reference = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = get_mods_from_package_ids(all_mods, package_ids)
+    indexed = time.perf_counter() - start
+
+    assert result == expected, "Implementations produced different output"
+
+    print(f"\n{len(package_ids)} active / {len(all_mods)} installed mods:")
+    print("-" * 40)
+    print(f"{'nested loops':<16} {reference:>10.3f} s")
+    print(f"{'indexed':<16} {indexed:>10.3f} s")
+    print(f"{'speedup':<16} {reference / indexed:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare the thread pool and process pool metadata parser backends.
+
+Usage: python -m tests.benchmarks.metadata_parser_backends [--mods 2000]
+"""
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from multiprocessing import cpu_count
+from pathlib import Path
+from typing import Any
+
+from PySide6.QtCore import QMutex, QThreadPool
+
+from app.utils.generic import chunks
+from app.utils.metadata_parser import (
+    init_parser_process,
+    parse_mod_batch,
+    parse_mod_metadata,
+)
+from tests.reference.synthetic_mods import generate_mod_tree
+
+
+def parse_with_threads(mod_directories: list[str]) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    mutex = QMutex()
+    threadpool = QThreadPool.globalInstance()
+
+    def parse(mod_directory: str) -> None:
+        metadata, _ = parse_mod_metadata("workshop", mod_directory, mod_directory, None)
+        mutex.lock()
+        results[mod_directory] = metadata
+        mutex.unlock()
+
+    for mod_directory in mod_directories:
+        threadpool.start(lambda mod_directory=mod_directory: parse(mod_directory))
+    threadpool.waitForDone()
+    return results
+
+
+def parse_with_processes(mod_directories: list[str]) -> dict[str, Any]:
+    num_processes = cpu_count()
+    batch = [(mod_directory, mod_directory) for mod_directory in mod_directories]
+    results: dict[str, Any] = {}
+    with ProcessPoolExecutor(
+        max_workers=num_processes,
+        initializer=init_parser_process,
+        initargs=(None,),
+    ) as pool:
+        futures = [
+            pool.submit(parse_mod_batch, "workshop", chunk)
+            for chunk in chunks(
+                _list=batch, limit=max(1, ceil(len(batch) / (num_processes * 4)))
+            )
+        ]
+        for future in futures:
+            for result in future.result():
+                results[result.mod_directory] = result.metadata
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mods", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print(f"Generating {args.mods} synthetic mods...")
+        mod_directories = generate_mod_tree(Path(temp_dir), args.mods)
+
+        # Warm the OS file cache so both backends see the same conditions
+        parse_with_threads(mod_directories)
+
+        timings: dict[str, list[float]] = {"threads": [], "processes": []}
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            thread_results = parse_with_threads(mod_directories)
+            timings["threads"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            process_results = parse_with_processes(mod_directories)
+            timings["processes"].append(time.perf_counter() - start)
+
+        assert thread_results == process_results, "Backends produced different output"
+
+    print(f"\nParsed {args.mods} mods, best of {args.repeat} ({cpu_count()} CPUs):")
+    print("-" * 40)
+    for backend, times in timings.items():
+        print(f"{backend:<12} {min(times):>8.3f} s")
+    print(
+        f"{'speedup':<12} {min(timings['threads']) / min(timings['processes']):>8.2f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Time populating and scrolling a ModListWidget on a synthetic mod corpus.
+
+populate: recreate_mod_list() until the list update signal for all rows, and the
+first paint. populate (previous): the same with the previous version of
+recreate_mod_list(), which inserted the rows one at a time, each handled by
+handle_rows_inserted(). scroll: scroll from the top to the bottom a page at a time,
+repainting each page, as when dragging the scroll bar. wheel: scroll down
+--wheel-steps rows a step at a time, repainting each step, as with the mouse
+wheel. Also reports the most rows whose layout was cached at once.
+
+Usage: python -m tests.benchmarks.mod_list [--mods 1000 10000] [--wheel-steps 500]
+    [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any
+from unittest.mock import patch
+
+from tests.reference.mods_panel import populate, settings_controller
+from tests.reference.synthetic_mods import generate_mod_corpus, metadata_manager_state
+
+
+def scroll(mod_list: Any) -> int:
+    """
+    :return: The number of pages scrolled
+    """
+    scroll_bar = mod_list.verticalScrollBar()
+    pages = 0
+    scroll_bar.setValue(0)
+    while True:
+        mod_list.viewport().repaint()
+        pages += 1
+        if scroll_bar.value() >= scroll_bar.maximum():
+            return pages
+        scroll_bar.setValue(scroll_bar.value() + scroll_bar.pageStep())
+
+
+def wheel(mod_list: Any, steps: int) -> int:
+    """
+    :return: The most rows whose layout was cached at once
+    """
+    scroll_bar = mod_list.verticalScrollBar()
+    cached_rows = 0
+    scroll_bar.setValue(0)
+    for _ in range(steps):
+        scroll_bar.setValue(scroll_bar.value() + scroll_bar.singleStep())
+        mod_list.viewport().repaint()
+        cached_rows = max(cached_rows, len(mod_list.item_delegate.row_layouts))
+    return cached_rows
+
+
+def run(mods: int, wheel_steps: int, repeat: int) -> dict[str, float]:
+    """
+    :return: Stage -> best time out of `repeat` runs, in seconds, and the most
+        rows whose layout was cached at once
+    """
+    from PySide6.QtWidgets import QApplication
+
+    from app.views.mods_panel import ModListWidget
+
+    corpus = generate_mod_corpus(mods, duplicates=0)
+    uuids = list(corpus)
+    state = metadata_manager_state(corpus)
+    timings: dict[str, list[float]] = {
+        "populate (previous)": [],
+        "populate": [],
+        "scroll": [],
+        "wheel": [],
+    }
+    cached_rows = 0
+    # Set the instance rather than mocking instance(), which is called for every row
+    with patch("app.utils.metadata.MetadataManager._instance", state):
+        for _ in range(repeat):
+            mod_list = ModListWidget("Active", settings_controller())
+            mod_list.resize(400, 800)
+            mod_list.show()
+            QApplication.processEvents()
+
+            start = time.perf_counter()
+            populate(mod_list, uuids, previous=True)
+            timings["populate (previous)"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            populate(mod_list, uuids)
+            timings["populate"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            scroll(mod_list)
+            timings["scroll"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            cached_rows = max(cached_rows, wheel(mod_list, wheel_steps))
+            timings["wheel"].append(time.perf_counter() - start)
+
+            mod_list.close()
+            mod_list.deleteLater()
+            QApplication.processEvents()
+    return {
+        **{stage: min(values) for stage, values in timings.items()},
+        "cached rows": cached_rows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--mods", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--wheel-steps", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from loguru import logger
+    from PySide6.QtWidgets import QApplication
+
+    logger.remove()
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+
+    print(f"\n{'stage':<20} {'mods':>6} {'time':>10}")
+    print("-" * 38)
+    for mods in args.mods:
+        results = run(mods, args.wheel_steps, args.repeat)
+        cached_rows = results.pop("cached rows")
+        for stage, seconds in results.items():
+            print(f"{stage:<20} {mods:>6} {seconds:>8.3f} s")
+        print(f"{'cached rows':<20} {mods:>6} {cached_rows:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
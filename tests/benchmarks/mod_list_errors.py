@@ -0,0 +1,117 @@
+"""
+Compare recalculating the errors and warnings of a mod list after a change with
+the previous version of ModListWidget.recalculate_internal_errors_warnings(),
+which recalculated every mod of the list and set the data of every item.
+
+Times dragging a mod to another position of a synthetic active mod list,
+activating a mod and deactivating one, each followed by the recalculation.
+
+Usage: python -m tests.benchmarks.mod_list_errors [--mods 1000 10000] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Callable
+from unittest.mock import patch
+
+from loguru import logger
+
+from tests.reference.mods_panel import (
+    compiled_corpus,
+    insert,
+    move,
+    populate,
+    reference_recalculate_internal_errors_warnings,
+    settings_controller,
+    take,
+)
+from tests.reference.synthetic_mods import metadata_manager_state
+
+
+def run(mods: int, repeat: int) -> dict[str, dict[str, float]]:
+    """
+    :return: Change -> method -> best time out of `repeat` runs, in seconds
+    """
+    from PySide6.QtWidgets import QApplication
+
+    from app.views.mods_panel import ModListWidget
+
+    corpus = compiled_corpus(mods)
+    # A few mods stay inactive, to activate them
+    uuids = list(corpus)
+    inactive = uuids[-10:]
+    active = uuids[:-10]
+    rng = random.Random(0)
+    methods: dict[str, Callable[[Any], Any]] = {
+        "previous": reference_recalculate_internal_errors_warnings,
+        "incremental": lambda mod_list: mod_list.recalculate_internal_errors_warnings(),
+    }
+    timings: dict[str, dict[str, list[float]]] = {}
+    # Set the instance rather than mocking instance(), which is called for every row
+    with patch(
+        "app.utils.metadata.MetadataManager._instance", metadata_manager_state(corpus)
+    ):
+        for method, recalculate in methods.items():
+            mod_list = ModListWidget("Active", settings_controller())
+            mod_list.resize(400, 800)
+            mod_list.show()
+            populate(mod_list, active)
+            mod_list.recalculate_internal_errors_warnings()
+            changes: dict[str, Callable[[], Any]] = {
+                "drag": lambda: move(
+                    mod_list,
+                    rng.randrange(mod_list.count()),
+                    rng.randrange(mod_list.count() + 1),
+                ),
+                "activate": lambda: insert(
+                    mod_list, rng.randrange(mod_list.count()), inactive.pop()
+                ),
+                "deactivate": lambda: take(mod_list, rng.randrange(mod_list.count())),
+            }
+            for _ in range(repeat):
+                for change, function in changes.items():
+                    function()
+                    start = time.perf_counter()
+                    recalculate(mod_list)
+                    mod_list.viewport().repaint()
+                    timings.setdefault(change, {}).setdefault(method, []).append(
+                        time.perf_counter() - start
+                    )
+            mod_list.close()
+            mod_list.deleteLater()
+            QApplication.processEvents()
+            inactive = uuids[-10:]
+            rng = random.Random(0)
+    return {
+        change: {method: min(values) for method, values in methods_timings.items()}
+        for change, methods_timings in timings.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--mods", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+
+    logger.remove()
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+
+    print(f"\n{'change':<12} {'method':<12} {'mods':>6} {'time':>10}")
+    print("-" * 44)
+    for mods in args.mods:
+        for change, methods_timings in run(mods, args.repeat).items():
+            for method, seconds in methods_timings.items():
+                print(f"{change:<12} {method:<12} {mods:>6} {seconds:>8.4f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compare searching a mod list with the previous version of
+ModsPanel.signal_search_and_filters(), which looked up the row of every mod with
+uuids.index(), read its metadata, set the data of every item and recalculated
+the errors and warnings of the list on every keystroke.
+
+Times typing a pattern into the search bar of a synthetic mod list, a
+character at a time: searching after each keystroke as before, searching the
+search table after each keystroke, and searching once typing pauses.
+
+Usage: python -m tests.benchmarks.mod_search [--mods 1000 10000]
+    [--pattern "synthetic mod 12"] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable
+from unittest.mock import patch
+
+from tests.reference.mods_panel import (
+    populate,
+    reference_signal_search_and_filters,
+    settings_controller,
+)
+from tests.reference.synthetic_mods import generate_mod_corpus, metadata_manager_state
+
+
+def run(mods: int, pattern: str, repeat: int) -> dict[str, float]:
+    """
+    :return: Method -> best time out of `repeat` runs to type the pattern, in seconds
+    """
+    from PySide6.QtWidgets import QApplication
+
+    from app.views.mods_panel import ModsPanel
+
+    corpus = generate_mod_corpus(mods, duplicates=0)
+    uuids = list(corpus)
+    prefixes = [pattern[:length] for length in range(1, len(pattern) + 1)]
+
+    def previous(panel: Any) -> None:
+        for prefix in prefixes:
+            panel.active_mods_search.setText(prefix)
+            reference_signal_search_and_filters(panel, "Active", prefix)
+
+    def per_keystroke(panel: Any) -> None:
+        for prefix in prefixes:
+            panel.active_mods_search.setText(prefix)
+            panel.on_active_mods_search_timeout()
+
+    def debounced(panel: Any) -> None:
+        for prefix in prefixes:
+            panel.active_mods_search.setText(prefix)
+        panel.on_active_mods_search_timeout()
+
+    methods: dict[str, Callable[[Any], None]] = {
+        "previous": previous,
+        "search table": per_keystroke,
+        "debounced": debounced,
+    }
+    timings: dict[str, list[float]] = {method: [] for method in methods}
+    # Set the instance rather than mocking instance(), which is called for every row
+    with patch(
+        "app.utils.metadata.MetadataManager._instance", metadata_manager_state(corpus)
+    ):
+        panel = ModsPanel(settings_controller())
+        populate(panel.active_mods_list, uuids)
+        for _ in range(repeat):
+            for method, function in methods.items():
+                panel.signal_clear_search("Active")
+                start = time.perf_counter()
+                function(panel)
+                timings[method].append(time.perf_counter() - start)
+        panel.deleteLater()
+        QApplication.processEvents()
+    return {method: min(values) for method, values in timings.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--mods", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--pattern", default="synthetic mod 12")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from loguru import logger
+    from PySide6.QtWidgets import QApplication
+
+    logger.remove()
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+
+    print(f"\n{'method':<14} {'mods':>6} {'time':>10}")
+    print("-" * 32)
+    for mods in args.mods:
+        for method, seconds in run(mods, args.pattern, args.repeat).items():
+            print(f"{method:<14} {mods:>6} {seconds:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Time each stage of the metadata and sort pipeline on synthetic mod corpora, and
+compare the timings with a saved baseline.
+
+Stages: MetadataMediator.refresh_metadata(), MetadataManager.compile_metadata(),
+get_mods_from_package_ids(), gen_tier_deps_graphs(), do_topo_sort(),
+do_alphabetical_sort() and ModListWidget.recalculate_internal_errors_warnings().
+
+Usage: python -m tests.benchmarks.pipeline [--mods 100 1000 5000] [--density 2.0]
+    [--duplicates 0.05] [--cycles 0] [--repeat 3] [--check] [--save-baseline]
+
+Timings depend on the machine, so compare against a baseline saved on the same
+machine: save one with --save-baseline on the base branch, then run --check on
+the branch under review. --check exits with an error when a stage is more than
+--tolerance times and --min-slowdown seconds slower than in the baseline.
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import types
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+from unittest.mock import patch
+
+from tests.reference.synthetic_mods import (
+    generate_mod_corpus,
+    metadata_manager_state,
+    write_mod_corpus,
+)
+
+BASELINE_PATH = Path(__file__).with_name("pipeline_baseline.json")
+
+
+@dataclass
+class Corpus:
+    """
+    A synthetic corpus and the pipeline data derived from it, shared by the stages.
+    """
+
+    mods: int
+    game_path: Path
+    # uuid -> metadata as parsed, before compile_metadata()
+    parsed: dict[str, Any]
+    # uuid -> metadata after compile_metadata()
+    compiled: dict[str, Any] = field(default_factory=dict)
+    # Active mods list, as package ids
+    package_ids: list[str] = field(default_factory=list)
+    active_uuids: list[str] = field(default_factory=list)
+    graphs: tuple[dict[str, set[str]], ...] = ()
+
+
+def bench_refresh_metadata(corpus: Corpus) -> Callable[[], Any]:
+    from app.models.metadata.metadata_mediator import MetadataMediator
+
+    mediator = MetadataMediator(
+        user_rules_path=corpus.game_path / "userRules.json",
+        community_rules_path=None,
+        steam_db_path=None,
+        workshop_mods_path=corpus.game_path / "Workshop",
+        local_mods_path=corpus.game_path / "Mods",
+        game_path=corpus.game_path,
+    )
+    return mediator.refresh_metadata
+
+
+def bench_compile_metadata(corpus: Corpus) -> Callable[[], Any]:
+    from app.utils.metadata import MetadataManager
+
+    state = metadata_manager_state(copy.deepcopy(corpus.parsed))
+    uuids = list(state.internal_local_metadata)
+    return lambda: MetadataManager.compile_metadata(state, uuids)
+
+
+def bench_get_mods_from_list(corpus: Corpus) -> Callable[[], Any]:
+    from app.utils.metadata import get_mods_from_package_ids
+
+    return lambda: get_mods_from_package_ids(corpus.compiled, corpus.package_ids)
+
+
+def bench_dependency_graphs(corpus: Corpus) -> Callable[[], Any]:
+    from app.sort.dependencies import gen_tier_deps_graphs
+
+    active_uuids = set(corpus.active_uuids)
+    active_package_ids = {corpus.compiled[uuid]["packageid"] for uuid in active_uuids}
+    return lambda: gen_tier_deps_graphs(
+        active_uuids, active_package_ids, corpus.compiled
+    )
+
+
+def _bench_sort(
+    corpus: Corpus, sort_method: Callable[[dict[str, set[str]], set[str]], list[str]]
+) -> Callable[[], Any]:
+    from app.sort.topo_sort import CircularDependencyError
+
+    active_uuids = set(corpus.active_uuids)
+
+    def sort() -> None:
+        for graph in corpus.graphs:
+            try:
+                sort_method(graph, active_uuids)
+            except CircularDependencyError:
+                # Timed up to and including the report of the dependency loops
+                pass
+
+    return sort
+
+
+def bench_topo_sort(corpus: Corpus) -> Callable[[], Any]:
+    from app.sort.topo_sort import do_topo_sort
+
+    return _bench_sort(corpus, do_topo_sort)
+
+
+def bench_alphabetical_sort(corpus: Corpus) -> Callable[[], Any]:
+    from app.sort.alphabetical_sort import do_alphabetical_sort
+
+    return _bench_sort(corpus, do_alphabetical_sort)
+
+
+def bench_recalculate_errors_warnings(corpus: Corpus) -> Callable[[], Any]:
+    from app.views.mods_panel import ModListWidget
+
+    settings_controller = types.SimpleNamespace(
+        settings=types.SimpleNamespace(external_use_this_instead_metadata_source="None")
+    )
+    mod_list = ModListWidget("Active", settings_controller)  # type: ignore[arg-type]
+    mod_list.recreate_mod_list("Active", corpus.active_uuids)
+    # Normally filled in by the rowsInserted handler, which also builds the widgets
+    mod_list.uuids = list(corpus.active_uuids)
+    return mod_list.recalculate_internal_errors_warnings
+
+
+STAGES: dict[str, Callable[[Corpus], Callable[[], Any]]] = {
+    "refresh_metadata": bench_refresh_metadata,
+    "compile_metadata": bench_compile_metadata,
+    "get_mods_from_list": bench_get_mods_from_list,
+    "dependency_graphs": bench_dependency_graphs,
+    "topo_sort": bench_topo_sort,
+    "alphabetical_sort": bench_alphabetical_sort,
+    "recalculate_errors_warnings": bench_recalculate_errors_warnings,
+}
+
+
+def prepare_corpus(corpus: Corpus) -> None:
+    """
+    Run the pipeline once to fill in the inputs of the later stages.
+    """
+    from app.sort.dependencies import gen_tier_deps_graphs
+    from app.utils.metadata import MetadataManager, get_mods_from_package_ids
+
+    corpus.compiled = copy.deepcopy(corpus.parsed)
+    MetadataManager.compile_metadata(
+        metadata_manager_state(corpus.compiled), list(corpus.compiled)
+    )
+    # Every mod, a few of them from the workshop when installed twice, and a
+    # few that are not installed
+    package_ids = list(dict.fromkeys(m["packageid"] for m in corpus.compiled.values()))
+    corpus.package_ids = [
+        package_id + "_steam"
+        if index % 10 == 0
+        else f"missing.{package_id}"
+        if index % 50 == 1
+        else package_id
+        for index, package_id in enumerate(package_ids)
+    ]
+    corpus.active_uuids = get_mods_from_package_ids(
+        corpus.compiled, corpus.package_ids
+    )[0]
+    active_package_ids = {
+        corpus.compiled[uuid]["packageid"] for uuid in corpus.active_uuids
+    }
+    corpus.graphs = gen_tier_deps_graphs(
+        set(corpus.active_uuids), active_package_ids, corpus.compiled
+    )
+
+
+def run(
+    mods: int,
+    density: float,
+    duplicates: float,
+    cycles: int,
+    repeat: int,
+    stages: list[str],
+) -> dict[str, float]:
+    """
+    Time the given stages on a corpus of `mods` mods.
+
+    :return: Stage -> best time out of `repeat` runs, in seconds
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        parsed = generate_mod_corpus(mods, density, duplicates, cycles)
+        corpus = Corpus(mods, write_mod_corpus(Path(temp_dir), parsed), parsed)
+        prepare_corpus(corpus)
+        state = metadata_manager_state(corpus.compiled)
+        with (
+            patch("app.utils.metadata.MetadataManager.instance", return_value=state),
+            patch("app.views.dialogue.show_warning"),
+        ):
+            for stage in stages:
+                timings = []
+                for _ in range(repeat):
+                    # Set up outside of the timing, as some stages change their input
+                    function = STAGES[stage](corpus)
+                    start = time.perf_counter()
+                    function()
+                    timings.append(time.perf_counter() - start)
+                results[stage] = min(timings)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--mods", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument(
+        "--density", type=float, default=2.0, help="Average loadAfter rules per mod"
+    )
+    parser.add_argument(
+        "--duplicates",
+        type=float,
+        default=0.05,
+        help="Fraction of mods installed twice",
+    )
+    parser.add_argument(
+        "--cycles", type=int, default=0, help="Number of dependency loops"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--stages", nargs="+", choices=list(STAGES), default=list(STAGES)
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Save the results as the baseline"
+    )
+    parser.add_argument(
+        "--check", action="store_true", help="Fail on regressions against the baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="Slowdown against the baseline that counts as a regression",
+    )
+    parser.add_argument(
+        "--min-slowdown",
+        type=float,
+        default=0.02,
+        help="Seconds a stage must lose to count as a regression, as short stages are noisy",
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from loguru import logger
+    from PySide6.QtWidgets import QApplication
+
+    logger.remove()
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+
+    settings = {
+        "density": args.density,
+        "duplicates": args.duplicates,
+        "cycles": args.cycles,
+    }
+    baseline: dict[str, Any] = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("settings") != settings:
+            print(f"Ignoring {args.baseline}, it was saved with other settings")
+            baseline = {}
+
+    results: dict[str, dict[str, float]] = {stage: {} for stage in args.stages}
+    regressions = []
+    print(f"\n{'stage':<28} {'mods':>6} {'time':>10} {'baseline':>10} {'ratio':>7}")
+    print("-" * 65)
+    for mods in args.mods:
+        timings = run(
+            mods, args.density, args.duplicates, args.cycles, args.repeat, args.stages
+        )
+        for stage, seconds in timings.items():
+            results[stage][str(mods)] = round(seconds, 6)
+            line = f"{stage:<28} {mods:>6} {seconds:>8.3f} s"
+            expected = baseline.get("results", {}).get(stage, {}).get(str(mods))
+            if expected:
+                ratio = seconds / expected
+                line += f" {expected:>8.3f} s {ratio:>6.2f}x"
+                if ratio > args.tolerance and seconds - expected > args.min_slowdown:
+                    line += "  REGRESSION"
+                    regressions.append(f"{stage} ({mods} mods)")
+            print(line)
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "machine": f"{platform.system()} {platform.machine()}, Python {platform.python_version()}",
+                    "settings": settings,
+                    "repeat": args.repeat,
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        print(f"\nSaved baseline to {args.baseline}")
+    if args.check and regressions:
+        print(f"\nRegressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Compare showing mod preview images with the previous version of
+ModInfo.display_mod_info(), which decoded the full size preview into a
+QPixmap on the GUI thread every time a mod was selected.
+
+Times selecting every mod of a list of synthetic 4K previews in turn, as when
+arrowing through a mod list: on the GUI thread as before, with the preview
+loader and an empty thumbnail cache, with the thumbnail cache on disk, and
+again with the previews in memory. For the preview loader, "gui" is the time
+spent on the GUI thread and "total" the time until every preview was loaded.
+
+Usage: python -m tests.benchmarks.preview_loading [--previews 20]
+    [--width 3840] [--height 2160]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+
+def write_previews(folder: Path, previews: int, width: int, height: int) -> list[str]:
+    """
+    Write PNG previews with a gradient, so they do not compress to nothing.
+    """
+    from PySide6.QtCore import QPoint
+    from PySide6.QtGui import QColor, QImage, QLinearGradient, QPainter
+
+    paths = []
+    for index in range(previews):
+        image = QImage(width, height, QImage.Format.Format_RGB32)
+        gradient = QLinearGradient(QPoint(0, 0), QPoint(width, height))
+        gradient.setColorAt(0, QColor.fromHsv(index * 17 % 360, 200, 200))
+        gradient.setColorAt(1, QColor.fromHsv(index * 53 % 360, 120, 90))
+        painter = QPainter(image)
+        painter.fillRect(image.rect(), gradient)
+        painter.end()
+        path = str(folder / f"Preview{index}.png")
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def previous(paths: list[str], size: Any) -> float:
+    """
+    :return: Seconds spent on the GUI thread
+    """
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QPixmap
+
+    start = time.perf_counter()
+    for path in paths:
+        QPixmap(path).scaled(size, Qt.AspectRatioMode.KeepAspectRatio)
+    return time.perf_counter() - start
+
+
+def preview_loader(loader: Any, paths: list[str], size: Any) -> tuple[float, float]:
+    """
+    :return: Seconds spent on the GUI thread, and until every preview was loaded
+    """
+    from PySide6.QtCore import QEventLoop, Qt
+    from PySide6.QtGui import QPixmap
+    from PySide6.QtWidgets import QApplication
+
+    loaded: set[str] = set()
+    gui = 0.0
+
+    def on_preview_loaded(path: str, image: Any) -> None:
+        nonlocal gui
+        start = time.perf_counter()
+        QPixmap.fromImage(image).scaled(size, Qt.AspectRatioMode.KeepAspectRatio)
+        loaded.add(path)
+        gui += time.perf_counter() - start
+
+    loader.preview_loaded.connect(on_preview_loaded)
+    start_total = time.perf_counter()
+    for index, path in enumerate(paths):
+        start = time.perf_counter()
+        image = loader.request(path, paths[index + 1 : index + 3])
+        if image is not None:
+            QPixmap.fromImage(image).scaled(size, Qt.AspectRatioMode.KeepAspectRatio)
+            loaded.add(path)
+        gui += time.perf_counter() - start
+        # Wait for the preview of the selected mod, as the user would
+        while path not in loaded:
+            QApplication.processEvents(QEventLoop.ProcessEventsFlag.WaitForMoreEvents)
+    total = time.perf_counter() - start_total
+    loader.preview_loaded.disconnect(on_preview_loaded)
+    return gui, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--previews", type=int, default=20)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from loguru import logger
+    from PySide6.QtCore import QSize
+    from PySide6.QtWidgets import QApplication
+
+    from app.utils.preview_loader import PreviewLoader
+
+    logger.remove()
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+    # About the size of the preview in the mod info panel
+    size = QSize(480, 270)
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_previews(Path(folder), args.previews, args.width, args.height)
+        thumbnail_folder = Path(folder) / "previews"
+
+        print(f"\n{'method':<18} {'gui':>10} {'total':>10}")
+        print("-" * 40)
+        seconds = previous(paths, size)
+        print(f"{'previous':<18} {seconds:>8.3f} s {seconds:>8.3f} s")
+        for method, loader in [
+            ("cold cache", PreviewLoader(thumbnail_folder)),
+            ("thumbnail cache", PreviewLoader(thumbnail_folder)),
+        ]:
+            gui, total = preview_loader(loader, paths, size)
+            print(f"{method:<18} {gui:>8.3f} s {total:>8.3f} s")
+        gui, total = preview_loader(loader, paths, size)
+        print(f"{'memory cache':<18} {gui:>8.3f} s {total:>8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Compare loading steamDB.json with loading its compiled copy.
+
+Usage: python -m tests.benchmarks.steam_db_loading [--entries 60000] [--lookups 3000]
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from app.utils.compiled_steam_db import compile_steam_db, load_compiled_steam_db
+from tests.reference.synthetic_mods import synthetic_packageid, synthetic_pfid
+
+
+def generate_steam_db(path: Path, entries: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    database = {}
+    for index in range(entries):
+        database[synthetic_pfid(index)] = {
+            "url": f"https://steamcommunity.com/sharedfiles/filedetails/?id={synthetic_pfid(index)}",
+            "packageId": synthetic_packageid(index),
+            "gameVersions": ["1.4", "1.5"][: rng.randint(1, 2)],
+            "steamName": f"Synthetic Mod {index}",
+            "name": f"Synthetic Mod {index}",
+            "authors": [f"Author {index % 97}"],
+            "dependencies": {
+                synthetic_pfid(dep): [f"Synthetic Mod {dep}", "https://example.com"]
+                for dep in rng.sample(range(index), min(index, rng.randint(0, 3)))
+            },
+        }
+    path.write_text(
+        json.dumps({"version": 0, "database": database}, indent=4), encoding="utf-8"
+    )
+
+
+def load_json(path: Path) -> dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        db_data = json.loads(f.read())
+    # Mirrors get_configured_steam_db()
+    {
+        metadata["packageid"]: metadata["name"]
+        for metadata in db_data.get("database", {}).values()
+        if metadata.get("packageid") and metadata.get("name")
+    }
+    return db_data["database"]
+
+
+def measure(target: Callable[[], Any]) -> tuple[float, float]:
+    """
+    Time a run of target, then measure its peak memory use in a second run
+    (tracemalloc slows everything down, so it is kept out of the timing).
+    """
+    start = time.perf_counter()
+    target()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = target()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak / 1024**2
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=60000)
+    parser.add_argument("--lookups", type=int, default=3000)
+    args = parser.parse_args()
+
+    from loguru import logger
+
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_path = Path(temp_dir) / "steamDB.json"
+        generate_steam_db(json_path, args.entries)
+        size = json_path.stat().st_size / 1024**2
+        pfids = random.Random(1).sample(
+            [synthetic_pfid(i) for i in range(args.entries)], args.lookups
+        )
+
+        def json_lookups() -> Any:
+            steam_db = load_json(json_path)
+            return steam_db, [steam_db[pfid] for pfid in pfids]
+
+        def compiled_lookups() -> Any:
+            steam_db = load_compiled_steam_db(json_path, Path(temp_dir))
+            assert steam_db is not None
+            return steam_db, [steam_db[pfid] for pfid in pfids]
+
+        start = time.perf_counter()
+        compile_steam_db(json_path, Path(temp_dir) / "compiled.msgpack")
+        compile_time = time.perf_counter() - start
+        # Creates the compiled copy the next measurement loads
+        load_compiled_steam_db(json_path, Path(temp_dir))
+        results = {
+            "json": measure(json_lookups),
+            "compiled": measure(compiled_lookups),
+        }
+
+    print(
+        f"\nSteam DB with {args.entries} entries ({size:.1f} MB), {args.lookups} lookups:"
+    )
+    print("-" * 48)
+    print(f"{'one-off compile':<16} {compile_time:>8.3f} s")
+    for name, (elapsed, peak) in results.items():
+        print(f"{name:<16} {elapsed:>8.3f} s {peak:>10.1f} MB peak")
+
+
+if __name__ == "__main__":
+    main()
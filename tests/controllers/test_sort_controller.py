@@ -0,0 +1,211 @@
+import random
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Generator
+from unittest.mock import patch
+
+import pytest
+
+from app.controllers.sort_controller import Sorter, SortResultCache, sort_cache_key
+from app.utils.constants import SortMethod
+from app.utils.metadata import MetadataManager
+
+
+def _generate_metadata(mods: int, seed: int) -> dict[str, Any]:
+    rng = random.Random(seed)
+    metadata: dict[str, Any] = {
+        "core": {"packageid": "ludeon.rimworld", "name": "Core"},
+        "harmony": {"packageid": "brrainz.harmony", "name": "Harmony"},
+    }
+    metadata["core"]["loadTheseBefore"] = {("brrainz.harmony", True)}
+    for index in range(mods):
+        rules = {("ludeon.rimworld", True)}
+        if index and rng.random() < 0.6:
+            for dependency in rng.sample(range(index), min(index, rng.randint(1, 2))):
+                rules.add((f"author.mod{dependency}", True))
+        metadata[f"uuid-{index}"] = {
+            "packageid": f"author.mod{index}",
+            "name": f"Mod {rng.randrange(mods)}",
+            "loadTheseBefore": rules,
+        }
+    metadata["bottom"] = {
+        "packageid": "author.bottom",
+        "name": "Bottom",
+        "loadBottom": True,
+        "loadTheseBefore": {("author.mod0", True)},
+    }
+    return metadata
+
+
+@pytest.fixture
+def metadata() -> Generator[dict[str, Any], None, None]:
+    metadata = _generate_metadata(150, seed=0)
+    with patch.object(
+        MetadataManager,
+        "instance",
+        return_value=SimpleNamespace(internal_local_metadata=metadata),
+    ):
+        yield metadata
+
+
+def _sort(
+    metadata: dict[str, Any], sort_method: SortMethod, active: set[str]
+) -> tuple[list[str], list[dict[str, set[str]]]]:
+    sorter = Sorter(
+        sort_method,
+        active_package_ids={metadata[uuid]["packageid"] for uuid in active},
+        active_uuids=active,
+    )
+    graphs = sorter.generate_dependency_graphs()
+    success, order = sorter.sort(graphs)
+    assert success
+    return order, graphs
+
+
+def _incremental_sort(
+    metadata: dict[str, Any],
+    sort_method: SortMethod,
+    active: set[str],
+    previous: tuple[list[str], list[dict[str, set[str]]]],
+    fallback: bool = False,
+) -> list[str]:
+    sorter = Sorter(
+        sort_method,
+        active_package_ids={metadata[uuid]["packageid"] for uuid in active},
+        active_uuids=active,
+    )
+    with patch.object(sorter, "sort", wraps=sorter.sort) as full_sort:
+        success, order = sorter.sort_incremental(*previous)
+    assert success
+    assert full_sort.called == fallback
+    return order
+
+
+def _assert_valid(
+    metadata: dict[str, Any], order: list[str], graphs: list[dict[str, set[str]]]
+) -> None:
+    position = {metadata[uuid]["packageid"]: index for index, uuid in enumerate(order)}
+    tier_positions = [[position[package_id] for package_id in g] for g in graphs]
+    assert max(tier_positions[0]) < min(tier_positions[1])
+    assert max(tier_positions[1]) < min(tier_positions[2])
+    for graph in graphs:
+        for package_id, dependencies in graph.items():
+            for dependency_id in dependencies:
+                assert position[dependency_id] < position[package_id]
+
+
+@pytest.mark.parametrize(
+    "sort_method", [SortMethod.ALPHABETICAL, SortMethod.TOPOLOGICAL]
+)
+def test_sort_incremental(metadata: dict[str, Any], sort_method: SortMethod) -> None:
+    active = {uuid for uuid in metadata if uuid not in {"uuid-5", "uuid-60"}}
+    previous = _sort(metadata, sort_method, active)
+
+    # Unchanged
+    assert _incremental_sort(metadata, sort_method, active, previous) == previous[0]
+
+    # Add and remove mods, and change a rule
+    active |= {"uuid-5", "uuid-60"}
+    active -= {"uuid-20", "uuid-100"}
+    metadata["uuid-70"]["loadTheseBefore"].add(("author.mod69", True))
+    order = _incremental_sort(metadata, sort_method, active, previous)
+
+    assert sorted(order) == sorted(active)
+    graphs = _sort(metadata, sort_method, active)[1]
+    _assert_valid(metadata, order, graphs)
+    # Tier two mods without rules between them and other tier two mods keep
+    # their order
+    connected = (
+        set()
+        .union(*graphs[1].values())
+        .union(
+            package_id for package_id, dependencies in graphs[1].items() if dependencies
+        )
+    )
+    isolated = [
+        uuid
+        for uuid in previous[0]
+        if uuid in active
+        and metadata[uuid]["packageid"] in graphs[1]
+        and metadata[uuid]["packageid"] not in connected
+    ]
+    assert len(isolated) > 10
+    assert [uuid for uuid in order if uuid in set(isolated)] == isolated
+
+
+def test_sort_incremental_falls_back_on_tier_change(metadata: dict[str, Any]) -> None:
+    active = set(metadata) - {"uuid-10"}
+    previous = _sort(metadata, SortMethod.ALPHABETICAL, active)
+
+    metadata["uuid-10"]["loadBottom"] = True
+    active.add("uuid-10")
+
+    assert (
+        _incremental_sort(
+            metadata, SortMethod.ALPHABETICAL, active, previous, fallback=True
+        )
+        == _sort(metadata, SortMethod.ALPHABETICAL, active)[0]
+    )
+
+
+def _cache_key(
+    metadata: dict[str, Any], active: set[str], rules_paths: list[str | None]
+) -> str | None:
+    return sort_cache_key(SortMethod.TOPOLOGICAL, active, metadata, rules_paths)
+
+
+def test_sort_cache_key(metadata: dict[str, Any], tmp_path: Path) -> None:
+    rules_path = tmp_path / "userRules.json"
+    rules_path.write_text("{}", encoding="utf-8")
+    active = set(metadata)
+    key = _cache_key(metadata, active, [None, str(rules_path)])
+
+    assert key == _cache_key(metadata, set(sorted(active)), [None, str(rules_path)])
+    assert key != sort_cache_key(
+        SortMethod.ALPHABETICAL, active, metadata, [None, str(rules_path)]
+    )
+    assert key != _cache_key(metadata, active - {"uuid-1"}, [None, str(rules_path)])
+
+    rules_path.write_text('{"rules": {}}', encoding="utf-8")
+    changed_rules_key = _cache_key(metadata, active, [None, str(rules_path)])
+    assert changed_rules_key != key
+
+    metadata["uuid-3"]["loadTheseAfter"] = {("author.mod4", False)}
+    assert _cache_key(metadata, active, [None, str(rules_path)]) != changed_rules_key
+
+    metadata["duplicate"] = dict(metadata["uuid-3"])
+    assert _cache_key(metadata, set(metadata), []) is None
+
+
+def test_sort_result_cache(metadata: dict[str, Any], tmp_path: Path) -> None:
+    path = tmp_path / "sort_cache.json"
+    cache = SortResultCache(path, max_entries=2)
+    active = set(metadata)
+    order, _ = _sort(metadata, SortMethod.TOPOLOGICAL, active)
+
+    assert cache.get("a", active, metadata) is None
+    cache.put("a", order, metadata)
+    cache.put("b", order[:1], metadata)
+    assert cache.get("a", active, metadata) == order
+    # "b" is now the least recently used
+    cache.put("c", order, metadata)
+
+    reloaded = SortResultCache(path, max_entries=2)
+    assert list(reloaded.entries) == []
+    assert reloaded.get("b", active, metadata) is None
+    assert list(reloaded.entries) == ["a", "c"]
+    assert reloaded.get("c", active, metadata) == order
+    # Cached orders are only used for the exact same mods
+    assert reloaded.get("c", active - {"uuid-1"}, metadata) is None
+
+    # Reads do not write the cache, flush() saves the recently used order
+    saved = path.read_bytes()
+    assert reloaded.get("a", active, metadata) == order
+    assert path.read_bytes() == saved
+    reloaded.flush()
+    flushed = SortResultCache(path)
+    flushed.load()
+    assert list(flushed.entries) == ["c", "a"]
+
+    path.write_text("not json", encoding="utf-8")
+    assert SortResultCache(path).get("a", active, metadata) is None
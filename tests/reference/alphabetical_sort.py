@@ -0,0 +1,142 @@
+"""
+The previous do_alphabetical_sort(), which the tests and benchmarks compare
+alphabetical_sort() against, and the input they run it on.
+"""
+
+import random
+from typing import Any
+
+from tests.reference.synthetic_mods import synthetic_packageid
+
+
+def reference_alphabetical_sort(
+    dependency_graph: dict[str, set[str]],
+    active_mods_uuids: set[str],
+    internal_local_metadata: dict[str, Any],
+) -> list[str]:
+    """
+    do_alphabetical_sort() before it tracked positions, with the metadata passed in.
+    """
+    active_mods_id_to_name = dict(
+        (
+            internal_local_metadata[uuid]["packageid"],
+            internal_local_metadata[uuid]["name"],
+        )
+        for uuid in active_mods_uuids
+    )
+    active_mods_packageid_to_uuid = dict(
+        (
+            internal_local_metadata[uuid]["packageid"],
+            uuid,
+        )
+        for uuid in active_mods_uuids
+    )
+    active_mods_alphabetized = sorted(
+        active_mods_id_to_name.items(), key=lambda x: x[1], reverse=False
+    )
+    dependencies_alphabetized = {}
+    for tuple_id_name in active_mods_alphabetized:
+        if tuple_id_name[0] in dependency_graph:
+            dependencies_alphabetized[tuple_id_name[0]] = dependency_graph[
+                tuple_id_name[0]
+            ]
+    mods_load_order: list[str] = []
+    for package_id in dependencies_alphabetized:
+        if package_id not in mods_load_order:
+            mods_load_order.append(package_id)
+            index_just_appended = mods_load_order.index(package_id)
+            _reference_recursively_force_insert(
+                mods_load_order,
+                dependency_graph,
+                package_id,
+                active_mods_uuids,
+                index_just_appended,
+                internal_local_metadata,
+            )
+
+    reordered = list()
+    for package_id in mods_load_order:
+        if package_id in active_mods_packageid_to_uuid:
+            mod_uuid = active_mods_packageid_to_uuid[package_id]
+            reordered.append(mod_uuid)
+    return reordered
+
+
+def _reference_recursively_force_insert(
+    mods_load_order: list[str],
+    dependency_graph: dict[str, set[str]],
+    package_id: str,
+    active_mods_uuids: set[str],
+    index_just_appended: int,
+    internal_local_metadata: dict[str, Any],
+) -> None:
+    deps_of_package = dependency_graph[package_id]
+    deps_id_to_name = {}
+    for dependency_id in deps_of_package:
+        for uuid in active_mods_uuids:
+            mod_package_id = internal_local_metadata[uuid]["packageid"]
+            if dependency_id == mod_package_id:
+                deps_id_to_name[dependency_id] = internal_local_metadata[uuid]["name"]
+    deps_of_package_alphabetized = sorted(
+        deps_id_to_name.items(), key=lambda x: x[1], reverse=True
+    )
+    for tuple_dep_id_dep_name in deps_of_package_alphabetized:
+        dep_id = tuple_dep_id_dep_name[0]
+        if dep_id not in mods_load_order:
+            index_to_insert_at = index_just_appended
+            for e in reversed(
+                mods_load_order[index_just_appended : mods_load_order.index(package_id)]
+            ):
+                if e in dependency_graph[dep_id]:
+                    index_to_insert_at = mods_load_order.index(e) + 1
+                    break
+
+            mods_load_order.insert(index_to_insert_at, dep_id)
+            new_idx = mods_load_order.index(dep_id)
+            _reference_recursively_force_insert(
+                mods_load_order,
+                dependency_graph,
+                dep_id,
+                active_mods_uuids,
+                new_idx,
+                internal_local_metadata,
+            )
+
+
+def generate_sort_input(
+    mods: int, seed: int = 0, max_dependencies: int = 4
+) -> tuple[dict[str, set[str]], set[str], dict[str, Any]]:
+    """
+    Generate a dependency graph, active uuids and their metadata.
+
+    Mods depend on random other mods (cycles included), some dependencies are
+    not active, names repeat so ties are covered, and a few packageids are
+    active twice under different uuids.
+    """
+    rng = random.Random(seed)
+    internal_local_metadata: dict[str, Any] = {}
+    package_ids = [synthetic_packageid(index) for index in range(mods)]
+    for index, package_id in enumerate(package_ids):
+        internal_local_metadata[f"uuid-{index}"] = {
+            "packageid": package_id,
+            "name": f"Mod {rng.randrange(max(1, mods // 3))}",
+        }
+        if rng.random() < 0.02:
+            internal_local_metadata[f"uuid-{index}-duplicate"] = {
+                "packageid": package_id,
+                "name": f"Mod {rng.randrange(max(1, mods // 3))}",
+            }
+    missing = [f"missing.mod{index}" for index in range(max(1, mods // 10))]
+    dependency_graph: dict[str, set[str]] = {}
+    for index, package_id in enumerate(package_ids):
+        dependencies = set()
+        for _ in range(rng.randint(0, max_dependencies)):
+            if rng.random() < 0.1:
+                dependencies.add(rng.choice(missing))
+            elif rng.random() < 0.8 and index:
+                # Mostly on earlier mods, like real dependency chains
+                dependencies.add(package_ids[rng.randrange(index)])
+            else:
+                dependencies.add(rng.choice(package_ids))
+        dependency_graph[package_id] = dependencies
+    return dependency_graph, set(internal_local_metadata), internal_local_metadata
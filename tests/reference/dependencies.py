@@ -0,0 +1,171 @@
+"""
+The previous dependency graph builders of Sorter.generate_dependency_graphs(),
+which the tests and benchmarks compare gen_tier_deps_graphs() against, and the
+input they run them on.
+"""
+
+import random
+from typing import Any
+
+from app.sort.dependencies import KNOWN_TIER_ONE_MODS, KNOWN_TIER_THREE_MODS
+from tests.reference.synthetic_mods import synthetic_packageid
+
+
+def reference_gen_tier_deps_graphs(
+    active_mods_uuids: set[str],
+    active_mod_ids: list[str],
+    internal_local_metadata: dict[str, Any],
+) -> tuple[dict[str, set[str]], dict[str, set[str]], dict[str, set[str]]]:
+    """
+    Sorter.generate_dependency_graphs() before the graphs were built in one pass,
+    with the metadata passed in.
+    """
+    dependencies_graph: dict[str, set[str]] = {}
+    reverse_dependencies_graph: dict[str, set[str]] = {}
+    for uuid in active_mods_uuids:
+        package_id = internal_local_metadata[uuid]["packageid"]
+        dependencies_graph[package_id] = set()
+        for dependency in internal_local_metadata[uuid].get("loadTheseBefore") or ():
+            if dependency[0] in active_mod_ids:
+                dependencies_graph[package_id].add(dependency[0])
+    for uuid in active_mods_uuids:
+        package_id = internal_local_metadata[uuid]["packageid"]
+        reverse_dependencies_graph[package_id] = set()
+        for dependent in internal_local_metadata[uuid].get("loadTheseAfter") or ():
+            if dependent[0] in active_mod_ids:
+                reverse_dependencies_graph[package_id].add(dependent[0])
+
+    processed_ids: set[str] = set()
+    tier_one_mods: set[str] = set()
+    for known_tier_one_mod in KNOWN_TIER_ONE_MODS:
+        if known_tier_one_mod in dependencies_graph:
+            tier_one_mods.add(known_tier_one_mod)
+            tier_one_mods.update(
+                _reference_get_dependencies_recursive(
+                    known_tier_one_mod, dependencies_graph, processed_ids
+                )
+            )
+    tier_one_graph = {
+        tier_one_mod: dependencies_graph[tier_one_mod] for tier_one_mod in tier_one_mods
+    }
+
+    known_tier_three_mods = {
+        internal_local_metadata[uuid].get("packageid")
+        for uuid in active_mods_uuids
+        if internal_local_metadata[uuid].get("loadBottom")
+    }
+    known_tier_three_mods.update(KNOWN_TIER_THREE_MODS)
+    tier_three_mods = set()
+    for known_tier_three_mod in known_tier_three_mods:
+        if known_tier_three_mod in dependencies_graph:
+            tier_three_mods.add(known_tier_three_mod)
+            tier_three_mods.update(
+                _reference_get_reverse_dependencies_recursive(
+                    known_tier_three_mod, reverse_dependencies_graph
+                )
+            )
+    tier_three_graph: dict[str, set[str]] = {}
+    for tier_three_mod in tier_three_mods:
+        tier_three_graph[tier_three_mod] = set()
+        for possible_add in dependencies_graph[tier_three_mod]:
+            if possible_add in tier_three_mods:
+                tier_three_graph[tier_three_mod].add(possible_add)
+
+    tier_two_graph = {}
+    for uuid in active_mods_uuids:
+        package_id = internal_local_metadata[uuid]["packageid"]
+        if package_id not in tier_one_mods and package_id not in tier_three_mods:
+            stripped_dependencies = set()
+            for dependency_id in (
+                internal_local_metadata[uuid].get("loadTheseBefore") or ()
+            ):
+                if (
+                    dependency_id[0] not in tier_one_mods
+                    and dependency_id[0] not in tier_three_mods
+                    and dependency_id[0] in active_mod_ids
+                ):
+                    stripped_dependencies.add(dependency_id[0])
+            tier_two_graph[package_id] = stripped_dependencies
+    return tier_one_graph, tier_two_graph, tier_three_graph
+
+
+def _reference_get_dependencies_recursive(
+    package_id: str,
+    active_mods_dependencies: dict[str, set[str]],
+    processed_ids: set[str],
+) -> set[str]:
+    dependencies_set = set()
+    if package_id in active_mods_dependencies:
+        for dependency_id in active_mods_dependencies[package_id]:
+            if dependency_id not in processed_ids:
+                processed_ids.add(dependency_id)
+                dependencies_set.add(dependency_id)
+                dependencies_set.update(
+                    _reference_get_dependencies_recursive(
+                        dependency_id, active_mods_dependencies, processed_ids
+                    )
+                )
+    return dependencies_set
+
+
+def _reference_get_reverse_dependencies_recursive(
+    package_id: str, active_mods_rev_dependencies: dict[str, set[str]]
+) -> set[str]:
+    reverse_dependencies_set = set()
+    if package_id in active_mods_rev_dependencies:
+        for dependent_id in active_mods_rev_dependencies[package_id]:
+            reverse_dependencies_set.add(dependent_id)
+            reverse_dependencies_set.update(
+                _reference_get_reverse_dependencies_recursive(
+                    dependent_id, active_mods_rev_dependencies
+                )
+            )
+    return reverse_dependencies_set
+
+
+def generate_sort_metadata(
+    mods: int, tail: int = 12, seed: int = 0
+) -> tuple[set[str], set[str], dict[str, Any]]:
+    """
+    Generate active uuids, their package ids and metadata with load order rules.
+
+    The first mods are known tier one mods. Mods load before random earlier
+    mods (cycles included) and some inactive ones. The last `tail` mods form a
+    loadTheseAfter chain below a loadBottom mod where each mod loads before
+    the next two, so the number of paths through it grows exponentially.
+    """
+    rng = random.Random(seed)
+    package_ids = sorted(KNOWN_TIER_ONE_MODS)[: min(mods, 4)]
+    package_ids += [synthetic_packageid(index) for index in range(mods)][
+        len(package_ids) :
+    ]
+    tail_start = max(0, mods - tail)
+    internal_local_metadata: dict[str, Any] = {}
+    for index, package_id in enumerate(package_ids):
+        load_before: set[tuple[str, bool]] = set()
+        for _ in range(rng.randint(0, 4)):
+            if rng.random() < 0.1:
+                load_before.add((f"missing.mod{rng.randrange(mods)}", False))
+            elif rng.random() < 0.9 and index:
+                load_before.add((package_ids[rng.randrange(index)], True))
+            else:
+                load_before.add((rng.choice(package_ids), False))
+        load_after: set[tuple[str, bool]] = set()
+        if index >= tail_start:
+            load_after.update(
+                (package_id, True) for package_id in package_ids[index + 1 : index + 3]
+            )
+        elif rng.random() < 0.05 and tail_start < mods:
+            load_after.add((package_ids[rng.randrange(tail_start, mods)], False))
+        metadata: dict[str, Any] = {
+            "packageid": package_id,
+            "name": f"Mod {index}",
+            "loadTheseBefore": load_before,
+            "loadTheseAfter": load_after,
+        }
+        if index == tail_start or rng.random() < 0.01:
+            metadata["loadBottom"] = True
+        internal_local_metadata[f"uuid-{index}"] = metadata
+        if rng.random() < 0.02:
+            internal_local_metadata[f"uuid-{index}-duplicate"] = dict(metadata)
+    return set(internal_local_metadata), set(package_ids), internal_local_metadata
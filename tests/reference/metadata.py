@@ -0,0 +1,468 @@
+"""
+The previous About.xml rule compilation and mods list matching of
+app.utils.metadata, which the tests and benchmarks compare the current ones
+against, and the input they run them on.
+"""
+
+import random
+from re import match
+from typing import Any
+
+from loguru import logger
+from natsort import natsorted
+
+from app.utils.metadata import add_dependency_to_mod, add_load_rule_to_mod
+from tests.reference.synthetic_mods import generate_mod_corpus, synthetic_packageid
+
+DATA_SOURCES = ["expansion", "local", "workshop"]
+
+
+def reference_add_incompatibility_to_mod(
+    mod_data: dict[str, Any],
+    dependency_or_dependency_ids: Any,
+    all_mods: dict[str, Any],
+) -> None:
+    """
+    add_incompatibility_to_mod() before it took the installed package ids, which
+    collected them from every mod on each call.
+    """
+    logger.debug(
+        f"Adding incompatibilities for packages [{dependency_or_dependency_ids}] to mod data: {mod_data} (and reverse direction too)"
+    )
+    if mod_data:
+        mod_data.setdefault("incompatibilities", set())
+
+        all_package_ids = set(all_mods[uuid]["packageid"] for uuid in all_mods)
+
+        if isinstance(dependency_or_dependency_ids, str):
+            dependency_id = dependency_or_dependency_ids.lower()
+            if dependency_id in all_package_ids:
+                mod_data["incompatibilities"].add(dependency_id)
+        elif isinstance(dependency_or_dependency_ids, list):
+            if isinstance(dependency_or_dependency_ids[0], str):
+                for dependency in dependency_or_dependency_ids:
+                    if dependency:
+                        dependency_id = dependency.lower()
+                        if dependency_id in all_package_ids:
+                            mod_data["incompatibilities"].add(dependency_id)
+            else:
+                logger.error(
+                    f"List of incompatibilities does not contain strings: [{dependency_or_dependency_ids}]"
+                )
+        else:
+            logger.error(
+                f"Incompatibilities is not a single string or a list of strings: [{dependency_or_dependency_ids}]"
+            )
+
+
+def reference_compile_about_xml_rules(state: Any, uuids: list[str]) -> None:
+    """
+    The About.xml part of MetadataManager.compile_metadata() before the rules
+    were compiled into version resolved tables, with the MetadataManager passed in.
+    """
+    for uuid in uuids:
+        logger.debug(
+            f"UUID: {uuid} packageid: "
+            + state.internal_local_metadata[uuid].get("packageid")
+        )
+        # moddependencies are not equal to mod load order rules
+        if state.internal_local_metadata[uuid].get("moddependencies"):
+            if isinstance(state.internal_local_metadata[uuid]["moddependencies"], dict):
+                dependencies = state.internal_local_metadata[uuid][
+                    "moddependencies"
+                ].get("li")
+            elif isinstance(
+                state.internal_local_metadata[uuid]["moddependencies"], list
+            ):
+                # Loop through the list and try to find dictionary. If we find one, use it.
+                for potential_dependencies in state.internal_local_metadata[uuid][
+                    "moddependencies"
+                ]:
+                    if (
+                        potential_dependencies
+                        and isinstance(potential_dependencies, dict)
+                        and potential_dependencies.get("li")
+                    ):
+                        dependencies = potential_dependencies["li"]
+            if dependencies:
+                logger.debug(f"Current mod requires these mods to work: {dependencies}")
+                add_dependency_to_mod(
+                    state.internal_local_metadata[uuid],
+                    dependencies,
+                    state.internal_local_metadata,
+                )
+
+        if state.internal_local_metadata[uuid].get("moddependenciesbyversion"):
+            major, minor = state.game_version.split(".")[
+                :2
+            ]  # Split the version and take the first two parts
+            version_regex = rf"v{major}\.{minor}"  # Construct the regex to match both major and minor versions
+            for version, dependencies_by_ver in state.internal_local_metadata[uuid][
+                "moddependenciesbyversion"
+            ].items():
+                if match(version_regex, version):
+                    if (
+                        dependencies_by_ver
+                        and isinstance(dependencies_by_ver, dict)
+                        and dependencies_by_ver.get("li")
+                    ):
+                        logger.debug(
+                            f"Current mod requires these mods by version to work: {dependencies_by_ver['li']}"
+                        )
+                        add_dependency_to_mod(
+                            state.internal_local_metadata[uuid],
+                            dependencies_by_ver["li"],
+                            state.internal_local_metadata,
+                        )
+                    else:
+                        logger.warning(
+                            f"About.xml syntax error. Unable to read <moddependenciesbyversion> tag from XML for version [{version}]: {state.internal_local_metadata[uuid]['metadata_file_path']}"
+                        )
+                        logger.debug(dependencies_by_ver)
+        if state.internal_local_metadata[uuid].get("incompatiblewith") and isinstance(
+            state.internal_local_metadata[uuid].get("incompatiblewith"), dict
+        ):
+            incompatibilities = state.internal_local_metadata[uuid][
+                "incompatiblewith"
+            ].get("li")
+            if incompatibilities:
+                logger.debug(
+                    f"Current mod is incompatible with these mods: {incompatibilities}"
+                )
+                reference_add_incompatibility_to_mod(
+                    state.internal_local_metadata[uuid],
+                    incompatibilities,
+                    state.internal_local_metadata,
+                )
+
+        if state.internal_local_metadata[uuid].get("incompatiblewithbyversion"):
+            major, minor = state.game_version.split(".")[
+                :2
+            ]  # Split the version and take the first two parts
+            version_regex = rf"v{major}\.{minor}"  # Construct the regex to match both major and minor versions
+            for version, incompatibilities_by_ver in state.internal_local_metadata[
+                uuid
+            ]["incompatiblewithbyversion"].items():
+                if match(version_regex, version):
+                    if (
+                        incompatibilities_by_ver
+                        and isinstance(incompatibilities_by_ver, dict)
+                        and incompatibilities_by_ver.get("li")
+                    ):
+                        logger.debug(
+                            f"Current mod is incompatible by version with these mods: {incompatibilities_by_ver['li']}"
+                        )
+                        reference_add_incompatibility_to_mod(
+                            state.internal_local_metadata[uuid],
+                            incompatibilities_by_ver["li"],
+                            state.internal_local_metadata,
+                        )
+                    else:
+                        logger.warning(
+                            f"About.xml syntax error. Unable to read <incompatiblewithbyversion> tag from XML for version [{version}]: {state.internal_local_metadata[uuid]['metadata_file_path']}"
+                        )
+                        logger.debug(incompatibilities_by_ver)
+        # Current mod should be loaded AFTER these mods. These mods can be thought
+        # of as "load these before". These are not necessarily dependencies in the sense
+        # that they "depend" on them. But, if they exist in the same mod list, they
+        # should be loaded before.
+        if state.internal_local_metadata[uuid].get("loadafter"):
+            try:
+                load_these_before = state.internal_local_metadata[uuid][
+                    "loadafter"
+                ].get("li")
+                if load_these_before:
+                    logger.debug(
+                        f"Current mod should load after these mods: {load_these_before}"
+                    )
+                    add_load_rule_to_mod(
+                        state.internal_local_metadata[uuid],
+                        load_these_before,
+                        "loadTheseBefore",
+                        "loadTheseAfter",
+                        state.internal_local_metadata,
+                        state.packageid_to_uuids,
+                    )
+            except Exception as e:
+                mod_metadata_path = state.internal_local_metadata[uuid][
+                    "metadata_file_path"
+                ]
+                logger.warning(
+                    f"About.xml syntax error. Unable to read <loadafter> tag from XML: {mod_metadata_path}"
+                )
+                logger.debug(e)
+
+        if state.internal_local_metadata[uuid].get("forceloadafter"):
+            try:
+                force_load_these_before = state.internal_local_metadata[uuid][
+                    "forceloadafter"
+                ].get("li")
+                if force_load_these_before:
+                    logger.debug(
+                        f"Current mod should force load after these mods: {force_load_these_before}"
+                    )
+                    add_load_rule_to_mod(
+                        state.internal_local_metadata[uuid],
+                        force_load_these_before,
+                        "loadTheseBefore",
+                        "loadTheseAfter",
+                        state.internal_local_metadata,
+                        state.packageid_to_uuids,
+                    )
+            except Exception as e:
+                mod_metadata_path = state.internal_local_metadata[uuid][
+                    "mod_metadata_path"
+                ]
+                logger.warning(
+                    f"About.xml syntax error. Unable to read <forceloadafter> tag from XML: {mod_metadata_path}"
+                )
+                logger.debug(e)
+
+        if state.internal_local_metadata[uuid].get("loadafterbyversion"):
+            major, minor = state.game_version.split(".")[:2]
+            version_regex = rf"v{major}\.{minor}"
+            for version, load_these_before_by_ver in state.internal_local_metadata[
+                uuid
+            ]["loadafterbyversion"].items():
+                if match(version_regex, version):
+                    try:
+                        if (
+                            load_these_before_by_ver
+                            and isinstance(load_these_before_by_ver, dict)
+                            and load_these_before_by_ver.get("li")
+                        ):
+                            logger.debug(
+                                f"Current mod should load before these mods for {version}: {load_these_before_by_ver['li']}"
+                            )
+                            add_load_rule_to_mod(
+                                state.internal_local_metadata[uuid],
+                                load_these_before_by_ver["li"],
+                                "loadTheseBefore",
+                                "loadTheseAfter",
+                                state.internal_local_metadata,
+                                state.packageid_to_uuids,
+                            )
+                        else:
+                            logger.warning(
+                                f"About.xml syntax error. Unable to read <loadafterbyversion> tag from XML for version [{version}]: {state.internal_local_metadata[uuid]['metadata_file_path']}"
+                            )
+                            logger.debug(load_these_before_by_ver)
+                    except Exception as e:
+                        mod_metadata_path = state.internal_local_metadata[uuid].get(
+                            "metadata_file_path"
+                        )
+                        logger.warning(
+                            f"Error processing <loadafterbyversion> tag for {version} from XML: {mod_metadata_path}"
+                        )
+                        logger.debug(e)
+
+        # Current mod should be loaded BEFORE these mods
+        # The current mod is a dependency for all these mods
+        if state.internal_local_metadata[uuid].get("loadbefore"):
+            try:
+                load_these_after = state.internal_local_metadata[uuid][
+                    "loadbefore"
+                ].get("li")
+                if load_these_after:
+                    logger.debug(
+                        f"Current mod should load before these mods: {load_these_after}"
+                    )
+                    add_load_rule_to_mod(
+                        state.internal_local_metadata[uuid],
+                        load_these_after,
+                        "loadTheseAfter",
+                        "loadTheseBefore",
+                        state.internal_local_metadata,
+                        state.packageid_to_uuids,
+                    )
+            except Exception as e:
+                mod_metadata_path = state.internal_local_metadata[uuid][
+                    "metadata_file_path"
+                ]
+                logger.warning(
+                    f"About.xml syntax error. Unable to read <loadbefore> tag from XML: {mod_metadata_path}"
+                )
+                logger.debug(e)
+
+        if state.internal_local_metadata[uuid].get("forceloadbefore"):
+            try:
+                force_load_these_after = state.internal_local_metadata[uuid][
+                    "forceloadbefore"
+                ].get("li")
+                if force_load_these_after:
+                    logger.debug(
+                        f"Current mod should force load before these mods: {force_load_these_after}"
+                    )
+                    add_load_rule_to_mod(
+                        state.internal_local_metadata[uuid],
+                        force_load_these_after,
+                        "loadTheseAfter",
+                        "loadTheseBefore",
+                        state.internal_local_metadata,
+                        state.packageid_to_uuids,
+                    )
+            except Exception as e:
+                mod_metadata_path = state.internal_local_metadata[uuid][
+                    "metadata_file_path"
+                ]
+                logger.warning(
+                    f"About.xml syntax error. Unable to read <forceloadbefore> tag from XML: {mod_metadata_path}"
+                )
+                logger.debug(e)
+
+        if state.internal_local_metadata[uuid].get("loadbeforebyversion"):
+            major, minor = state.game_version.split(".")[:2]
+            version_regex = rf"v{major}\.{minor}"
+            for version, load_these_after_by_ver in state.internal_local_metadata[uuid][
+                "loadbeforebyversion"
+            ].items():
+                if match(version_regex, version):
+                    try:
+                        if (
+                            load_these_after_by_ver
+                            and isinstance(load_these_after_by_ver, dict)
+                            and load_these_after_by_ver.get("li")
+                        ):
+                            logger.debug(
+                                f"Current mod should load after these mods for {version}: {load_these_after_by_ver['li']}"
+                            )
+                            add_load_rule_to_mod(
+                                state.internal_local_metadata[uuid],
+                                load_these_after_by_ver["li"],
+                                "loadTheseAfter",
+                                "loadTheseBefore",
+                                state.internal_local_metadata,
+                                state.packageid_to_uuids,
+                            )
+                        else:
+                            logger.warning(
+                                f"About.xml syntax error. Unable to read <loadbeforebyversion> tag from XML for version [{version}]: {state.internal_local_metadata[uuid]['metadata_file_path']}"
+                            )
+                            logger.debug(load_these_after_by_ver)
+                    except Exception as e:
+                        mod_metadata_path = state.internal_local_metadata[uuid].get(
+                            "metadata_file_path"
+                        )
+                        logger.warning(
+                            f"Error processing <loadbeforebyversion> tag for {version} from XML: {mod_metadata_path}"
+                        )
+                        logger.debug(e)
+
+    logger.info("Finished adding dependencies through About.xml information")
+
+
+def generate_compile_input(
+    mods: int, seed: int = 0
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Generate parsed metadata where a third of the mods has version specific
+    rules, and the uuids to compile.
+    """
+    corpus = generate_mod_corpus(mods, by_version=0.3, seed=seed)
+    return corpus, list(corpus)
+
+
+def reference_get_mods_from_package_ids(
+    all_mods: dict[str, Any], package_ids_to_import: list[str]
+) -> tuple[list[str], list[str], dict[str, Any], list[str]]:
+    """
+    The matching part of get_mods_from_list() before it was indexed by packageid.
+    Loops over every installed mod for each package id in the list.
+    """
+    active_mods_uuids: list[str] = []
+    inactive_mods_uuids: list[str] = []
+    duplicate_mods: dict[str, Any] = {}
+    duplicates_processed = []
+    populated_mods = []
+    to_populate = []
+    for mod_uuid, mod_data in all_mods.items():
+        duplicate_mods.setdefault(mod_data["packageid"], []).append(mod_uuid)
+    duplicate_mods = {k: v for k, v in duplicate_mods.items() if len(v) > 1}
+    for package_id in package_ids_to_import:
+        package_id_normalized = package_id.lower()
+        package_id_steam_suffix = "_steam"
+        package_id_normalized_stripped = package_id_normalized.replace(
+            package_id_steam_suffix, ""
+        )
+        is_steam = package_id_steam_suffix in package_id_normalized
+        target_id = (
+            package_id_normalized_stripped if is_steam else package_id_normalized
+        )
+        to_populate.append(target_id)
+        sources_order = (
+            ["workshop", "local"] if is_steam else ["expansion", "local", "workshop"]
+        )
+        for uuid, metadata in all_mods.items():
+            metadata_package_id = metadata["packageid"]
+            if metadata_package_id in [
+                package_id_normalized,
+                package_id_normalized_stripped,
+            ]:
+                if target_id not in duplicate_mods.keys():
+                    populated_mods.append(target_id)
+                    active_mods_uuids.append(uuid)
+                else:
+                    if target_id in duplicates_processed:
+                        continue
+                    for source in sources_order:
+                        paths_to_uuid = {}
+                        for duplicate_uuid in duplicate_mods[target_id]:
+                            if source in all_mods[duplicate_uuid]["data_source"]:
+                                paths_to_uuid[all_mods[duplicate_uuid]["path"]] = (
+                                    duplicate_uuid
+                                )
+                        source_paths_sorted = natsorted(paths_to_uuid.keys())
+                        if source_paths_sorted:
+                            calculated_duplicate_uuid = paths_to_uuid[
+                                source_paths_sorted[0]
+                            ]
+                            populated_mods.append(target_id)
+                            duplicates_processed.append(target_id)
+                            active_mods_uuids.append(calculated_duplicate_uuid)
+                            break
+    missing_mods = list(set(to_populate) - set(populated_mods))
+    inactive_mods_uuids = [
+        uuid for uuid in all_mods.keys() if uuid not in active_mods_uuids
+    ]
+    return active_mods_uuids, inactive_mods_uuids, duplicate_mods, missing_mods
+
+
+def generate_mods(
+    installed: int, active: int, seed: int = 0
+) -> tuple[dict[str, Any], list[str]]:
+    """
+    Generate installed mod metadata and a mods list to import.
+
+    About 5% of the installed mods are duplicated in another data source, and
+    the list has a few _steam suffixed and missing entries mixed in.
+    """
+    rng = random.Random(seed)
+    all_mods: dict[str, Any] = {}
+    for index in range(installed):
+        data_source = rng.choice(DATA_SOURCES)
+        all_mods[f"uuid-{index}"] = {
+            "packageid": synthetic_packageid(index),
+            "data_source": data_source,
+            "path": f"/{data_source}/{index}",
+        }
+        if rng.random() < 0.05:
+            duplicate_source = rng.choice(DATA_SOURCES)
+            all_mods[f"uuid-{index}-duplicate"] = {
+                "packageid": synthetic_packageid(index),
+                "data_source": duplicate_source,
+                "path": f"/{duplicate_source}/{index}-copy",
+            }
+    uuids = list(all_mods)
+    rng.shuffle(uuids)
+    all_mods = {uuid: all_mods[uuid] for uuid in uuids}
+
+    package_ids = []
+    for index in rng.sample(range(installed), min(active, installed)):
+        package_id = synthetic_packageid(index)
+        roll = rng.random()
+        if roll < 0.05:
+            package_id += "_steam"
+        elif roll < 0.07:
+            package_id = f"missing.{package_id}"
+        package_ids.append(package_id)
+    return all_mods, package_ids
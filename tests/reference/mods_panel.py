@@ -0,0 +1,514 @@
+"""
+The previous versions of the ModListWidget and ModsPanel methods, which the
+tests and benchmarks compare the current ones against, and the helpers to fill
+and change a mod list the way the tests and benchmarks do.
+"""
+
+import copy
+import types
+from typing import Any
+
+from loguru import logger
+
+from tests.reference.synthetic_mods import generate_mod_corpus, metadata_manager_state
+
+
+def settings_controller(
+    mod_type_filter_toggle: bool = True,
+    hide_invalid_mods_when_filtering_toggle: bool = False,
+) -> Any:
+    """
+    The settings used by ModListWidget and ModsPanel, without a SettingsController.
+    """
+    return types.SimpleNamespace(
+        settings=types.SimpleNamespace(
+            external_use_this_instead_metadata_source="None",
+            mod_type_filter_toggle=mod_type_filter_toggle,
+            hide_invalid_mods_when_filtering_toggle=hide_invalid_mods_when_filtering_toggle,
+        )
+    )
+
+
+def reference_recreate_mod_list(
+    mod_list: Any, list_type: str, uuids: list[str]
+) -> None:
+    """
+    ModListWidget.recreate_mod_list() before the items were inserted in bulk.
+    """
+    from PySide6.QtCore import Qt
+
+    from app.utils.custom_list_widget_item import CustomListWidgetItem
+    from app.utils.custom_list_widget_item_metadata import (
+        CustomListWidgetItemMetadata,
+    )
+
+    # Disable updates
+    mod_list.setUpdatesEnabled(False)
+    # Clear list
+    mod_list.clear()
+    mod_list.uuids = list()
+    # The new items have no errors or warnings yet
+    mod_list.rule_index.invalidate()
+    mod_list.item_delegate.row_layouts.clear()
+    if uuids:  # Insert data...
+        for uuid_key in uuids:
+            list_item = CustomListWidgetItem(mod_list)
+            data = CustomListWidgetItemMetadata(uuid=uuid_key)
+            list_item.setData(Qt.ItemDataRole.UserRole, data)
+            mod_list.addItem(list_item)
+    else:  # ...unless we don't have mods, at which point reenable updates and exit
+        mod_list.setUpdatesEnabled(True)
+        return
+    # Enable updates and repaint
+    mod_list.setUpdatesEnabled(True)
+    mod_list.repaint()
+
+
+def populate(mod_list: Any, uuids: list[str], previous: bool = False) -> None:
+    from PySide6.QtWidgets import QApplication
+
+    updated: list[str] = []
+    mod_list.list_update_signal.connect(updated.append)
+    if previous:
+        reference_recreate_mod_list(mod_list, "Active", uuids)
+    else:
+        mod_list.recreate_mod_list("Active", uuids)
+    while str(len(uuids)) not in updated:
+        QApplication.processEvents()
+    mod_list.list_update_signal.disconnect(updated.append)
+    mod_list.viewport().repaint()
+
+
+def reference_recalculate_internal_errors_warnings(
+    mod_list: Any,
+) -> tuple[str, str, int, int]:
+    """
+    ModListWidget.recalculate_internal_errors_warnings() before ModListRuleIndex,
+    which recalculated every mod on every change.
+    """
+    from PySide6.QtCore import Qt
+
+    logger.info(f"Recalculating {mod_list.list_type} list errors / warnings")
+
+    internal_local_metadata = mod_list.metadata_manager.internal_local_metadata
+
+    packageid_to_uuid = {
+        internal_local_metadata[uuid]["packageid"]: uuid for uuid in mod_list.uuids
+    }
+    package_ids_set = set(packageid_to_uuid.keys())
+
+    package_id_to_errors: dict[str, dict[str, None | set[str] | bool]] = {
+        uuid: {
+            "missing_dependencies": set() if mod_list.list_type == "Active" else None,
+            "conflicting_incompatibilities": (
+                set() if mod_list.list_type == "Active" else None
+            ),
+            "load_before_violations": set() if mod_list.list_type == "Active" else None,
+            "load_after_violations": set() if mod_list.list_type == "Active" else None,
+            "version_mismatch": True,
+            "use_this_instead": set()
+            if mod_list.settings_controller.settings.external_use_this_instead_metadata_source
+            != "None"
+            else None,
+        }
+        for uuid in mod_list.uuids
+    }
+
+    num_warnings = 0
+    total_warning_text = ""
+    num_errors = 0
+    total_error_text = ""
+
+    for uuid, mod_errors in package_id_to_errors.items():
+        current_mod_index = mod_list.uuids.index(uuid)
+        current_item = mod_list.item(current_mod_index)
+        if current_item is None:
+            continue
+        current_item_data = current_item.data(Qt.ItemDataRole.UserRole)
+        current_item_data["mismatch"] = False
+        current_item_data["errors"] = ""
+        current_item_data["warnings"] = ""
+        mod_data = internal_local_metadata[uuid]
+        # Check mod supportedversions against currently loaded version of game
+        mod_errors["version_mismatch"] = mod_list.metadata_manager.is_version_mismatch(
+            uuid
+        )
+        # Set an item's validity dynamically based on the version mismatch value
+        if (
+            mod_data["packageid"] not in mod_list.ignore_warning_list
+            and not current_item_data["warning_toggled"]
+        ):
+            current_item_data["mismatch"] = mod_errors["version_mismatch"]
+        else:
+            # If a mod has been moved for eg. inactive -> active. We keep ignoring the warnings.
+            # This makes sure to add the mod to the ignore list of the new modlist.
+            # TODO: Check if toggle_warning method can add a mod to the ignore list
+            # of both ModListWidgets (Active and Inactive) at the same time. Then we can remove some of this confusing code...
+            if not current_item_data["warning_toggled"]:
+                if mod_data["packageid"] in mod_list.ignore_warning_list:
+                    mod_list.ignore_warning_list.remove(mod_data["packageid"])
+            elif mod_data["packageid"] not in mod_list.ignore_warning_list:
+                mod_list.ignore_warning_list.append(mod_data.get("packageid"))
+        # Check for "Active" mod list specific errors and warnings
+        if (
+            mod_list.list_type == "Active"
+            and mod_data.get("packageid")
+            and mod_data["packageid"] not in mod_list.ignore_warning_list
+        ):
+            # Check dependencies (and replacements for dependencies)
+            # Note: dependency replacements are NOT assumed to be subject
+            # to the same load order rules as the orignal mods!
+            mod_errors["missing_dependencies"] = {
+                dep
+                for dep in mod_data.get("dependencies", [])
+                if dep not in package_ids_set
+                and not mod_list._has_replacement(
+                    mod_data["packageid"], dep, package_ids_set
+                )
+            }
+
+            # Check incompatibilities
+            mod_errors["conflicting_incompatibilities"] = {
+                incomp
+                for incomp in mod_data.get("incompatibilities", [])
+                if incomp in package_ids_set
+            }
+
+            # Check loadTheseBefore
+            for load_this_before in mod_data.get("loadTheseBefore", []):
+                if (
+                    load_this_before[1]
+                    and load_this_before[0] in packageid_to_uuid
+                    and current_mod_index
+                    <= mod_list.uuids.index(packageid_to_uuid[load_this_before[0]])
+                ):
+                    assert isinstance(mod_errors["load_before_violations"], set)
+                    mod_errors["load_before_violations"].add(load_this_before[0])
+
+            # Check loadTheseAfter
+            for load_this_after in mod_data.get("loadTheseAfter", []):
+                if (
+                    load_this_after[1]
+                    and load_this_after[0] in packageid_to_uuid
+                    and current_mod_index
+                    >= mod_list.uuids.index(packageid_to_uuid[load_this_after[0]])
+                ):
+                    assert isinstance(mod_errors["load_after_violations"], set)
+                    mod_errors["load_after_violations"].add(load_this_after[0])
+        # Calculate any needed string for errors
+        tool_tip_text = ""
+        for error_type, tooltip_header in [
+            ("missing_dependencies", "\nMissing Dependencies:"),
+            ("conflicting_incompatibilities", "\nIncompatibilities:"),
+        ]:
+            if mod_errors[error_type]:
+                tool_tip_text += tooltip_header
+                errors = mod_errors[error_type]
+                assert isinstance(errors, set)
+                for key in errors:
+                    name = internal_local_metadata.get(
+                        packageid_to_uuid.get(key, ""), {}
+                    ).get(
+                        "name",
+                        mod_list.metadata_manager.steamdb_packageid_to_name.get(
+                            key, key
+                        ),
+                    )
+                    tool_tip_text += f"\n  * {name}"
+        # If missing dependency and/or incompatibility, add tooltip to errors
+        current_item_data["errors"] = tool_tip_text
+        # Calculate any needed string for warnings
+        for error_type, tooltip_header in [
+            ("load_before_violations", "\nShould be Loaded After:"),
+            ("load_after_violations", "\nShould be Loaded Before:"),
+        ]:
+            if mod_errors[error_type]:
+                tool_tip_text += tooltip_header
+                errors = mod_errors[error_type]
+                assert isinstance(errors, set)
+                for key in errors:
+                    name = internal_local_metadata.get(
+                        packageid_to_uuid.get(key, ""), {}
+                    ).get(
+                        "name",
+                        mod_list.metadata_manager.steamdb_packageid_to_name.get(
+                            key, key
+                        ),
+                    )
+                    tool_tip_text += f"\n  * {name}"
+        # Handle version mismatch behavior
+        if (
+            mod_errors["version_mismatch"]
+            and mod_data["packageid"] not in mod_list.ignore_warning_list
+        ):
+            # Add tool tip to indicate mod and game version mismatch
+            tool_tip_text += "\nMod and Game Version Mismatch"
+        # Handle "use this instead" behavior
+        if (
+            current_item_data["alternative"]
+            and mod_data["packageid"] not in mod_list.ignore_warning_list
+        ):
+            tool_tip_text += f"\nAn alternative updated mod is recommended:\n{current_item_data['alternative']}"
+        # Add to error summary if any missing dependencies or incompatibilities
+        if mod_list.list_type == "Active" and any(
+            [
+                mod_errors[key]
+                for key in [
+                    "missing_dependencies",
+                    "conflicting_incompatibilities",
+                ]
+            ]
+        ):
+            num_errors += 1
+            total_error_text += f"\n\n{mod_data['name']}"
+            total_error_text += "\n" + "=" * len(mod_data["name"])
+            total_error_text += tool_tip_text
+
+        # Add to warning summary if any loadBefore or loadAfter violations, or version mismatch
+        # Version mismatch is determined earlier without checking if the mod is in ignore_warning_list
+        # so we have to check it again here in order to not display a faulty, empty version warning
+        if (
+            mod_list.list_type == "Active"
+            and mod_data["packageid"] not in mod_list.ignore_warning_list
+            and any(
+                [
+                    mod_errors[key]
+                    for key in [
+                        "load_before_violations",
+                        "load_after_violations",
+                        "version_mismatch",
+                        "use_this_instead",
+                    ]
+                ]
+            )
+        ):
+            num_warnings += 1
+            total_warning_text += f"\n\n{mod_data['name']}"
+            total_warning_text += "\n============================="
+            total_warning_text += tool_tip_text
+        # Add tooltip to item data and set the data back to the item
+        current_item_data["errors_warnings"] = tool_tip_text.strip()
+        current_item_data["warnings"] = tool_tip_text[
+            len(current_item_data["errors"]) :
+        ].strip()
+        current_item_data["errors"] = current_item_data["errors"].strip()
+        current_item.setData(Qt.ItemDataRole.UserRole, current_item_data)
+    logger.info(f"Finished recalculating {mod_list.list_type} list errors and warnings")
+    return total_error_text, total_warning_text, num_errors, num_warnings
+
+
+def compiled_corpus(mods: int, seed: int = 0) -> dict[str, Any]:
+    """
+    A synthetic corpus with the rules compiled by MetadataManager.compile_metadata().
+    """
+    from app.utils.metadata import MetadataManager
+
+    corpus = copy.deepcopy(generate_mod_corpus(mods, seed=seed))
+    MetadataManager.compile_metadata(metadata_manager_state(corpus), list(corpus))
+    return corpus
+
+
+def move(mod_list: Any, source: int, destination: int) -> None:
+    """
+    Move a row the way dropping it within the list does.
+    """
+    from PySide6.QtCore import QModelIndex
+
+    mod_list.model().moveRow(QModelIndex(), source, QModelIndex(), destination)
+    uuid = mod_list.uuids.pop(source)
+    mod_list.uuids.insert(
+        destination - 1 if destination > source else destination, uuid
+    )
+
+
+def take(mod_list: Any, row: int) -> None:
+    """
+    Remove a row, without waiting for the rows removed handler.
+    """
+    mod_list.takeItem(row)
+    mod_list.uuids.pop(row)
+
+
+def insert(mod_list: Any, row: int, uuid: str) -> None:
+    """
+    Insert a mod, without waiting for the rows inserted handler.
+    """
+    from PySide6.QtCore import Qt
+
+    from app.utils.custom_list_widget_item import CustomListWidgetItem
+    from app.utils.custom_list_widget_item_metadata import (
+        CustomListWidgetItemMetadata,
+    )
+
+    item = CustomListWidgetItem()
+    item.setData(
+        Qt.ItemDataRole.UserRole,
+        CustomListWidgetItemMetadata(uuid=uuid),
+        avoid_emit=True,
+    )
+    mod_list.insertItem(row, item)
+    mod_list.uuids.insert(row, uuid)
+
+
+def reference_update_count(panel: Any, list_type: str) -> None:
+    """
+    ModsPanel.update_count() before it read the items by row.
+    """
+    from PySide6.QtCore import Qt
+
+    label = (
+        panel.active_mods_label if list_type == "Active" else panel.inactive_mods_label
+    )
+    search = (
+        panel.active_mods_search
+        if list_type == "Active"
+        else panel.inactive_mods_search
+    )
+    uuids = (
+        panel.active_mods_list.uuids
+        if list_type == "Active"
+        else panel.inactive_mods_list.uuids
+    )
+    num_filtered = 0
+    num_unfiltered = 0
+    for uuid in uuids:
+        item = (
+            panel.active_mods_list.item(uuids.index(uuid))
+            if list_type == "Active"
+            else panel.inactive_mods_list.item(uuids.index(uuid))
+        )
+        if item is None:
+            continue
+        item_data = item.data(Qt.ItemDataRole.UserRole)
+        item_filtered = item_data["filtered"]
+
+        if item.isHidden() or item_filtered:
+            num_filtered += 1
+        else:
+            num_unfiltered += 1
+    if search.text():
+        label.setText(f"{list_type} [{num_unfiltered}/{num_filtered + num_unfiltered}]")
+    elif num_filtered > 0:
+        label.setText(f"{list_type} [{num_unfiltered}/{num_filtered + num_unfiltered}]")
+    else:
+        label.setText(f"{list_type} [{num_filtered + num_unfiltered}]")
+
+
+def reference_signal_search_and_filters(
+    panel: Any,
+    list_type: str,
+    pattern: str,
+    filters_active: bool = False,
+    recalculate_list_errors_warnings: bool = True,
+) -> None:
+    """
+    ModsPanel.signal_search_and_filters() before the search table.
+    """
+    from PySide6.QtCore import Qt
+
+    from app.utils.event_bus import EventBus
+
+    _filter = None
+    filter_state = None  # The 'Hide Filter' state
+    source_filter = None
+    uuids = None
+    # Notify controller when search bar text or any filters change
+    if list_type == "Active":
+        EventBus().filters_changed_in_active_modlist.emit()
+    elif list_type == "Inactive":
+        EventBus().filters_changed_in_inactive_modlist.emit()
+    # Determine which list to filter
+    if list_type == "Active":
+        _filter = panel.active_mods_search_filter
+        filter_state = panel.active_mods_search_filter_state
+        source_filter = panel.active_mods_data_source_filter
+        uuids = panel.active_mods_list.uuids
+    elif list_type == "Inactive":
+        _filter = panel.inactive_mods_search_filter
+        filter_state = panel.inactive_mods_search_filter_state
+        source_filter = panel.inactive_mods_data_source_filter
+        uuids = panel.inactive_mods_list.uuids
+    else:
+        raise NotImplementedError(f"Unknown list type: {list_type}")
+    # Evaluate the search filter state for the list
+    search_filter = None
+    if _filter.currentText() == "Name":
+        search_filter = "name"
+    elif _filter.currentText() == "PackageId":
+        search_filter = "packageid"
+    elif _filter.currentText() == "Author(s)":
+        search_filter = "authors"
+    elif _filter.currentText() == "PublishedFileId":
+        search_filter = "publishedfileid"
+    # Filter the list using any search and filter state
+    for uuid in uuids:
+        item = (
+            panel.active_mods_list.item(uuids.index(uuid))
+            if list_type == "Active"
+            else panel.inactive_mods_list.item(uuids.index(uuid))
+        )
+        if item is None:
+            continue
+        item_data = item.data(Qt.ItemDataRole.UserRole)
+        metadata = panel.metadata_manager.internal_local_metadata[uuid]
+        if pattern != "":
+            filters_active = True
+        # Hide invalid items if enabled in settings
+        if panel.settings_controller.settings.hide_invalid_mods_when_filtering_toggle:
+            invalid = item_data["invalid"]
+            if invalid and filters_active:
+                item_data["filtered"] = True
+                item.setHidden(True)
+                continue
+            elif invalid and not filters_active:
+                item_data["filtered"] = False
+                item.setHidden(False)
+        # Check if the item is filtered
+        item_filtered = item_data["filtered"]
+        # Check if the item should be filtered or not based on search filter
+        if (
+            pattern
+            and metadata.get(search_filter)
+            and pattern.lower() not in str(metadata.get(search_filter)).lower()
+        ):
+            item_filtered = True
+        elif source_filter == "all":  # or data source
+            item_filtered = False
+        elif source_filter == "git_repo":
+            item_filtered = not metadata.get("git_repo")
+        elif source_filter == "steamcmd":
+            item_filtered = not metadata.get("steamcmd")
+        elif source_filter != metadata.get("data_source"):
+            item_filtered = True
+
+        type_filter_index = (
+            panel.active_data_source_filter_type_index
+            if list_type == "Active"
+            else panel.inactive_data_source_filter_type_index
+        )
+
+        if type_filter_index == 1 and not metadata.get("csharp"):
+            item_filtered = True
+        elif type_filter_index == 2 and metadata.get("csharp"):
+            item_filtered = True
+
+        # Check if the item should be filtered or hidden based on filter state
+        if filter_state:
+            item.setHidden(item_filtered)
+            if item_filtered:
+                item_data["hidden_by_filter"] = True
+                item_filtered = False
+            else:
+                item_data["hidden_by_filter"] = False
+        else:
+            if item_filtered and item.isHidden():
+                item.setHidden(False)
+                item_data["hidden_by_filter"] = False
+        # Update item data
+        item_data["filtered"] = item_filtered
+        item.setData(Qt.ItemDataRole.UserRole, item_data)
+    # mod_list_updated()
+    reference_update_count(panel, list_type)
+    panel.save_btn_animation_signal.emit()
+    if recalculate_list_errors_warnings:
+        panel.recalculate_list_errors_warnings(list_type=list_type)
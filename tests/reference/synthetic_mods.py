@@ -0,0 +1,317 @@
+import random
+import types
+from pathlib import Path
+from typing import Any
+
+import xmltodict
+
+ABOUT_XML_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<ModMetaData>
+  <name>{name}</name>
+  <author>{author}</author>
+  <packageId>{packageid}</packageId>
+  <supportedVersions>
+{supported_versions}
+  </supportedVersions>
+  <modDependencies>
+{dependencies}
+  </modDependencies>
+  <loadAfter>
+{load_after}
+  </loadAfter>
+  <description>{description}</description>
+</ModMetaData>
+"""
+
+DEPENDENCY_TEMPLATE = """    <li>
+      <packageId>{packageid}</packageId>
+      <displayName>{name}</displayName>
+      <steamWorkshopUrl>steam://url/CommunityFilePage/{pfid}</steamWorkshopUrl>
+    </li>"""
+
+VERSIONS = ["1.0", "1.1", "1.2", "1.3", "1.4", "1.5"]
+
+
+def synthetic_packageid(index: int) -> str:
+    return f"synthetic.author{index % 97}.mod{index}"
+
+
+def synthetic_pfid(index: int) -> str:
+    return str(1_000_000_000 + index)
+
+
+def generate_mod_tree(root: Path, count: int, seed: int = 0) -> list[str]:
+    """
+    Generate a synthetic mods folder with `count` mods that look like real ones.
+
+    Mods have several supported versions, dependencies and load order rules on
+    earlier mods, a description, and a mix of PublishedFileId.txt, Preview.png
+    and C# assemblies. Output is deterministic for a given seed.
+
+    :param root: Folder to create the mods in
+    :param count: Number of mods to create
+    :param seed: Seed for the random generator
+    :return: List of the created mod directories
+    """
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    mod_directories = []
+    for index in range(count):
+        mod_directory = root / synthetic_pfid(index)
+        about = mod_directory / "About"
+        about.mkdir(parents=True, exist_ok=True)
+
+        earlier = rng.sample(range(index), min(index, rng.randint(0, 4)))
+        dependencies = "\n".join(
+            DEPENDENCY_TEMPLATE.format(
+                packageid=synthetic_packageid(dep),
+                name=f"Synthetic Mod {dep}",
+                pfid=synthetic_pfid(dep),
+            )
+            for dep in earlier[:2]
+        )
+        load_after = "\n".join(
+            f"    <li>{synthetic_packageid(dep)}</li>" for dep in earlier
+        )
+        supported_versions = "\n".join(
+            f"    <li>{version}</li>"
+            for version in VERSIONS[rng.randint(0, len(VERSIONS) - 1) :]
+        )
+        description = " ".join(
+            rng.choice(["Adds", "new", "weapons", "apparel", "pawns", "and", "fixes"])
+            for _ in range(rng.randint(20, 200))
+        )
+        (about / "About.xml").write_text(
+            ABOUT_XML_TEMPLATE.format(
+                name=f"Synthetic Mod {index}",
+                author=f"Author {index % 97}",
+                packageid=synthetic_packageid(index),
+                supported_versions=supported_versions,
+                dependencies=dependencies,
+                load_after=load_after,
+                description=description,
+            ),
+            encoding="utf-8",
+        )
+        if rng.random() < 0.8:
+            (about / "PublishedFileId.txt").write_text(
+                synthetic_pfid(index), encoding="utf-8"
+            )
+        if rng.random() < 0.9:
+            (about / "Preview.png").write_bytes(b"\x89PNG\r\n\x1a\n")
+        if rng.random() < 0.4:
+            assemblies = mod_directory / "Assemblies"
+            assemblies.mkdir(exist_ok=True)
+            (assemblies / f"SyntheticMod{index}.dll").write_bytes(b"MZ")
+        mod_directories.append(str(mod_directory))
+    return mod_directories
+
+
+GAME_VERSION = "1.5.4104 rev435"
+
+
+def generate_mod_corpus(
+    mods: int,
+    density: float = 2.0,
+    duplicates: float = 0.05,
+    cycles: int = 0,
+    by_version: float = 0.0,
+    seed: int = 0,
+) -> dict[str, dict[str, Any]]:
+    """
+    Generate the About.xml metadata of `mods` mods as parsed into
+    MetadataManager.internal_local_metadata, keyed by uuid.
+
+    The first mod is Core. Every other mod loads after Core and, on average,
+    `density` random earlier mods, and depends on up to two of them. A
+    `duplicates` fraction of the mods is installed both from the workshop and
+    locally, and `cycles` mods also load before one of the mods they load
+    after. A `by_version` fraction of the mods also has version specific
+    rules and incompatibilities. Output is deterministic for a given seed.
+
+    :param mods: Number of distinct mods
+    :param density: Average number of loadAfter rules on earlier mods
+    :param duplicates: Fraction of mods installed twice
+    :param cycles: Number of dependency loops of two mods
+    :param by_version: Fraction of mods with version specific rules
+    :param seed: Seed for the random generator
+    :return: uuid -> mod metadata
+    """
+    rng = random.Random(seed)
+    cycle_mods = set(rng.sample(range(2, mods), min(cycles, max(mods - 2, 0))))
+    corpus: dict[str, dict[str, Any]] = {
+        "expansion-core": {
+            "name": "Core",
+            "packageid": "ludeon.rimworld",
+            "supportedversions": {"li": GAME_VERSION[:3]},
+            "data_source": "expansion",
+            "folder": "Core",
+            "path": "/expansion/Core",
+        }
+    }
+    for index in range(1, mods):
+        earlier = rng.sample(
+            range(1, index), min(index - 1, round(rng.expovariate(1 / density)))
+        )
+        metadata: dict[str, Any] = {
+            "name": f"Synthetic Mod {index}",
+            "authors": f"Author {index % 97}",
+            "packageid": synthetic_packageid(index),
+            "supportedversions": {"li": VERSIONS[rng.randint(0, len(VERSIONS) - 1) :]},
+            "loadafter": {
+                "li": ["Ludeon.RimWorld"]
+                + [synthetic_packageid(dep) for dep in earlier]
+            },
+            "data_source": "workshop" if rng.random() < 0.7 else "local",
+            "folder": synthetic_pfid(index),
+        }
+        if earlier:
+            metadata["moddependencies"] = {
+                "li": [
+                    {
+                        "packageId": synthetic_packageid(dep),
+                        "displayName": f"Synthetic Mod {dep}",
+                    }
+                    for dep in earlier[:2]
+                ]
+            }
+        if index in cycle_mods:
+            metadata["loadafter"]["li"].append(synthetic_packageid(index - 1))
+            metadata["loadbefore"] = {"li": [synthetic_packageid(index - 1)]}
+        if by_version and rng.random() < by_version:
+            others = [synthetic_packageid(rng.randrange(1, mods)) for _ in range(4)]
+            metadata["loadafterbyversion"] = {
+                f"v{version}": {"li": others[:2] if version == "1.5" else others[0]}
+                for version in VERSIONS[-3:]
+            }
+            metadata["loadbeforebyversion"] = {"v1.5": {"li": others[2]}}
+            metadata["moddependenciesbyversion"] = {
+                "v1.5": {"li": {"packageId": others[0], "displayName": others[0]}}
+            }
+            metadata["incompatiblewith"] = {"li": others[3]}
+            metadata["incompatiblewithbyversion"] = {"v1.4": {"li": others[1:3]}}
+        metadata["path"] = f"/{metadata['data_source']}/{metadata['folder']}"
+        if metadata["data_source"] == "workshop":
+            metadata["publishedfileid"] = synthetic_pfid(index)
+        corpus[f"uuid-{index}"] = metadata
+        if rng.random() < duplicates:
+            duplicate = dict(metadata)
+            duplicate["data_source"] = (
+                "local" if metadata["data_source"] == "workshop" else "workshop"
+            )
+            duplicate["folder"] = f"{synthetic_pfid(index)}-copy"
+            duplicate["path"] = f"/{duplicate['data_source']}/{duplicate['folder']}"
+            corpus[f"uuid-{index}-duplicate"] = duplicate
+    return corpus
+
+
+def write_mod_corpus(root: Path, corpus: dict[str, dict[str, Any]]) -> Path:
+    """
+    Write a corpus from generate_mod_corpus() as a game folder, with
+    expansions in Data, local mods in Mods and workshop mods in Workshop.
+
+    :param root: Folder to create the game folder in
+    :param corpus: uuid -> mod metadata
+    :return: The game folder
+    """
+    folders = {"expansion": "Data", "local": "Mods", "workshop": "Workshop"}
+    for folder in folders.values():
+        (root / folder).mkdir(parents=True, exist_ok=True)
+    (root / "Version.txt").write_text(GAME_VERSION, encoding="utf-8")
+    for metadata in corpus.values():
+        about = root / folders[metadata["data_source"]] / metadata["folder"] / "About"
+        about.mkdir(parents=True, exist_ok=True)
+        about_xml: dict[str, Any] = {
+            "name": metadata["name"],
+            "packageId": metadata["packageid"],
+            "supportedVersions": metadata["supportedversions"],
+        }
+        for key, tag in [
+            ("moddependencies", "modDependencies"),
+            ("loadafter", "loadAfter"),
+            ("loadbefore", "loadBefore"),
+            ("incompatiblewith", "incompatibleWith"),
+            ("moddependenciesbyversion", "modDependenciesByVersion"),
+            ("loadafterbyversion", "loadAfterByVersion"),
+            ("loadbeforebyversion", "loadBeforeByVersion"),
+            ("incompatiblewithbyversion", "incompatibleWithByVersion"),
+        ]:
+            if key in metadata:
+                about_xml[tag] = metadata[key]
+        (about / "About.xml").write_text(
+            xmltodict.unparse({"ModMetaData": about_xml}, pretty=True),
+            encoding="utf-8",
+        )
+        if "publishedfileid" in metadata:
+            (about / "PublishedFileId.txt").write_text(
+                metadata["publishedfileid"], encoding="utf-8"
+            )
+    return root
+
+
+def metadata_manager_state(internal_local_metadata: dict[str, Any]) -> Any:
+    """
+    The MetadataManager attributes used by the tests and benchmarks, without the
+    settings, Steam and file watching parts of a MetadataManager.
+    """
+    from app.utils.metadata import MetadataManager
+
+    state = types.SimpleNamespace(
+        internal_local_metadata=internal_local_metadata,
+        game_version=GAME_VERSION,
+        packageid_to_uuids={},
+        mod_rule_tables={},
+        external_steam_metadata=None,
+        external_community_rules=None,
+        external_user_rules=None,
+        external_no_version_warning=None,
+        steamdb_packageid_to_name={},
+        has_alternative_mod=lambda uuid: None,
+    )
+    for uuid, metadata in internal_local_metadata.items():
+        state.packageid_to_uuids.setdefault(metadata["packageid"], set()).add(uuid)
+    state.is_version_mismatch = types.MethodType(
+        MetadataManager.is_version_mismatch, state
+    )
+    return state
+
+
+def generate_acf(items: int, seed: int = 0) -> dict[str, Any]:
+    """
+    Generate the contents of a SteamCMD appworkshop_294100.acf with `items`
+    installed mods. Output is deterministic for a given seed.
+    """
+    rng = random.Random(seed)
+    installed = {}
+    details = {}
+    for index in range(items):
+        publishedfileid = synthetic_pfid(index)
+        manifest = str(rng.randrange(10**18))
+        timeupdated = str(1_600_000_000 + rng.randrange(10**8))
+        installed[publishedfileid] = {
+            "size": str(rng.randrange(10**9)),
+            "timeupdated": timeupdated,
+            "manifest": manifest,
+        }
+        details[publishedfileid] = {
+            "manifest": manifest,
+            "timeupdated": timeupdated,
+            "timetouched": str(int(timeupdated) + rng.randrange(10**6)),
+            "BytesDownloaded": installed[publishedfileid]["size"],
+            "BytesToDownload": installed[publishedfileid]["size"],
+            "latest_timeupdated": timeupdated,
+            "latest_manifest": manifest,
+        }
+    return {
+        "AppWorkshop": {
+            "appid": "294100",
+            "SizeOnDisk": str(rng.randrange(10**11)),
+            "NeedsUpdate": "0",
+            "NeedsDownload": "0",
+            "TimeLastUpdated": "1700000000",
+            "TimeLastAppRan": "1700000000",
+            "LastBuildID": "0",
+            "WorkshopItemsInstalled": installed,
+            "WorkshopItemDetails": details,
+        }
+    }
@@ -0,0 +1,39 @@
+import pytest
+
+from app.sort.alphabetical_sort import alphabetical_sort
+from tests.reference.alphabetical_sort import (
+    generate_sort_input,
+    reference_alphabetical_sort,
+)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("mods,max_dependencies", [(30, 3), (200, 4), (150, 10)])
+def test_alphabetical_sort_matches_reference(
+    seed: int, mods: int, max_dependencies: int
+) -> None:
+    sort_input = generate_sort_input(mods, seed, max_dependencies)
+
+    assert alphabetical_sort(*sort_input) == reference_alphabetical_sort(*sort_input)
+
+
+def test_alphabetical_sort_dependencies_first() -> None:
+    metadata = {
+        uuid: {"packageid": uuid, "name": name}
+        for uuid, name in [("a", "A"), ("b", "B"), ("c", "C"), ("d", "D"), ("z", "Z")]
+    }
+    dependency_graph = {
+        "a": {"c", "b", "not.installed"},
+        "b": set(),
+        "c": {"b", "z"},
+        "d": set(),
+        "z": set(),
+    }
+
+    assert alphabetical_sort(dependency_graph, set(metadata), metadata) == [
+        "b",
+        "z",
+        "c",
+        "a",
+        "d",
+    ]
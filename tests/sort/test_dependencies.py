@@ -0,0 +1,82 @@
+from typing import Any
+
+import pytest
+
+from app.sort.dependencies import gen_tier_deps_graphs
+from tests.reference.dependencies import (
+    generate_sort_metadata,
+    reference_gen_tier_deps_graphs,
+)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_gen_tier_deps_graphs_matches_reference(seed: int) -> None:
+    active_uuids, active_package_ids, metadata = generate_sort_metadata(
+        300, tail=8, seed=seed
+    )
+
+    result = gen_tier_deps_graphs(active_uuids, active_package_ids, metadata)
+    expected = reference_gen_tier_deps_graphs(
+        active_uuids, list(active_package_ids), metadata
+    )
+
+    assert result == expected
+    # The alphabetical sort breaks ties by dependency set order, keep it too
+    for graph, expected_graph in zip(result, expected):
+        for package_id, dependencies in graph.items():
+            assert list(dependencies) == list(expected_graph[package_id])
+
+
+def test_gen_tier_deps_graphs_tiers() -> None:
+    metadata: dict[str, dict[str, Any]] = {
+        "core": {
+            "packageid": "ludeon.rimworld",
+            "loadTheseBefore": {("brrainz.harmony", True)},
+        },
+        "harmony": {"packageid": "brrainz.harmony"},
+        "lib": {
+            "packageid": "a.lib",
+            "loadTheseAfter": {("a.mod", True)},
+        },
+        "mod": {
+            "packageid": "a.mod",
+            "loadTheseBefore": {
+                ("ludeon.rimworld", True),
+                ("a.lib", True),
+                ("not.active", False),
+            },
+        },
+        "core_patch": {
+            "packageid": "a.core_patch",
+            "loadTheseBefore": {("ludeon.rimworld", True)},
+            "loadTheseAfter": {("a.core_patch", True)},
+        },
+        "bottom": {
+            "packageid": "a.bottom",
+            "loadBottom": True,
+            "loadTheseBefore": {("a.mod", True)},
+            # A cycle through tier three mods
+            "loadTheseAfter": {("a.late", True)},
+        },
+        "late": {
+            "packageid": "a.late",
+            "loadTheseBefore": {("a.bottom", True)},
+            "loadTheseAfter": {("a.bottom", True)},
+        },
+        "rocketman": {"packageid": "krkr.rocketman"},
+    }
+
+    tier_one, tier_two, tier_three = gen_tier_deps_graphs(
+        set(metadata), {mod["packageid"] for mod in metadata.values()}, metadata
+    )
+
+    assert tier_one == {
+        "ludeon.rimworld": {"brrainz.harmony"},
+        "brrainz.harmony": set(),
+    }
+    assert tier_two == {"a.lib": set(), "a.mod": {"a.lib"}, "a.core_patch": set()}
+    assert tier_three == {
+        "a.bottom": set(),
+        "a.late": {"a.bottom"},
+        "krkr.rocketman": set(),
+    }
@@ -0,0 +1,82 @@
+from typing import Any
+
+import pytest
+
+import app.sort.topo_sort as topo_sort
+from app.sort.topo_sort import (
+    find_circular_dependencies,
+    find_shortest_cycle,
+    find_strongly_connected_components,
+)
+
+
+def test_find_strongly_connected_components() -> None:
+    dependency_graph = {
+        "a": {"b"},
+        "b": {"c", "d"},
+        "c": {"a"},
+        "d": {"e", "not.in.graph"},
+        "e": {"d"},
+        "f": {"f", "a"},
+    }
+
+    components = find_strongly_connected_components(dependency_graph)
+
+    assert sorted(sorted(component) for component in components) == [
+        ["a", "b", "c"],
+        ["d", "e"],
+        ["f"],
+        ["not.in.graph"],
+    ]
+    # Dependencies come before the mods that depend on them
+    order = [sorted(component)[0] for component in components]
+    assert order.index("d") < order.index("a") < order.index("f")
+
+
+def test_find_strongly_connected_components_long_chain() -> None:
+    dependency_graph = {f"mod{i}": {f"mod{i + 1}"} for i in range(5000)}
+    dependency_graph["mod5000"] = {"mod0"}
+
+    assert len(find_strongly_connected_components(dependency_graph)) == 1
+
+
+def test_find_shortest_cycle() -> None:
+    dependency_graph = {
+        "a": {"b", "x"},
+        "b": {"c"},
+        "c": {"d"},
+        "d": {"a"},
+        "x": {"d"},
+    }
+
+    assert find_shortest_cycle(dependency_graph, ["d", "c", "b", "a", "x"]) == [
+        "a",
+        "x",
+        "d",
+    ]
+
+
+def test_find_circular_dependencies_caps_reported_cycles(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    warnings: list[dict[str, Any]] = []
+    monkeypatch.setattr(
+        "app.views.dialogue.show_warning", lambda **kwargs: warnings.append(kwargs)
+    )
+    monkeypatch.setattr(topo_sort, "MAX_REPORTED_CYCLES", 2)
+    # Every mod depends on every other one, so there are far too many simple
+    # cycles to list, and three more loops of two mods
+    dependency_graph = {
+        f"dense{i}": {f"dense{j}" for j in range(60) if j != i} for i in range(60)
+    }
+    for name in ["x", "y", "z"]:
+        dependency_graph[f"{name}1"] = {f"{name}2"}
+        dependency_graph[f"{name}2"] = {f"{name}1"}
+
+    find_circular_dependencies(dependency_graph)
+
+    assert warnings[0]["details"].split("\n\n") == [
+        "dense0 -> dense1",
+        "x1 -> x2",
+        "... and 2 more dependency loops",
+    ]
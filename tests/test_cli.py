@@ -0,0 +1,135 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.cli import active_uuids_from_mods_config, main
+from app.models.metadata.metadata_factory import read_mods_config
+from app.models.metadata.metadata_structure import (
+    CaseInsensitiveStr,
+    ModsConfig,
+    ModType,
+)
+
+MOD_EXAMPLES = Path("tests/data/mod_examples")
+MODS_CONFIG = """<?xml version="1.0" encoding="utf-8"?>
+<ModsConfigData>
+  <version>1.5.4104 rev435</version>
+  <activeMods>
+    <li>local.mod2</li>
+    <li>steam.mod1</li>
+    <li>ludeon.rimworld.biotech</li>
+    <li>local.mod1</li>
+    <li>not.installed</li>
+    <li>ludeon.rimworld</li>
+    <li>bs.fishery</li>
+  </activeMods>
+  <knownExpansions>
+    <li>ludeon.rimworld.biotech</li>
+  </knownExpansions>
+</ModsConfigData>
+"""
+
+
+def _paths(tmp_path: Path) -> list[str]:
+    mods_config_path = tmp_path / "ModsConfig.xml"
+    mods_config_path.write_text(MODS_CONFIG, encoding="utf-8")
+    return [
+        "--game",
+        str(MOD_EXAMPLES / "RimWorld"),
+        "--local",
+        str(MOD_EXAMPLES / "Local"),
+        "--workshop",
+        str(MOD_EXAMPLES / "Steam"),
+        "--user-rules",
+        "tests/data/dbs/userRules.json",
+        "--mods-config",
+        str(mods_config_path),
+    ]
+
+
+@pytest.mark.parametrize("method", ["alphabetical", "topological"])
+def test_sort(tmp_path: Path, capsys: pytest.CaptureFixture[str], method: str) -> None:
+    assert main(["sort", *_paths(tmp_path), "--method", method]) == 0
+
+    out, err = capsys.readouterr()
+    # Fishery loads before Core, and local.mod1 has a user rule to load last
+    assert out.split() == [
+        "bs.fishery",
+        "ludeon.rimworld",
+        "ludeon.rimworld.biotech",
+        "local.mod2",
+        "steam.mod1",
+        "local.mod1",
+    ]
+    assert "not.installed" in err
+    for phase in ["scan", "read mods config", f"sort ({method})", "total"]:
+        assert f"\n{phase}: " in f"\n{err}"
+
+
+def test_save(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    output = tmp_path / "Sorted.xml"
+
+    assert main(["save", *_paths(tmp_path), "--output", str(output)]) == 0
+    assert (
+        "dropping from the saved list 1 active mods that are not installed: not.installed"
+        in (capsys.readouterr().err)
+    )
+
+    mods_config = read_mods_config(output)
+    assert mods_config is not None
+    assert mods_config.activeMods[0] == "bs.fishery"
+    assert mods_config.activeMods[-1] == "local.mod1"
+    assert mods_config.knownExpansions == ["ludeon.rimworld.biotech"]
+    assert mods_config.version == "1.5.4104 rev435"
+    assert "<li>local.mod1</li>" in output.read_text(encoding="utf-8")
+
+
+def test_active_uuids_match_the_app() -> None:
+    sort_metadata = {
+        uuid: {"packageid": package_id, "data_source": mod_type, "path": path}
+        for uuid, package_id, mod_type, path in [
+            ("f", "author.mod", ModType.STEAM_WORKSHOP, "/workshop/1"),
+            ("e", "author.mod", ModType.STEAM_CMD, "/local/mod10"),
+            ("d", "author.mod", ModType.LOCAL, "/local/mod2"),
+            ("c", "other.mod", ModType.STEAM_WORKSHOP, "/workshop/2"),
+            ("b", "other.mod", ModType.GIT, "/local/other"),
+            ("a", "ludeon.rimworld", ModType.LUDEON, "/data/core"),
+        ]
+    }
+    mods_config = ModsConfig(
+        "1.5",
+        [
+            CaseInsensitiveStr(package_id)
+            for package_id in [
+                "ludeon.rimworld",
+                "author.mod",
+                "other.mod_steam",
+                "gone.mod",
+            ]
+        ],
+        [],
+    )
+
+    active_uuids, missing = active_uuids_from_mods_config(mods_config, sort_metadata)
+
+    # As in the app: local before workshop, by path, or workshop for "_steam"
+    assert active_uuids == ["a", "d", "c"]
+    assert missing == ["gone.mod"]
+
+
+def test_does_not_import_widgets() -> None:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, app.cli; "
+            "print([m for m in sys.modules if m.startswith(('PySide6.QtWidgets', 'app.views'))])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,136 @@
+from pathlib import Path
+
+import pytest
+from steamfiles import acf
+
+from app.utils.steam.steamfiles import vdf
+from app.utils.steam.steamfiles.wrapper import (
+    acf_to_dict,
+    dict_to_acf,
+    update_acf_entries,
+)
+from tests.reference.synthetic_mods import generate_acf
+
+ACF_DATA = generate_acf(20)
+INSTALLED = ("AppWorkshop", "WorkshopItemsInstalled")
+
+
+def test_loads_matches_steamfiles() -> None:
+    data = acf.dumps(ACF_DATA)
+    assert vdf.loads(data.encode("utf-8")) == acf.loads(data) == ACF_DATA
+    assert vdf.loads(b"\xef\xbb\xbf" + data.encode("utf-8")) == ACF_DATA
+    assert vdf.loads(b"") == {}
+
+
+def test_loads_other_layouts() -> None:
+    data = (
+        b'// comment\n"root" {\n'
+        b'  "key" "value"  "escaped" "a \\"b\\"\\n\\\\"\n'
+        b"  unquoted 42\n"
+        b'  "section"\n  {\n    "nested" "1"\n  }\n'
+        b'  "key" "replaced"\n'
+        b"}\n"
+    )
+    assert vdf.loads(data) == {
+        "root": {
+            "key": "replaced",
+            "escaped": 'a "b"\n\\',
+            "unquoted": "42",
+            "section": {"nested": "1"},
+        }
+    }
+
+
+@pytest.mark.parametrize(
+    "data", [b'"root"\n{\n\t"key"\t\t"value"\n', b'"root"\n{\n\t"key"\n}\n', b"}"]
+)
+def test_loads_invalid(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        vdf.loads(data)
+
+
+def test_dumps() -> None:
+    assert vdf.dumps(ACF_DATA) == acf.dumps(ACF_DATA).encode("utf-8")
+    escaped = {"root": {'a "b"': "c\\d\ne", "number": 1}}
+    assert vdf.dumps(escaped) == (
+        b'"root"\n{\n\t"a \\"b\\""\t\t"c\\\\d\\ne"\n\t"number"\t\t"1"\n}\n'
+    )
+    assert vdf.loads(vdf.dumps(escaped)) == {
+        "root": {'a "b"': "c\\d\ne", "number": "1"}
+    }
+
+
+def test_patch() -> None:
+    data = vdf.dumps(ACF_DATA)
+    installed = ACF_DATA["AppWorkshop"]["WorkshopItemsInstalled"]
+    removed, replaced = list(installed)[:2]
+    patched = vdf.patch(
+        data,
+        INSTALLED,
+        {removed: None, replaced: {"size": "1"}, "123": {"size": "2"}, "456": None},
+    )
+    expected = {key: value for key, value in installed.items() if key != removed} | {
+        replaced: {"size": "1"},
+        "123": {"size": "2"},
+    }
+    assert vdf.loads(patched) == {
+        "AppWorkshop": ACF_DATA["AppWorkshop"] | {"WorkshopItemsInstalled": expected}
+    }
+    # Entries are rewritten in place, new ones added at the end of the section
+    rewritten = {
+        "AppWorkshop": ACF_DATA["AppWorkshop"]
+        | {
+            "WorkshopItemsInstalled": {
+                key: expected[key] for key in installed if key != removed
+            }
+            | {"123": {"size": "2"}}
+        }
+    }
+    assert patched == vdf.dumps(rewritten)
+    assert vdf.patch(data, INSTALLED, {}) == data
+    with pytest.raises(KeyError):
+        vdf.patch(data, ("AppWorkshop", "Missing"), {"1": None})
+
+
+def test_patch_empty_or_flat_section() -> None:
+    # A fresh SteamCMD appworkshop_294100.acf
+    data = b'"AppWorkshop"\n{\n\t"WorkshopItemsInstalled"\n\t{\n\t}\n}\n'
+    patched = vdf.patch(data, INSTALLED, {"1": {"size": "1"}})
+    assert patched == vdf.dumps(
+        {"AppWorkshop": {"WorkshopItemsInstalled": {"1": {"size": "1"}}}}
+    )
+
+    data = vdf.dumps({"root": {"other": {"a": "1"}, "flat": {"a": "1", "b": "2"}}})
+    assert vdf.loads(vdf.patch(data, ("root", "flat"), {"a": None, "c": "3"})) == {
+        "root": {"other": {"a": "1"}, "flat": {"b": "2", "c": "3"}}
+    }
+    with pytest.raises(KeyError):
+        vdf.patch(data, ("root", "flat", "a"), {"1": None})
+
+
+def test_patch_keeps_other_bytes() -> None:
+    data = b'"root" { "a" "1" "b" { "x" "y" } // kept\n  "c" "3" }'
+    assert vdf.patch(data, ("root",), {"b": None}) == (
+        b'"root" { "a" "1"  // kept\n  "c" "3" }'
+    )
+    assert vdf.patch(data, ("root",), {"c": "4", "d": "5"}) == (
+        b'"root" { "a" "1" "b" { "x" "y" } // kept\n\t"c"\t\t"4" \n\t"d"\t\t"5"\n}'
+    )
+
+
+def test_update_acf_entries(tmp_path: Path) -> None:
+    path = tmp_path / "appworkshop_294100.acf"
+    dict_to_acf(ACF_DATA, str(path))
+    removed = next(iter(ACF_DATA["AppWorkshop"]["WorkshopItemDetails"]))
+    update_acf_entries(
+        str(path),
+        {
+            INSTALLED: {removed: None},
+            ("AppWorkshop", "WorkshopItemDetails"): {removed: None},
+        },
+    )
+    parsed = acf_to_dict(str(path))
+    for section in ("WorkshopItemsInstalled", "WorkshopItemDetails"):
+        assert removed not in parsed["AppWorkshop"][section]
+        assert len(parsed["AppWorkshop"][section]) == 19
+    assert list(tmp_path.iterdir()) == [path]
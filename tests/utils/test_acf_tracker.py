@@ -0,0 +1,133 @@
+import os
+import types
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock, patch
+
+from app.utils.acf_tracker import AcfTracker, acf_item_hashes
+from app.utils.metadata import MetadataManager
+from app.utils.metadata_index import ModMetadataIndex
+from app.utils.steam.steamfiles.wrapper import dict_to_acf
+
+
+def _acf(items: dict[str, tuple[str, str]]) -> dict[str, Any]:
+    """
+    :param items: publishedfileid -> (timeupdated, timetouched)
+    """
+    return {
+        "AppWorkshop": {
+            "appid": "294100",
+            "WorkshopItemsInstalled": {
+                publishedfileid: {"size": "10", "timeupdated": timeupdated}
+                for publishedfileid, (timeupdated, _) in items.items()
+            },
+            "WorkshopItemDetails": {
+                publishedfileid: {
+                    "manifest": "5",
+                    "timeupdated": timeupdated,
+                    "timetouched": timetouched,
+                }
+                for publishedfileid, (timeupdated, timetouched) in items.items()
+            },
+        }
+    }
+
+
+def _write(path: Path, acf_data: dict[str, Any], mtime_ns: int) -> None:
+    dict_to_acf(acf_data, str(path))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_acf_item_hashes() -> None:
+    hashes = acf_item_hashes(_acf({"1": ("100", "200"), "2": ("100", "200")}))
+    assert hashes.keys() == {"1", "2"}
+    assert hashes["1"] == hashes["2"]
+    assert hashes == acf_item_hashes(_acf({"2": ("100", "200"), "1": ("100", "200")}))
+    assert hashes["1"] != acf_item_hashes(_acf({"1": ("100", "201")}))["1"]
+    assert acf_item_hashes({}) == {}
+
+
+def test_acf_tracker_reports_changed_items(tmp_path: Path) -> None:
+    path = tmp_path / "appworkshop_294100.acf"
+    tracker = AcfTracker()
+    assert tracker.refresh(str(path)) is None
+
+    _write(path, _acf({"1": ("100", "200"), "2": ("100", "200")}), 1_000_000_000)
+    assert tracker.refresh(str(path)) == {"1", "2"}
+    assert tracker.data == _acf({"1": ("100", "200"), "2": ("100", "200")})
+
+    # Unchanged files are not parsed again
+    with patch("app.utils.acf_tracker.acf_to_dict") as acf_to_dict:
+        assert tracker.refresh(str(path)) is None
+        acf_to_dict.assert_not_called()
+    assert (tracker.parses, tracker.skips) == (1, 2)
+
+    _write(path, _acf({"1": ("100", "300"), "3": ("100", "200")}), 2_000_000_000)
+    assert tracker.refresh(str(path)) == {"1", "2", "3"}
+    # The file was written again, but no entry changed
+    _write(path, _acf({"3": ("100", "200"), "1": ("100", "300")}), 3_000_000_000)
+    assert tracker.refresh(str(path)) == set()
+
+    path.unlink()
+    assert tracker.refresh(str(path)) == {"1", "3"}
+    assert tracker.data == {}
+
+
+def test_refresh_acf_metadata_updates_changed_mods(tmp_path: Path) -> None:
+    workshop_acf_path = tmp_path / "appworkshop_294100.acf"
+    mod_path = tmp_path / "1"
+    mod_path.mkdir()
+    os.utime(mod_path, (500, 500))
+    mods: dict[str, dict[str, Any]] = {
+        "workshop1": {
+            "data_source": "workshop",
+            "publishedfileid": "1",
+            "path": str(mod_path),
+            "internal_time_touched": 500,
+        },
+        "workshop2": {"data_source": "workshop", "publishedfileid": "2"},
+        "local1": {"data_source": "local", "publishedfileid": "1"},
+    }
+    state: Any = types.SimpleNamespace(
+        internal_local_metadata=mods,
+        mod_index=ModMetadataIndex(),
+        workshop_acf_path=str(workshop_acf_path),
+        workshop_acf_data={},
+        workshop_acf_tracker=AcfTracker(),
+        mod_metadata_updated_signal=Mock(),
+    )
+    for uuid, mod_metadata in mods.items():
+        state.mod_index.add(uuid, mod_metadata)
+    state.apply_acf_metadata = types.MethodType(
+        MetadataManager.apply_acf_metadata, state
+    )
+    state._MetadataManager__apply_acf_changes = types.MethodType(
+        MetadataManager._MetadataManager__apply_acf_changes,  # type: ignore[attr-defined]
+        state,
+    )
+
+    def refresh() -> list[str]:
+        state.mod_metadata_updated_signal.reset_mock()
+        MetadataManager.refresh_acf_metadata(state, steamclient=True, steamcmd=False)
+        return [c.args[0] for c in state.mod_metadata_updated_signal.emit.mock_calls]
+
+    _write(workshop_acf_path, _acf({"1": ("100", "200")}), 1_000_000_000)
+    assert refresh() == ["workshop1"]
+    assert mods["workshop1"]["internal_time_touched"] == 200
+    assert "internal_time_touched" not in mods["local1"]
+
+    _write(
+        workshop_acf_path,
+        _acf({"1": ("100", "200"), "2": ("150", "250")}),
+        2_000_000_000,
+    )
+    assert refresh() == ["workshop2"]
+    assert mods["workshop2"]["internal_time_updated"] == 150
+    assert refresh() == []
+
+    # Removed entries no longer apply, as when the mods are parsed again
+    _write(workshop_acf_path, _acf({"2": ("150", "250")}), 3_000_000_000)
+    assert refresh() == ["workshop1"]
+    assert mods["workshop1"]["internal_time_touched"] == 500
+    assert "internal_time_updated" not in mods["workshop1"]
+    assert mods["workshop2"]["internal_time_touched"] == 250
@@ -0,0 +1,91 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.utils.compiled_steam_db import (
+    CompiledSteamDb,
+    compiled_steam_db_path,
+    load_compiled_steam_db,
+)
+
+STEAM_DB = Path("tests/data/dbs/steamDB.json")
+
+
+@pytest.fixture
+def steam_db_path(tmp_path: Path) -> Path:
+    path = tmp_path / "steamDB.json"
+    shutil.copy(STEAM_DB, path)
+    return path
+
+
+def _load(steam_db_path: Path) -> CompiledSteamDb:
+    steam_db = load_compiled_steam_db(steam_db_path, steam_db_path.parent)
+    assert steam_db is not None
+    return steam_db
+
+
+def test_compiled_steam_db_matches_json(steam_db_path: Path) -> None:
+    expected = json.loads(steam_db_path.read_text(encoding="utf-8"))
+
+    steam_db = _load(steam_db_path)
+
+    assert steam_db.version == expected["version"]
+    assert list(steam_db) == list(expected["database"])
+    assert dict(steam_db.items()) == expected["database"]
+    assert list(steam_db.values()) == list(expected["database"].values())
+    assert len(steam_db) == len(expected["database"])
+    assert "missing" not in steam_db
+    assert steam_db.get("missing") is None
+
+
+def test_compiled_steam_db_packageid_index(steam_db_path: Path) -> None:
+    steam_db = _load(steam_db_path)
+    pfids = steam_db.publishedfileids_by_packageid("PACKAGEID1")
+
+    assert pfids
+    assert all(steam_db[pfid]["packageId"].lower() == "packageid1" for pfid in pfids)
+    assert steam_db.publishedfileids_by_packageid("not.a.mod") == []
+
+
+def test_compiled_steam_db_changes_stick(steam_db_path: Path) -> None:
+    steam_db = _load(steam_db_path)
+    first = next(iter(steam_db))
+
+    steam_db[first]["blacklist"] = {"value": True, "comment": "broken"}
+    steam_db.setdefault("new", {})["blacklist"] = {"value": True}
+    del steam_db[first]
+
+    assert first not in steam_db
+    assert list(steam_db)[-1] == "new"
+    assert steam_db["new"] == {"blacklist": {"value": True}}
+    json.dumps(dict(steam_db))
+
+    steam_db[first] = {"url": "example.com"}
+    assert steam_db[first] == {"url": "example.com"}
+    assert first in list(steam_db)
+
+
+def test_compiled_steam_db_rebuilds_when_json_changes(steam_db_path: Path) -> None:
+    _load(steam_db_path)
+    compiled_path = compiled_steam_db_path(steam_db_path, steam_db_path.parent)
+    compiled_mtime = compiled_path.stat().st_mtime_ns
+
+    # Unchanged JSON reuses the compiled file
+    _load(steam_db_path)
+    assert compiled_path.stat().st_mtime_ns == compiled_mtime
+
+    data = json.loads(steam_db_path.read_text(encoding="utf-8"))
+    data["database"] = {"123": {"packageId": "a.b", "steamName": "Name"}}
+    steam_db_path.write_text(json.dumps(data), encoding="utf-8")
+    stat = steam_db_path.stat()
+    os.utime(steam_db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert dict(_load(steam_db_path).items()) == data["database"]
+
+
+def test_compiled_steam_db_invalid_json(steam_db_path: Path) -> None:
+    steam_db_path.write_text("{not json", encoding="utf-8")
+    assert load_compiled_steam_db(steam_db_path, steam_db_path.parent) is None
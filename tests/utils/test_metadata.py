@@ -0,0 +1,135 @@
+import copy
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from app.utils.metadata import (
+    MetadataManager,
+    compile_mod_rules,
+    get_mods_from_package_ids,
+)
+from app.utils.mod_list_matching import select_duplicate_mod
+from tests.reference.metadata import (
+    generate_compile_input,
+    generate_mods,
+    reference_compile_about_xml_rules,
+    reference_get_mods_from_package_ids,
+)
+from tests.reference.synthetic_mods import metadata_manager_state
+
+
+def _mod(packageid: str, data_source: str, path: str) -> dict[str, Any]:
+    return {"packageid": packageid, "data_source": data_source, "path": path}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_get_mods_from_package_ids_matches_reference(seed: int) -> None:
+    all_mods, package_ids = generate_mods(installed=400, active=150, seed=seed)
+    # Repeat some entries so already processed duplicates are covered too
+    package_ids += package_ids[:10] + [f"{p}_steam" for p in package_ids[10:20]]
+
+    assert get_mods_from_package_ids(
+        all_mods, package_ids
+    ) == reference_get_mods_from_package_ids(all_mods, package_ids)
+
+
+def test_get_mods_from_package_ids_duplicates_and_steam_suffix() -> None:
+    all_mods = {
+        "a": _mod("author.mod", "local", "/local/b"),
+        "b": _mod("author.mod", "workshop", "/workshop/1"),
+        "c": _mod("author.mod", "local", "/local/a"),
+        "d": _mod("other.mod_steam", "workshop", "/workshop/2"),
+        "e": _mod("other.mod", "local", "/local/other"),
+        "f": _mod("ludeon.rimworld", "expansion", "/data/core"),
+    }
+    package_ids = ["Ludeon.RimWorld", "Author.Mod", "other.mod_steam", "gone.mod"]
+
+    active, inactive, duplicates, missing = get_mods_from_package_ids(
+        all_mods, package_ids
+    )
+
+    # Local wins over workshop, then the natural sort order of paths
+    assert active == ["f", "c", "d", "e"]
+    assert inactive == ["a", "b"]
+    assert duplicates == {"author.mod": ["a", "b", "c"]}
+    assert missing == ["gone.mod"]
+
+    active, _, _, _ = get_mods_from_package_ids(all_mods, ["author.mod_steam"])
+    assert active == ["b"]
+
+
+def test_select_duplicate_mod() -> None:
+    all_mods = {
+        "9": _mod("author.mod", "workshop", "/workshop/1"),
+        "1": _mod("author.mod", "local", "/local/mod10"),
+        "5": _mod("author.mod", "local", "/local/mod2"),
+        "0": _mod("author.mod", "expansion", "/data/mod"),
+    }
+    # The choice does not depend on the uuids or their order
+    assert select_duplicate_mod(all_mods, {"9", "1", "5"}, False) == "5"
+    assert select_duplicate_mod(all_mods, ["1", "9", "5", "0"], False) == "0"
+    assert select_duplicate_mod(all_mods, {"9", "1", "5"}, True) == "9"
+    assert select_duplicate_mod(all_mods, {"0"}, True) is None
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_compile_metadata_matches_reference(seed: int) -> None:
+    corpus, uuids = generate_compile_input(300, seed=seed)
+    expected = metadata_manager_state(copy.deepcopy(corpus))
+    reference_compile_about_xml_rules(expected, uuids)
+
+    state = metadata_manager_state(copy.deepcopy(corpus))
+    MetadataManager.compile_metadata(state, uuids)
+
+    assert state.internal_local_metadata == expected.internal_local_metadata
+
+
+def test_compile_mod_rules() -> None:
+    mod = {
+        "packageid": "author.mod",
+        "moddependencies": {"li": {"packageId": "brrainz.harmony"}},
+        "loadafter": {"li": ["ludeon.rimworld", "brrainz.harmony"]},
+        "loadbefore": "not a list",
+        "loadafterbyversion": {
+            "v1.4": {"li": "old.mod"},
+            "v1.5": {"li": "new.mod"},
+        },
+        "incompatiblewithbyversion": {"v1.5": None},
+    }
+
+    assert compile_mod_rules(mod, "1.5.4104 rev435") == [
+        ("dependencies", {"packageId": "brrainz.harmony"}),
+        ("loadTheseBefore", ["ludeon.rimworld", "brrainz.harmony"]),
+        ("loadTheseBefore", "new.mod"),
+    ]
+    # Version specific rules are skipped when the game version is unknown
+    assert compile_mod_rules(mod, "") == [
+        ("dependencies", {"packageId": "brrainz.harmony"}),
+        ("loadTheseBefore", ["ludeon.rimworld", "brrainz.harmony"]),
+    ]
+
+
+def test_compile_metadata_reuses_rule_tables() -> None:
+    corpus, uuids = generate_compile_input(50)
+    state = metadata_manager_state(copy.deepcopy(corpus))
+    MetadataManager.compile_metadata(state, uuids)
+
+    # Unchanged mods, e.g. after a refresh, are not compiled again
+    state.internal_local_metadata = copy.deepcopy(corpus)
+    with patch(
+        "app.utils.metadata.compile_mod_rules", wraps=compile_mod_rules
+    ) as compile_rules:
+        MetadataManager.compile_metadata(state, uuids)
+        assert compile_rules.call_count == 0
+
+        state.internal_local_metadata = copy.deepcopy(corpus)
+        state.internal_local_metadata[uuids[1]]["loadafter"] = {"li": "author.other"}
+        MetadataManager.compile_metadata(state, uuids)
+        assert [c.args[0]["packageid"] for c in compile_rules.call_args_list] == [
+            corpus[uuids[1]]["packageid"]
+        ]
+
+        state.game_version = "1.4.3901 rev34"
+        MetadataManager.compile_metadata(state, uuids)
+        assert compile_rules.call_count == 1 + len(uuids)
@@ -0,0 +1,143 @@
+import os
+from pathlib import Path
+
+from app.utils.metadata_cache import METADATA_CACHE_VERSION, MetadataCache
+
+
+def _make_mod(root: Path, name: str = "ModA") -> Path:
+    mod = root / name
+    (mod / "About").mkdir(parents=True)
+    (mod / "About" / "About.xml").write_text(
+        "<ModMetaData><packageId>author.moda</packageId></ModMetaData>",
+        encoding="utf-8",
+    )
+    return mod
+
+
+def _metadata(mod: Path) -> dict[str, object]:
+    return {
+        "packageid": "author.moda",
+        "name": "Mod A",
+        "path": str(mod),
+        "metadata_file_path": str(mod / "About" / "About.xml"),
+        "supportedversions": {"li": ["1.4", "1.5"]},
+    }
+
+
+def test_store_and_lookup_roundtrip(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path)
+    cache = MetadataCache(tmp_path / "cache.json")
+    cache.store(str(mod), "local", _metadata(mod), False, None)
+
+    assert cache.lookup(str(mod), "local", None) == _metadata(mod)
+    assert cache.lookup(str(mod), "workshop", None) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lookup_returns_independent_copies(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path)
+    cache = MetadataCache(tmp_path / "cache.json")
+    metadata = _metadata(mod)
+    cache.store(str(mod), "local", metadata, False, None)
+    # Mutations after storing (e.g. compile_metadata) must not leak into the cache
+    metadata["loadTheseBefore"] = "compiled"
+
+    restored = cache.lookup(str(mod), "local", None)
+    assert restored is not None and "loadTheseBefore" not in restored
+    restored["name"] = "changed"
+    assert cache.lookup(str(mod), "local", None) == _metadata(mod)
+
+
+def test_changed_about_xml_invalidates_entry(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path)
+    cache = MetadataCache(tmp_path / "cache.json")
+    cache.store(str(mod), "local", _metadata(mod), False, None)
+
+    about_xml = mod / "About" / "About.xml"
+    stat = about_xml.stat()
+    os.utime(about_xml, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.lookup(str(mod), "local", None) is None
+
+
+def test_new_published_file_id_invalidates_entry(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path)
+    cache = MetadataCache(tmp_path / "cache.json")
+    cache.store(str(mod), "local", _metadata(mod), False, None)
+
+    about = mod / "About"
+    stat = about.stat()
+    (about / "PublishedFileId.txt").write_text("123456789", encoding="utf-8")
+    # Guard against coarse filesystem timestamps
+    os.utime(about, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.lookup(str(mod), "local", None) is None
+
+
+def test_versioned_assemblies_invalidate_entry(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path)
+    (mod / "1.5").mkdir()
+    cache = MetadataCache(tmp_path / "cache.json")
+    cache.store(str(mod), "local", _metadata(mod), False, None)
+
+    # A new Assemblies folder changes the version folder
+    version = mod / "1.5"
+    stat = version.stat()
+    (version / "Assemblies").mkdir()
+    os.utime(version, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.lookup(str(mod), "local", None) is None
+    cache.store(str(mod), "local", _metadata(mod), False, None)
+
+    # A new assembly changes the Assemblies folder
+    assemblies = version / "Assemblies"
+    stat = assemblies.stat()
+    (assemblies / "Mod.dll").write_bytes(b"MZ")
+    os.utime(assemblies, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.lookup(str(mod), "local", None) is None
+
+
+def test_steamdb_signature_only_matters_for_sensitive_entries(tmp_path: Path) -> None:
+    mod_a = _make_mod(tmp_path, "ModA")
+    mod_b = _make_mod(tmp_path, "ModB")
+    cache = MetadataCache(tmp_path / "cache.json")
+    cache.store(str(mod_a), "workshop", _metadata(mod_a), False, None)
+    cache.store(str(mod_b), "workshop", _metadata(mod_b), True, None)
+
+    assert cache.lookup(str(mod_a), "workshop", "steamdb:1") is not None
+    assert cache.lookup(str(mod_b), "workshop", "steamdb:1") is None
+    assert cache.lookup(str(mod_b), "workshop", None) is not None
+
+
+def test_save_load_prune_and_clear(tmp_path: Path) -> None:
+    mod_a = _make_mod(tmp_path, "ModA")
+    mod_b = _make_mod(tmp_path, "ModB")
+    cache_path = tmp_path / "cache.json"
+    cache = MetadataCache(cache_path)
+    cache.store(str(mod_a), "local", _metadata(mod_a), False, None)
+    cache.store(str(mod_b), "local", _metadata(mod_b), False, None)
+    cache.save(keep=[str(mod_a)])
+
+    reloaded = MetadataCache(cache_path)
+    assert reloaded.lookup(str(mod_a), "local", None) == _metadata(mod_a)
+    assert reloaded.lookup(str(mod_b), "local", None) is None
+
+    reloaded.clear()
+    assert not cache_path.exists()
+    assert MetadataCache(cache_path).lookup(str(mod_a), "local", None) is None
+
+
+def test_outdated_or_corrupt_cache_is_discarded(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path)
+    cache_path = tmp_path / "cache.json"
+    cache = MetadataCache(cache_path)
+    cache.store(str(mod), "local", _metadata(mod), False, None)
+    cache.save()
+
+    cache_path.write_bytes(
+        cache_path.read_bytes().replace(
+            f'"version":{METADATA_CACHE_VERSION}'.encode(),
+            f'"version":{METADATA_CACHE_VERSION + 1}'.encode(),
+        )
+    )
+    assert MetadataCache(cache_path).lookup(str(mod), "local", None) is None
+
+    cache_path.write_text("not json", encoding="utf-8")
+    assert MetadataCache(cache_path).lookup(str(mod), "local", None) is None
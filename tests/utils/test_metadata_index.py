@@ -0,0 +1,52 @@
+from app.utils.metadata_index import ModMetadataIndex
+
+
+def _mod(packageid: str, pfid: str | None, path: str, name: str) -> dict[str, str]:
+    mod = {"packageid": packageid, "path": path, "name": name}
+    if pfid:
+        mod["publishedfileid"] = pfid
+    return mod
+
+
+def test_index_lookups() -> None:
+    index = ModMetadataIndex()
+    index.add("a", _mod("author.mod", "123", "/mods/123", "Some Mod"))
+    index.add("b", _mod("author.mod", "123", "/local/123", "Some Mod"))
+    index.add("c", _mod("other.mod", None, "/local/other", "Other"))
+
+    assert index.uuids_by_packageid("author.mod") == {"a", "b"}
+    assert index.uuids_by_publishedfileid("123") == {"a", "b"}
+    assert index.uuid_by_path("/local/other") == "c"
+    assert index.uuids_by_name("SOME mod") == {"a", "b"}
+    assert index.uuids_by_packageid("missing.mod") == set()
+    assert index.uuid_by_path("/missing") is None
+
+
+def test_index_reindexes_changed_mod() -> None:
+    index = ModMetadataIndex()
+    index.add("a", _mod("old.id", "1", "/mods/a", "Old"))
+    index.add("a", _mod("new.id", "2", "/mods/a", "New"))
+
+    assert "old.id" not in index.packageid_to_uuids
+    assert index.uuids_by_packageid("new.id") == {"a"}
+    assert index.uuids_by_publishedfileid("1") == set()
+    assert index.uuids_by_name("old") == set()
+    assert index.uuids_by_name("new") == {"a"}
+
+
+def test_index_remove() -> None:
+    index = ModMetadataIndex()
+    index.add("a", _mod("author.mod", "1", "/mods/a", "Mod"))
+    index.add("b", _mod("author.mod", "2", "/mods/b", "Mod"))
+
+    index.remove("a")
+    index.remove("unknown")
+
+    assert index.uuids_by_packageid("author.mod") == {"b"}
+    assert index.uuids_by_publishedfileid("1") == set()
+    assert index.uuid_by_path("/mods/a") is None
+
+    index.remove("b")
+    assert index.packageid_to_uuids == {}
+    assert index.name_to_uuids == {}
+    assert index.path_to_uuid == {}
@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+import app.utils.metadata_parser as metadata_parser
+from app.utils.compiled_steam_db import load_compiled_steam_db
+from app.utils.metadata_parser import (
+    init_parser_process,
+    parse_mod_batch,
+    parse_mod_metadata,
+    steam_metadata_for_parser,
+)
+
+MOD_EXAMPLES = Path("tests/data/mod_examples")
+
+
+def _local_mod_directories() -> list[str]:
+    return sorted(str(path) for path in (MOD_EXAMPLES / "Local").iterdir())
+
+
+def test_parse_mod_batch_matches_parse_mod_metadata() -> None:
+    init_parser_process(None)
+    batch = [
+        (directory, f"uuid-{i}") for i, directory in enumerate(_local_mod_directories())
+    ]
+
+    results = parse_mod_batch("local", batch)
+
+    assert [(r.mod_directory, r.uuid) for r in results] == batch
+    for result in results:
+        metadata, steamdb_sensitive = parse_mod_metadata(
+            "local", result.mod_directory, result.uuid, None
+        )
+        assert result.metadata == metadata
+        assert result.steamdb_sensitive == steamdb_sensitive
+        assert result.fingerprint and result.mod_directory in result.fingerprint
+
+
+def test_parse_mod_batch_uses_steam_metadata() -> None:
+    mod_directory = str(MOD_EXAMPLES / "Steam" / "steam_mod_1")
+    metadata, _ = parse_mod_metadata("workshop", mod_directory, "uuid", None)
+    pfid = metadata.get("publishedfileid", "steam_mod_1")
+
+    steam_metadata, compiled_path, removed = steam_metadata_for_parser(
+        {pfid: {"steamName": "Steam Name", "packageId": "x.y", "url": "ignored"}}
+    )
+    assert steam_metadata == {pfid: {"steamName": "Steam Name", "packageId": "x.y"}}
+    assert (compiled_path, removed) == (None, [])
+
+    init_parser_process(steam_metadata)
+    try:
+        (result,) = parse_mod_batch("workshop", [(mod_directory, "uuid")])
+    finally:
+        init_parser_process(None)
+    assert (
+        result.metadata
+        == parse_mod_metadata("workshop", mod_directory, "uuid", steam_metadata)[0]
+    )
+
+
+def test_parser_processes_load_the_compiled_steam_db(tmp_path: Path) -> None:
+    steam_db_path = tmp_path / "steamDB.json"
+    steam_db_path.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "database": {
+                    "1": {"steamName": "One", "packageId": "a.one"},
+                    "2": {"steamName": "Two", "packageId": "a.two"},
+                    "3": {"steamName": "Three", "packageId": "a.three"},
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+    steam_db = load_compiled_steam_db(steam_db_path, tmp_path)
+    assert steam_db is not None
+    steam_db["1"]["steamName"] = "Changed"
+    del steam_db["2"]
+
+    args = steam_metadata_for_parser(steam_db)
+
+    # Only the entries used in this process are sent, the others stay encoded
+    assert args == (
+        {"1": {"steamName": "Changed", "packageId": "a.one"}},
+        str(steam_db.path),
+        ["2"],
+    )
+    assert steam_db.changes()[0].keys() == {"1"}
+    init_parser_process(*args)
+    try:
+        process_steam_metadata = metadata_parser._parser_steam_metadata()
+        assert process_steam_metadata is not None
+        assert dict(process_steam_metadata.items()) == {
+            "1": {"steamName": "Changed", "packageId": "a.one"},
+            "3": {"steamName": "Three", "packageId": "a.three"},
+        }
+    finally:
+        init_parser_process(None)
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+from app.utils.metadata_parser import parse_mod_metadata
+from app.utils.mod_directory_probe import probe_mod_directory
+
+
+def _make_mod(root: Path) -> Path:
+    about = root / "about"
+    about.mkdir(parents=True)
+    (about / "ABOUT.XML").write_text(
+        "<ModMetaData><packageId>a.b</packageId><name>A</name></ModMetaData>",
+        encoding="utf-8",
+    )
+    (about / "publishedfileid.txt").write_text("123", encoding="utf-8")
+    (about / "preview.PNG").write_bytes(b"\x89PNG\r\n\x1a\n")
+    return root
+
+
+def test_probe_finds_files_case_insensitively(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path / "mod")
+    (mod / ".git").mkdir()
+
+    probe = probe_mod_directory(str(mod))
+
+    assert probe.about_folder == "about"
+    assert probe.about_file_path == str(mod / "about" / "ABOUT.XML")
+    assert probe.pfid_file_path == str(mod / "about" / "publishedfileid.txt")
+    assert probe.preview_file_path == str(mod / "about" / "preview.PNG")
+    assert probe.scenario_file is None
+    assert probe.git_repo
+    assert not probe.csharp
+    assert set(probe.fingerprint()) == {
+        str(mod),
+        str(mod / "about"),
+        str(mod / "about" / "ABOUT.XML"),
+        str(mod / "about" / "publishedfileid.txt"),
+    }
+
+
+def test_probe_detects_versioned_assemblies(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path / "mod")
+    (mod / "1.5" / "Assemblies").mkdir(parents=True)
+    (mod / "1.5" / "Assemblies" / "Mod.DLL").write_bytes(b"MZ")
+    (mod / "1.4").mkdir()
+    probe = probe_mod_directory(str(mod))
+    assert probe.csharp
+    # Adding or removing versioned assemblies changes the fingerprint
+    assert {
+        str(mod / "1.4"),
+        str(mod / "1.5"),
+        str(mod / "1.5" / "Assemblies"),
+    } <= set(probe.fingerprint())
+
+    # A top level Assemblies folder without any .dll takes precedence
+    (mod / "Assemblies").mkdir()
+    probe = probe_mod_directory(str(mod))
+    assert not probe.csharp
+    assert str(mod / "Assemblies") in probe.fingerprint()
+
+
+def test_probe_finds_scenario_without_about(tmp_path: Path) -> None:
+    mod = tmp_path / "scenario"
+    mod.mkdir()
+    (mod / "Scenario.rsc").write_text("<savedscenario/>", encoding="utf-8")
+
+    probe = probe_mod_directory(str(mod))
+
+    assert probe.about_folder is None
+    assert probe.about_file_path is None
+    assert probe.scenario_file_path == str(mod / "Scenario.rsc")
+
+
+def test_parse_mod_metadata_keeps_probe_results(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path / "mod")
+
+    metadata, _ = parse_mod_metadata("local", str(mod), "uuid", None)
+
+    assert metadata["packageid"] == "a.b"
+    assert metadata["publishedfileid"] == "123"
+    assert metadata["preview_file_path"] == str(mod / "about" / "preview.PNG")
+    assert metadata["metadata_file_path"] == str(mod / "about" / "ABOUT.XML")
@@ -0,0 +1,84 @@
+import random
+from typing import Any
+
+from app.utils.mod_list_stream import ModListStream, inactive_sort_key
+
+
+def _mod(package_id: str, name: str | None = None) -> dict[str, Any]:
+    mod_data: dict[str, Any] = {"packageid": package_id}
+    if name is not None:
+        mod_data["name"] = name
+    return mod_data
+
+
+def _apply(
+    stream: ModListStream, mods: dict[str, dict[str, Any]]
+) -> tuple[list[str], list[str]]:
+    """
+    Place the mods in order, inserting them as the mod lists would.
+    """
+    active: list[str] = []
+    inactive: list[str] = []
+    for uuid, mod_data in mods.items():
+        placement = stream.place(uuid, mod_data)
+        assert placement is not None
+        is_active, row = placement
+        (active if is_active else inactive).insert(row, uuid)
+    return active, inactive
+
+
+def test_mods_are_placed_in_load_order_and_by_name() -> None:
+    stream = ModListStream(
+        ["ludeon.rimworld", "Author.Core_steam", "author.ui", "author.missing"]
+    )
+    mods = {
+        "ui": _mod("author.ui", "UI"),
+        "zeta": _mod("author.zeta", "Zeta"),
+        "core": _mod("author.core", "Core"),
+        "alpha": _mod("author.alpha", "alpha"),
+        "unnamed": _mod("author.unnamed"),
+        "rimworld": _mod("ludeon.rimworld", "Core"),
+    }
+    active, inactive = _apply(stream, mods)
+
+    assert active == ["rimworld", "core", "ui"]
+    assert inactive == ["unnamed", "alpha", "zeta"]
+    # Mods are only placed once
+    assert stream.place("ui", mods["ui"]) is None
+
+
+def test_only_the_first_duplicate_is_active() -> None:
+    stream = ModListStream(["author.mod", "author.other", "author.mod"])
+    active, inactive = _apply(
+        stream,
+        {
+            "local": _mod("author.mod", "Mod"),
+            "workshop": _mod("Author.Mod", "Mod"),
+            "other": _mod("author.other", "Other"),
+        },
+    )
+    assert active == ["local", "other"]
+    assert inactive == ["workshop"]
+
+
+def test_placement_does_not_depend_on_parse_order() -> None:
+    package_ids = [f"author.mod{index}" for index in range(50)]
+    mods = {
+        f"uuid{index}": _mod(f"author.mod{index}", f"Mod {index % 7} {index}")
+        for index in range(100)
+    }
+    expected_active = [f"uuid{index}" for index in range(50)]
+    expected_inactive = sorted(
+        (uuid for uuid in mods if uuid not in expected_active),
+        key=lambda uuid: inactive_sort_key(mods[uuid]),
+    )
+
+    uuids = list(mods)
+    random.Random(0).shuffle(uuids)
+    active, inactive = _apply(
+        ModListStream(package_ids), {uuid: mods[uuid] for uuid in uuids}
+    )
+    assert active == expected_active
+    assert [inactive_sort_key(mods[uuid]) for uuid in inactive] == [
+        inactive_sort_key(mods[uuid]) for uuid in expected_inactive
+    ]
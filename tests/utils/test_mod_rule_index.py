@@ -0,0 +1,82 @@
+from typing import Any
+
+from app.utils.mod_rule_index import ModListRuleIndex, rule_package_ids
+
+
+def _metadata() -> dict[str, Any]:
+    def mod(package_id: str, **rules: Any) -> dict[str, Any]:
+        return {"packageid": package_id, **rules}
+
+    return {
+        "core": mod("ludeon.rimworld"),
+        "harmony": mod("brrainz.harmony", loadTheseBefore={("ludeon.rimworld", True)}),
+        "a": mod(
+            "author.a",
+            dependencies={"brrainz.harmony"},
+            loadTheseAfter={("ludeon.rimworld", True)},
+        ),
+        "b": mod("author.b", incompatibilities={"author.c"}),
+        "c": mod("author.c", loadTheseBefore={("author.a", False)}),
+        "c_local": mod("author.c"),
+        "d": mod("author.d"),
+    }
+
+
+def test_rule_package_ids() -> None:
+    metadata = _metadata()
+
+    # Known replacements of dependencies count too
+    assert rule_package_ids(metadata["a"]) == {
+        "brrainz.harmony",
+        "zetrith.prepatcher",
+        "ludeon.rimworld",
+    }
+    assert rule_package_ids(metadata["b"]) == {"author.c"}
+    # Implicit load order rules are not checked
+    assert rule_package_ids(metadata["c"]) == set()
+
+
+def test_update() -> None:
+    metadata = _metadata()
+    index = ModListRuleIndex()
+    uuids = ["core", "harmony", "a", "b", "c", "d"]
+
+    assert index.update(uuids, metadata) == uuids
+    assert index.update(uuids, metadata) == []
+    assert index.packageid_to_uuid["author.c"] == "c"
+
+    # Moving Core affects the mods that refer to it, not the mods it passes
+    uuids = ["harmony", "a", "b", "core", "c", "d"]
+    assert index.update(uuids, metadata) == ["harmony", "a", "core"]
+    assert index.positions["core"] == 3
+
+    # Mods with the same packageid are recalculated together
+    uuids = ["harmony", "a", "b", "core", "c", "d", "c_local"]
+    assert index.update(uuids, metadata) == ["b", "c", "c_local"]
+    assert index.packageid_to_uuid["author.c"] == "c_local"
+
+    uuids = ["harmony", "a", "b", "core", "d", "c_local"]
+    assert index.update(uuids, metadata) == ["b", "c_local"]
+    assert index.packageid_to_uuid["author.c"] == "c_local"
+    assert index.dependents["author.c"] == {"b"}
+
+    # Removing harmony affects the mods that depend on it
+    uuids = ["a", "b", "core", "d", "c_local"]
+    assert index.update(uuids, metadata) == ["a"]
+    assert "brrainz.harmony" not in index.packageid_to_uuid
+
+
+def test_invalidate() -> None:
+    metadata = _metadata()
+    index = ModListRuleIndex()
+    uuids = ["core", "harmony", "a", "b", "d"]
+    index.update(uuids, metadata)
+
+    index.invalidate(["d", "c"])
+    assert index.update(uuids, metadata) == ["d"]
+
+    # Rules are read again after invalidating everything
+    metadata["d"]["dependencies"] = {"author.b"}
+    index.invalidate()
+    assert index.update(uuids, metadata) == uuids
+    assert index.update(["core", "harmony", "a", "d"], metadata) == ["d"]
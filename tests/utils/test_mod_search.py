@@ -0,0 +1,96 @@
+from typing import Any
+
+from app.utils.mod_search import ModSearchTable
+
+
+def _metadata() -> dict[str, Any]:
+    return {
+        "a": {
+            "name": "Better Pawns",
+            "packageid": "author.betterpawns",
+            "authors": "Author",
+            "data_source": "workshop",
+            "publishedfileid": "123",
+            "csharp": True,
+        },
+        "b": {
+            "name": "Pawn Tweaks",
+            "packageid": "other.pawntweaks",
+            "authors": {"li": ["Other", "Author"]},
+            "data_source": "local",
+            "git_repo": True,
+        },
+        "c": {
+            "name": "Storage",
+            "packageid": "other.storage",
+            "data_source": "local",
+            "steamcmd": True,
+        },
+        # No name, so it matches every name search
+        "d": {"packageid": "nameless.mod", "data_source": "expansion"},
+    }
+
+
+def _table(uuids: list[str], metadata: dict[str, Any]) -> ModSearchTable:
+    table = ModSearchTable()
+    table.update(uuids, metadata)
+    return table
+
+
+def test_search() -> None:
+    table = _table(["a", "b", "c", "d"], _metadata())
+
+    assert table.search("name", "") == [False, False, False, False]
+    assert table.search("name", "PAWN") == [False, False, True, False]
+    assert table.search("packageid", "other.") == [True, False, False, True]
+    assert table.search("authors", "author") == [False, False, False, False]
+    assert table.search("authors", "other") == [True, False, False, False]
+    assert table.search("publishedfileid", "12") == [False, False, False, False]
+
+
+def test_search_narrows_previous_matches() -> None:
+    table = _table(["a", "b", "c", "d"], _metadata())
+
+    assert table.search("name", "pawn") == [False, False, True, False]
+    # Only the rows that matched "pawn" are searched for "pawns"
+    table.rows[2] = table.rows[2]._replace(name="pawns")
+    assert table.search("name", "pawns") == [False, True, True, False]
+    # A pattern that does not extend the previous one searches every row
+    assert table.search("name", "awns") == [False, True, False, False]
+
+
+def test_update_follows_list_and_metadata() -> None:
+    metadata = _metadata()
+    table = _table(["a", "b", "c", "d"], metadata)
+    assert table.search("name", "pawn") == [False, False, True, False]
+
+    # Replaced metadata
+    metadata["c"] = {**metadata["c"], "name": "Pawn Storage"}
+    table.update(["a", "b", "c", "d"], metadata)
+    assert table.search("name", "pawns") == [False, True, True, False]
+    assert table.search("name", "pawn") == [False, False, False, False]
+
+    # Metadata changed in place
+    metadata["a"]["name"] = "Better Colonists"
+    table.invalidate("a")
+    table.update(["a", "b", "c", "d"], metadata)
+    assert table.search("name", "pawn") == [True, False, False, False]
+
+    # Mods moved to and from the list
+    table.update(["d", "b"], metadata)
+    assert table.uuids == ["d", "b"]
+    assert table.search("name", "pawn") == [False, False]
+
+
+def test_filter() -> None:
+    table = _table(["a", "b", "c", "d"], _metadata())
+
+    assert table.filter("name", "", "all", 0) == [False, False, False, False]
+    assert table.filter("name", "pawn", "all", 0) == [False, False, True, False]
+    assert table.filter("name", "", "local", 0) == [True, False, False, True]
+    assert table.filter("name", "pawn", "local", 0) == [True, False, True, True]
+    assert table.filter("name", "", "git_repo", 0) == [True, False, True, True]
+    assert table.filter("name", "", "steamcmd", 0) == [True, True, False, True]
+    # C# mods only, then XML mods only
+    assert table.filter("name", "", "all", 1) == [False, True, True, True]
+    assert table.filter("name", "", "all", 2) == [True, False, False, False]
@@ -0,0 +1,99 @@
+import os
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import QRunnable, Qt
+from PySide6.QtGui import QColor, QImage
+from pytestqt.qtbot import QtBot
+
+from app.utils.preview_loader import (
+    PreviewLoader,
+    load_preview_thumbnail,
+    preview_thumbnail_path,
+)
+
+
+def _write_image(path: Path, width: int, height: int, color: Qt.GlobalColor) -> str:
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(color)
+    assert image.save(str(path))
+    return str(path)
+
+
+def test_load_preview_thumbnail_scales_and_caches(tmp_path: Path) -> None:
+    thumbnail_folder = tmp_path / "previews"
+    image_path = _write_image(tmp_path / "Preview.png", 2000, 1000, Qt.GlobalColor.blue)
+
+    image = load_preview_thumbnail(image_path, thumbnail_folder, size=640)
+    assert (image.width(), image.height()) == (640, 320)
+    thumbnail_path = preview_thumbnail_path(
+        image_path, os.stat(image_path).st_mtime_ns, 640, thumbnail_folder
+    )
+    assert thumbnail_path.exists()
+    assert list(thumbnail_folder.iterdir()) == [thumbnail_path]
+
+    # The cached thumbnail is read instead of the preview
+    _write_image(thumbnail_path, 640, 320, Qt.GlobalColor.red)
+    image = load_preview_thumbnail(image_path, thumbnail_folder, size=640)
+    assert image.pixelColor(0, 0) == QColor(Qt.GlobalColor.red)
+
+    # Until the preview changes
+    stat = os.stat(image_path)
+    os.utime(image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    image = load_preview_thumbnail(image_path, thumbnail_folder, size=640)
+    assert image.pixelColor(0, 0) == QColor(Qt.GlobalColor.blue)
+    assert len(list(thumbnail_folder.iterdir())) == 2
+
+
+def test_load_preview_thumbnail_keeps_small_and_unreadable_previews(
+    tmp_path: Path,
+) -> None:
+    image_path = _write_image(tmp_path / "Preview.png", 300, 200, Qt.GlobalColor.blue)
+    image = load_preview_thumbnail(image_path, tmp_path / "previews", size=640)
+    assert (image.width(), image.height()) == (300, 200)
+
+    (tmp_path / "Broken.png").write_bytes(b"not a png")
+    assert load_preview_thumbnail(str(tmp_path / "Broken.png"), tmp_path).isNull()
+    assert load_preview_thumbnail(str(tmp_path / "Missing.png"), tmp_path).isNull()
+
+
+def test_preview_loader_loads_in_background(tmp_path: Path, qtbot: QtBot) -> None:
+    loader = PreviewLoader(tmp_path / "previews", memory_cache_size=2)
+    paths = [
+        _write_image(tmp_path / f"Preview{index}.png", 100, 100, Qt.GlobalColor.blue)
+        for index in range(3)
+    ]
+
+    with qtbot.waitSignal(
+        loader.preview_loaded, check_params_cb=lambda path, _: path == paths[0]
+    ):
+        assert loader.request(paths[0], [paths[1]]) is None
+    qtbot.waitUntil(lambda: len(loader.images) == 2)
+
+    image = loader.request(paths[0])
+    assert image is not None and image.width() == 100
+    # The least recently used preview is dropped from memory
+    with qtbot.waitSignal(loader.preview_loaded):
+        assert loader.request(paths[2]) is None
+    assert [path for path, _ in loader.images] == [paths[0], paths[2]]
+
+
+def test_preview_loader_cancels_stale_requests(tmp_path: Path, qtbot: QtBot) -> None:
+    loader = PreviewLoader(tmp_path / "previews")
+    paths = [
+        _write_image(tmp_path / f"Preview{index}.png", 100, 100, Qt.GlobalColor.blue)
+        for index in range(3)
+    ]
+    # Keep the threads of the loader busy until every request is made
+    busy = threading.Event()
+    for _ in range(loader.threadpool.maxThreadCount()):
+        loader.threadpool.start(QRunnable.create(busy.wait))
+
+    loader.request(paths[0], [paths[1]])
+    loader.request(paths[2])
+    busy.set()
+    with qtbot.waitSignal(loader.preview_loaded):
+        pass
+    loader.threadpool.waitForDone()
+
+    assert [path for path, _ in loader.images] == [paths[2]]
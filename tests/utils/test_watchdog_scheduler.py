@@ -0,0 +1,143 @@
+import threading
+import time
+import types
+from typing import Any
+from unittest.mock import Mock
+
+import pytest
+
+from app.utils.metadata import MetadataManager
+from app.utils.watchdog_scheduler import (
+    ModChange,
+    WatchdogBatch,
+    WatchdogEventScheduler,
+    merge_mod_change,
+)
+
+
+@pytest.mark.parametrize(
+    "operations, merged",
+    [
+        (["created", "updated", "updated"], "created"),
+        (["created", "updated", "deleted"], None),
+        (["updated", "updated"], "updated"),
+        (["updated", "deleted"], "deleted"),
+        (["deleted", "created"], "updated"),
+    ],
+)
+def test_merge_mod_change(operations: list[str], merged: str | None) -> None:
+    change: ModChange | None = None
+    for index, operation in enumerate(operations):
+        change = merge_mod_change(
+            change, ModChange(operation, "workshop" if index == 0 else None, "mod")
+        )
+    if merged is None:
+        assert change is None
+    else:
+        assert change == ModChange(merged, "workshop", "mod")
+
+
+class _Batches:
+    def __init__(self) -> None:
+        self.batches: list[WatchdogBatch] = []
+        self.received = threading.Event()
+
+    def __call__(self, batch: WatchdogBatch) -> None:
+        self.batches.append(batch)
+        self.received.set()
+
+
+def test_scheduler_merges_events_into_one_batch() -> None:
+    batches = _Batches()
+    scheduler = WatchdogEventScheduler(batches, delay=0.2)
+    try:
+        # Events keep the window open while they come in
+        for index in range(200):
+            scheduler.schedule(f"uuid{index}", "updated", "workshop", f"mod{index}")
+            scheduler.schedule(f"uuid{index}", "updated", "workshop", f"mod{index}")
+        scheduler.schedule("new", "created", "local", "new")
+        scheduler.schedule("gone", "deleted", "local", "gone")
+        assert batches.received.wait(5)
+        time.sleep(0.3)
+
+        assert len(batches.batches) == 1
+        batch = batches.batches[0]
+        assert len(batch.updated) == 200
+        assert batch.created == {"new": ModChange("created", "local", "new")}
+        assert batch.deleted == {"gone": ModChange("deleted", "local", "gone")}
+        assert (scheduler.events_received, scheduler.batches_emitted) == (402, 1)
+    finally:
+        scheduler.stop()
+
+
+def test_scheduler_emits_after_max_delay() -> None:
+    batches = _Batches()
+    scheduler = WatchdogEventScheduler(batches, delay=0.2, max_delay=0.3)
+    try:
+        start = time.monotonic()
+        while not batches.received.is_set():
+            assert time.monotonic() - start < 5
+            scheduler.schedule("uuid", "updated", "workshop", "mod")
+            time.sleep(0.02)
+        assert len(batches.batches) == 1
+    finally:
+        scheduler.stop()
+
+
+def test_scheduler_stop_drops_pending_changes() -> None:
+    batches = _Batches()
+    scheduler = WatchdogEventScheduler(batches, delay=0.1)
+    scheduler.schedule("uuid", "created", "local", "mod")
+    scheduler.schedule("uuid", "deleted", "local", "mod")
+    scheduler.schedule("other", "updated", "local", "other")
+    scheduler.stop()
+    time.sleep(0.2)
+    assert batches.batches == []
+
+
+def test_process_changes_parses_once_per_data_source() -> None:
+    state: Any = types.SimpleNamespace(
+        internal_local_metadata={"old": {}, "gone": {}},
+        process_deletion=Mock(),
+        process_batch=Mock(),
+        wait_for_parsers=Mock(),
+        shutdown_parser_processes=Mock(),
+        compile_metadata=Mock(),
+        mod_metadata_updated_signal=Mock(),
+        mod_created_signal=Mock(),
+    )
+    batch = WatchdogBatch(
+        {
+            "new": ModChange("created", "workshop", "/workshop/new"),
+            "old": ModChange("updated", "workshop", "/workshop/old"),
+            "local": ModChange("updated", "local", "/local/mod"),
+            "gone": ModChange("deleted", "local", "/local/gone"),
+        }
+    )
+    MetadataManager.process_changes(state, batch)
+
+    state.process_deletion.assert_called_once_with("local", "/local/gone", "gone")
+    assert [c.kwargs for c in state.process_batch.call_args_list] == [
+        {
+            "batch": {"/workshop/new": "new", "/workshop/old": "old"},
+            "data_source": "workshop",
+        },
+        {"batch": {"/local/mod": "local"}, "data_source": "local"},
+    ]
+    state.wait_for_parsers.assert_called_once_with()
+    # Parser processes hold a snapshot of the Steam metadata, and are not kept
+    state.shutdown_parser_processes.assert_called_once_with()
+    # Mods that did not exist are not compiled
+    state.compile_metadata.assert_called_once_with(uuids=["old"])
+    state.mod_metadata_updated_signal.emit.assert_called_once_with("old")
+    state.mod_created_signal.emit.assert_called_once_with("new")
+
+
+def test_shutdown_parser_processes() -> None:
+    pool = Mock()
+    state: Any = types.SimpleNamespace(parser_process_pool=pool)
+    MetadataManager.shutdown_parser_processes(state)
+    pool.shutdown.assert_called_once_with()
+    assert state.parser_process_pool is None
+    MetadataManager.shutdown_parser_processes(state)
+    pool.shutdown.assert_called_once_with()
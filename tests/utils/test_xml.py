@@ -0,0 +1,142 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from app.utils.xml import ABOUT_XML_FIELDS, about_xml_to_json, xml_path_to_json
+
+MOD_EXAMPLES = Path("tests/data/mod_examples")
+
+
+def _used_fields(data: dict[str, Any]) -> dict[str, Any]:
+    """Reduce xml_path_to_json() output to the fields about_xml_to_json() extracts."""
+    ((root, fields),) = data.items()
+    if not isinstance(fields, dict):
+        return {root: None}
+    used = {k: v for k, v in fields.items() if k.lower() in ABOUT_XML_FIELDS}
+    return {root: used} if used else data
+
+
+def _about_xml_files() -> list[Path]:
+    return sorted(
+        path for path in MOD_EXAMPLES.rglob("*") if path.name.lower() == "about.xml"
+    )
+
+
+@pytest.mark.parametrize("path", _about_xml_files(), ids=str)
+def test_about_xml_to_json_matches_mod_examples(path: Path) -> None:
+    assert about_xml_to_json(str(path)) == _used_fields(xml_path_to_json(str(path)))
+
+
+WELL_FORMED = {
+    "repeated_and_nested": """<?xml version="1.0" encoding="utf-8"?>
+<ModMetaData>
+  <name>Example</name>
+  <packageId>Author.Example</packageId>
+  <supportedVersions><li>1.4</li><li> 1.5 </li></supportedVersions>
+  <modDependencies>
+    <li>
+      <packageId>brrainz.harmony</packageId>
+      <displayName>Harmony</displayName>
+      <steamWorkshopUrl>steam://url/CommunityFilePage/2009463077</steamWorkshopUrl>
+    </li>
+  </modDependencies>
+  <loadAfter><li>ludeon.rimworld</li></loadAfter>
+  <modDependenciesByVersion>
+    <v1.4><li><packageId>a.b</packageId></li></v1.4>
+    <v1.5></v1.5>
+  </modDependenciesByVersion>
+  <unusedTag><li>ignored</li></unusedTag>
+</ModMetaData>
+""",
+    "single_li_and_empty": """<ModMetaData>
+  <packageId>a.b</packageId>
+  <supportedVersions><li>1.5</li></supportedVersions>
+  <loadBefore/>
+  <incompatibleWith>
+  </incompatibleWith>
+  <description></description>
+</ModMetaData>
+""",
+    "attributes_comments_and_mixed_text": """<ModMetaData xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+  <!-- a comment -->
+  <packageId>a.b</packageId>
+  <name IfModActive="x.y">Name</name>
+  <description>Line one<!-- hidden --> line two<b>bold</b> tail</description>
+  <url xsi:nil="true"/>
+  <modVersion><![CDATA[1.0 <beta>]]></modVersion>
+  <author>One</author>
+  <author>Two</author>
+</ModMetaData>
+""",
+    "case_variants": """<modmetadata>
+  <PackageID>A.B</PackageID>
+  <Name>Name</Name>
+  <SupportedVersions><li>1.5</li></SupportedVersions>
+</modmetadata>
+""",
+    "entities_and_unicode": """﻿<?xml version="1.0" encoding="utf-8"?>
+<ModMetaData>
+  <packageId>a.b</packageId>
+  <name>R&amp;D &#8212; Ünïcödé</name>
+</ModMetaData>
+""",
+}
+
+
+@pytest.mark.parametrize("content", WELL_FORMED.values(), ids=WELL_FORMED.keys())
+def test_about_xml_to_json_matches_xmltodict(tmp_path: Path, content: str) -> None:
+    path = tmp_path / "About.xml"
+    path.write_text(content, encoding="utf-8")
+    assert about_xml_to_json(str(path)) == _used_fields(xml_path_to_json(str(path)))
+
+
+MALFORMED = {
+    "unescaped_ampersand": """<ModMetaData>
+  <packageId>a.b</packageId>
+  <name>Rock & Stone</name>
+  <loadAfter><li>c.d</li><li></li></loadAfter>
+</ModMetaData>
+""",
+    "undefined_entity": """<ModMetaData>
+  <packageId>a.b</packageId>
+  <description>Uses&nbsp;spaces</description>
+  <supportedVersions><li>1.5</li></supportedVersions>
+</ModMetaData>
+""",
+    "unclosed_tag": """<ModMetaData>
+  <packageId>a.b</packageId>
+  <name>Name</name>
+  <supportedVersions><li>1.5</li></supportedVersions>
+  <description>Description
+</ModMetaData>
+""",
+}
+
+
+@pytest.mark.parametrize("content", MALFORMED.values(), ids=MALFORMED.keys())
+def test_about_xml_to_json_recovers_like_fallback(tmp_path: Path, content: str) -> None:
+    path = tmp_path / "About.xml"
+    path.write_text(content, encoding="utf-8")
+    result = about_xml_to_json(str(path))
+    assert result["ModMetaData"]["packageId"] == "a.b"
+    assert result == _used_fields(xml_path_to_json(str(path)))
+
+
+def test_about_xml_to_json_without_used_fields(tmp_path: Path) -> None:
+    path = tmp_path / "About.xml"
+    for content in (
+        "<ModMetaData><unknown>x</unknown></ModMetaData>",
+        "<ModMetaData/>",
+        "<ModMetaData>  </ModMetaData>",
+    ):
+        path.write_text(content, encoding="utf-8")
+        assert about_xml_to_json(str(path)) == xml_path_to_json(str(path))
+
+
+def test_about_xml_to_json_missing_or_unrecoverable(tmp_path: Path) -> None:
+    assert about_xml_to_json(str(tmp_path / "missing.xml")) == {}
+
+    path = tmp_path / "About.xml"
+    path.write_text("not xml at all", encoding="utf-8")
+    assert about_xml_to_json(str(path)) == {}
@@ -0,0 +1,379 @@
+import random
+from typing import Any, Generator
+from unittest.mock import patch
+
+import pytest
+from PySide6.QtCore import QModelIndex, Qt
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QStyleOptionViewItem,
+)
+from pytestqt.qtbot import QtBot
+
+from app.views.mods_panel import ModListWidget, ModsPanel
+from tests.reference.mods_panel import (
+    compiled_corpus,
+    insert,
+    move,
+    populate,
+    reference_recalculate_internal_errors_warnings,
+    reference_signal_search_and_filters,
+    settings_controller,
+    take,
+)
+from tests.reference.synthetic_mods import generate_mod_corpus, metadata_manager_state
+
+
+@pytest.fixture
+def mod_list(qtbot: QtBot) -> Generator[ModListWidget, None, None]:
+    corpus = generate_mod_corpus(200, duplicates=0)
+    with patch(
+        "app.utils.metadata.MetadataManager._instance", metadata_manager_state(corpus)
+    ):
+        mod_list = ModListWidget("Active", settings_controller())
+        qtbot.addWidget(mod_list)
+        mod_list.resize(300, 400)
+        mod_list.show()
+        populate(mod_list, list(corpus))
+        yield mod_list
+
+
+@pytest.fixture
+def mods_panels(qtbot: QtBot) -> Generator[list[ModsPanel], None, None]:
+    corpus = generate_mod_corpus(200, duplicates=0)
+    for index, uuid in enumerate(corpus):
+        corpus[uuid]["csharp"] = index % 3 == 0
+        corpus[uuid]["git_repo"] = index % 5 == 0
+    with patch(
+        "app.utils.metadata.MetadataManager._instance", metadata_manager_state(corpus)
+    ):
+        mods_panels = []
+        for _ in range(2):
+            mods_panel = ModsPanel(
+                settings_controller(hide_invalid_mods_when_filtering_toggle=True)
+            )
+            qtbot.addWidget(mods_panel)
+            populate(mods_panel.active_mods_list, list(corpus))
+            for row in range(0, 200, 7):
+                _set_item_data(mods_panel.active_mods_list, row, invalid=True)
+            mods_panels.append(mods_panel)
+        yield mods_panels
+
+
+def _option(mod_list: ModListWidget, index: QModelIndex) -> QStyleOptionViewItem:
+    option = QStyleOptionViewItem()
+    mod_list.initViewItemOption(option)
+    option.rect = mod_list.visualRect(index)  # type: ignore[attr-defined]
+    return option
+
+
+def _set_item_data(mod_list: ModListWidget, row: int, **values: Any) -> None:
+    item = mod_list.item(row)
+    item_data = item.data(Qt.ItemDataRole.UserRole)
+    for key, value in values.items():
+        item_data[key] = value
+    item.setData(Qt.ItemDataRole.UserRole, item_data)
+
+
+def test_rows_are_painted_without_widgets(mod_list: ModListWidget) -> None:
+    assert mod_list.count() == 200
+    assert mod_list.uuids == [
+        mod_list.item(row).data(Qt.ItemDataRole.UserRole)["uuid"]
+        for row in range(mod_list.count())
+    ]
+    assert all(
+        mod_list.itemWidget(mod_list.item(row)) is None
+        for row in range(mod_list.count())
+    )
+    heights = {
+        mod_list.visualRect(mod_list.model().index(row, 0)).height() for row in range(5)
+    }
+    assert heights == {mod_list.item_delegate.ICON_SIZE}
+    assert not mod_list.grab().isNull()
+
+
+def test_recreate_mod_list_inserts_in_bulk(
+    mod_list: ModListWidget, qtbot: QtBot
+) -> None:
+    uuids = mod_list.uuids[::-1][:150]
+    other_list = ModListWidget("Inactive", settings_controller())
+    qtbot.addWidget(other_list)
+    other_list.uuids = mod_list.uuids[100:]
+    mod_list.items_added_signal.connect(other_list.handle_other_list_rows_added)
+    updates: list[str] = []
+    added: list[str] = []
+    mod_list.list_update_signal.connect(updates.append)
+    mod_list.item_added_signal.connect(added.append)
+
+    mod_list.recreate_mod_list("Active", uuids)
+    QApplication.processEvents()
+
+    assert updates == ["150"]
+    assert added == []
+    assert mod_list.uuids == uuids
+    assert [
+        mod_list.item(row).data(Qt.ItemDataRole.UserRole)["uuid"]
+        for row in range(mod_list.count())
+    ] == uuids
+    assert other_list.uuids == []
+
+    mod_list.recreate_mod_list("Active", [])
+    assert updates == ["150", "0"]
+    assert mod_list.uuids == []
+
+
+def test_insert_uuids(mod_list: ModListWidget, qtbot: QtBot) -> None:
+    uuids = mod_list.uuids[:6]
+    mod_list.recreate_mod_list("Active", [uuids[1], uuids[3]])
+    QApplication.processEvents()
+    updates: list[str] = []
+    added: list[list[str]] = []
+    mod_list.list_update_signal.connect(updates.append)
+    mod_list.items_added_signal.connect(added.append)
+
+    # Each row counts the mods inserted before it
+    mod_list.insert_uuids([(0, uuids[0]), (4, uuids[5]), (2, uuids[2])])
+    QApplication.processEvents()
+
+    expected = [uuids[0], uuids[1], uuids[2], uuids[3], uuids[5]]
+    assert mod_list.uuids == expected
+    assert [
+        mod_list.item(row).data(Qt.ItemDataRole.UserRole)["uuid"]
+        for row in range(mod_list.count())
+    ] == expected
+    assert added == [[uuids[0], uuids[5], uuids[2]]]
+    # Errors and warnings are left to the final pass
+    assert updates == []
+
+
+def test_browse_only_list_does_not_move_mods(mod_list: ModListWidget) -> None:
+    moves: list[str] = []
+    mod_list.key_press_signal.connect(moves.append)
+
+    mod_list.set_browse_only(True)
+    mod_list.mod_double_clicked(mod_list.item(0))
+    assert moves == []
+    assert mod_list.dragDropMode() == QAbstractItemView.DragDropMode.NoDragDrop
+
+    mod_list.set_browse_only(False)
+    mod_list.mod_double_clicked(mod_list.item(0))
+    assert moves == ["DoubleClick"]
+    assert mod_list.dragDropMode() == QAbstractItemView.DragDropMode.DragDrop
+
+
+def test_neighbour_uuids(mod_list: ModListWidget) -> None:
+    uuids = mod_list.uuids
+    mod_list.setCurrentRow(5)
+    assert mod_list.neighbour_uuids(uuids[5], 2) == [
+        uuids[6],
+        uuids[4],
+        uuids[7],
+        uuids[3],
+    ]
+    assert mod_list.neighbour_uuids(uuids[0], 2) == [uuids[1], uuids[2]]
+    assert mod_list.neighbour_uuids("not-in-list", 2) == []
+
+
+def test_row_layout(mod_list: ModListWidget) -> None:
+    delegate = mod_list.item_delegate
+    index = mod_list.model().index(1, 0)
+
+    icons, name_rect, name, badges = delegate.get_row_layout(
+        _option(mod_list, index), index
+    )
+    assert [tooltip for _, _, tooltip in icons] == [
+        "Subscribed via Steam",
+        "Contains custom content (textures / XML)",
+    ]
+    assert name == "Synthetic Mod 1"
+    assert badges == []
+
+    _set_item_data(mod_list, 1, warnings="Warning", errors="Error")
+    icons, name_rect, name, badges = delegate.get_row_layout(
+        _option(mod_list, index), index
+    )
+    assert [tooltip for _, _, tooltip in badges] == ["Warning", "Error"]
+    assert badges[0][0].left() == name_rect.right() + 1
+
+
+def test_row_layouts_are_cached_for_visible_rows(mod_list: ModListWidget) -> None:
+    delegate = mod_list.item_delegate
+    rows = mod_list.visible_rows()
+    assert rows.start == 0
+    assert len(rows) == mod_list.viewport().height() // delegate.ICON_SIZE + 1
+
+    mod_list.viewport().repaint()
+    uuid = mod_list.uuids[1]
+    cached = delegate.row_layouts[uuid]
+    mod_list.viewport().repaint()
+    assert delegate.row_layouts[uuid] is cached
+    # Layouts are rebuilt when the row's data changes
+    _set_item_data(mod_list, 1, warnings="Warning")
+    mod_list.viewport().repaint()
+    assert delegate.row_layouts[uuid] is not cached
+
+    scroll_bar = mod_list.verticalScrollBar()
+    most_cached = 0
+    while scroll_bar.value() < scroll_bar.maximum():
+        scroll_bar.setValue(scroll_bar.value() + scroll_bar.singleStep())
+        mod_list.viewport().repaint()
+        most_cached = max(most_cached, len(delegate.row_layouts))
+    rows = mod_list.visible_rows()
+    assert rows.stop == mod_list.count()
+    assert most_cached <= 2 * (len(rows) + 2 * mod_list.ROW_LAYOUT_OVERSCAN) + len(rows)
+    assert uuid not in delegate.row_layouts
+
+
+def test_clicking_warning_icon_toggles_warning(
+    mod_list: ModListWidget, qtbot: QtBot
+) -> None:
+    _set_item_data(mod_list, 2, warnings="Warning")
+    index = mod_list.model().index(2, 0)
+    badges = mod_list.item_delegate.get_row_layout(_option(mod_list, index), index)[3]
+
+    with qtbot.waitSignal(mod_list.recalculate_warnings_signal):
+        qtbot.mouseClick(  # type: ignore[no-untyped-call]
+            mod_list.viewport(),
+            Qt.MouseButton.LeftButton,
+            pos=badges[0][0].center(),
+        )
+
+    assert mod_list.item(2).data(Qt.ItemDataRole.UserRole)["warning_toggled"]
+    assert mod_list.ignore_warning_list == ["synthetic.author2.mod2"]
+
+
+def _filter_state(mods_panel: ModsPanel) -> list[tuple[bool, bool, bool]]:
+    mod_list = mods_panel.active_mods_list
+    return [
+        (
+            mod_list.item(row).isHidden(),
+            mod_list.item(row).data(Qt.ItemDataRole.UserRole)["filtered"],
+            mod_list.item(row).data(Qt.ItemDataRole.UserRole)["hidden_by_filter"],
+        )
+        for row in range(mod_list.count())
+    ]
+
+
+def test_search_and_filters_match_reference(mods_panels: list[ModsPanel]) -> None:
+    mods_panel, reference_panel = mods_panels
+    # (hide filter, search filter, pattern, data source filter, mod type filter)
+    steps = [
+        (True, "Name", "mod 1", "all", 0),
+        (True, "Name", "mod 12", "all", 0),
+        (True, "Name", "mod 2", "all", 0),
+        (True, "PackageId", "author2.", "all", 0),
+        (True, "Name", "", "workshop", 0),
+        (True, "Name", "mod", "local", 1),
+        (True, "Name", "", "git_repo", 2),
+        (False, "Name", "", "git_repo", 2),
+        (False, "Name", "mod 3", "all", 0),
+        (False, "Author(s)", "author 4", "all", 1),
+        (True, "Author(s)", "author 4", "all", 1),
+        (True, "Name", "", "all", 0),
+    ]
+    for filter_state, search_filter, pattern, source_filter, type_filter in steps:
+        for panel in mods_panels:
+            panel.active_mods_search_filter_state = filter_state
+            panel.active_mods_search_filter.setCurrentText(search_filter)
+            panel.active_mods_search.setText(pattern)
+            panel.active_mods_data_source_filter = source_filter
+            panel.active_data_source_filter_type_index = type_filter
+        filters_active = source_filter != "all" or type_filter != 0
+
+        mods_panel.signal_search_and_filters(
+            "Active", pattern, filters_active=filters_active
+        )
+        reference_signal_search_and_filters(
+            reference_panel, "Active", pattern, filters_active=filters_active
+        )
+
+        assert _filter_state(mods_panel) == _filter_state(reference_panel)
+        assert (
+            mods_panel.active_mods_label.text()
+            == reference_panel.active_mods_label.text()
+        )
+
+
+def test_search_waits_for_typing_to_pause(
+    mods_panels: list[ModsPanel], qtbot: QtBot
+) -> None:
+    mods_panel = mods_panels[0]
+    with patch.object(
+        mods_panel.active_mods_list,
+        "recalculate_internal_errors_warnings",
+        side_effect=AssertionError("Searching recalculated errors and warnings"),
+    ):
+        for pattern in ["m", "mo", "mod", "mod 1"]:
+            mods_panel.active_mods_search.setText(pattern)
+        assert mods_panel.active_mods_label.text() == "Active [200]"
+
+        qtbot.waitUntil(lambda: mods_panel.active_mods_label.text() != "Active [200]")
+
+    # Synthetic Mod 1 and 10 to 199, less the invalid mods, which are hidden
+    assert mods_panel.active_mods_label.text() == "Active [96/200]"
+    assert not mods_panel.active_mods_search_timer.isActive()
+
+
+def _errors_warnings(mod_list: ModListWidget) -> list[tuple[Any, ...]]:
+    return [
+        (
+            item_data["uuid"],
+            item_data["mismatch"],
+            item_data["errors"],
+            item_data["warnings"],
+            item_data["errors_warnings"],
+        )
+        for item_data in (
+            mod_list.item(row).data(Qt.ItemDataRole.UserRole)
+            for row in range(mod_list.count())
+        )
+    ]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_recalculate_errors_warnings_matches_reference(qtbot: QtBot, seed: int) -> None:
+    corpus = compiled_corpus(300, seed=seed)
+    uuids = list(corpus)
+    rng = random.Random(seed)
+    inactive = uuids[-40:]
+    with patch(
+        "app.utils.metadata.MetadataManager._instance", metadata_manager_state(corpus)
+    ):
+        mod_lists = []
+        for _ in range(2):
+            mod_list = ModListWidget("Active", settings_controller())
+            qtbot.addWidget(mod_list)
+            populate(mod_list, uuids[:-40])
+            mod_lists.append(mod_list)
+        mod_list, reference_mod_list = mod_lists
+
+        for step in range(60):
+            change = rng.choice(["drag", "activate", "deactivate", "toggle"])
+            count = mod_list.count()
+            if change == "drag":
+                source, destination = rng.randrange(count), rng.randrange(count + 1)
+                for each in mod_lists:
+                    move(each, source, destination)
+            elif change == "activate" and inactive:
+                row, uuid = rng.randrange(count), inactive.pop()
+                for each in mod_lists:
+                    insert(each, row, uuid)
+            elif change == "deactivate":
+                row = rng.randrange(count)
+                inactive.append(mod_list.uuids[row])
+                for each in mod_lists:
+                    take(each, row)
+            elif change == "toggle":
+                uuid = rng.choice(mod_list.uuids)
+                for each in mod_lists:
+                    each.toggle_warning(corpus[uuid]["packageid"], uuid)
+
+            assert mod_list.recalculate_internal_errors_warnings() == (
+                reference_recalculate_internal_errors_warnings(reference_mod_list)
+            ), f"step {step}: {change}"
+            assert _errors_warnings(mod_list) == _errors_warnings(reference_mod_list)
+            # The ignore list is only used for lookups, so its order does not matter
+            assert sorted(mod_list.ignore_warning_list) == sorted(
+                reference_mod_list.ignore_warning_list
+            )